@@ -2,8 +2,13 @@
 App utilities
 """
 
+import streamlit as st
 from streamlit_extras.stylable_container import stylable_container
 
+# Most completed trials to keep in each user's session. The results of a long
+# trial (mainly its patient-level data) can be hundreds of megabytes.
+MAX_STORED_TRIALS = 2
+
 
 def iconMetricContainer(
     key, icon_unicode, css_style=None, icon_color="grey", family="filled",
@@ -87,3 +92,58 @@ def read_file_contents(file_name):
     """
     with open(file_name, encoding="utf-8") as f:
         return f.read()
+
+
+def get_stored_results(key):
+    """
+    Return the results of a trial run earlier in this session, if any.
+
+    Results are kept in `st.session_state`, so they survive the reruns of the
+    script caused by changing any widget, and are private to each user.
+
+    Parameters
+    ----------
+    key : str
+        Identifies the trial's scenario (from `scenario_key`).
+
+    Returns
+    -------
+    dict or None
+        The results passed to `store_results`, or None if this scenario
+        hasn't been run in this session.
+    """
+    stored = st.session_state.setdefault("stored_trials", {})
+    results = stored.pop(key, None)
+    if results is not None:
+        # Move to the end, so it is the last to be forgotten
+        stored[key] = results
+    return results
+
+
+def store_results(key, results, max_entries=MAX_STORED_TRIALS):
+    """
+    Keep the results of a trial for the rest of this session.
+
+    Once more than `max_entries` trials are stored, the least recently used
+    are forgotten, to limit how much memory each session uses.
+
+    Parameters
+    ----------
+    key : str
+        Identifies the trial's scenario (from `scenario_key`).
+    results : dict
+        The trial's results that are displayed. Don't include the `Trial`
+        itself, as its models hold every patient.
+    max_entries : int, optional
+        Most trials to keep. Default `MAX_STORED_TRIALS`.
+    """
+    stored = st.session_state.setdefault("stored_trials", {})
+    stored.pop(key, None)
+    stored[key] = results
+    while len(stored) > max_entries:
+        del stored[next(iter(stored))]
+
+
+def has_stored_results():
+    """Return whether any trial has been run in this session."""
+    return bool(st.session_state.get("stored_trials"))
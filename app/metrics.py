@@ -67,9 +67,14 @@ year{"" if self.sim_duration_days // 365 == 1 else "s"} and
             self.df_trial_results["Total Savings"] / self.sim_duration_years
         ).mean()
 
-        self.extra_throm = g.trial_additional_thrombolysis_from_ctp[
-            g.trials_run_counter
-        ]
+        # Calculated from this trial's results rather than read from g, as g
+        # is shared between everyone using the app
+        self.extra_throm = round(
+            self.df_trial_results[
+                "Mean Additional Thrombolysed Patients From CTP Running"
+            ].mean(),
+            2,
+        )
         self.extra_throm_yearly = (self.extra_throm / (g.sim_duration / 60 / 24)) * 365
 
         self.avoid_yearly = (
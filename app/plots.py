@@ -14,34 +14,34 @@ from vidigi.process_mapping import (
 from convert_event_log import convert_event_log
 
 
-def plot_occupancy(
-    occupancy_df,
-    total_sim_duration_days,
-    warm_up_duration_days,
-    plot_confidence_intervals=False,
-):
+@st.cache_data(show_spinner=False, max_entries=20)
+def summarise_occupancy(_occupancy_df, total_sim_duration_days, cache_key):
     """
-    Plot occupancy over time, optionally with confidence bands.
+    Resample occupancy to an hourly grid and summarise it across runs.
+
+    This is the slow part of drawing the occupancy plots, so it is cached:
+    changing how the plot is displayed doesn't repeat it.
 
     Parameters
     ----------
-    occ_df : pd.DataFrame
-        Data frame with columns "Time" (minutes), "Occupancy", and "run".
-    total_sim_days : float
+    _occupancy_df : pd.DataFrame
+        Data frame with columns "Time" (minutes), "Occupancy", and "run". Not
+        hashed by Streamlit, so `cache_key` must identify it.
+    total_sim_duration_days : float
         Total simulation duration in days.
-    warm_up_days : float
-        Warm-up duration in days; shown as a vertical line.
-    plot_confidence_intervals : bool, optional
-        If True, plot median and quantile bands across runs.
-        If False, plot individual runs plus mean and rolling mean.
+    cache_key : hashable
+        Identifies the trial and unit the occupancy is from, e.g.
+        `(scenario_key(scenario), "ward")`.
 
     Returns
     -------
-    plotly.graph_objects.Figure
-        Plotly figure showing occupancy trajectories.
+    tuple of pd.DataFrame
+        The occupancy with a "Days" column added, the mean occupancy across
+        runs on the grid, and the quantiles of occupancy across runs on the
+        grid.
     """
     # Convert from minutes to days
-    occupancy_df["Days"] = occupancy_df["Time"] / 60 / 24
+    occupancy_df = _occupancy_df.assign(Days=_occupancy_df["Time"] / 60 / 24)
 
     # Define regular grid
     grid_days = np.arange(
@@ -64,22 +64,59 @@ def plot_occupancy(
     # Mean occupancy across runs on the grid
     mean_df = grid_df.groupby("Days", as_index=False)["Occupancy"].mean()
 
-    if plot_confidence_intervals:
-        # Summary quantiles across runs at each time point
-        summary_df = (
-            grid_df.groupby("Days")["Occupancy"]
-            .agg(
-                min="min",
-                p10=lambda x: x.quantile(0.1),
-                p25=lambda x: x.quantile(0.25),
-                median="median",
-                p75=lambda x: x.quantile(0.75),
-                p90=lambda x: x.quantile(0.9),
-                max="max",
-            )
-            .reset_index()
+    # Summary quantiles across runs at each time point
+    summary_df = (
+        grid_df.groupby("Days")["Occupancy"]
+        .agg(
+            min="min",
+            p10=lambda x: x.quantile(0.1),
+            p25=lambda x: x.quantile(0.25),
+            median="median",
+            p75=lambda x: x.quantile(0.75),
+            p90=lambda x: x.quantile(0.9),
+            max="max",
         )
+        .reset_index()
+    )
 
+    return occupancy_df, mean_df, summary_df
+
+
+def plot_occupancy(
+    occupancy_df,
+    total_sim_duration_days,
+    warm_up_duration_days,
+    cache_key,
+    plot_confidence_intervals=False,
+):
+    """
+    Plot occupancy over time, optionally with confidence bands.
+
+    Parameters
+    ----------
+    occ_df : pd.DataFrame
+        Data frame with columns "Time" (minutes), "Occupancy", and "run".
+    total_sim_days : float
+        Total simulation duration in days.
+    warm_up_days : float
+        Warm-up duration in days; shown as a vertical line.
+    cache_key : hashable
+        Identifies the trial and unit the occupancy is from (see
+        `summarise_occupancy`).
+    plot_confidence_intervals : bool, optional
+        If True, plot median and quantile bands across runs.
+        If False, plot individual runs plus mean and rolling mean.
+
+    Returns
+    -------
+    plotly.graph_objects.Figure
+        Plotly figure showing occupancy trajectories.
+    """
+    occupancy_df, mean_df, summary_df = summarise_occupancy(
+        occupancy_df, total_sim_duration_days, cache_key
+    )
+
+    if plot_confidence_intervals:
         occupancy_fig = go.Figure()
 
         # Min-max band (lightest)
@@ -176,9 +213,7 @@ def plot_occupancy(
 
     else:
         # Rolling mean of mean occupancy (7-day window)
-        mean_df["rolling_mean_7"] = (
-            mean_df["Occupancy"].rolling(window=7, center=True).mean()
-        )
+        rolling_mean_7 = mean_df["Occupancy"].rolling(window=7, center=True).mean()
 
         # Create a line plot with one line per run
         occupancy_fig = px.line(
@@ -198,7 +233,7 @@ def plot_occupancy(
         # Add rolling mean line
         occupancy_fig.add_scatter(
             x=mean_df["Days"],
-            y=mean_df["rolling_mean_7"],
+            y=rolling_mean_7,
             mode="lines",
             name="7-day rolling mean",
             line={"width": 1, "color": "green"},
@@ -346,23 +381,25 @@ there are no directly-follows relationships in this subgroup."
 
 @st.fragment
 def generate_occupancy_plots(
-    my_trial, warm_up_duration_days, sim_duration_days
+    results, warm_up_duration_days, sim_duration_days, results_key
 ):
     """
     Display ward and SDEC occupancy plots and related result tables.
 
     Parameters
     ----------
-    my_trial : object
-        Trial object containing simulation results, including
-        attributes such as `ward_occupancy_df`,
-        `sdec_occupancy_df`, ``df_trial_results` and
+    results : dict
+        Results of a trial, as stored by `store_results`, including
+        `ward_occupancy_df`, `sdec_occupancy_df`, `df_trial_results` and
         `trial_patient_df`.
     warm_up_duration_days : float
         Warm-up duration in days. Used both for plotting and
         to mark the end of the warm-up on the occupancy plots.
     sim_duration_days : float
         Main simulation duration in days (excluding warm-up).
+    results_key : str
+        Identifies the trial's scenario (from `scenario_key`), so that the
+        resampled occupancy is only calculated once per trial.
 
     Returns
     -------
@@ -377,22 +414,24 @@ def generate_occupancy_plots(
 
     st.subheader("Ward Occupancy Over Time")
     ward_occupancy_fig = plot_occupancy(
-        occupancy_df=my_trial.ward_occupancy_df,
+        occupancy_df=results["ward_occupancy_df"],
         total_sim_duration_days=(
             warm_up_duration_days + sim_duration_days
         ),
         warm_up_duration_days=warm_up_duration_days,
+        cache_key=(results_key, "ward"),
         plot_confidence_intervals=conf_intervals,
     )
     st.plotly_chart(ward_occupancy_fig)
 
     st.subheader("SDEC Occupancy Over Time")
     sdec_occupancy_fig = plot_occupancy(
-        occupancy_df=my_trial.sdec_occupancy_df,
+        occupancy_df=results["sdec_occupancy_df"],
         total_sim_duration_days=(
             warm_up_duration_days + sim_duration_days
         ),
         warm_up_duration_days=warm_up_duration_days,
+        cache_key=(results_key, "sdec"),
         plot_confidence_intervals=conf_intervals,
     )
     st.plotly_chart(sdec_occupancy_fig)
@@ -400,16 +439,16 @@ def generate_occupancy_plots(
     # Detailed tabular outputs below the plots
     with st.expander("Click to view detailed result tables"):
         st.subheader("Full Per-Run Results for Trial")
-        st.dataframe(my_trial.df_trial_results.T)
+        st.dataframe(results["df_trial_results"].T)
 
         st.subheader("ull Per-Patient Results for Trial (Including Warm-Up)")
-        st.dataframe(my_trial.trial_patient_df)
+        st.dataframe(results["trial_patient_df"])
 
         st.subheader("Ward Occupancy Audits")
-        st.dataframe(my_trial.ward_occupancy_df)
+        st.dataframe(results["ward_occupancy_df"])
 
         st.subheader("SDEC Occupancy Audits")
-        st.dataframe(my_trial.sdec_occupancy_df)
+        st.dataframe(results["sdec_occupancy_df"])
 
 
 @st.fragment
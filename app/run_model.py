@@ -6,13 +6,20 @@ Page for users to choose parameters, run the model and view results.
 import streamlit as st
 import pandas as pd
 import plotly.express as px
+from streamlit.runtime.scriptrunner_utils.exceptions import ScriptControlException
 
 # Model imports
-from stroke_ward_model.inputs import g
+from stroke_ward_model.cache import scenario_key
+from stroke_ward_model.inputs import g, Scenario
 from stroke_ward_model.trial import Trial
 
 # App imports
-from app_utils import iconMetricContainer
+from app_utils import (
+    get_stored_results,
+    has_stored_results,
+    iconMetricContainer,
+    store_results,
+)
 from convert_event_log import convert_event_log, create_vidigi_animation
 from plots import (
     plot_dfg_per_feature,
@@ -30,7 +37,11 @@ st.logo("app/resources/nhs-logo-colour.png", size="large")
 with open("app/resources/style.css") as css:
     st.markdown(f"<style>{css.read()}</style>", unsafe_allow_html=True)
 
-g.gen_graph = True
+# Parameters chosen in the sidebar are collected here and used to build an
+# immutable Scenario for the run. The shared g class is never modified, so
+# several people can use the app at the same time without their choices
+# affecting each other's model runs.
+scenario_params = {"gen_graph": True}
 
 patient_level_metric_choices = {
     "Nurse Queue Time": "q_time_nurse",
@@ -104,7 +115,7 @@ with st.sidebar:
         "Choose the number of nurses available for triage", 0, 10, 2
     )
 
-    g.number_of_nurses = number_of_triage_nurses
+    scenario_params["number_of_nurses"] = number_of_triage_nurses
 
     therapy_sdec = st.toggle(
         "Toggle whether the SDEC will run with full therapy support",
@@ -120,17 +131,17 @@ If therapy support enabled, patients with a higher
  location of where they are seen is the only thing changing.
         """,
     )
-    g.therapy_sdec = therapy_sdec
+    scenario_params["therapy_sdec"] = therapy_sdec
 
     number_of_sdec_beds = st.slider(
         "Choose the number of beds available in the SDEC", 0, 20, 5
     )
-    g.sdec_beds = number_of_sdec_beds
+    scenario_params["sdec_beds"] = number_of_sdec_beds
 
     number_of_ward_beds = st.slider(
         "Choose the number of beds available in the ward", 10, 100, 49
     )
-    g.number_of_ward_beds = number_of_ward_beds
+    scenario_params["number_of_ward_beds"] = number_of_ward_beds
 
     st.caption(
         f"Total number of beds available: {number_of_ward_beds + number_of_sdec_beds}"
@@ -192,7 +203,7 @@ This equates to the CT perfusion scanner being available roughly
         sdec_open_time = st.time_input(
             "What time should the SDEC be open from?", value="08:00", step=60 * 60
         )
-        g.sdec_opening_hour = sdec_open_time.hour
+        scenario_params["sdec_opening_hour"] = sdec_open_time.hour
 
         sdec_unaval_perc = ((24.0 - sdec_avail_hours) / 24.0) * 100
 
@@ -218,7 +229,7 @@ The CTP perfusion scanner is available {ctp_avail_hours / 24.0:.1%} of the time
             step=60 * 60,
         )
 
-        g.ctp_opening_hour = ctp_open_time.hour
+        scenario_params["ctp_opening_hour"] = ctp_open_time.hour
 
         ctp_unaval_perc = ((24.0 - ctp_avail_hours) / 24.0) * 100
 
@@ -226,22 +237,24 @@ The CTP perfusion scanner is available {ctp_avail_hours / 24.0:.1%} of the time
     ctp_available_perc = 100.0 - ctp_unaval_perc
 
     if sdec_available_perc <= 100 and sdec_available_perc >= 0:
-        g.sdec_value = sdec_available_perc
-        g.sdec_unav_freq = 1440 * (sdec_available_perc / 100)
-        g.sdec_unav_time = 1440 - g.sdec_unav_freq
+        scenario_params["sdec_value"] = sdec_available_perc
+        sdec_unav_freq = 1440 * (sdec_available_perc / 100)
+        scenario_params["sdec_unav_freq"] = sdec_unav_freq
+        scenario_params["sdec_unav_time"] = 1440 - sdec_unav_freq
     elif sdec_available_perc == 100:
-        g.sdec_value = sdec_available_perc
-        g.sdec_unav_freq = g.sim_duration * 2
-        g.sdec_unav_time = 0
+        scenario_params["sdec_value"] = sdec_available_perc
+        scenario_params["sdec_unav_freq"] = g.sim_duration * 2
+        scenario_params["sdec_unav_time"] = 0
 
     if ctp_available_perc <= 100 and ctp_available_perc >= 0:
-        g.ctp_value = ctp_available_perc
-        g.ctp_unav_freq = 1440 * (ctp_available_perc / 100)
-        g.ctp_unav_time = 1440 - g.ctp_unav_freq
+        scenario_params["ctp_value"] = ctp_available_perc
+        ctp_unav_freq = 1440 * (ctp_available_perc / 100)
+        scenario_params["ctp_unav_freq"] = ctp_unav_freq
+        scenario_params["ctp_unav_time"] = 1440 - ctp_unav_freq
     elif ctp_available_perc == 100:
-        g.ctp_value = ctp_available_perc
-        g.ctp_unav_freq = g.sim_duration * 2
-        g.ctp_unav_time = 0
+        scenario_params["ctp_value"] = ctp_available_perc
+        scenario_params["ctp_unav_freq"] = g.sim_duration * 2
+        scenario_params["ctp_unav_time"] = 0
 
     st.divider()
 
@@ -254,7 +267,7 @@ The CTP perfusion scanner is available {ctp_avail_hours / 24.0:.1%} of the time
         "What time does your in-hours demand start?", "07:00", step=60 * 60
     )
 
-    g.in_hours_start = in_hours_demand_start.hour
+    scenario_params["in_hours_start"] = in_hours_demand_start.hour
 
     in_hours_mean_iat = st.number_input(
         """
@@ -270,7 +283,7 @@ in-hours?
         "What time does your out-of-hours demand start?", "00:00", step=60 * 60
     )
 
-    g.ooh_start = out_of_hours_demand_start.hour
+    scenario_params["ooh_start"] = out_of_hours_demand_start.hour
 
     out_of_hours_mean_iat = st.number_input(
         """
@@ -290,8 +303,8 @@ out-of-hours?
     ooh_duration = 24 - in_hours_duration
 
     # Apply upscale to the Inter-Arrival Times for the model
-    g.in_hours_start = in_hours_demand_start.hour
-    g.ooh_start = out_of_hours_demand_start.hour
+    scenario_params["in_hours_start"] = in_hours_demand_start.hour
+    scenario_params["ooh_start"] = out_of_hours_demand_start.hour
 
     upscale_pct = st.slider(
         "Upscale demand by percentage (%)",
@@ -302,16 +315,18 @@ out-of-hours?
     )
     upscale_factor = 1 + (upscale_pct / 100)
 
-    g.patient_inter_day = in_hours_mean_iat / upscale_factor
-    g.patient_inter_night = out_of_hours_mean_iat / upscale_factor
+    patient_inter_day = in_hours_mean_iat / upscale_factor
+    patient_inter_night = out_of_hours_mean_iat / upscale_factor
+    scenario_params["patient_inter_day"] = patient_inter_day
+    scenario_params["patient_inter_night"] = patient_inter_night
     if upscale_factor != 1:
-        st.caption(f"The new in-hours IAT is {g.patient_inter_day:.1f}")
-        st.caption(f"The new out-of-hours IAT is {g.patient_inter_night:.1f}")
+        st.caption(f"The new in-hours IAT is {patient_inter_day:.1f}")
+        st.caption(f"The new out-of-hours IAT is {patient_inter_night:.1f}")
 
     # Calculate Annual Volumes for display
     # Formula: (60 / Adjusted IAT) * Hours per day * 365.25
-    annual_in = (60 / g.patient_inter_day) * in_hours_duration * 365.25
-    annual_out = (60 / g.patient_inter_night) * ooh_duration * 365.25
+    annual_in = (60 / patient_inter_day) * in_hours_duration * 365.25
+    annual_out = (60 / patient_inter_night) * ooh_duration * 365.25
     total_annual = annual_in + annual_out
 
     # 4. Display Summary to User
@@ -327,7 +342,7 @@ out-of-hours?
     ###############################
     st.subheader("Model Parameters (ADVANCED)")
 
-    g.number_of_runs = st.number_input(
+    scenario_params["number_of_runs"] = st.number_input(
         "Number of Runs", min_value=1, max_value=100, value=10
     )
 
@@ -338,7 +353,7 @@ out-of-hours?
     )
     sim_duration_minutes = sim_duration_days * 24 * 60
 
-    g.sim_duration = sim_duration_minutes
+    scenario_params["sim_duration"] = sim_duration_minutes
 
     st.caption(
         f"""
@@ -363,11 +378,11 @@ Time' graph to help assess whether your warm-up duration is appropriate.
     )
     warm_up_duration_minutes = warm_up_duration_days * 24 * 60
 
-    g.warm_up_period = warm_up_duration_minutes
+    scenario_params["warm_up_period"] = warm_up_duration_minutes
 
     debug_console = st.toggle("Turn on Debugging Console Messages", value=False)
 
-    g.show_trace = debug_console
+    scenario_params["show_trace"] = debug_console
 
     master_seed = st.number_input(
         "Set the master seed",
@@ -383,162 +398,306 @@ when trying out different scenarios.</b>
         """,
     )
 
-    g.master_seed = master_seed
+    scenario_params["master_seed"] = master_seed
 
 
 #####################
 # MARK: Run Model   #
 #####################
+# Results shown while the model is running, with the labels they are shown with
+partial_result_columns = {
+    "Mean Q Time Ward (Hour)": "Mean Ward Admission Delay (hours)",
+    "Mean Occupancy": "Mean Ward Occupancy",
+    "Number of Admissions Avoided In Run": "Admissions Avoided",
+    "Thrombolysis Savings (£)": "Thrombolysis Savings (£)",
+    "Total Savings": "Total Savings (£)",
+}
+
+
+def request_cancel():
+    st.session_state["run_cancelled"] = True
+
+
+def summarise_partial_results(trial):
+    """
+    Estimate the main results from the runs a trial has completed so far.
+
+    Parameters
+    ----------
+    trial : Trial
+        A trial that is being run.
+
+    Returns
+    -------
+    pd.DataFrame
+        The mean of each result in `partial_result_columns` across the
+        completed runs, with the half-width of its 95% confidence interval.
+    """
+    rows = []
+    for column, label in partial_result_columns.items():
+        statistics = trial.trial_statistics[column]
+        rows.append(
+            {
+                "Result": label,
+                "Mean so far": statistics.mean,
+                "95% CI (±)": statistics.ci_half_width(),
+            }
+        )
+    return pd.DataFrame(rows)
+
+
 button_run_pressed = st.button("Run simulation")
 
-if button_run_pressed:
-    with st.spinner("Running Model - Please Wait", show_time=True):
-        # Create an instance of the Trial class
-        my_trial = Trial()
+scenario = Scenario(**scenario_params)
+
+# Results are stored in the session under the scenario's parameters, so
+# changing a display option (which reruns this script) doesn't run the model
+# again, and neither does pressing the button again with the same inputs
+results_key = scenario_key(scenario)
+results = get_stored_results(results_key)
+
+if button_run_pressed and (results is None or results["cancelled"]):
+    cancel_placeholder = st.empty()
+    cancel_placeholder.button("Cancel run", on_click=request_cancel)
+    progress_bar = st.progress(0.0, text="Running Model - Please Wait")
+    partial_results = st.empty()
+
+    # Create an instance of the Trial class
+    my_trial = Trial(config=scenario)
+    number_of_runs = scenario.number_of_runs
+    shown_progress = {"percent": -1}
+
+    # Pressing the cancel button (or changing any input) reruns the page.
+    # Streamlit does this by raising an exception from the next st command,
+    # which here is in a progress callback, and only then calls the button's
+    # on_click. So the callbacks catch the exception and cancel the trial,
+    # which keeps the runs completed so far, then it is raised again once
+    # they have been stored.
+    interruption = {}
+
+    def stop_trial(exception):
+        interruption["exception"] = exception
+        my_trial.cancel()
+
+    def show_progress(runs_done):
+        # Only update the bar when it moves, to limit messages to the browser
+        percent = int(100 * min(runs_done / number_of_runs, 1.0))
+        if percent != shown_progress["percent"]:
+            shown_progress["percent"] = percent
+            progress_bar.progress(
+                percent / 100,
+                text=(
+                    f"Running Model - {my_trial.completed_runs} of "
+                    f"{number_of_runs} runs complete"
+                ),
+            )
 
-        # Call the run_trial method of our Trial object
-        my_trial.run_trial()
+    def show_run_progress(trial, run):
+        try:
+            show_progress(trial.completed_runs)
+            partial_results.dataframe(
+                summarise_partial_results(trial), hide_index=True
+            )
+        except ScriptControlException as e:
+            stop_trial(e)
+
+    def show_model_progress(run, time, end_time):
+        try:
+            show_progress(my_trial.completed_runs + time / end_time)
+        except ScriptControlException as e:
+            stop_trial(e)
+
+    # Call the run_trial method of our Trial object
+    my_trial.run_trial(
+        run_progress=show_run_progress, model_progress=show_model_progress
+    )
 
+    if my_trial.completed_runs > 0:
         metrics = Metrics(
-            g=g(),
+            g=scenario,
             patient_df_including_warmup=my_trial.trial_patient_df,
             df_trial_results=my_trial.df_trial_results,
         )
 
-        # st.write(my_trial.trial_info)
+        # Only keep what is displayed, not the trial itself, as its models
+        # (with every patient) take far more memory. The results of a
+        # cancelled trial are kept too, but it is run again when the button
+        # is next pressed.
+        results = {
+            "df_trial_results": my_trial.df_trial_results,
+            "trial_summary": my_trial.trial_summary,
+            "trial_patient_df": my_trial.trial_patient_df,
+            "ward_occupancy_df": my_trial.ward_occupancy_df,
+            "sdec_occupancy_df": my_trial.sdec_occupancy_df,
+            "metrics": metrics,
+            "completed_runs": my_trial.completed_runs,
+            "cancelled": my_trial.cancelled,
+        }
+        store_results(results_key, results)
+
+    if "exception" in interruption:
+        # Let Streamlit carry on with the rerun it asked for
+        raise interruption["exception"]
+
+    cancel_placeholder.empty()
+    progress_bar.empty()
+    partial_results.empty()
+
+run_cancelled = st.session_state.pop("run_cancelled", False)
+if results is not None and results["cancelled"]:
+    st.warning(
+        f"The model run was cancelled after {results['completed_runs']} of "
+        f"{scenario.number_of_runs} runs, so these results are from those "
+        "runs only. Press 'Run simulation' to carry out all of the runs."
+    )
+elif run_cancelled:
+    st.warning(
+        "The model run was cancelled before any runs were completed. "
+        "Press 'Run simulation' to start it again."
+    )
+elif results is None and has_stored_results():
+    st.info(
+        "The parameters have changed since the model was last run. "
+        "Press 'Run simulation' to see the results for these parameters."
+    )
 
-        tab1, tab2, tab3, tab4, tab5 = st.tabs(
-            [
-                "Overview",
-                "Output Graphs",
-                "Process Maps",
-                "Model Exploration",
-                "Animation",
-            ]
-        )
+if results is not None:
+    df_trial_results = results["df_trial_results"]
+    trial_summary = results["trial_summary"]
+    metrics = results["metrics"]
+
+    tab1, tab2, tab3, tab4, tab5 = st.tabs(
+        [
+            "Overview",
+            "Output Graphs",
+            "Process Maps",
+            "Model Exploration",
+            "Animation",
+        ]
+    )
 
-        ############################
-        # MARK: Summary statistics #
-        ############################
-        with tab1:
-            st.subheader("Configuration")
-
-            col1, col2, col3, col4, col5 = st.columns(5)
-
-            with col1:
-                with iconMetricContainer(
-                    key="ctp_avail",
-                    icon_unicode="ea4a",
-                    family="outline",
-                    icon_color="black",
-                    type="symbols",
-                ):
-                    st.metric(
-                        label="CTP scanners",
-                        value="Yes" if g.number_of_ctp > 0 else "No",
-                        border=True,
-                    )
+    ############################
+    # MARK: Summary statistics #
+    ############################
+    with tab1:
+        st.subheader("Configuration")
+
+        col1, col2, col3, col4, col5 = st.columns(5)
+
+        with col1:
+            with iconMetricContainer(
+                key="ctp_avail",
+                icon_unicode="ea4a",
+                family="outline",
+                icon_color="black",
+                type="symbols",
+            ):
+                st.metric(
+                    label="CTP scanners",
+                    value="Yes" if scenario.number_of_ctp > 0 else "No",
+                    border=True,
+                )
 
-                    st.caption(
-                        f"""
+                st.caption(
+                    f"""
 Available from {metrics.start_hour_ctp:g}:00-{metrics.end_hour_ctp:g}:00 ({metrics.duration_hours_ctp:g}h)
-                        """
-                    )
+                    """
+                )
 
-            with col2:
-                with iconMetricContainer(
-                    key="sdec_beds",
-                    icon_unicode="e4d0",
-                    family="outline",
-                    icon_color="black",
-                    type="symbols",
-                ):
-                    st.metric(
-                        label=f"SDEC beds",
-                        value=g.sdec_beds,
-                        border=True,
-                    )
+        with col2:
+            with iconMetricContainer(
+                key="sdec_beds",
+                icon_unicode="e4d0",
+                family="outline",
+                icon_color="black",
+                type="symbols",
+            ):
+                st.metric(
+                    label=f"SDEC beds",
+                    value=scenario.sdec_beds,
+                    border=True,
+                )
 
-                    if g.sdec_beds > 0:
-                        st.caption(
-                            f"""
+                if scenario.sdec_beds > 0:
+                    st.caption(
+                        f"""
 Available from {metrics.start_hour_sdec:g}:00-{metrics.end_hour_sdec:g}:00 ({metrics.duration_hours_sdec:g}h)
-                            """
-                        )
-                    else:
-                        st.caption("")
-
-            with col3:
-                with iconMetricContainer(
-                    key="sdec_therapy",
-                    icon_unicode="f2c2",
-                    family="outline",
-                    icon_color="black",
-                    type="symbols",
-                ):
-                    st.metric(
-                        label="SDEC Therapy",
-                        value="Yes" if g.therapy_sdec else "No",
-                        border=True,
+                        """
                     )
-
-                    # Blank lines for spacing
+                else:
                     st.caption("")
 
-            with col4:
-                with iconMetricContainer(
-                    key="ward_bed_count",
-                    icon_unicode="ea48",
-                    family="outline",
-                    icon_color="black",
-                    type="symbols",
-                ):
-                    st.metric(
-                        label="Standard Ward Beds",
-                        value=f"{g.number_of_ward_beds}",
-                        border=True,
-                    )
-
-                    # Blank lines for spacing
-                    st.caption("")
+        with col3:
+            with iconMetricContainer(
+                key="sdec_therapy",
+                icon_unicode="f2c2",
+                family="outline",
+                icon_color="black",
+                type="symbols",
+            ):
+                st.metric(
+                    label="SDEC Therapy",
+                    value="Yes" if scenario.therapy_sdec else "No",
+                    border=True,
+                )
 
-            with col5:
-                with iconMetricContainer(
-                    key="triage_nurse_count",
-                    icon_unicode="f5a3",
-                    family="outline",
-                    icon_color="black",
-                    type="symbols",
-                ):
-                    st.metric(
-                        label="Triage Nurses",
-                        value=f"{g.number_of_nurses}",
-                        border=True,
-                    )
+                # Blank lines for spacing
+                st.caption("")
+
+        with col4:
+            with iconMetricContainer(
+                key="ward_bed_count",
+                icon_unicode="ea48",
+                family="outline",
+                icon_color="black",
+                type="symbols",
+            ):
+                st.metric(
+                    label="Standard Ward Beds",
+                    value=f"{scenario.number_of_ward_beds}",
+                    border=True,
+                )
 
-                    # Blank lines for spacing
-                    st.caption("")
+                # Blank lines for spacing
+                st.caption("")
+
+        with col5:
+            with iconMetricContainer(
+                key="triage_nurse_count",
+                icon_unicode="f5a3",
+                family="outline",
+                icon_color="black",
+                type="symbols",
+            ):
+                st.metric(
+                    label="Triage Nurses",
+                    value=f"{scenario.number_of_nurses}",
+                    border=True,
+                )
 
-            st.divider()
-            st.subheader("Patient throughoutput")
-
-            pcol1, pcol2, pcol3, pcol4 = st.columns(4)
-
-            with pcol1:
-                with iconMetricContainer(
-                    key="patients_per_year",
-                    icon_unicode="ebcc",
-                    family="outline",
-                    icon_color="black",
-                    type="symbols",
-                ):
-                    st.metric(
-                        label="Average Patients per Year",
-                        value=f"{metrics.average_patients_per_year:.0f}",
-                        border=True,
-                    )
+                # Blank lines for spacing
+                st.caption("")
+
+        st.divider()
+        st.subheader("Patient throughoutput")
+
+        pcol1, pcol2, pcol3, pcol4 = st.columns(4)
+
+        with pcol1:
+            with iconMetricContainer(
+                key="patients_per_year",
+                icon_unicode="ebcc",
+                family="outline",
+                icon_color="black",
+                type="symbols",
+            ):
+                st.metric(
+                    label="Average Patients per Year",
+                    value=f"{metrics.average_patients_per_year:.0f}",
+                    border=True,
+                )
 
-                st.caption(f"""
+            st.caption(f"""
 Range: {metrics.scale_to_year(metrics.min_patients_per_run):.0f}
 to {metrics.scale_to_year(metrics.max_patients_per_run):.0f}
 
@@ -549,64 +708,64 @@ to {metrics.scale_to_year(metrics.in_hours_arrivals.max()):.0f})
 Out-of-hours: {metrics.scale_to_year(metrics.ooh_arrivals.mean()):.0f}
 (range: {metrics.scale_to_year(metrics.ooh_arrivals.min()):.0f}
 to {metrics.scale_to_year(metrics.ooh_arrivals.max()):.0f})
-                           """)
-
-            with pcol2:
-                st.dataframe(
-                    round(
-                        metrics.diagnosis_by_stroke_type_count,
-                        0,
-                    ),
-                    hide_index=True,
+                       """)
+
+        with pcol2:
+            st.dataframe(
+                round(
+                    metrics.diagnosis_by_stroke_type_count,
+                    0,
+                ),
+                hide_index=True,
+            )
+
+        with pcol3:
+            with iconMetricContainer(
+                key="patients_per_day",
+                icon_unicode="e878",
+                family="outline",
+                icon_color="black",
+                type="symbols",
+            ):
+                st.metric(
+                    label="Average Patients per Day",
+                    value=f"{(metrics.average_patients_per_day):.0f}",
+                    border=True,
                 )
 
-            with pcol3:
-                with iconMetricContainer(
-                    key="patients_per_day",
-                    icon_unicode="e878",
-                    family="outline",
-                    icon_color="black",
-                    type="symbols",
-                ):
-                    st.metric(
-                        label="Average Patients per Day",
-                        value=f"{(metrics.average_patients_per_day):.0f}",
-                        border=True,
-                    )
+        with pcol4:
+            st.dataframe(
+                metrics.diagnosis_by_stroke_type_count_per_day.round(2),
+                hide_index=True,
+            )
 
-            with pcol4:
-                st.dataframe(
-                    metrics.diagnosis_by_stroke_type_count_per_day.round(2),
-                    hide_index=True,
+        st.divider()
+
+        st.subheader("Results")
+
+        col1a, col2a, col3a = st.columns(3)
+
+        # Add container with thrombolysis savings per year
+        throm_yearly_save = (
+            df_trial_results["Thrombolysis Savings (£)"]
+            / metrics.sim_duration_years
+        ).mean()
+
+        with col1a:
+            with iconMetricContainer(
+                key="thrombolysis_savings",
+                icon_unicode="e133",
+                family="outline",
+                icon_color="black",
+                type="symbols",
+            ):
+                st.metric(
+                    label="Average Thrombolysis Savings per Year",
+                    value=f"£{throm_yearly_save:,.0f}",
+                    border=True,
                 )
 
-            st.divider()
-
-            st.subheader("Results")
-
-            col1a, col2a, col3a = st.columns(3)
-
-            # Add container with thrombolysis savings per year
-            throm_yearly_save = (
-                my_trial.df_trial_results["Thrombolysis Savings (£)"]
-                / metrics.sim_duration_years
-            ).mean()
-
-            with col1a:
-                with iconMetricContainer(
-                    key="thrombolysis_savings",
-                    icon_unicode="e133",
-                    family="outline",
-                    icon_color="black",
-                    type="symbols",
-                ):
-                    st.metric(
-                        label="Average Thrombolysis Savings per Year",
-                        value=f"£{throm_yearly_save:,.0f}",
-                        border=True,
-                    )
-
-                    st.caption(f"""
+                st.caption(f"""
 The average total savings for the full model period
 of {metrics.sim_duration_display} were
 £{metrics.df_trial_results["Thrombolysis Savings (£)"].mean():,.0f}.
@@ -614,92 +773,92 @@ This looks only at savings from patients who were able to be offered thrombolysi
 due to the enhanced capabilities of the CTP scanner.
 """)
 
-            with col2a:
-                with iconMetricContainer(
-                    key="sdec_savings",
-                    icon_unicode="e4d0",
-                    family="outline",
-                    icon_color="black",
-                    type="symbols",
-                ):
-                    st.metric(
-                        label="Average SDEC Savings per Year",
-                        value=f"£{metrics.sdec_yearly_save:,.0f}",
-                        border=True,
-                    )
+        with col2a:
+            with iconMetricContainer(
+                key="sdec_savings",
+                icon_unicode="e4d0",
+                family="outline",
+                icon_color="black",
+                type="symbols",
+            ):
+                st.metric(
+                    label="Average SDEC Savings per Year",
+                    value=f"£{metrics.sdec_yearly_save:,.0f}",
+                    border=True,
+                )
 
-                    st.caption(f"""
+                st.caption(f"""
 The average total savings for the full model period
 of {metrics.sim_duration_display} were
 £{metrics.df_trial_results["SDEC Savings (£)"].mean():,.0f}. This is
 calculated as the total savings from running the SDEC, subtracting the
 medical cost of running the SDEC. SDEC running costs are set to
-£{(g.sdec_dr_cost_min * 60):.2f} per hour.
-                    """)
-
-            with col3a:
-                with iconMetricContainer(
-                    key="overall_savings",
-                    icon_unicode="f04b",
-                    family="outline",
-                    icon_color="black",
-                    type="symbols",
-                ):
-                    st.metric(
-                        label="Average Overall Savings per Year",
-                        value=f"£{metrics.overall_yearly_save:,.0f}",
-                        border=True,
-                    )
+£{(scenario.sdec_dr_cost_min * 60):.2f} per hour.
+                """)
 
-                    st.caption(
-                        f"""
+        with col3a:
+            with iconMetricContainer(
+                key="overall_savings",
+                icon_unicode="f04b",
+                family="outline",
+                icon_color="black",
+                type="symbols",
+            ):
+                st.metric(
+                    label="Average Overall Savings per Year",
+                    value=f"£{metrics.overall_yearly_save:,.0f}",
+                    border=True,
+                )
+
+                st.caption(
+                    f"""
 The average total savings for the full model period
 of {metrics.sim_duration_display} were
 £{metrics.df_trial_results["Total Savings"].mean():,.0f}.
-                        """
-                    )
+                    """
+                )
 
-            st.html("<br/>")
-
-            col1b, col2b, col3b = st.columns(3)
-
-            with col1b:
-                # Add container with extra patients thrombolysed per year
-                with iconMetricContainer(
-                    key="additional_thrombolysis",
-                    icon_unicode="e138",
-                    family="outline",
-                    icon_color="black",
-                    type="symbols",
-                ):
-                    st.metric(
-                        label="Extra patients thrombolysed per year",
-                        value=f"{metrics.extra_throm_yearly:.0f}",
-                        border=True,
-                    )
+        st.html("<br/>")
+
+        col1b, col2b, col3b = st.columns(3)
+
+        with col1b:
+            # Add container with extra patients thrombolysed per year
+            with iconMetricContainer(
+                key="additional_thrombolysis",
+                icon_unicode="e138",
+                family="outline",
+                icon_color="black",
+                type="symbols",
+            ):
+                st.metric(
+                    label="Extra patients thrombolysed per year",
+                    value=f"{metrics.extra_throm_yearly:.0f}",
+                    border=True,
+                )
 
-                    st.caption("""
+                st.caption("""
 This looks at the average count of patients who were able to be offered
 thrombolysis due to the enhanced capabilities of the CTP scanner.
-                    """)
-
-            with col2b:
-                # Add container with average admissions avoided per year
-                with iconMetricContainer(
-                    key="admissions_avoided",
-                    icon_unicode="e0b6",
-                    family="outline",
-                    icon_color="black",
-                    type="symbols",
-                ):
-                    st.metric(
-                        label="Average Admissions Avoided per Year",
-                        value=f"{metrics.avoid_yearly:,.0f}",
-                        border=True,
-                    )
+                """)
 
-                    st.caption(
-                        f"""
+        with col2b:
+            # Add container with average admissions avoided per year
+            with iconMetricContainer(
+                key="admissions_avoided",
+                icon_unicode="e0b6",
+                family="outline",
+                icon_color="black",
+                type="symbols",
+            ):
+                st.metric(
+                    label="Average Admissions Avoided per Year",
+                    value=f"{metrics.avoid_yearly:,.0f}",
+                    border=True,
+                )
+
+                st.caption(
+                    f"""
 Avoided admissions are those patients who were able to leave after being seen
 in SDEC, and would have had a full admission if the SDEC was not available.
 Range = {metrics.avoid_yearly_min} to {metrics.avoid_yearly_max} per year across runs.
@@ -707,236 +866,237 @@ Range = {metrics.avoid_yearly_min} to {metrics.avoid_yearly_max} per year across
 The average total number of admissions avoided for the full model period
 of {metrics.sim_duration_display} were
 {metrics.df_trial_results["Number of Admissions Avoided In Run"].mean():,.0f}.
-                        """
-                    )
+                    """
+                )
 
-            # Add container with mean ward occupancy
-            with col3b:
-                with iconMetricContainer(
-                    key="ward_occupancy",
-                    icon_unicode="e13c",
-                    family="outline",
-                    icon_color="black",
-                    type="symbols",
-                ):
-                    st.metric(
-                        label="Mean Ward Occupancy",
-                        value=f"""
-{metrics.mean_ward_occ:,.0f} of {g.number_of_ward_beds} beds
-                        """,
-                        border=True,
-                    )
+        # Add container with mean ward occupancy
+        with col3b:
+            with iconMetricContainer(
+                key="ward_occupancy",
+                icon_unicode="e13c",
+                family="outline",
+                icon_color="black",
+                type="symbols",
+            ):
+                st.metric(
+                    label="Mean Ward Occupancy",
+                    value=f"""
+{metrics.mean_ward_occ:,.0f} of {scenario.number_of_ward_beds} beds
+                    """,
+                    border=True,
+                )
 
-                    st.caption(
-                        f"""
-This is an average occupancy of {(metrics.mean_ward_occ / g.number_of_ward_beds):.1%}
-                        """
-                    )
+                st.caption(
+                    f"""
+This is an average occupancy of {(metrics.mean_ward_occ / scenario.number_of_ward_beds):.1%}
+                    """
+                )
 
-            col1c, col2c, col3c = st.columns(3)
-
-            # Add container with average admission delays per year
-            with col1c:
-                with iconMetricContainer(
-                    key="admission_delays",
-                    icon_unicode="f38c",
-                    family="outline",
-                    icon_color="black",
-                    type="symbols",
-                ):
-                    st.metric(
-                        label="Average Admission Delays per Year",
-                        value=f"{metrics.admit_delay_yearly:,.0f}",
-                        border=True,
-                    )
+        col1c, col2c, col3c = st.columns(3)
+
+        # Add container with average admission delays per year
+        with col1c:
+            with iconMetricContainer(
+                key="admission_delays",
+                icon_unicode="f38c",
+                family="outline",
+                icon_color="black",
+                type="symbols",
+            ):
+                st.metric(
+                    label="Average Admission Delays per Year",
+                    value=f"{metrics.admit_delay_yearly:,.0f}",
+                    border=True,
+                )
 
-                    st.caption(
-                        f"""
+                st.caption(
+                    f"""
 Range = {metrics.admit_delay_yearly_min} to {metrics.admit_delay_yearly_max} per year across runs.
 The average number of admissions that were delayed for the full model period
 of {metrics.sim_duration_display} were
 {metrics.df_trial_results["Number of Admission Delays"].mean():,.0f}.
-                        """
-                    )
+                    """
+                )
 
-            # Add container with average duration of admission delays
-            with col2c:
-                with iconMetricContainer(
-                    key="admission_delay_average",
-                    icon_unicode="e425",
-                    family="outline",
-                    icon_color="black",
-                    type="symbols",
-                ):
-                    st.metric(
-                        label="Average Ward Admission Delay Duration",
-                        value=f"""
-{g.trial_mean_q_time_ward[g.trials_run_counter]} hours
-                        """,
-                        border=True,
-                    )
+        # Add container with average duration of admission delays
+        with col2c:
+            with iconMetricContainer(
+                key="admission_delay_average",
+                icon_unicode="e425",
+                family="outline",
+                icon_color="black",
+                type="symbols",
+            ):
+                st.metric(
+                    label="Average Ward Admission Delay Duration",
+                    value=f"""
+{trial_summary['trial_mean_q_time_ward']} hours
+                    """,
+                    border=True,
+                )
 
-            # Add container with maximum duration of admission delay
-            with col3c:
-                with iconMetricContainer(
-                    key="admission_delay_max",
-                    icon_unicode="f377",
-                    family="outline",
-                    icon_color="black",
-                    type="symbols",
-                ):
-                    st.metric(
-                        label="Maximum Ward Admission Delay Duration",
-                        value=f"""
-{g.trial_max_q_time_ward[g.trials_run_counter]} hours
-                        """,
-                        border=True,
-                    )
+        # Add container with maximum duration of admission delay
+        with col3c:
+            with iconMetricContainer(
+                key="admission_delay_max",
+                icon_unicode="f377",
+                family="outline",
+                icon_color="black",
+                type="symbols",
+            ):
+                st.metric(
+                    label="Maximum Ward Admission Delay Duration",
+                    value=f"""
+{trial_summary['trial_max_q_time_ward']} hours
+                    """,
+                    border=True,
+                )
 
-                st.caption("""
+            st.caption("""
 This looks at the maximum delay seen across all model runs
-                """)
-
-            col1d, col2d = st.columns(2)
-
-            # Add container with average duration of nurse triage delay
-            with col1d:
-                with iconMetricContainer(
-                    key="nurse_delay_average",
-                    icon_unicode="e425",
-                    family="outline",
-                    icon_color="black",
-                    type="symbols",
-                ):
-                    st.metric(
-                        label="Average Nurse Triage Delay Duration",
-                        value=f"""
-{g.trial_mean_q_time_nurse[g.trials_run_counter]} minutes
-                        """,
-                        border=True,
-                    )
+            """)
+
+        col1d, col2d = st.columns(2)
+
+        # Add container with average duration of nurse triage delay
+        with col1d:
+            with iconMetricContainer(
+                key="nurse_delay_average",
+                icon_unicode="e425",
+                family="outline",
+                icon_color="black",
+                type="symbols",
+            ):
+                st.metric(
+                    label="Average Nurse Triage Delay Duration",
+                    value=f"""
+{trial_summary['trial_mean_q_time_nurse']} minutes
+                    """,
+                    border=True,
+                )
 
-            # Add container with maximum duration of nurse triage delay
-            with col2d:
-                with iconMetricContainer(
-                    key="nurse_delay_max",
-                    icon_unicode="f377",
-                    family="outline",
-                    icon_color="black",
-                    type="symbols",
-                ):
-                    st.metric(
-                        label="Maximum Nurse Triage Delay Duration",
-                        value=f"""
-{g.trial_max_q_time_nurse[g.trials_run_counter]} minutes
-                        """,
-                        border=True,
-                    )
+        # Add container with maximum duration of nurse triage delay
+        with col2d:
+            with iconMetricContainer(
+                key="nurse_delay_max",
+                icon_unicode="f377",
+                family="outline",
+                icon_color="black",
+                type="symbols",
+            ):
+                st.metric(
+                    label="Maximum Nurse Triage Delay Duration",
+                    value=f"""
+{trial_summary['trial_max_q_time_nurse']} minutes
+                    """,
+                    border=True,
+                )
 
-                st.caption("""
+            st.caption("""
 This looks at the maximum delay seen across all model runs
-                """)
-
-            col1e, col2e = st.columns(2)
-
-            # Add container with patients outside SDEC
-            # operating hours
-            with col1e:
-                with iconMetricContainer(
-                    key="arrive_outside_sdec_operating_hours",
-                    icon_unicode="e14b",
-                    family="outline",
-                    icon_color="black",
-                    type="symbols",
-                ):
-                    st.metric(
-                        label="""
+            """)
+
+        col1e, col2e = st.columns(2)
+
+        # Add container with patients outside SDEC
+        # operating hours
+        with col1e:
+            with iconMetricContainer(
+                key="arrive_outside_sdec_operating_hours",
+                icon_unicode="e14b",
+                family="outline",
+                icon_color="black",
+                type="symbols",
+            ):
+                st.metric(
+                    label="""
 Average Patients Outside of SDEC Operating Hours
-                        """,
-                        # value=f"{patients_outside_sdec_operating_hours_per_year:.0f} of {average_patients_per_year:.0f} ({(patients_outside_sdec_operating_hours_per_year / average_patients_per_year):.1%})",
-                        value=f"""
+                    """,
+                    # value=f"{patients_outside_sdec_operating_hours_per_year:.0f} of {average_patients_per_year:.0f} ({(patients_outside_sdec_operating_hours_per_year / average_patients_per_year):.1%})",
+                    value=f"""
 {metrics.patients_outside_sdec_operating_hours_per_year:.0f} of
 {metrics.average_patients_per_year:.0f}
 ({(metrics.patients_outside_sdec_operating_hours_per_year / metrics.average_patients_per_year):.1%})
-                        """,
-                        border=True,
-                    )
+                    """,
+                    border=True,
+                )
 
-                    st.caption("""
+                st.caption("""
 This looks at the average count of patients who were unable to be routed to
 SDEC after their CT or CTP scan due to SDEC being shut.
-                    """)
-
-            with col2e:
-                with iconMetricContainer(
-                    key="arrive_sdec_is_full",
-                    icon_unicode="e7ef",
-                    family="outline",
-                    icon_color="black",
-                    type="symbols",
-                ):
-                    st.metric(
-                        label="Average Patients Bypassing SDEC Due to it Being Full",
-                        value=f"""
+                """)
+
+        with col2e:
+            with iconMetricContainer(
+                key="arrive_sdec_is_full",
+                icon_unicode="e7ef",
+                family="outline",
+                icon_color="black",
+                type="symbols",
+            ):
+                st.metric(
+                    label="Average Patients Bypassing SDEC Due to it Being Full",
+                    value=f"""
 {metrics.sdec_full_per_year:.0f} of
 {metrics.patients_inside_sdec_operating_hours_per_year:.0f}
 ({(metrics.sdec_full_per_year / metrics.patients_inside_sdec_operating_hours_per_year):.1%})
 """,
-                        border=True,
-                    )
+                    border=True,
+                )
 
-                    st.caption(f"""
+                st.caption(f"""
 This looks at the average count across all runs of patients arriving in SDEC
 during its open hours who had to be routed directly to a ward due to the SDEC
 being full. Range across runs = {metrics.sdec_full_per_year_min:.0f} to {metrics.sdec_full_per_year_max:.0f} patients per year.
-                    """)
+                """)
 
-            st.subheader("Full Per-Run Results for Trial")
+        st.subheader("Full Per-Run Results for Trial")
 
-            st.dataframe(my_trial.df_trial_results.T)
+        st.dataframe(df_trial_results.T)
 
-        with tab2:
-            generate_occupancy_plots(
-                my_trial=my_trial,
-                warm_up_duration_days=warm_up_duration_days,
-                sim_duration_days=sim_duration_days,
-            )
+    with tab2:
+        generate_occupancy_plots(
+            results=results,
+            warm_up_duration_days=warm_up_duration_days,
+            sim_duration_days=sim_duration_days,
+            results_key=results_key,
+        )
 
-        ##############################
-        #  MARK: Process Maps (DFGs) #
-        ##############################
-        with tab3:
-            plot_dfg_per_feature(
-                split_vars=split_vars,
-                patient_df=metrics.patient_df,
-            )
+    ##############################
+    #  MARK: Process Maps (DFGs) #
+    ##############################
+    with tab3:
+        plot_dfg_per_feature(
+            split_vars=split_vars,
+            patient_df=metrics.patient_df,
+        )
 
-        with tab4:
-            ####################################
-            # MARK: Flexible Plot of Variables #
-            ####################################
-            plot_histogram(
-                patient_df=metrics.patient_df,
-                patient_level_metric_choices=patient_level_metric_choices,
-                split_vars=split_vars,
-            )
+    with tab4:
+        ####################################
+        # MARK: Flexible Plot of Variables #
+        ####################################
+        plot_histogram(
+            patient_df=metrics.patient_df,
+            patient_level_metric_choices=patient_level_metric_choices,
+            split_vars=split_vars,
+        )
 
-            ####################################
-            # MARK: Heatmap                    #
-            ####################################
-            plot_time_heatmap(patient_df=metrics.patient_df, time_vars=time_vars)
-
-        #########################
-        # MARK: Animation       #
-        #########################
-        with tab5:
-            # This needs to receive the full dataframe, including patients
-            # generated before the warm-up period elapsed
-            # st.write("Event Log")
-            # st.write(event_log)
-            # st.plotly_chart(
-            #     create_vidigi_animation_advanced(event_log, scenario=g())
-            # )
-
-            # st.write(create_vidigi_animation(event_log, scenario=g()))
-            st.write("Coming Soon!")
+        ####################################
+        # MARK: Heatmap                    #
+        ####################################
+        plot_time_heatmap(patient_df=metrics.patient_df, time_vars=time_vars)
+
+    #########################
+    # MARK: Animation       #
+    #########################
+    with tab5:
+        # This needs to receive the full dataframe, including patients
+        # generated before the warm-up period elapsed
+        # st.write("Event Log")
+        # st.write(event_log)
+        # st.plotly_chart(
+        #     create_vidigi_animation_advanced(event_log, scenario=g())
+        # )
+
+        # st.write(create_vidigi_animation(event_log, scenario=g()))
+        st.write("Coming Soon!")
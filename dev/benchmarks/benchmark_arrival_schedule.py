@@ -0,0 +1,73 @@
+"""
+Benchmark generating a run's arrivals up front against sampling them one at a
+time.
+
+For each arrival sampler, compares the time taken to:
+
+1. Sample every inter-arrival time for the run with repeated `sample()` calls
+   (as the arrivals process does when `precompute_arrivals` is False), and to
+   draw an onset type for each arrival.
+2. Build an `ArrivalSchedule` for the run in one vectorised pass.
+
+Run from the repository root with:
+
+    python dev/benchmarks/benchmark_arrival_schedule.py
+"""
+
+import contextlib
+import io
+import time
+
+from stroke_ward_model.inputs import Scenario
+from stroke_ward_model.model import Model
+
+RUN_DAYS = 365 * 5
+REPEATS = 3
+
+
+def make_model(arrival_sampler):
+    config = Scenario(
+        show_trace=False,
+        sim_duration=1440 * RUN_DAYS,
+        warm_up_period=1440 * RUN_DAYS / 5,
+        arrival_sampler=arrival_sampler,
+    )
+    with contextlib.redirect_stdout(io.StringIO()):
+        return Model(run_number=0, config=config)
+
+
+def time_one_at_a_time(arrival_sampler):
+    model = make_model(arrival_sampler)
+    run_length = model.config.sim_duration + model.config.warm_up_period
+    start = time.perf_counter()
+    now = 0.0
+    n_arrivals = 0
+    while True:
+        now += model.patient_inter_dist.sample(simulation_time=now)
+        if now >= run_length:
+            break
+        if model.is_in_hours(now % 1440):
+            model.onset_type_distribution_in_hours.sample()
+        else:
+            model.onset_type_distribution_out_of_hours.sample()
+        n_arrivals += 1
+    return time.perf_counter() - start, n_arrivals
+
+
+def time_schedule(arrival_sampler):
+    model = make_model(arrival_sampler)
+    start = time.perf_counter()
+    schedule = model.build_arrival_schedule()
+    return time.perf_counter() - start, len(schedule)
+
+
+if __name__ == "__main__":
+    print(f"Generating arrivals for {RUN_DAYS} days + warm-up (best of {REPEATS})")
+    for arrival_sampler in ["thinning", "inversion"]:
+        scalar_s, n_scalar = min(
+            time_one_at_a_time(arrival_sampler) for _ in range(REPEATS)
+        )
+        vector_s, n_vector = min(time_schedule(arrival_sampler) for _ in range(REPEATS))
+        print(f"  {arrival_sampler}:")
+        print(f"    one at a time: {scalar_s * 1000:8.1f} ms ({n_scalar:,} arrivals)")
+        print(f"    schedule:      {vector_s * 1000:8.1f} ms ({n_vector:,} arrivals)")
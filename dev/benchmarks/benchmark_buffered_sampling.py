@@ -0,0 +1,89 @@
+"""
+Benchmark serving samples from buffered blocks against drawing them one at a
+time.
+
+Compares:
+
+1. The cost per `sample()` call of each Exponential, Normal and
+   DiscreteEmpirical distribution type, with and without a `BufferedSampler`.
+2. The time taken for a full model run with `buffered_sampling` off and on,
+   checking that both give exactly the same results.
+
+Run from the repository root with:
+
+    python dev/benchmarks/benchmark_buffered_sampling.py
+"""
+
+import contextlib
+import io
+import time
+
+import pandas as pd
+from sim_tools.distributions import DiscreteEmpirical, Exponential, Normal
+
+from stroke_ward_model.distributions import BufferedSampler
+from stroke_ward_model.inputs import Scenario
+from stroke_ward_model.model import Model
+
+N_SAMPLES = 200_000
+RUN_DAYS = 365
+REPEATS = 3
+
+DISTRIBUTIONS = {
+    "Exponential": lambda: Exponential(mean=10, random_seed=42),
+    "Normal": lambda: Normal(mean=5, sigma=3, minimum=0, random_seed=42),
+    "DiscreteEmpirical": lambda: DiscreteEmpirical(
+        values=[0, 1, 2, 3, 4, 5], freq=[1, 2, 3, 3, 2, 1], random_seed=42
+    ),
+}
+
+
+def time_per_sample(dist):
+    start = time.perf_counter()
+    for _ in range(N_SAMPLES):
+        dist.sample()
+    return (time.perf_counter() - start) / N_SAMPLES
+
+
+def time_run(buffered_sampling):
+    config = Scenario(
+        show_trace=False,
+        sim_duration=1440 * RUN_DAYS,
+        warm_up_period=1440 * RUN_DAYS / 5,
+        number_of_ward_beds=49,
+        sdec_unav_freq=1440 / 3,
+        sdec_unav_time=1440 - 1440 / 3,
+        ctp_unav_freq=1440 / 3,
+        ctp_unav_time=1440 - 1440 / 3,
+        buffered_sampling=buffered_sampling,
+    )
+    with contextlib.redirect_stdout(io.StringIO()):
+        model = Model(run_number=0, config=config)
+        start = time.perf_counter()
+        model.run()
+    return time.perf_counter() - start, model
+
+
+if __name__ == "__main__":
+    print(f"Cost per sample() call (mean of {N_SAMPLES:,} calls)")
+    for name, make_dist in DISTRIBUTIONS.items():
+        scalar_s = time_per_sample(make_dist())
+        buffered_s = time_per_sample(BufferedSampler(make_dist()))
+        print(
+            f"  {name:18s} unbuffered {scalar_s * 1e6:6.2f} us, "
+            f"buffered {buffered_s * 1e6:6.2f} us "
+            f"(speed-up {scalar_s / buffered_s:4.1f}x)"
+        )
+
+    print(f"Model run of {RUN_DAYS} days + warm-up (best of {REPEATS})")
+    unbuffered_s, unbuffered = min(
+        (time_run(False) for _ in range(REPEATS)), key=lambda x: x[0]
+    )
+    buffered_s, buffered = min(
+        (time_run(True) for _ in range(REPEATS)), key=lambda x: x[0]
+    )
+    pd.testing.assert_frame_equal(
+        unbuffered.results_df, buffered.results_df, check_exact=True
+    )
+    print(f"  unbuffered: {unbuffered_s:6.2f} s")
+    print(f"  buffered:   {buffered_s:6.2f} s (results identical)")
@@ -0,0 +1,79 @@
+"""
+Benchmark running the replications of a trial in worker processes.
+
+Times `Trial.run_trial()` one run after another and with `workers=` set to
+each of the given numbers of processes. It also checks that every parallel
+trial gives exactly the same results as the serial trial.
+
+Run from the repository root with:
+
+    python dev/benchmarks/benchmark_parallel_trial.py [workers ...]
+
+e.g. `python dev/benchmarks/benchmark_parallel_trial.py 2 4 8`. The default
+is the number of CPUs available.
+"""
+
+import contextlib
+import io
+import os
+import sys
+import time
+
+import pandas as pd
+
+from stroke_ward_model.inputs import Scenario
+from stroke_ward_model.trial import Trial
+
+N_RUNS = 16
+RUN_DAYS = 365
+
+
+def make_scenario():
+    return Scenario(
+        show_trace=False,
+        number_of_runs=N_RUNS,
+        sim_duration=1440 * RUN_DAYS,
+        warm_up_period=1440 * RUN_DAYS / 5,
+        number_of_ward_beds=49,
+        sdec_unav_freq=1440 / 3,
+        sdec_unav_time=1440 - 1440 / 3,
+        ctp_unav_freq=1440 / 3,
+        ctp_unav_time=1440 - 1440 / 3,
+    )
+
+
+def time_trial(scenario, workers):
+    trial = Trial(config=scenario)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        trial.run_trial(workers=workers)
+    return trial, time.perf_counter() - start
+
+
+def assert_same_results(trial_1, trial_2):
+    for attr in [
+        "df_trial_results",
+        "trial_patient_df",
+        "ward_occupancy_df",
+        "sdec_occupancy_df",
+    ]:
+        pd.testing.assert_frame_equal(
+            getattr(trial_1, attr), getattr(trial_2, attr), check_exact=True
+        )
+
+
+if __name__ == "__main__":
+    worker_counts = [int(w) for w in sys.argv[1:]] or [os.cpu_count()]
+    scenario = make_scenario()
+
+    serial_trial, serial_s = time_trial(scenario, workers=None)
+    print(f"Trial of {N_RUNS} runs of {RUN_DAYS} days + warm-up")
+    print(f"  serial:      {serial_s:7.2f} s")
+
+    for workers in worker_counts:
+        parallel_trial, parallel_s = time_trial(scenario, workers=workers)
+        assert_same_results(serial_trial, parallel_trial)
+        print(
+            f"  {workers:2d} workers:  {parallel_s:7.2f} s "
+            f"(speed-up {serial_s / parallel_s:4.1f}x, results identical)"
+        )
@@ -0,0 +1,79 @@
+"""
+Benchmark how much quicker and leaner runs are at lower recording levels.
+
+For single runs of increasing length, measures the run time (best of
+`REPEATS` runs) and, in a separate run, the peak memory allocated (with
+`tracemalloc`) at each `recording_level`:
+
+- "full" records everything (the default);
+- "patient" skips the queue and occupancy time series;
+- "kpi" only keeps the running totals needed for the run KPIs.
+
+The KPI-only peak should barely grow with the length of the run.
+
+Run from the repository root with:
+
+    python dev/benchmarks/benchmark_recording_level.py
+"""
+
+import contextlib
+import io
+import time
+import tracemalloc
+
+from stroke_ward_model.inputs import Scenario
+from stroke_ward_model.model import Model, RECORDING_LEVELS
+
+RUN_DAYS = [365, 365 * 3]
+REPEATS = 5
+
+
+def make_scenario(run_days, recording_level):
+    return Scenario(
+        show_trace=False,
+        sim_duration=1440 * run_days,
+        warm_up_period=1440 * run_days / 5,
+        number_of_ward_beds=49,
+        sdec_unav_freq=1440 / 3,
+        sdec_unav_time=1440 - 1440 / 3,
+        ctp_unav_freq=1440 / 3,
+        ctp_unav_time=1440 - 1440 / 3,
+        recording_level=recording_level,
+    )
+
+
+def run_time(scenario):
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        Model(run_number=0, config=scenario).run()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def peak_memory(scenario):
+    tracemalloc.start()
+    model = Model(run_number=0, config=scenario)
+    model.run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024**2
+
+
+if __name__ == "__main__":
+    results = {}
+    with contextlib.redirect_stdout(io.StringIO()):
+        for run_days in RUN_DAYS:
+            for level in RECORDING_LEVELS:
+                scenario = make_scenario(run_days, level)
+                results[run_days, level] = (run_time(scenario), peak_memory(scenario))
+
+    for run_days in RUN_DAYS:
+        print(f"{run_days}-day run + warm-up (best of {REPEATS}):")
+        baseline = results[run_days, "full"][0]
+        for level in reversed(RECORDING_LEVELS):
+            elapsed, peak_mb = results[run_days, level]
+            print(
+                f"  {level:>7}: {elapsed:6.2f} s ({baseline / elapsed:4.2f}x), "
+                f"{peak_mb:6.1f} MB peak"
+            )
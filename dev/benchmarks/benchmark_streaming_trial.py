@@ -0,0 +1,81 @@
+"""
+Benchmark the peak memory of a trial with and without streaming aggregation.
+
+For increasing numbers of runs, measures the peak memory allocated (with
+`tracemalloc`) while running a trial that keeps every model and patient, and
+a streaming trial (`streaming_trial=True`) for each way of handling the
+patient-level data. A streaming trial's peak should stay roughly flat as the
+number of runs grows.
+
+Run from the repository root with:
+
+    python dev/benchmarks/benchmark_streaming_trial.py
+"""
+
+import contextlib
+import io
+import tempfile
+import time
+import tracemalloc
+
+from stroke_ward_model.inputs import Scenario
+from stroke_ward_model.trial import Trial
+
+RUN_COUNTS = [5, 10, 20]
+RUN_DAYS = 180
+
+
+def make_scenario(number_of_runs, **overrides):
+    return Scenario(
+        show_trace=False,
+        number_of_runs=number_of_runs,
+        sim_duration=1440 * RUN_DAYS,
+        warm_up_period=1440 * RUN_DAYS / 5,
+        number_of_ward_beds=49,
+        sdec_unav_freq=1440 / 3,
+        sdec_unav_time=1440 - 1440 / 3,
+        ctp_unav_freq=1440 / 3,
+        ctp_unav_time=1440 - 1440 / 3,
+        **overrides,
+    )
+
+
+def peak_memory(scenario):
+    tracemalloc.start()
+    start = time.perf_counter()
+    trial = Trial(config=scenario)
+    with contextlib.redirect_stdout(io.StringIO()):
+        trial.run_trial()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024**2, elapsed
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as output_dir:
+        modes = {
+            "full": {},
+            "streaming (summary)": {"streaming_trial": True},
+            "streaming (disk)": {
+                "streaming_trial": True,
+                "streaming_patient_data": "disk",
+                "streaming_output_dir": output_dir,
+            },
+            "streaming (drop)": {
+                "streaming_trial": True,
+                "streaming_patient_data": "drop",
+            },
+        }
+
+        print(f"Peak memory of a trial of {RUN_DAYS}-day runs + warm-up")
+        for mode, overrides in modes.items():
+            print(f"  {mode}:")
+            for number_of_runs in RUN_COUNTS:
+                peak_mb, elapsed = peak_memory(
+                    make_scenario(number_of_runs, **overrides)
+                )
+                print(
+                    f"    {number_of_runs:3d} runs: {peak_mb:7.1f} MB peak "
+                    f"({elapsed:5.1f} s)"
+                )
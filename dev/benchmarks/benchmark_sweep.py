@@ -0,0 +1,82 @@
+"""
+Benchmark how much common random numbers narrow the confidence intervals of
+the differences between scenarios in a sweep.
+
+Compares two numbers of ward beds (`BEDS`), with `RUNS` replications of
+each, in two ways:
+
+1. Paired: with `Sweep`, so replication r of both scenarios uses the same
+   random numbers, and the confidence interval is for the mean of the paired
+   differences.
+2. Independent: with the second scenario given a different master seed, so
+   the scenarios' replications are unrelated, and the confidence interval is
+   Welch's interval for the difference in means.
+
+Run from the repository root with:
+
+    python dev/benchmarks/benchmark_sweep.py
+"""
+
+import contextlib
+import io
+import math
+
+from scipy import stats
+
+from stroke_ward_model.inputs import Scenario
+from stroke_ward_model.sweep import Sweep
+
+BEDS = (35, 40)
+RUNS = 10
+RUN_DAYS = 180
+KPIS = [
+    "Mean Q Time Ward (Hour)",
+    "Number of Admission Delays",
+    "Mean Occupancy",
+    "Total Savings",
+]
+
+
+def welch_half_width(a, b, confidence=0.95):
+    var_a, var_b = a.var() / len(a), b.var() / len(b)
+    dof = (var_a + var_b) ** 2 / (var_a**2 / (len(a) - 1) + var_b**2 / (len(b) - 1))
+    return stats.t.ppf((1 + confidence) / 2, dof) * math.sqrt(var_a + var_b)
+
+
+if __name__ == "__main__":
+    base = Scenario(
+        show_trace=False,
+        number_of_runs=RUNS,
+        sim_duration=1440 * RUN_DAYS,
+        warm_up_period=1440 * RUN_DAYS / 5,
+    )
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        paired = Sweep({"number_of_ward_beds": list(BEDS)}, base=base)
+        paired.run()
+        independent = [
+            Sweep({"number_of_ward_beds": [BEDS[0]]}, base=base).run(),
+            Sweep(
+                {"number_of_ward_beds": [BEDS[1]]},
+                base=base.replace(master_seed=10_042),
+            ).run(),
+        ]
+
+    summary = paired.summarise().set_index(["Scenario", "KPI"])
+    print(
+        f"95% CI half-width of the difference, {BEDS[1]} vs {BEDS[0]} beds "
+        f"({RUNS} runs):"
+    )
+    for kpi in KPIS:
+        row = summary.loc[(1, kpi)]
+        paired_half_width = (
+            row["Difference CI Upper"] - row["Difference CI Lower"]
+        ) / 2
+        independent_half_width = welch_half_width(
+            *(results.loc[results["KPI"] == kpi, "Value"] for results in independent)
+        )
+        print(
+            f"  {kpi:>28}: paired {paired_half_width:10.2f}, "
+            f"independent {independent_half_width:10.2f} "
+            f"({independent_half_width / paired_half_width:5.1f}x wider)"
+        )
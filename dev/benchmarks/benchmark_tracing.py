@@ -0,0 +1,94 @@
+"""
+Benchmark the cost of trace calls in the model when tracing is switched off.
+
+Compares:
+
+1. A single eagerly-formatted `trace()` call (as the model used to make) with
+   the `Model.should_trace()` guard that now wraps every trace call.
+2. A full model run with the real guard against a run where the guard is
+   replaced by a stub that always returns False (i.e. no tracing code at all).
+
+Run from the repository root with:
+
+    python dev/benchmarks/benchmark_tracing.py
+"""
+
+import contextlib
+import io
+import time
+import timeit
+
+from sim_tools.trace import trace
+
+from stroke_ward_model.inputs import g
+from stroke_ward_model.model import Model
+from stroke_ward_model.utils import minutes_to_ampm
+
+N_CALLS = 100_000
+RUN_DAYS = 365
+REPEATS = 3
+
+
+def configure():
+    g.show_trace = False
+    g.sim_duration = 1440 * RUN_DAYS
+    g.warm_up_period = g.sim_duration / 5
+    g.number_of_ward_beds = 49
+    g.sdec_unav_freq = 1440 / 3
+    g.sdec_unav_time = 1440 - g.sdec_unav_freq
+    g.ctp_unav_freq = 1440 / 3
+    g.ctp_unav_time = 1440 - g.ctp_unav_freq
+
+
+def time_single_call():
+    with contextlib.redirect_stdout(io.StringIO()):
+        model = Model(run_number=1)
+    now = 1234.5678
+    patient_id = 42
+
+    def eager():
+        trace(
+            time=now,
+            debug=g.show_trace,
+            msg=f"👩‍⚕️ Patient {patient_id} is being seen by a nurse at {minutes_to_ampm(int(now % 1440))}.",
+            identifier=patient_id,
+            config=g.trace_config,
+        )
+
+    def guarded():
+        if model.should_trace(patient_id):
+            eager()
+
+    eager_s = min(timeit.repeat(eager, number=N_CALLS, repeat=REPEATS))
+    guarded_s = min(timeit.repeat(guarded, number=N_CALLS, repeat=REPEATS))
+
+    print(f"Per-call cost with tracing off ({N_CALLS:,} calls, best of {REPEATS})")
+    print(f"  eager trace(): {eager_s / N_CALLS * 1e9:8.1f} ns")
+    print(f"  guarded:       {guarded_s / N_CALLS * 1e9:8.1f} ns")
+
+
+def time_run(stub_guard):
+    with contextlib.redirect_stdout(io.StringIO()):
+        model = Model(run_number=1)
+    if stub_guard:
+        model.should_trace = lambda identifier: False
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        model.run()
+    return time.perf_counter() - start
+
+
+def time_full_run():
+    guarded = min(time_run(stub_guard=False) for _ in range(REPEATS))
+    no_tracing = min(time_run(stub_guard=True) for _ in range(REPEATS))
+
+    print(f"Full model run ({RUN_DAYS} days + warm-up, best of {REPEATS})")
+    print(f"  with trace guards:     {guarded:6.2f} s")
+    print(f"  with tracing removed:  {no_tracing:6.2f} s")
+    print(f"  overhead:              {(guarded / no_tracing - 1) * 100:6.2f} %")
+
+
+if __name__ == "__main__":
+    configure()
+    time_single_call()
+    time_full_run()
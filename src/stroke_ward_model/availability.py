@@ -0,0 +1,309 @@
+"""
+Provides precomputed opening calendars for the units that are only available
+at certain times of day (the CTP scanner and SDEC).
+"""
+
+import math
+from bisect import bisect_right
+
+MINUTES_PER_DAY = 1440
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+
+
+# MARK: AvailabilityCalendar
+class AvailabilityCalendar:
+    """
+    Repeating calendar of the times a unit is open.
+
+    The calendar is a set of opening windows within a period (e.g. a day or a
+    week) that repeats from `origin` onwards. Before `origin` the unit is
+    treated as open.
+
+    Whether the unit is open at a given time is looked up from a table with
+    one entry per minute of the period, so checking is constant time however
+    many windows there are. Only minutes in which the unit opens or closes
+    fall back to a search of the (few) opening and closing times within the
+    period.
+
+    Parameters
+    ----------
+    open_windows : list of tuple
+        `(start, end)` pairs, in minutes from the start of the period, giving
+        the times the unit is open. Windows that run past the end of the
+        period wrap around to the start. Overlapping windows are merged.
+    period : float, optional
+        Length of the repeating period in minutes. Default is one day (1440).
+    origin : float, optional
+        Simulation time (in minutes) at which the first period starts.
+        Default 0.
+
+    Attributes
+    ----------
+    open_windows : tuple of tuple
+        Merged, sorted `(start, end)` opening windows within the period.
+    period : float
+        Length of the repeating period in minutes.
+    origin : float
+        Simulation time at which the first period starts.
+
+    Raises
+    ------
+    ValueError
+        If the period is not positive, or a window ends before it starts or
+        is longer than the period.
+    """
+
+    def __init__(self, open_windows, period=MINUTES_PER_DAY, origin=0.0):
+        if period <= 0:
+            raise ValueError(f"period must be positive, got {period}")
+
+        self.period = period
+        self.origin = origin
+        self.open_windows = self._merge_windows(open_windows, period)
+
+        # Alternating open and close times within the period, so the unit is
+        # open when an odd number of them have passed
+        self._boundaries = [t for window in self.open_windows for t in window]
+
+        # State at the start of each minute of the period: 1 open, 0 closed,
+        # or -1 if the unit opens or closes part-way through that minute
+        self._minute_states = []
+        for minute in range(math.ceil(period)):
+            end = min(minute + 1, period)
+            changes = [t for t in self._boundaries if minute < t < end]
+            if changes:
+                self._minute_states.append(-1)
+            else:
+                self._minute_states.append(int(self._is_open_in_period(minute)))
+
+    @staticmethod
+    def _merge_windows(open_windows, period):
+        windows = []
+        for start, end in open_windows:
+            if end < start:
+                raise ValueError(f"Window ({start}, {end}) ends before it starts")
+            if end - start > period:
+                raise ValueError(
+                    f"Window ({start}, {end}) is longer than the period ({period})"
+                )
+            length = end - start
+            if length == period:
+                return ((0, period),)
+            start = start % period
+            end = start + length
+            if end > period:
+                windows.extend([(start, period), (0, end - period)])
+            elif end > start:
+                windows.append((start, end))
+
+        merged = []
+        for start, end in sorted(windows):
+            if merged and start <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+            else:
+                merged.append((start, end))
+        return tuple(merged)
+
+    # MARK: Constructors
+    @classmethod
+    def always_open(cls):
+        """Return a calendar for a unit that never closes."""
+        return cls([(0, MINUTES_PER_DAY)])
+
+    @classmethod
+    def from_cycle(cls, open_time, closed_time, start=0.0):
+        """
+        Build a calendar that alternates between open and closed.
+
+        This is how the model's `*_opening_hour`, `*_unav_freq` and
+        `*_unav_time` parameters describe availability: the unit is open
+        from the start of the run until `start + open_time`, then closed for
+        `closed_time`, then open for `open_time`, and so on.
+
+        Parameters
+        ----------
+        open_time : float
+            Minutes the unit is open in each cycle.
+        closed_time : float
+            Minutes the unit is closed in each cycle.
+        start : float, optional
+            Simulation time at which the first cycle starts. Default 0.
+
+        Returns
+        -------
+        AvailabilityCalendar
+            Never closes if `closed_time` is 0 (or both times are 0), and
+            never opens after `start` if `open_time` is 0.
+        """
+        if closed_time <= 0:
+            return cls.always_open()
+        return cls([(0, open_time)], period=open_time + closed_time, origin=start)
+
+    @classmethod
+    def from_opening_hours(cls, daily_hours, weekend_hours=None, first_weekday=0):
+        """
+        Build a calendar from clock-time opening hours.
+
+        Parameters
+        ----------
+        daily_hours : list of tuple
+            `(open_hour, close_hour)` pairs for each day, e.g.
+            `[(8, 12), (13, 20)]`. Hours can be fractional, and a window that
+            closes after 24 runs on past midnight.
+        weekend_hours : list of tuple, optional
+            Opening hours used on Saturdays and Sundays instead of
+            `daily_hours`. An empty list closes the unit at weekends. If None
+            (the default), every day has the same opening hours.
+        first_weekday : int, optional
+            Day of the week the simulation starts on, where 0 is Monday and 6
+            is Sunday. Simulation time 0 is taken to be midnight at the start
+            of this day. Default 0.
+
+        Returns
+        -------
+        AvailabilityCalendar
+            With a period of one day if `weekend_hours` is None, or one week
+            otherwise.
+        """
+        if weekend_hours is None:
+            windows = [
+                (open_hour * 60, close_hour * 60)
+                for open_hour, close_hour in daily_hours
+            ]
+            return cls(windows, period=MINUTES_PER_DAY)
+
+        windows = []
+        for day in range(7):
+            weekday = (first_weekday + day) % 7
+            hours = weekend_hours if weekday >= 5 else daily_hours
+            day_start = day * MINUTES_PER_DAY
+            windows.extend(
+                (day_start + open_hour * 60, day_start + close_hour * 60)
+                for open_hour, close_hour in hours
+            )
+        return cls(windows, period=MINUTES_PER_WEEK)
+
+    # MARK: Lookups
+    def _is_open_in_period(self, position):
+        return bisect_right(self._boundaries, position) % 2 == 1
+
+    def is_open(self, time):
+        """
+        Return whether the unit is open at a given time.
+
+        Parameters
+        ----------
+        time : float
+            Simulation time in minutes.
+
+        Returns
+        -------
+        bool
+        """
+        if time < self.origin:
+            return True
+        position = (time - self.origin) % self.period
+        state = self._minute_states[int(position)]
+        if state < 0:
+            return self._is_open_in_period(position)
+        return state == 1
+
+    def is_closed(self, time):
+        """Return whether the unit is closed at a given time."""
+        return not self.is_open(time)
+
+    def _openings_in_period(self):
+        # Times in the period at which the unit goes from closed to open (a
+        # window starting at 0 only counts if the unit was closed at the end
+        # of the previous period)
+        return [
+            start
+            for start, _ in self.open_windows
+            if start > 0 or self.open_windows[-1][1] < self.period
+        ]
+
+    def _closings_in_period(self):
+        return [
+            end
+            for _, end in self.open_windows
+            if end < self.period or self.open_windows[0][0] > 0
+        ]
+
+    def count_openings(self, start, end):
+        """
+        Count the times the unit reopens after a closure in a time range.
+
+        Parameters
+        ----------
+        start, end : float
+            Simulation times in minutes. Openings exactly at either time are
+            not counted.
+
+        Returns
+        -------
+        int
+        """
+        count = 0
+        for opening in self._openings_in_period():
+            first = self.origin + opening
+            # The unit is open before the origin, so opening at the origin
+            # isn't a reopening
+            if opening == 0:
+                first += self.period
+            # Number of openings first + k * period (k >= 0) below end, less
+            # those at or before start
+            count += max(0, math.ceil((end - first) / self.period))
+            count -= max(0, math.floor((start - first) / self.period) + 1)
+        return max(count, 0)
+
+    def next_change(self, time):
+        """
+        Return the first time after `time` at which the unit opens or closes.
+
+        Parameters
+        ----------
+        time : float
+            Simulation time in minutes.
+
+        Returns
+        -------
+        float or None
+            None if the unit never opens or closes after `time`.
+        """
+        changes = sorted(set(self._openings_in_period() + self._closings_in_period()))
+        if not changes:
+            return None
+        if time < self.origin:
+            # The unit is open until the calendar starts, so the first change
+            # is either closing at the origin or the first closure after it
+            if not self.is_open(self.origin):
+                return self.origin
+            closings = self._closings_in_period()
+            if not closings:
+                return None
+            return self.origin + min(closings)
+
+        cycle_start = time - (time - self.origin) % self.period
+        position = time - cycle_start
+        later = [t for t in changes if t > position]
+        if later:
+            return cycle_start + later[0]
+        return cycle_start + self.period + changes[0]
+
+    def __eq__(self, other):
+        if not isinstance(other, AvailabilityCalendar):
+            return NotImplemented
+        return (self.open_windows, self.period, self.origin) == (
+            other.open_windows,
+            other.period,
+            other.origin,
+        )
+
+    def __hash__(self):
+        return hash((self.open_windows, self.period, self.origin))
+
+    def __repr__(self):
+        return (
+            f"AvailabilityCalendar(open_windows={list(self.open_windows)}, "
+            f"period={self.period}, origin={self.origin})"
+        )
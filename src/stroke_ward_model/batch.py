@@ -0,0 +1,350 @@
+"""
+Runs a batch of scenarios read from a file, without any prompts, and combines
+their trial-level results into one table (e.g. for scheduled capacity sweeps).
+
+From the command line:
+
+    python -m stroke_ward_model.batch scenarios.json --workers 4
+
+See `load_scenarios` for the format of the scenario file and `main` for the
+command line options.
+"""
+
+import argparse
+import contextlib
+import io
+import itertools
+import json
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+from stroke_ward_model.inputs import g, Scenario
+from stroke_ward_model.trial import Trial
+
+# Columns of the combined results table, as (key of Trial.trial_summary,
+# column)
+COMBINED_RESULTS = [
+    ("trial_mean_q_time_nurse", "Mean Q Time Nurse (Mins)"),
+    ("trial_number_of_admissions_avoided", "Number of Admissions Avoided In Run"),
+    ("trial_mean_q_time_ward", "Mean Q Time Ward (Hours)"),
+    ("trial_mean_occupancy", "Mean Occupancy"),
+    ("trial_number_of_admission_delays", "Number of Admission Delays"),
+    ("trial_financial_savings_of_a_a", "Total SDEC Savings (£)"),
+    ("sdec_medical_cost", "Total SDEC Staff Cost (£)"),
+    ("trial_sdec_financial_savings", "SDEC Savings - Costs (£)"),
+    ("trial_thrombolysis_savings", "Thrombolysis Savings (£)"),
+    ("trial_total_savings", "Total Savings (£)"),
+    ("trial_mrs_change", "Mean MRS Change"),
+    ("trial_patient_count", "Mean Patients Generated in Run"),
+]
+
+
+# MARK: Scenario files
+def _csv_value(name, value):
+    """
+    Convert a value read from a CSV scenario file to a plain Python value.
+
+    A column of whole numbers with an empty cell is read as floats, so values
+    of parameters whose default is an integer are converted back to int.
+    """
+    if hasattr(value, "item"):
+        value = value.item()
+    default = getattr(g, name, None)
+    if (
+        isinstance(default, int)
+        and not isinstance(default, bool)
+        and isinstance(value, float)
+        and value.is_integer()
+    ):
+        value = int(value)
+    return value
+
+
+def _read_scenario_file(path):
+    path = Path(path)
+    suffix = path.suffix.lower()
+
+    if suffix == ".csv":
+        rows = pd.read_csv(path).to_dict(orient="records")
+        # Empty cells leave the parameter at its default
+        return [
+            {
+                name: _csv_value(name, value)
+                for name, value in row.items()
+                if not pd.isna(value)
+            }
+            for row in rows
+        ]
+
+    with path.open(encoding="utf-8") as f:
+        if suffix == ".json":
+            return json.load(f)
+        if suffix in (".yaml", ".yml"):
+            try:
+                import yaml
+            except ImportError as e:
+                raise ImportError(
+                    "Reading YAML scenario files needs PyYAML "
+                    "(pip install pyyaml)"
+                ) from e
+            return yaml.safe_load(f)
+
+    raise ValueError(
+        f"Scenario files must be .json, .yaml, .yml or .csv, got {path.name}"
+    )
+
+
+def _expand_scenarios(contents):
+    """Turn the contents of a scenario file into a list of parameter dicts."""
+    if isinstance(contents, list):
+        return [dict(params) for params in contents]
+    if not isinstance(contents, dict):
+        raise ValueError("A scenario file must hold a list or a mapping")
+
+    unknown = set(contents) - {"base", "scenarios", "grid"}
+    if unknown:
+        raise ValueError(
+            f"Unknown scenario file section(s): {sorted(unknown)}. Expected "
+            f"'base', 'scenarios' and/or 'grid'"
+        )
+
+    base = contents.get("base") or {}
+    scenarios = contents.get("scenarios") or [{}]
+    grid = contents.get("grid") or {}
+
+    # Every combination of the grid values, for each listed scenario
+    combinations = [
+        dict(zip(grid, values)) for values in itertools.product(*grid.values())
+    ]
+    return [
+        {**base, **params, **combination}
+        for params in scenarios
+        for combination in combinations
+    ]
+
+
+def _apply_availability_percentages(params):
+    """
+    Set the SDEC and CTP opening cycle from `sdec_value` and `ctp_value` (the
+    percentage of each day they are open), as the app does, unless the cycle
+    is given directly.
+    """
+    for unit in ("sdec", "ctp"):
+        percent = params.get(f"{unit}_value")
+        cycle_given = {f"{unit}_unav_freq", f"{unit}_unav_time"} & set(params)
+        if percent is None or cycle_given:
+            continue
+        if not 0 <= percent <= 100:
+            raise ValueError(f"{unit}_value must be between 0 and 100, got {percent}")
+        params[f"{unit}_unav_freq"] = 1440 * (percent / 100)
+        params[f"{unit}_unav_time"] = 1440 - params[f"{unit}_unav_freq"]
+    return params
+
+
+def load_scenarios(path, **overrides):
+    """
+    Read the scenarios to run from a file.
+
+    A scenario is given by the `g` parameters that differ from their defaults,
+    e.g. `{"number_of_ward_beds": 40, "therapy_sdec": true}`. A scenario can
+    also have a "name", which is shown in the results but isn't a parameter.
+    `sdec_value` and `ctp_value` (the percentage of the day the SDEC and CTP
+    scanner are open, as asked for in the app) set `sdec_unav_freq` and
+    `sdec_unav_time` (or their CTP equivalents), unless these are given too.
+
+    The file can be:
+
+    - JSON or YAML (.json, .yaml or .yml), holding either a list of
+      scenarios or a mapping with any of:
+        - "base": parameters shared by every scenario;
+        - "scenarios": a list of scenarios;
+        - "grid": a list of values for each of several parameters, every
+          combination of which is run (for each scenario, if there are any).
+    - CSV (.csv), with one row per scenario and one column per parameter.
+      Empty cells leave a parameter at its default.
+
+    YAML files need PyYAML to be installed.
+
+    Parameters
+    ----------
+    path : str or Path
+        The scenario file.
+    **overrides
+        Parameters to set in every scenario, overriding the file.
+
+    Returns
+    -------
+    names : list of str or None
+        The name of each scenario (None if not given).
+    scenarios : list of Scenario
+        The scenarios, numbered by `trials_run_counter` from 1 in the order
+        they are given (unless the file sets `trials_run_counter`).
+
+    Raises
+    ------
+    ValueError
+        If the file isn't in one of these formats.
+    TypeError
+        If a scenario has a parameter that isn't in `g`.
+    """
+    names = []
+    scenarios = []
+    for number, params in enumerate(
+        _expand_scenarios(_read_scenario_file(path)), start=1
+    ):
+        params = _apply_availability_percentages({**params, **overrides})
+        names.append(params.pop("name", None))
+        params.setdefault("trials_run_counter", number)
+        scenarios.append(Scenario(**params))
+    return names, scenarios
+
+
+# MARK: Running scenarios
+def _run_scenario(config, quiet=False):
+    """
+    Run a trial of a scenario and return its trial-level results.
+
+    This is defined at module level so that it can be sent to worker
+    processes.
+    """
+    trial = Trial(config)
+    if quiet:
+        with contextlib.redirect_stdout(io.StringIO()):
+            trial.run_trial()
+    else:
+        trial.run_trial()
+    return trial.trial_summary
+
+
+def run_scenarios(scenarios, names=None, workers=None, quiet=False):
+    """
+    Run a trial of each scenario and combine their trial-level results.
+
+    Parameters
+    ----------
+    scenarios : list of Scenario
+        The scenarios to run.
+    names : list of str, optional
+        A name for each scenario, shown in a "Scenario" column.
+    workers : int, optional
+        Number of worker processes to share the scenarios between. If None
+        or 1 (the default), the scenarios are run one after another in this
+        process. The results are the same either way.
+    quiet : bool, optional
+        If True, the trial results each trial prints are not shown.
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per scenario, indexed by "Trial Number" (its
+        `trials_run_counter`). Holds the scenario's name (if any were given),
+        the parameters that differ between scenarios, and the columns in
+        `COMBINED_RESULTS`.
+    """
+    if workers is not None and workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            summaries = list(
+                executor.map(_run_scenario, scenarios, itertools.repeat(quiet))
+            )
+    else:
+        summaries = [_run_scenario(config, quiet) for config in scenarios]
+
+    params = pd.DataFrame([config.to_dict() for config in scenarios])
+    varied = [
+        name
+        for name in params.columns
+        if name != "trials_run_counter"
+        and params[name].astype(str).nunique() > 1
+    ]
+
+    results = pd.DataFrame(
+        [
+            {column: summary[key] for key, column in COMBINED_RESULTS}
+            for summary in summaries
+        ]
+    )
+    combined = pd.concat([params[varied], results], axis=1)
+    if names is not None and any(name is not None for name in names):
+        combined.insert(0, "Scenario", names)
+    combined.index = pd.Index(
+        [config.trials_run_counter for config in scenarios], name="Trial Number"
+    )
+    return combined
+
+
+# MARK: Command line
+def main(argv=None):
+    """
+    Run the scenarios in a scenario file and write the combined results.
+
+    Command line options:
+
+    - `scenario_file`: the scenarios to run (see `load_scenarios`);
+    - `--workers`: number of worker processes to share the scenarios between
+      (default 1);
+    - `--output`: file to write the combined results to, as CSV, or Parquet
+      if it ends in .parquet (default all_trial_results.csv);
+    - `--cache-dir`: directory of a result cache (see `ResultCache`), so that
+      scenarios that have already been run are loaded rather than run again;
+    - `--quiet`: don't show the results printed by each trial.
+
+    Parameters
+    ----------
+    argv : list of str, optional
+        The command line arguments. Defaults to `sys.argv[1:]`.
+
+    Returns
+    -------
+    int
+        Exit status (0).
+    """
+    parser = argparse.ArgumentParser(
+        description="Run the stroke ward model for each scenario in a file."
+    )
+    parser.add_argument("scenario_file", help=".json, .yaml, .yml or .csv file")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="number of worker processes to run scenarios in (default 1)",
+    )
+    parser.add_argument(
+        "--output",
+        default="all_trial_results.csv",
+        help="where to write the combined results (.csv or .parquet)",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        help="directory to cache trial results in, to skip repeated scenarios",
+    )
+    parser.add_argument(
+        "--quiet",
+        action="store_true",
+        help="don't show the results printed by each trial",
+    )
+    args = parser.parse_args(argv)
+
+    overrides = {}
+    if args.cache_dir is not None:
+        overrides["result_cache_dir"] = args.cache_dir
+    names, scenarios = load_scenarios(args.scenario_file, **overrides)
+
+    combined = run_scenarios(
+        scenarios, names=names, workers=args.workers, quiet=args.quiet
+    )
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    if output.suffix.lower() == ".parquet":
+        combined.to_parquet(output)
+    else:
+        combined.to_csv(output)
+
+    print(f"All {len(scenarios)} trials completed. Results written to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,287 @@
+"""
+Provides a disk cache of trial results, so that a scenario that has already
+been run can be loaded rather than run again.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import tempfile
+from functools import lru_cache
+from importlib import metadata
+from pathlib import Path
+
+# Scenario parameters that don't change a trial's results, so are left out of
+# the cache key: tracing and printing options, where outputs are written, the
+# trial counter (only used to label outputs), the end-of-run validation (which
+# doesn't change results if it passes), how often progress is reported and the
+# cache settings themselves
+UNCACHED_PARAMETERS = frozenset(
+    {
+        "show_trace",
+        "tracked_cases",
+        "trace_config",
+        "write_to_csv",
+        "gen_graph",
+        "trials_run_counter",
+        "patient_validation",
+        "patient_validation_sample_size",
+        "progress_interval",
+        "result_cache_dir",
+        "result_cache_max_entries",
+        "result_cache_max_mb",
+    }
+)
+
+
+@lru_cache(maxsize=None)
+def model_version():
+    """
+    Return the version of the model that cached results are stored under.
+
+    This is the installed package version together with a fingerprint of the
+    model's source code, so results are not reused after the model has been
+    changed, even if the version number hasn't been updated (e.g. when
+    running from a clone of the repository).
+
+    Returns
+    -------
+    str
+        E.g. "0.2.0+1a2b3c4d5e6f".
+    """
+    try:
+        package_version = metadata.version("stroke_ward_model")
+    except metadata.PackageNotFoundError:
+        package_version = "0"
+
+    source = hashlib.sha256()
+    for path in sorted(Path(__file__).parent.glob("*.py")):
+        source.update(path.name.encode())
+        source.update(path.read_bytes())
+    return f"{package_version}+{source.hexdigest()[:12]}"
+
+
+def scenario_key(config):
+    """
+    Hash the parameters of a scenario that affect its results.
+
+    Every scenario parameter (including the master seed and number of runs)
+    is included apart from those in `UNCACHED_PARAMETERS`.
+
+    Parameters
+    ----------
+    config : Scenario
+        The trial's parameters.
+
+    Returns
+    -------
+    str
+        Hexadecimal SHA-256 digest, which is the same for equal scenarios.
+    """
+    params = {
+        name: value
+        for name, value in config.to_dict().items()
+        if name not in UNCACHED_PARAMETERS
+    }
+    # Values that aren't JSON types (e.g. availability calendars) are
+    # described by their repr
+    encoded = json.dumps(params, sort_keys=True, default=repr)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+# MARK: ResultCache
+class ResultCache:
+    """
+    Cache of trial outputs on local disk, keyed by scenario.
+
+    Each entry is a pickle of a trial's outputs, stored as
+    `<directory>/<version>/<scenario key>.pkl`, where the scenario key is
+    given by `scenario_key` and the version by `model_version`. Results from
+    other versions of the model are never returned, and can be removed with
+    `invalidate`.
+
+    Reading an entry marks it as recently used. Whenever an entry is added,
+    the least recently used entries (of any version) are removed until there
+    are no more than `max_entries` entries taking up no more than
+    `max_bytes`.
+
+    Parameters
+    ----------
+    directory : str or Path
+        Directory to store the cache in. Created if it doesn't exist.
+    max_entries : int, optional
+        Most entries to keep. Unlimited if None (the default).
+    max_bytes : int, optional
+        Most disk space to use, in bytes. Unlimited if None (the default).
+    version : str, optional
+        Version to store and look up results under. Defaults to
+        `model_version()`.
+
+    Attributes
+    ----------
+    directory : Path
+        Directory the cache is stored in.
+    version : str
+        Version results are stored and looked up under.
+    """
+
+    def __init__(self, directory, max_entries=None, max_bytes=None, version=None):
+        self.directory = Path(directory)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.version = model_version() if version is None else version
+
+    @classmethod
+    def from_config(cls, config):
+        """
+        Create the cache set up by the `result_cache_*` settings of a
+        scenario.
+
+        Returns
+        -------
+        ResultCache or None
+            None if `config.result_cache_dir` is None (caching is off).
+        """
+        if config.result_cache_dir is None:
+            return None
+        max_mb = config.result_cache_max_mb
+        return cls(
+            config.result_cache_dir,
+            max_entries=config.result_cache_max_entries,
+            max_bytes=None if max_mb is None else int(max_mb * 1024**2),
+        )
+
+    def _path(self, config):
+        return self.directory / self.version / f"{scenario_key(config)}.pkl"
+
+    def _entries(self):
+        return list(self.directory.glob("*/*.pkl"))
+
+    def __len__(self):
+        return len(self._entries())
+
+    def __contains__(self, config):
+        return self._path(config).exists()
+
+    def get(self, config):
+        """
+        Return the cached outputs of a scenario, if there are any.
+
+        Parameters
+        ----------
+        config : Scenario
+            The trial's parameters.
+
+        Returns
+        -------
+        dict or None
+            The outputs stored by `put`, or None if the scenario isn't in the
+            cache (or its entry can't be read, in which case it is removed).
+        """
+        path = self._path(config)
+        try:
+            with path.open("rb") as f:
+                outputs = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, EOFError, pickle.UnpicklingError):
+            path.unlink(missing_ok=True)
+            return None
+
+        # Mark the entry as recently used
+        os.utime(path)
+        return outputs
+
+    def put(self, config, outputs):
+        """
+        Store the outputs of a scenario, then evict old entries if the cache
+        is over its limits.
+
+        Parameters
+        ----------
+        config : Scenario
+            The trial's parameters.
+        outputs : dict
+            The outputs to store. Must be picklable.
+
+        Returns
+        -------
+        Path
+            The file the outputs were stored in.
+        """
+        path = self._path(config)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Write to a temporary file first, so that other processes never read
+        # a partly written entry
+        fd, temp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(outputs, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, path)
+        except BaseException:
+            Path(temp_path).unlink(missing_ok=True)
+            raise
+
+        self.evict()
+        return path
+
+    def evict(self):
+        """
+        Remove the least recently used entries until the cache is within
+        `max_entries` and `max_bytes`.
+
+        Returns
+        -------
+        int
+            Number of entries removed.
+        """
+        entries = []
+        for path in self._entries():
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+        entries.sort(key=lambda entry: entry[0])
+
+        total_bytes = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in entries:
+            too_many = (
+                self.max_entries is not None
+                and len(entries) - removed > self.max_entries
+            )
+            too_big = self.max_bytes is not None and total_bytes > self.max_bytes
+            if not (too_many or too_big):
+                break
+            path.unlink(missing_ok=True)
+            total_bytes -= size
+            removed += 1
+        return removed
+
+    def invalidate(self, version=None):
+        """
+        Remove every entry stored under a version of the model.
+
+        Parameters
+        ----------
+        version : str, optional
+            Version to remove. Defaults to this cache's `version`.
+        """
+        version = self.version if version is None else version
+        shutil.rmtree(self.directory / version, ignore_errors=True)
+
+    def invalidate_other_versions(self):
+        """Remove every entry stored under a version other than `version`."""
+        if not self.directory.exists():
+            return
+        for version_dir in self.directory.iterdir():
+            if version_dir.is_dir() and version_dir.name != self.version:
+                shutil.rmtree(version_dir, ignore_errors=True)
+
+    def clear(self):
+        """Remove every entry, of every version."""
+        shutil.rmtree(self.directory, ignore_errors=True)
@@ -2,14 +2,15 @@
 Initialises and manages random distributions used throughout the simulation.
 """
 
+from bisect import bisect_right
+from types import SimpleNamespace
+
 import numpy as np
 import pandas as pd
 from sim_tools.distributions import Exponential, Normal, DiscreteEmpirical
 from typing import Optional
 from numpy.random import SeedSequence
 
-from stroke_ward_model.inputs import g
-
 
 class NSPPThinningModified:
     """
@@ -133,6 +134,356 @@ class NSPPThinningModified:
 
         return interarrival_time
 
+    def sample_interarrival_times(self, run_length: float) -> np.ndarray:
+        """
+        Sample the inter-arrival times of every arrival in a run at once.
+
+        Candidate arrivals are generated at the maximum arrival rate and
+        thinned in a single vectorised pass. The two random number streams are
+        used in the same way as repeated calls to `sample()` starting from
+        time 0, so the arrivals are the same as those `sample()` would give
+        (up to floating-point rounding at interval boundaries).
+
+        Parameters
+        ----------
+        run_length: float
+            Arrivals are generated from time 0 up to this time.
+
+        Returns
+        -------
+        numpy.ndarray
+            The inter-arrival time before each arrival. Their cumulative sum
+            gives the arrival times, all of which are before `run_length`.
+        """
+        acceptance = self.min_iat / self.data["mean_iat"].to_numpy(dtype=float)
+        block_size = int(run_length / self.min_iat) + 100
+
+        w = np.empty(0)
+        u = np.empty(0)
+        while True:
+            w = np.concatenate(
+                (w, self.arr_rng.exponential(self.min_iat, size=block_size))
+            )
+            u = np.concatenate((u, self.thinning_rng.uniform(size=block_size)))
+            candidate_times = np.cumsum(w)
+            if candidate_times[-1] >= run_length:
+                break
+
+        idx = (candidate_times // self.interval).astype(np.int64) % len(acceptance)
+        accepted = np.flatnonzero(u < acceptance[idx])
+
+        if len(accepted) == 0:
+            return np.empty(0)
+
+        # Each inter-arrival time is the sum of the gaps between the rejected
+        # candidates since the previous arrival and the accepted candidate.
+        # The gaps are added one position at a time across all arrivals, which
+        # adds them in the same order as sample() does
+        group_starts = np.concatenate(([0], accepted[:-1] + 1))
+        group_lengths = accepted - group_starts + 1
+        interarrival_times = np.zeros(len(accepted))
+        for position in range(group_lengths.max()):
+            in_group = group_lengths > position
+            interarrival_times[in_group] += w[group_starts[in_group] + position]
+
+        return interarrival_times[np.cumsum(interarrival_times) < run_length]
+
+
+class NSPPPiecewiseConstant:
+    """
+    Non Stationary Poisson Process via inversion of the cumulative hazard.
+
+    An exact alternative to `NSPPThinningModified` for arrival rates that are
+    constant within equally spaced intervals and repeat over a cycle (e.g.
+    the hourly table of mean IATs repeating every day).
+
+    The cumulative arrival rate (hazard) at the start of each interval is
+    precomputed once. Each inter-arrival time is then sampled with a single
+    unit-mean exponential draw, which is added to the hazard at the current
+    time and mapped back to a time by inverting the piecewise-linear
+    cumulative hazard. Unlike thinning, no candidate arrivals are rejected,
+    so the cost per arrival does not depend on how much the rate varies.
+    """
+
+    def __init__(
+        self,
+        data: pd.DataFrame,
+        interval_width: Optional[float] = None,
+        random_seed: Optional[int | SeedSequence] = None,
+    ):
+        """
+        Non Stationary Poisson Process via inversion of the cumulative hazard.
+
+        Parameters
+        ----------
+        data: pandas.DataFrame
+            DataFrame with time points and mean inter-arrival times.
+            Columns should be "t" and "mean_iat" respectively. The rates
+            repeat once the end of the table is reached.
+
+        interval_width: float, optional (default=None)
+            The width of each time interval. If None, it will be calculated
+            from consecutive time points in the data. Required if data has only
+            one row.
+
+        random_seed: int | SeedSequence, optional (default=None)
+            Random seed for the exponential distribution
+        """
+        self.data = data
+        self.rng = np.random.default_rng(random_seed)
+
+        mean_iat = data["mean_iat"].to_numpy(dtype=float)
+
+        if (mean_iat <= 0).any():
+            raise ValueError("Mean inter-arrival times must be positive")
+
+        # Use provided interval width or calculate from data
+        if interval_width is not None:
+            self.interval = interval_width
+        elif len(data) > 1:
+            # Calculate from data (assumes all intervals are equal in length)
+            self.interval = data.iloc[1]["t"] - data.iloc[0]["t"]
+        else:
+            raise ValueError(
+                "With only one data point, interval_width must be provided"
+            )
+
+        self.cycle_length = self.interval * len(mean_iat)
+
+        # Arrival rate in each interval, and the expected number of arrivals
+        # (cumulative hazard) from the start of the cycle to the start of each
+        # interval. The final value is the hazard over a whole cycle.
+        self.rates = 1.0 / mean_iat
+        self.cumulative_hazard = np.concatenate(
+            ([0.0], np.cumsum(self.rates * self.interval))
+        )
+        self.cycle_hazard = self.cumulative_hazard[-1]
+
+        # Plain Python copies for the scalar lookups made for every arrival,
+        # which are quicker to index than NumPy arrays
+        self._rates = self.rates.tolist()
+        self._cumulative_hazard = self.cumulative_hazard.tolist()
+
+        # Kept for consistency with NSPPThinningModified. Always 0 as no
+        # candidate arrivals are rejected.
+        self.rejects_last_sample = None
+
+    def __repr__(self):
+        """Return a string representation of the NSPPPiecewiseConstant instance."""
+        # Truncate the data representation if too long
+        max_len = 100
+        data_str = repr(self.data)
+        if len(data_str) > max_len:
+            data_str = data_str[:max_len] + "..."
+
+        return (
+            f"{self.__class__.__name__}(data={data_str}, "
+            + f"interval={self.interval})"
+        )
+
+    def hazard(self, simulation_time: float) -> float:
+        """
+        Return the expected number of arrivals between time 0 and a time.
+
+        Parameters
+        ----------
+        simulation_time: float
+            The simulation time.
+
+        Returns
+        -------
+        float
+            The cumulative hazard at `simulation_time`.
+        """
+        cycles, time_in_cycle = divmod(simulation_time, self.cycle_length)
+        idx = min(int(time_in_cycle // self.interval), len(self._rates) - 1)
+        return (
+            cycles * self.cycle_hazard
+            + self._cumulative_hazard[idx]
+            + self._rates[idx] * (time_in_cycle - idx * self.interval)
+        )
+
+    def inverse_hazard(self, hazard: float) -> float:
+        """
+        Return the time at which the cumulative hazard reaches a value.
+
+        Parameters
+        ----------
+        hazard: float
+            A cumulative hazard value.
+
+        Returns
+        -------
+        float
+            The simulation time at which `hazard(time)` equals `hazard`.
+        """
+        cycles, hazard_in_cycle = divmod(hazard, self.cycle_hazard)
+        idx = min(
+            bisect_right(self._cumulative_hazard, hazard_in_cycle) - 1,
+            len(self._rates) - 1,
+        )
+        return (
+            cycles * self.cycle_length
+            + idx * self.interval
+            + (hazard_in_cycle - self._cumulative_hazard[idx]) / self._rates[idx]
+        )
+
+    def sample(self, simulation_time: float) -> float:
+        """
+        Sample the next inter-arrival time.
+
+        Parameters
+        ----------
+        simulation_time: float
+            The current simulation time. This is used to look up
+            the mean IAT for the time period.
+
+        Returns
+        -------
+        float
+            The inter-arrival time
+        """
+        self.rejects_last_sample = 0
+
+        target = self.hazard(simulation_time) + self.rng.exponential()
+        return max(self.inverse_hazard(target) - simulation_time, 0.0)
+
+    def sample_interarrival_times(self, run_length: float) -> np.ndarray:
+        """
+        Sample the inter-arrival times of every arrival in a run at once.
+
+        Unit-mean exponential draws are summed to give the cumulative hazard
+        at each arrival, which is inverted for all arrivals in one vectorised
+        pass.
+
+        Parameters
+        ----------
+        run_length: float
+            Arrivals are generated from time 0 up to this time.
+
+        Returns
+        -------
+        numpy.ndarray
+            The inter-arrival time before each arrival. Their cumulative sum
+            gives the arrival times, all of which are before `run_length`.
+        """
+        hazard_end = self.hazard(run_length)
+        block_size = int(hazard_end) + 100
+
+        draws = np.empty(0)
+        while True:
+            draws = np.concatenate((draws, self.rng.exponential(size=block_size)))
+            hazards = np.cumsum(draws)
+            if hazards[-1] >= hazard_end:
+                break
+
+        cycles, hazard_in_cycle = np.divmod(hazards, self.cycle_hazard)
+        idx = np.minimum(
+            np.searchsorted(self.cumulative_hazard, hazard_in_cycle, side="right") - 1,
+            len(self.rates) - 1,
+        )
+        arrival_times = (
+            cycles * self.cycle_length
+            + idx * self.interval
+            + (hazard_in_cycle - self.cumulative_hazard[idx]) / self.rates[idx]
+        )
+        arrival_times = arrival_times[arrival_times < run_length]
+
+        return np.diff(arrival_times, prepend=0.0)
+
+
+class BufferedSampler:
+    """
+    Serves samples from a distribution out of blocks drawn in advance.
+
+    Drawing a single value from a NumPy random number generator has a large
+    fixed cost compared to drawing many at once. This wrapper draws
+    `block_size` values at a time from the wrapped distribution and returns
+    them one by one from a buffer, drawing a new block when it runs out.
+
+    NumPy generators produce the same sequence of values whether they are
+    drawn one at a time or in blocks, so a wrapped distribution returns
+    exactly the same values (and types) as the unwrapped one would for the
+    same seed.
+
+    Any other attribute (e.g. `mean`, `values`, `random_seed`) is looked up on
+    the wrapped distribution.
+
+    Parameters
+    ----------
+    distribution : object
+        A distribution with a `sample(size=None)` method, such as the
+        sim_tools `Exponential`, `Normal` and `DiscreteEmpirical`
+        distributions.
+    block_size : int, optional
+        Number of values to draw at a time. Default is 4096.
+    """
+
+    def __init__(self, distribution, block_size=4096):
+        self.distribution = distribution
+        self.block_size = block_size
+        self._buffer = []
+        self._position = 0
+
+    def __getattr__(self, name):
+        # Only called for attributes not found on the wrapper itself
+        if name == "distribution":
+            raise AttributeError(name)
+        return getattr(self.distribution, name)
+
+    def __repr__(self):
+        return (
+            f"{self.__class__.__name__}({self.distribution!r}, "
+            f"block_size={self.block_size})"
+        )
+
+    def _refill(self):
+        # tolist() converts to plain Python values, which are what the
+        # distributions return when sampling a single value
+        buffer = self.distribution.sample(size=self.block_size).tolist()
+        # A single truncated Normal sample is the minimum itself (e.g. the
+        # int 0) rather than the float returned when sampling a block
+        minimum = getattr(self.distribution, "minimum", None)
+        if isinstance(self.distribution, Normal) and minimum is not None:
+            buffer = [minimum if value == minimum else value for value in buffer]
+        self._buffer = buffer
+        self._position = 0
+
+    def sample(self, size=None):
+        """
+        Return the next value (or values) from the buffer.
+
+        Parameters
+        ----------
+        size : int or tuple of int, optional
+            Number/shape of samples to return. If None, a single value is
+            returned.
+
+        Returns
+        -------
+        object or numpy.ndarray
+            A single value if `size` is None, otherwise an array of values in
+            the order they would have been drawn.
+        """
+        if size is None:
+            if self._position == len(self._buffer):
+                self._refill()
+            value = self._buffer[self._position]
+            self._position += 1
+            return value
+
+        n_values = int(np.prod(size))
+        values = []
+        while len(values) < n_values:
+            if self._position == len(self._buffer):
+                self._refill()
+            end = min(
+                self._position + n_values - len(values), len(self._buffer)
+            )
+            values.extend(self._buffer[self._position : end])
+            self._position = end
+        return np.array(values).reshape(size)
+
 
 ##############################
 # MARK: Set up distributions #
@@ -140,18 +491,19 @@ class NSPPThinningModified:
 def initialise_distributions(self):
     """
     Set up distributions for sampling from.
-    Pulls distribution parameters from g class where relevant.
+    Pulls distribution parameters from the model's scenario config (`config`)
+    where relevant.
     Use of Seed
     """
-    ss = np.random.SeedSequence(g.master_seed + self.run_number)
+    ss = np.random.SeedSequence(self.config.master_seed + self.run_number)
     seeds = ss.spawn(40)
 
     # Generate a dataframe for in and out of hours starts
     def build_iat_dataframe(step_minutes=60):
         t = np.arange(0, 24 * 60, step_minutes)
 
-        start = g.in_hours_start * 60
-        end = g.ooh_start * 60
+        start = self.config.in_hours_start * 60
+        end = self.config.ooh_start * 60
 
         if start < end:
             # Normal case (does not cross midnight)
@@ -160,7 +512,11 @@ def initialise_distributions(self):
             # Crosses midnight
             in_hours_mask = (t >= start) | (t < end)
 
-        mean_iat = np.where(in_hours_mask, g.patient_inter_day, g.patient_inter_night)
+        mean_iat = np.where(
+            in_hours_mask,
+            self.config.patient_inter_day,
+            self.config.patient_inter_night,
+        )
         df = pd.DataFrame({"t": t, "mean_iat": mean_iat})
         print(df)
         return df
@@ -168,75 +524,91 @@ def initialise_distributions(self):
     self.iat_dataframe = build_iat_dataframe()
 
     # Inter-arrival times
-    self.patient_inter_dist = NSPPThinningModified(
-        data=self.iat_dataframe,
-        interval_width=60,
-        random_seed1=seeds[0],
-        random_seed2=seeds[1],
-    )
+    if self.config.arrival_sampler == "thinning":
+        self.patient_inter_dist = NSPPThinningModified(
+            data=self.iat_dataframe,
+            interval_width=60,
+            random_seed1=seeds[0],
+            random_seed2=seeds[1],
+        )
+    elif self.config.arrival_sampler == "inversion":
+        self.patient_inter_dist = NSPPPiecewiseConstant(
+            data=self.iat_dataframe,
+            interval_width=60,
+            random_seed=seeds[0],
+        )
+    else:
+        raise ValueError(
+            "arrival_sampler must be 'thinning' or 'inversion', "
+            f"got {self.config.arrival_sampler!r}"
+        )
 
     # Activity duration dists
     # These are the activities that are *not* dependent on patient attributes
     self.nurse_consult_time_dist = Exponential(
-        mean=g.mean_n_consult_time, random_seed=seeds[2]
+        mean=self.config.mean_n_consult_time, random_seed=seeds[2]
+    )
+    self.ct_time_dist = Exponential(
+        mean=self.config.mean_n_ct_time, random_seed=seeds[3]
+    )
+    self.sdec_time_dist = Exponential(
+        mean=self.config.mean_n_sdec_time, random_seed=seeds[4]
     )
-    self.ct_time_dist = Exponential(mean=g.mean_n_ct_time, random_seed=seeds[3])
-    self.sdec_time_dist = Exponential(mean=g.mean_n_sdec_time, random_seed=seeds[4])
 
     # Ward stay dists
     # These are the activities that are dependent on patient attributes
     self.i_ward_time_mrs_0_dist = Exponential(
-        mean=g.mean_n_i_ward_time_mrs_0, random_seed=seeds[5]
+        mean=self.config.mean_n_i_ward_time_mrs_0, random_seed=seeds[5]
     )
     self.i_ward_time_mrs_1_dist = Exponential(
-        mean=g.mean_n_i_ward_time_mrs_1, random_seed=seeds[6]
+        mean=self.config.mean_n_i_ward_time_mrs_1, random_seed=seeds[6]
     )
     self.i_ward_time_mrs_2_dist = Exponential(
-        mean=g.mean_n_i_ward_time_mrs_2, random_seed=seeds[7]
+        mean=self.config.mean_n_i_ward_time_mrs_2, random_seed=seeds[7]
     )
     self.i_ward_time_mrs_3_dist = Exponential(
-        mean=g.mean_n_i_ward_time_mrs_3, random_seed=seeds[8]
+        mean=self.config.mean_n_i_ward_time_mrs_3, random_seed=seeds[8]
     )
     self.i_ward_time_mrs_4_dist = Exponential(
-        mean=g.mean_n_i_ward_time_mrs_4, random_seed=seeds[9]
+        mean=self.config.mean_n_i_ward_time_mrs_4, random_seed=seeds[9]
     )
     self.i_ward_time_mrs_5_dist = Exponential(
-        mean=g.mean_n_i_ward_time_mrs_5, random_seed=seeds[10]
+        mean=self.config.mean_n_i_ward_time_mrs_5, random_seed=seeds[10]
     )
 
     self.ich_ward_time_mrs_0_dist = Exponential(
-        mean=g.mean_n_ich_ward_time_mrs_0, random_seed=seeds[11]
+        mean=self.config.mean_n_ich_ward_time_mrs_0, random_seed=seeds[11]
     )
     self.ich_ward_time_mrs_1_dist = Exponential(
-        mean=g.mean_n_ich_ward_time_mrs_1, random_seed=seeds[12]
+        mean=self.config.mean_n_ich_ward_time_mrs_1, random_seed=seeds[12]
     )
     self.ich_ward_time_mrs_2_dist = Exponential(
-        mean=g.mean_n_ich_ward_time_mrs_2, random_seed=seeds[13]
+        mean=self.config.mean_n_ich_ward_time_mrs_2, random_seed=seeds[13]
     )
     self.ich_ward_time_mrs_3_dist = Exponential(
-        mean=g.mean_n_ich_ward_time_mrs_3, random_seed=seeds[14]
+        mean=self.config.mean_n_ich_ward_time_mrs_3, random_seed=seeds[14]
     )
     self.ich_ward_time_mrs_4_dist = Exponential(
-        mean=g.mean_n_ich_ward_time_mrs_4, random_seed=seeds[15]
+        mean=self.config.mean_n_ich_ward_time_mrs_4, random_seed=seeds[15]
     )
     self.ich_ward_time_mrs_5_dist = Exponential(
-        mean=g.mean_n_ich_ward_time_mrs_5, random_seed=seeds[16]
+        mean=self.config.mean_n_ich_ward_time_mrs_5, random_seed=seeds[16]
     )
 
     self.tia_ward_time_dist = Exponential(
-        mean=g.mean_n_tia_ward_time, random_seed=seeds[17]
+        mean=self.config.mean_n_tia_ward_time, random_seed=seeds[17]
     )
     self.non_stroke_ward_time_dist = Exponential(
-        mean=g.mean_n_non_stroke_ward_time, random_seed=seeds[18]
+        mean=self.config.mean_n_non_stroke_ward_time, random_seed=seeds[18]
     )
 
     # Patient Attribute Distributions
     self.onset_type_distribution_in_hours = DiscreteEmpirical(
         values=[0, 1, 2],
         freq=[
-            g.in_hours_known_onset,
-            g.in_hours_unknown_onset_inside_ctp,
-            g.in_hours_unknown_onset_outside_ctp,
+            self.config.in_hours_known_onset,
+            self.config.in_hours_unknown_onset_inside_ctp,
+            self.config.in_hours_unknown_onset_outside_ctp,
         ],  # equal weight of all possibilities
         random_seed=seeds[19],
     )
@@ -244,14 +616,16 @@ def initialise_distributions(self):
     self.onset_type_distribution_out_of_hours = DiscreteEmpirical(
         values=[0, 1, 2],
         freq=[
-            g.out_of_hours_known_onset,
-            g.out_of_hours_unknown_onset_inside_ctp,
-            g.out_of_hours_unknown_onset_outside_ctp,
+            self.config.out_of_hours_known_onset,
+            self.config.out_of_hours_unknown_onset_inside_ctp,
+            self.config.out_of_hours_unknown_onset_outside_ctp,
         ],  # equal weight of all possibilities
         random_seed=seeds[32],
     )
 
-    self.mrs_type_distribution = Exponential(g.mean_mrs, random_seed=seeds[20])
+    self.mrs_type_distribution = Exponential(
+        self.config.mean_mrs, random_seed=seeds[20]
+    )
 
     self.diagnosis_distribution = DiscreteEmpirical(
         values=list(range(0, 101)),  # 0 to 100 (upper is exclusive)
@@ -268,35 +642,35 @@ def initialise_distributions(self):
     # TODO: Is this the best distribution for this?
     # Per-patient diagnosis randomisation
     # self.ich_range = random.normalvariate(g.ich, 1)
-    self.ich_range_distribution = Normal(g.ich, 1, random_seed=seeds[23])
+    self.ich_range_distribution = Normal(self.config.ich, 1, random_seed=seeds[23])
     # self.i_range = max(random.normalvariate(g.i, 1), self.ich_range)
-    self.i_range_distribution = Normal(g.i, 1, random_seed=seeds[24])
+    self.i_range_distribution = Normal(self.config.i, 1, random_seed=seeds[24])
     # self.tia_range = max(random.normalvariate(g.tia, 1), self.i_range)
-    self.tia_range_distribution = Normal(g.tia, 1, random_seed=seeds[25])
+    self.tia_range_distribution = Normal(self.config.tia, 1, random_seed=seeds[25])
     # self.stroke_mimic_range = max(
     #     random.normalvariate(g.stroke_mimic, 1), self.tia_range
     # )
     self.stroke_mimic_range_distribution = Normal(
-        g.stroke_mimic, 1, random_seed=seeds[26]
+        self.config.stroke_mimic, 1, random_seed=seeds[26]
     )
     # self.non_stroke_range = max(
     #     random.normalvariate(g.stroke_mimic, 1), self.stroke_mimic_range
     # )
     self.non_stroke_range_distribution = Normal(
-        g.stroke_mimic, 1, random_seed=seeds[27]
+        self.config.stroke_mimic, 1, random_seed=seeds[27]
     )
 
     # TODO: Is this the best distribution for this?
     # Admission chance distributions
     # self.tia_admission_chance = random.normalvariate(g.tia_admission, 1)
     self.tia_admission_chance_distribution = Normal(
-        g.tia_admission, 1, random_seed=seeds[28]
+        self.config.tia_admission, 1, random_seed=seeds[28]
     )
     # self.stroke_mimic_admission_chance = random.normalvariate(
     #     g.stroke_mimic_admission, 1
     # )
     self.stroke_mimic_admission_chance_distribution = Normal(
-        g.stroke_mimic_admission, 1, random_seed=seeds[29]
+        self.config.stroke_mimic_admission, 1, random_seed=seeds[29]
     )
 
     # MRS on discharge distribution
@@ -311,3 +685,735 @@ def initialise_distributions(self):
         freq=[1, 1, 1],
         random_seed=seeds[31],
     )
+
+    # Optionally serve samples from blocks drawn in advance. This does not
+    # change the values sampled, only how quickly they are produced
+    if self.config.buffered_sampling:
+        for name, value in list(vars(self).items()):
+            if isinstance(value, (Exponential, Normal, DiscreteEmpirical)):
+                setattr(self, name, BufferedSampler(value))
+
+    # Random number stream for choosing which patients to check when only a
+    # sample of them are validated after the run
+    self.validation_rng = np.random.default_rng(seeds[33])
+
+    # Look up the distributions used for each patient's ward stay once, so
+    # that each stay can be sampled in one step
+    self.ward_stay_engine = WardStayEngine(
+        self, thrombolysis_los_save=self.config.thrombolysis_los_save
+    )
+
+
+##############################
+# MARK: Ward length of stay  #
+##############################
+
+
+class WardStayRule:
+    """
+    How the ward stay of patients with a given diagnosis and mRS on
+    admission is sampled.
+
+    Distributions are given by the name of the attribute they are stored in
+    by `initialise_distributions`, so rules can be written down before any
+    distributions exist.
+
+    Parameters
+    ----------
+    los : str
+        Distribution the length of stay (in minutes) is sampled from.
+    mrs_reduction : str or None, optional
+        Distribution the reduction in mRS during the stay is sampled from.
+        None means the patient is discharged with their mRS on admission.
+        Default None.
+    thrombolysis : bool, optional
+        Whether thrombolysis shortens the stay (by `thrombolysis_los_save`)
+        for these patients. Default False.
+    thrombolysed_mrs_reduction : str or None, optional
+        Distribution the reduction in mRS is sampled from instead for
+        patients who were thrombolysed, if `thrombolysis` is True. Default
+        None (the same as for patients who were not thrombolysed).
+    record_mrs_discharge : bool, optional
+        Whether an mRS on discharge is set for these patients at all.
+        Default True.
+    """
+
+    def __init__(
+        self,
+        los,
+        mrs_reduction=None,
+        thrombolysis=False,
+        thrombolysed_mrs_reduction=None,
+        record_mrs_discharge=True,
+    ):
+        self.los = los
+        self.mrs_reduction = mrs_reduction
+        self.thrombolysis = thrombolysis
+        self.thrombolysed_mrs_reduction = (
+            mrs_reduction
+            if thrombolysed_mrs_reduction is None
+            else thrombolysed_mrs_reduction
+        )
+        self.record_mrs_discharge = record_mrs_discharge
+
+    def __repr__(self):
+        return (
+            f"{self.__class__.__name__}(los={self.los!r}, "
+            f"mrs_reduction={self.mrs_reduction!r}, "
+            f"thrombolysis={self.thrombolysis!r}, "
+            f"thrombolysed_mrs_reduction={self.thrombolysed_mrs_reduction!r}, "
+            f"record_mrs_discharge={self.record_mrs_discharge!r})"
+        )
+
+
+# Ward stay rule for each (patient_diagnosis, mrs_type). Adding a diagnosis
+# or giving a group of patients a different length of stay distribution only
+# needs a change here (and the distribution adding in
+# initialise_distributions())
+WARD_STAY_RULES = {
+    # Intracerebral haemorrhage - unsuitable for thrombolysis
+    **{
+        (0, mrs): WardStayRule(
+            los=f"ich_ward_time_mrs_{mrs}_dist",
+            mrs_reduction=None if mrs == 0 else "mrs_reduction_during_stay",
+        )
+        for mrs in range(6)
+    },
+    # Ischaemic stroke - thrombolysis shortens the stay of those with an mRS
+    # above 0, and those with an mRS above 1 can improve further
+    (1, 0): WardStayRule(los="i_ward_time_mrs_0_dist"),
+    (1, 1): WardStayRule(
+        los="i_ward_time_mrs_1_dist",
+        mrs_reduction="mrs_reduction_during_stay",
+        thrombolysis=True,
+    ),
+    **{
+        (1, mrs): WardStayRule(
+            los=f"i_ward_time_mrs_{mrs}_dist",
+            mrs_reduction="mrs_reduction_during_stay",
+            thrombolysis=True,
+            thrombolysed_mrs_reduction="mrs_reduction_during_stay_thrombolysed",
+        )
+        for mrs in range(2, 6)
+    },
+    # Transient ischaemic attack - not suitable for thrombolysis
+    **{
+        (2, mrs): WardStayRule(los="tia_ward_time_dist", record_mrs_discharge=False)
+        for mrs in range(6)
+    },
+    # Stroke mimic and non-stroke
+    **{
+        (diagnosis, mrs): WardStayRule(
+            los="non_stroke_ward_time_dist", record_mrs_discharge=False
+        )
+        for diagnosis in [3, 4]
+        for mrs in range(6)
+    },
+}
+
+
+class WardStayEngine:
+    """
+    Samples patients' ward stays from a table of rules keyed by diagnosis and
+    mRS on admission.
+
+    The distributions for each rule are looked up when the engine is
+    created, so sampling a stay is a single dictionary lookup followed by
+    the draws themselves.
+
+    Parameters
+    ----------
+    distributions : object
+        Object holding the distributions named in the rules, e.g. a `Model`
+        after `initialise_distributions` has been called.
+    thrombolysis_los_save : float
+        Factor the length of stay is multiplied by for patients whose stay is
+        shortened by thrombolysis.
+    rules : dict, optional
+        `WardStayRule` for each `(patient_diagnosis, mrs_type)`. Defaults to
+        `WARD_STAY_RULES`.
+    """
+
+    def __init__(self, distributions, thrombolysis_los_save, rules=None):
+        self.rules = dict(WARD_STAY_RULES if rules is None else rules)
+        self.thrombolysis_los_save = thrombolysis_los_save
+
+        def resolve(name):
+            return None if name is None else getattr(distributions, name)
+
+        self._resolved = {
+            key: (
+                resolve(rule.los),
+                resolve(rule.mrs_reduction),
+                rule.thrombolysis,
+                resolve(rule.thrombolysed_mrs_reduction),
+                rule.record_mrs_discharge,
+            )
+            for key, rule in self.rules.items()
+        }
+
+    def _lookup(self, patient_diagnosis, mrs_type):
+        try:
+            return self._resolved[(patient_diagnosis, mrs_type)]
+        except KeyError:
+            raise KeyError(
+                f"No ward stay rule for patient_diagnosis={patient_diagnosis}, "
+                f"mrs_type={mrs_type}"
+            ) from None
+
+    def sample(self, patient_diagnosis, mrs_type, thrombolysis=False):
+        """
+        Sample the ward stay of a single patient.
+
+        Parameters
+        ----------
+        patient_diagnosis : int
+            The patient's diagnosis category.
+        mrs_type : int
+            The patient's mRS on admission.
+        thrombolysis : bool, optional
+            Whether the patient was thrombolysed. Default False.
+
+        Returns
+        -------
+        tuple
+            `(los, thrombolysed_los, mrs_discharge)`: the sampled length of
+            stay, the shortened length of stay if thrombolysis shortens this
+            patient's stay (otherwise None), and the mRS on discharge (None if
+            not recorded for this patient).
+        """
+        (
+            los_dist,
+            mrs_reduction,
+            thrombolysis_applies,
+            thrombolysed_mrs_reduction,
+            record_mrs_discharge,
+        ) = self._lookup(patient_diagnosis, mrs_type)
+
+        los = los_dist.sample()
+
+        if thrombolysis and thrombolysis_applies:
+            thrombolysed_los = los * self.thrombolysis_los_save
+            mrs_reduction = thrombolysed_mrs_reduction
+        else:
+            thrombolysed_los = None
+
+        if not record_mrs_discharge:
+            mrs_discharge = None
+        elif mrs_reduction is None:
+            mrs_discharge = mrs_type
+        else:
+            mrs_discharge = mrs_type - mrs_reduction.sample()
+
+        return los, thrombolysed_los, mrs_discharge
+
+    def sample_batch(self, patient_diagnosis, mrs_type, thrombolysis):
+        """
+        Sample the ward stays of many patients at once.
+
+        Each distribution is sampled once for all the patients that use it,
+        in patient order, so the results are the same as calling `sample`
+        for each patient in turn.
+
+        Parameters
+        ----------
+        patient_diagnosis : array-like of int
+            Each patient's diagnosis category.
+        mrs_type : array-like of int
+            Each patient's mRS on admission.
+        thrombolysis : array-like of bool
+            Whether each patient was thrombolysed.
+
+        Returns
+        -------
+        pd.DataFrame
+            Columns "los", "thrombolysed_los" and "mrs_discharge", one row per
+            patient, as returned by `sample`, with NaN in place of None.
+        """
+        patient_diagnosis = np.asarray(patient_diagnosis).tolist()
+        mrs_type = np.asarray(mrs_type).tolist()
+        thrombolysis = np.asarray(thrombolysis, dtype=bool)
+        n_patients = len(patient_diagnosis)
+
+        resolved = [self._lookup(d, m) for d, m in zip(patient_diagnosis, mrs_type)]
+        thrombolysed = thrombolysis & np.array([r[2] for r in resolved], dtype=bool)
+        record_mrs_discharge = np.array([r[4] for r in resolved], dtype=bool)
+        mrs_reductions = [
+            (r[3] if thrombolysed_row else r[1]) if r[4] else None
+            for r, thrombolysed_row in zip(resolved, thrombolysed.tolist())
+        ]
+
+        los = np.empty(n_patients)
+        for dist, rows in _rows_by_distribution([r[0] for r in resolved]):
+            los[rows] = dist.sample(size=len(rows))
+
+        thrombolysed_los = np.where(
+            thrombolysed, los * self.thrombolysis_los_save, np.nan
+        )
+
+        mrs_discharge = np.where(
+            record_mrs_discharge, np.asarray(mrs_type, dtype=float), np.nan
+        )
+        for dist, rows in _rows_by_distribution(mrs_reductions):
+            mrs_discharge[rows] -= dist.sample(size=len(rows))
+
+        return pd.DataFrame(
+            {
+                "los": los,
+                "thrombolysed_los": thrombolysed_los,
+                "mrs_discharge": mrs_discharge,
+            }
+        )
+
+
+def _rows_by_distribution(dists):
+    # Group row positions by the distribution they sample from (skipping
+    # rows with no distribution), keeping each group in row order
+    groups = {}
+    for row, dist in enumerate(dists):
+        if dist is not None:
+            groups.setdefault(id(dist), (dist, []))[1].append(row)
+    return groups.values()
+
+
+##############################
+# MARK: Arrival schedule     #
+##############################
+
+# Parameters that determine the arrivals generated for a run. Scenarios with
+# the same values for all of these (and the same run number) have identical
+# arrivals, so can share an arrival schedule.
+ARRIVAL_DEMAND_PARAMETERS = (
+    "master_seed",
+    "sim_duration",
+    "warm_up_period",
+    "in_hours_start",
+    "ooh_start",
+    "patient_inter_day",
+    "patient_inter_night",
+    "arrival_sampler",
+    "in_hours_known_onset",
+    "in_hours_unknown_onset_inside_ctp",
+    "in_hours_unknown_onset_outside_ctp",
+    "out_of_hours_known_onset",
+    "out_of_hours_unknown_onset_inside_ctp",
+    "out_of_hours_unknown_onset_outside_ctp",
+)
+
+
+def arrival_demand(config, run_number):
+    """
+    Return the settings that determine the arrivals for a run.
+
+    Parameters
+    ----------
+    config : Scenario
+        The scenario being run.
+    run_number : int
+        The run number.
+
+    Returns
+    -------
+    dict
+        The values of `ARRIVAL_DEMAND_PARAMETERS` in `config`, plus the run
+        number.
+    """
+    demand = {name: getattr(config, name) for name in ARRIVAL_DEMAND_PARAMETERS}
+    demand["run_number"] = run_number
+    return demand
+
+
+class ArrivalSchedule:
+    """
+    Every patient arrival for a run, generated up front.
+
+    Holds the time of each arrival along with whether it was in hours and
+    the patient's onset type, so that the arrivals process in the model only
+    has to replay them. The same schedule can be passed to models for other
+    scenarios with the same demand (see `ARRIVAL_DEMAND_PARAMETERS`) so that
+    they see exactly the same arrivals.
+
+    Parameters
+    ----------
+    interarrival_times : array-like
+        Time between each arrival and the previous one (or the start of the
+        run for the first arrival).
+    in_hours : array-like of bool
+        Whether each arrival was in hours.
+    onset_type : array-like of int
+        The onset type of each arriving patient (0 = known onset,
+        1 = unknown onset inside CTP window, 2 = unknown onset outside CTP
+        window).
+    demand : dict
+        The settings the schedule was generated with, as returned by
+        `arrival_demand`.
+
+    Attributes
+    ----------
+    interarrival_times : numpy.ndarray
+        Time between each arrival and the previous one.
+    arrival_times : numpy.ndarray
+        Simulation time of each arrival.
+    in_hours : numpy.ndarray
+        Whether each arrival was in hours.
+    onset_type : numpy.ndarray
+        The onset type of each arriving patient.
+    demand : dict
+        The settings the schedule was generated with.
+    """
+
+    def __init__(self, interarrival_times, in_hours, onset_type, demand):
+        self.interarrival_times = np.asarray(interarrival_times, dtype=float)
+        # Accumulated one at a time, in the same way as the simulation clock,
+        # so these match the times at which the patients arrive in the model
+        self.arrival_times = np.cumsum(self.interarrival_times)
+        self.in_hours = np.asarray(in_hours, dtype=bool)
+        self.onset_type = np.asarray(onset_type)
+        self.demand = dict(demand)
+
+    def __len__(self):
+        return len(self.interarrival_times)
+
+    def __repr__(self):
+        return (
+            f"{self.__class__.__name__}({len(self)} arrivals, "
+            f"run_number={self.demand.get('run_number')})"
+        )
+
+    def matches(self, config, run_number):
+        """
+        Check whether the schedule can be used for a scenario and run.
+
+        Parameters
+        ----------
+        config : Scenario
+            The scenario being run.
+        run_number : int
+            The run number.
+
+        Returns
+        -------
+        bool
+            True if the schedule was generated with the same demand.
+        """
+        return self.demand == arrival_demand(config, run_number)
+
+    def replay(self):
+        """
+        Iterate over the arrivals in order.
+
+        Returns
+        -------
+        iterator of tuple
+            `(interarrival_time, in_hours, onset_type)` for each arrival, as
+            plain Python values.
+        """
+        return zip(
+            self.interarrival_times.tolist(),
+            self.in_hours.tolist(),
+            self.onset_type.tolist(),
+        )
+
+    def to_dataframe(self):
+        """
+        Return the schedule as a DataFrame, one row per arrival.
+
+        Returns
+        -------
+        pd.DataFrame
+            Columns "arrival_time", "interarrival_time", "in_hours" and
+            "onset_type", indexed by the ID the patient will be given.
+        """
+        return pd.DataFrame(
+            {
+                "arrival_time": self.arrival_times,
+                "interarrival_time": self.interarrival_times,
+                "in_hours": self.in_hours,
+                "onset_type": self.onset_type,
+            },
+            index=pd.RangeIndex(1, len(self) + 1, name="Patient ID"),
+        )
+
+
+def build_arrival_schedule(self):
+    """
+    Generate every arrival for a run from the model's distributions.
+
+    The arrival times are sampled for the whole run (including the warm-up
+    period) in one go, and the in-hours flag and onset type of each arrival
+    are worked out at the same time.
+
+    Returns
+    -------
+    ArrivalSchedule
+        The arrivals for the run.
+    """
+    run_length = self.config.sim_duration + self.config.warm_up_period
+    interarrival_times = self.patient_inter_dist.sample_interarrival_times(run_length)
+
+    # Same rule as Model.is_in_hours()
+    time_of_day = np.cumsum(interarrival_times) % 1440
+    start = self.config.in_hours_start * 60
+    end = self.config.ooh_start * 60
+    if start < end:
+        in_hours = (time_of_day >= start) & (time_of_day < end)
+    else:
+        in_hours = (time_of_day >= start) | (time_of_day < end)
+
+    # Each onset type distribution is sampled in arrival order, as it would
+    # be if the patients were generated one at a time
+    onset_type = np.empty(len(interarrival_times), dtype=np.int64)
+    onset_type[in_hours] = self.onset_type_distribution_in_hours.sample(
+        size=int(in_hours.sum())
+    )
+    onset_type[~in_hours] = self.onset_type_distribution_out_of_hours.sample(
+        size=int((~in_hours).sum())
+    )
+
+    return ArrivalSchedule(
+        interarrival_times,
+        in_hours,
+        onset_type,
+        arrival_demand(self.config, self.run_number),
+    )
+
+
+def generate_arrival_schedule(config, run_number):
+    """
+    Generate the arrivals for a scenario and run without creating a model.
+
+    The schedule is the same as the one a `Model` for this scenario and run
+    would generate, and can be passed to models for any scenario with the
+    same demand.
+
+    Parameters
+    ----------
+    config : Scenario
+        The scenario to generate arrivals for.
+    run_number : int
+        The run number (used for seeding).
+
+    Returns
+    -------
+    ArrivalSchedule
+        The arrivals for the run.
+    """
+    holder = SimpleNamespace(config=config, run_number=run_number)
+    initialise_distributions(holder)
+    return build_arrival_schedule(holder)
+
+
+##############################
+# MARK: Patient attributes   #
+##############################
+
+# Name of each diagnosis category, indexed by the category number
+PATIENT_DIAGNOSIS_TYPES = ("ICH", "I", "TIA", "Stroke Mimic", "Non Stroke")
+
+
+class PatientAttributeTable:
+    """
+    Randomised attributes for a run's patients, generated in batches.
+
+    Row `i` holds the attributes given to the `i`-th patient to arrive:
+    their mRS type, diagnosis and non-admission scores, the admission chance
+    thresholds, the diagnosis thresholds and the resulting diagnosis
+    category. Each attribute is sampled from its own distribution in patient
+    order, so the values are the same as if they were sampled one patient at
+    a time.
+
+    Parameters
+    ----------
+    columns : dict
+        Array of values for each of `COLUMNS`, all the same length.
+
+    Attributes
+    ----------
+    columns : dict of numpy.ndarray
+        Array of values for each of `COLUMNS`.
+    """
+
+    COLUMNS = (
+        "mrs_type",
+        "diagnosis",
+        "non_admission",
+        "tia_admission_chance",
+        "stroke_mimic_admission_chance",
+        "ich_range",
+        "i_range",
+        "tia_range",
+        "stroke_mimic_range",
+        "non_stroke_range",
+        "patient_diagnosis",
+    )
+
+    def __init__(self, columns):
+        missing = set(self.COLUMNS) - set(columns)
+        if missing:
+            raise ValueError(f"Missing patient attribute columns: {missing}")
+        self.columns = {name: np.asarray(columns[name]) for name in self.COLUMNS}
+        lengths = {len(values) for values in self.columns.values()}
+        if len(lengths) > 1:
+            raise ValueError("Patient attribute columns must all be the same length")
+
+    def __len__(self):
+        return len(self.columns["patient_diagnosis"])
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({len(self)} patients)"
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    @property
+    def patient_diagnosis_type(self):
+        """numpy.ndarray : Name of each patient's diagnosis category."""
+        return np.array(PATIENT_DIAGNOSIS_TYPES)[self.columns["patient_diagnosis"]]
+
+    @classmethod
+    def concat(cls, tables):
+        """
+        Join tables end to end.
+
+        Parameters
+        ----------
+        tables : list of PatientAttributeTable
+            The tables to join, in patient order.
+
+        Returns
+        -------
+        PatientAttributeTable
+            A table with the rows of each table in turn.
+        """
+        return cls(
+            {
+                name: np.concatenate([table.columns[name] for table in tables])
+                for name in cls.COLUMNS
+            }
+        )
+
+    def rows(self):
+        """
+        Iterate over the patients in order.
+
+        Returns
+        -------
+        iterator of tuple
+            The values of `COLUMNS` for each patient, as plain Python values.
+        """
+        return zip(*(self.columns[name].tolist() for name in self.COLUMNS))
+
+    def to_dataframe(self):
+        """
+        Return the table as a DataFrame, one row per patient.
+
+        Returns
+        -------
+        pd.DataFrame
+            The `COLUMNS` plus "patient_diagnosis_type", indexed by the ID the
+            patient will be given.
+        """
+        df = pd.DataFrame(
+            self.columns, index=pd.RangeIndex(1, len(self) + 1, name="Patient ID")
+        )
+        df["patient_diagnosis_type"] = self.patient_diagnosis_type
+        return df
+
+
+def sample_patient_attributes(self, n_patients):
+    """
+    Sample the randomised attributes for the next patients from the model's
+    distributions.
+
+    Parameters
+    ----------
+    n_patients : int
+        Number of patients to sample attributes for.
+
+    Returns
+    -------
+    PatientAttributeTable
+        The attributes of each patient, in arrival order.
+    """
+    # patient.mrs_type = min(round(random.expovariate(1.0 / g.mean_mrs)), 5)
+    # np.round() rounds halves to even, like round()
+    mrs_type = np.minimum(
+        np.round(self.mrs_type_distribution.sample(size=n_patients)), 5
+    ).astype(np.int64)
+    diagnosis = self.diagnosis_distribution.sample(size=n_patients)
+    non_admission = self.non_admission_distribution.sample(size=n_patients)
+
+    tia_admission_chance = self.tia_admission_chance_distribution.sample(
+        size=n_patients
+    )
+    stroke_mimic_admission_chance = (
+        self.stroke_mimic_admission_chance_distribution.sample(size=n_patients)
+    )
+
+    # Each diagnosis threshold is at least as high as the one before it
+    ich_range = self.ich_range_distribution.sample(size=n_patients)
+    i_range = np.maximum(self.i_range_distribution.sample(size=n_patients), ich_range)
+    tia_range = np.maximum(self.tia_range_distribution.sample(size=n_patients), i_range)
+    stroke_mimic_range = np.maximum(
+        self.stroke_mimic_range_distribution.sample(size=n_patients), tia_range
+    )
+    non_stroke_range = np.maximum(
+        self.non_stroke_range_distribution.sample(size=n_patients),
+        stroke_mimic_range,
+    )
+
+    # The first threshold the diagnosis score falls within gives the
+    # category; anyone above the stroke mimic threshold is non-stroke
+    patient_diagnosis = np.select(
+        [
+            diagnosis <= ich_range,
+            diagnosis <= i_range,
+            diagnosis <= tia_range,
+            diagnosis <= stroke_mimic_range,
+        ],
+        [0, 1, 2, 3],
+        default=4,
+    )
+
+    return PatientAttributeTable(
+        {
+            "mrs_type": mrs_type,
+            "diagnosis": diagnosis,
+            "non_admission": non_admission,
+            "tia_admission_chance": tia_admission_chance,
+            "stroke_mimic_admission_chance": stroke_mimic_admission_chance,
+            "ich_range": ich_range,
+            "i_range": i_range,
+            "tia_range": tia_range,
+            "stroke_mimic_range": stroke_mimic_range,
+            "non_stroke_range": non_stroke_range,
+            "patient_diagnosis": patient_diagnosis,
+        }
+    )
+
+
+def generate_patient_attribute_table(config, run_number, n_patients):
+    """
+    Generate the patient attributes for a scenario and run without creating
+    a model.
+
+    The `i`-th row is the same as the attributes a `Model` for this scenario
+    and run would give the `i`-th patient to arrive.
+
+    Parameters
+    ----------
+    config : Scenario
+        The scenario to generate attributes for.
+    run_number : int
+        The run number (used for seeding).
+    n_patients : int
+        Number of patients to generate attributes for.
+
+    Returns
+    -------
+    PatientAttributeTable
+        The attributes of each patient, in arrival order.
+    """
+    holder = SimpleNamespace(config=config, run_number=run_number)
+    initialise_distributions(holder)
+    return sample_patient_attributes(holder, n_patients)
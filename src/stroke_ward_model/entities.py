@@ -2,7 +2,10 @@
 Defines patient entities and their attributes for the stroke ward simulation.
 """
 
+from operator import attrgetter
+
 import numpy as np
+import pandas as pd
 
 
 # MARK: Patient
@@ -20,6 +23,10 @@ class Patient:
     (or at the start of assessment) using parameters defined in the global
     configuration class `g`.
 
+    Attributes are held in `__slots__`, so new attributes cannot be added to
+    a patient after it is created. Use `to_dict()` or
+    `patients_to_dataframe()` to export them.
+
     Parameters
     ----------
     p_id : int or str
@@ -138,6 +145,57 @@ class Patient:
     All generated content has been thoroughly reviewed.
     """
 
+    # Patients keep their attributes in fixed slots rather than a per-instance
+    # __dict__, which takes far less memory when every patient in a long run
+    # is kept. The order here is the column order of patients_to_dataframe()
+    __slots__ = (
+        "id",
+        "q_time_nurse",
+        "q_time_ward",
+        "onset_type",
+        "mrs_type",
+        "mrs_discharge",
+        "diagnosis",
+        "patient_diagnosis",
+        "patient_diagnosis_type",
+        "priority",
+        "non_admission",
+        "advanced_ct_pathway",
+        "sdec_pathway",
+        "thrombolysis",
+        "thrombectomy",
+        "admission_avoidance",
+        "non_admitted_tia_ns_sm",
+        "ward_los",
+        "ward_los_thrombolysis",
+        "sdec_los",
+        "ctp_duration",
+        "ct_duration",
+        "arrived_ooh",
+        "clock_start",
+        "nurse_q_start_time",
+        "nurse_triage_start_time",
+        "nurse_triage_end_time",
+        "ct_scan_start_time",
+        "ct_scan_end_time",
+        "ctp_scan_start_time",
+        "ctp_scan_end_time",
+        "sdec_running_when_required",
+        "sdec_full_when_required",
+        "sdec_admit_time",
+        "sdec_discharge_time",
+        "ward_q_start_time",
+        "ward_admit_time",
+        "ward_discharge_time",
+        "exit_time",
+        "nurse_attending_id",
+        "ct_scanner_id",
+        "sdec_bed_id",
+        "ward_bed_id",
+        "generated_during_warm_up",
+        "journey_completed",
+    )
+
     _required_fields = [
         "arrived_ooh",
         "advanced_ct_pathway",
@@ -265,5 +323,180 @@ class Patient:
             )
 
     def __repr__(self):
-        attrs = vars(self)
-        return "\n".join(f"{k}: {v}" for k, v in attrs.items())
+        return "\n".join(f"{k}: {getattr(self, k)}" for k in self.__slots__)
+
+    def to_dict(self):
+        """
+        Return the patient's attributes as a dictionary.
+
+        Returns
+        -------
+        dict
+            Attribute values keyed by name, in the order of `__slots__`.
+        """
+        return dict(zip(self.__slots__, _get_patient_fields(self)))
+
+
+_get_patient_fields = attrgetter(*Patient.__slots__)
+
+
+def patients_to_dataframe(patients, columns=None):
+    """
+    Build a DataFrame of patient attributes, one row per patient.
+
+    Equivalent to `pd.DataFrame([p.to_dict() for p in patients])`, but
+    reads each patient's attributes into a tuple in one step rather than
+    building a dictionary for every patient.
+
+    Parameters
+    ----------
+    patients : list of Patient
+        The patients to include, in the order they should appear.
+    columns : list of str, optional
+        Attributes to include. If None (the default), every attribute is
+        included.
+
+    Returns
+    -------
+    pd.DataFrame
+        One column per patient attribute, in the order of `Patient.__slots__`
+        (or of `columns`, if given).
+    """
+    if columns is None:
+        return pd.DataFrame.from_records(
+            [_get_patient_fields(p) for p in patients],
+            columns=list(Patient.__slots__),
+        )
+
+    columns = list(columns)
+    get_fields = attrgetter(*columns)
+    records = [get_fields(p) for p in patients]
+    if len(columns) == 1:
+        # attrgetter returns the value itself rather than a tuple
+        records = [(value,) for value in records]
+    return pd.DataFrame.from_records(records, columns=columns)
+
+
+def validate_patients(patients_df):
+    """
+    Check that every patient has all of their required fields set.
+
+    This is the same check as `Patient.validate()`, done for all patients at
+    once with a single null check over the columns of
+    `patients_to_dataframe()`.
+
+    Parameters
+    ----------
+    patients_df : pd.DataFrame
+        Patient attributes as returned by `patients_to_dataframe()`. Only
+        the `id` column and the columns of `Patient._required_fields` are
+        used, so the other columns can be left out.
+
+    Raises
+    ------
+    ValueError
+        If any patient has a required field that is None or NaN. The
+        message names each failing patient ID with its missing fields.
+    """
+    required = Patient._required_fields
+    missing = patients_df[required].isna().to_numpy()
+    failing_rows = np.flatnonzero(missing.any(axis=1))
+
+    if len(failing_rows):
+        patient_ids = patients_df["id"].to_numpy()[failing_rows]
+        details = "\n".join(
+            f"Patient {patient_id}: missing fields "
+            f"{[field for field, m in zip(required, missing[row]) if m]}"
+            for patient_id, row in zip(patient_ids, failing_rows)
+        )
+        raise ValueError(
+            f"Patient validation failed for {len(failing_rows)} patient(s).\n"
+            f"{details}"
+        )
+
+
+# MARK: PatientRegister
+class PatientRegister:
+    """
+    The patients currently in a queue or a unit (e.g. the ward), keyed by ID.
+
+    Adding or removing a patient and counting the patients present all take
+    constant time, unlike removing a patient from a list, which has to
+    search the whole list. Iterating over the register gives the patients in
+    the order they were added, so the current occupants can still be listed
+    for debugging or animation.
+    """
+
+    def __init__(self):
+        # Dictionaries keep insertion order, so this is also the order the
+        # patients were added
+        self._patients = {}
+
+    def __len__(self):
+        return len(self._patients)
+
+    def __contains__(self, patient):
+        return patient.id in self._patients
+
+    def __iter__(self):
+        return iter(list(self._patients.values()))
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(ids={self.ids()})"
+
+    def add(self, patient):
+        """
+        Add a patient to the register.
+
+        Parameters
+        ----------
+        patient : Patient
+            The patient to add.
+
+        Raises
+        ------
+        ValueError
+            If a patient with the same ID is already in the register.
+        """
+        if patient.id in self._patients:
+            raise ValueError(f"Patient {patient.id} is already in the register")
+        self._patients[patient.id] = patient
+
+    def remove(self, patient):
+        """
+        Remove a patient from the register.
+
+        Parameters
+        ----------
+        patient : Patient
+            The patient to remove.
+
+        Raises
+        ------
+        ValueError
+            If the patient is not in the register.
+        """
+        if self._patients.pop(patient.id, None) is None:
+            raise ValueError(f"Patient {patient.id} is not in the register")
+
+    def ids(self):
+        """
+        Return the IDs of the patients in the register.
+
+        Returns
+        -------
+        list
+            Patient IDs, in the order the patients were added.
+        """
+        return list(self._patients)
+
+    def occupants(self):
+        """
+        Return the patients in the register.
+
+        Returns
+        -------
+        list of Patient
+            The patients, in the order they were added.
+        """
+        return list(self._patients.values())
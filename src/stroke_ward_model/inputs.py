@@ -1,7 +1,10 @@
 """
-Defines global configuration parameters for the stroke ward simulation model.
+Defines global configuration parameters for the stroke ward simulation model,
+and the immutable per-scenario snapshots of them that are passed to each model.
 """
 
+from types import MappingProxyType
+
 
 # MARK: g
 # Global class to store parameters for the model.
@@ -20,7 +23,60 @@ class g:
     sim_duration : int
         Total simulated time in minutes (default: 525600, one year).
     number_of_runs : int
-        Number of simulation replications.
+        Number of simulation replications. Not used if
+        `replication_targets` or `replication_time_budget` is set.
+    replication_targets : dict or None
+        Target relative confidence interval half-widths for chosen KPIs,
+        keyed by `Trial.df_trial_results` column, e.g.
+        `{"Mean Q Time Ward (Hour)": 0.05, "Total Savings": 0.05}`. If set,
+        a trial keeps adding replications until every KPI's half-width is
+        within its target proportion of the mean. Default None.
+    replication_time_budget : float or None
+        Wall-clock time in seconds after which a trial stops adding
+        replications. Can be used with or without `replication_targets`.
+        Default None.
+    replication_confidence : float
+        Confidence level of the intervals checked against
+        `replication_targets`. Default 0.95.
+    replication_min_runs : int
+        Replications to run before checking `replication_targets`.
+        Default 5.
+    replication_max_runs : int
+        Most replications to run when `replication_targets` or
+        `replication_time_budget` is set. Default 1000.
+    streaming_trial : bool
+        If True, a trial releases each model once its run has been
+        summarised and aggregates the run results with running statistics,
+        and handles each run's patient-level and occupancy data as set by
+        `streaming_patient_data`, so that memory use stays flat however many
+        runs there are. Default False.
+    streaming_patient_data : str
+        What a streaming trial does with each run's patient-level and
+        occupancy data: "summary" (the default) keeps one row per run with
+        the number of patients and the mean of each numeric patient
+        attribute, "disk" writes them to parquet files in
+        `streaming_output_dir`, and "drop" discards them.
+    streaming_output_dir : str
+        Directory that a streaming trial writes each run's data to when
+        `streaming_patient_data` is "disk", in a subdirectory named by the
+        scenario's `scenario_key`. Default "trial_output".
+    result_cache_dir : str or None
+        Directory of a disk cache of trial results (see
+        `stroke_ward_model.cache.ResultCache`). If set, a trial of a scenario
+        that has already been run with the same parameters, master seed,
+        number of runs and version of the model is loaded from the cache
+        instead of being run again. Default None (no caching).
+    result_cache_max_entries : int or None
+        Most trials to keep in the cache, removing the least recently used
+        first. Default 100.
+    result_cache_max_mb : float or None
+        Most disk space (in MB) for the cache to use, removing the least
+        recently used trials first. Default 1024.
+    progress_interval : float
+        How often, in simulated minutes, a run reports its progress and
+        checks whether its trial has been cancelled, when it is given a
+        progress hook (see `Model.run`). Results are the same whatever the
+        interval. Default one week (10080).
     warm_up_period : float
         Number of minutes considered warm-up (not included in statistics),
         defined as one-fifth of the total simulation time.
@@ -36,6 +92,44 @@ class g:
         This may be changed in future.
         NOTE that this has now been changed to be used directly as an average
         IAT, but this may change in future. This supersedes the previous note.
+    arrival_sampler : str
+        Method used to sample inter-arrival times from the hourly
+        time-dependent arrival rates. "thinning" (default) uses
+        acceptance-rejection sampling (`NSPPThinningModified`); "inversion"
+        inverts the cumulative arrival rate exactly, with one random draw per
+        arrival (`NSPPPiecewiseConstant`). The two give statistically
+        equivalent but not identical arrival streams.
+    precompute_arrivals : bool
+        If True, every arrival for a run (with its in-hours flag and onset
+        type) is generated up front in one vectorised pass when the model is
+        created, and the arrivals process replays them. Default False.
+    patient_validation : str
+        Which patients who completed their journey are checked for missing
+        attributes at the end of each run: "all" (the default), "sample" (a
+        random sample of `patient_validation_sample_size` patients) or
+        "none". Sampling or skipping the check makes large sweeps faster.
+    patient_validation_sample_size : int
+        Number of patients checked per run when `patient_validation` is
+        "sample". Default 1000.
+    recording_level : str
+        How much each run records. "full" (the default) records the
+        patient-level results, keeps every patient object and records the
+        queue and occupancy time series. "patient" records everything except
+        the time series. "kpi" only keeps the running totals needed for the
+        run-level KPIs, which is quicker and uses much less memory for large
+        parameter sweeps; the patients aren't validated at the end of the run
+        (see `patient_validation`), as they aren't kept.
+    fast_resources : bool
+        If True, the model uses lightweight resources in place of Vidigi
+        stores, and doesn't record which nurse, SDEC bed or ward bed each
+        patient used (`nurse_attending_id`, `sdec_bed_id` and `ward_bed_id`
+        are left as NaN). These are only needed for animations. All other
+        results are the same either way. Default False.
+    buffered_sampling : bool
+        If True, the model's Exponential, Normal and DiscreteEmpirical
+        distributions draw their samples in blocks and serve them from a
+        buffer (`BufferedSampler`), which is quicker than drawing one value at
+        a time. The values sampled are the same either way. Default False.
     number_of_nurses : int
         Number of nurses available in the system.
     mean_n_consult_time : int
@@ -113,10 +207,23 @@ class g:
         Operational unavailability duration of CT perfusion scanner
     ctp_unav_freq : int
         How often CT perfusion unavailability duration occurs
+    sdec_calendar : AvailabilityCalendar or None
+        When SDEC is open, e.g. with several opening windows a day or
+        different hours at weekends (see
+        `stroke_ward_model.availability.AvailabilityCalendar`). If None (the
+        default), SDEC opens at `sdec_opening_hour`, stays open for
+        `sdec_unav_freq` minutes and then closes for `sdec_unav_time`
+        minutes, repeating throughout the run.
+    ctp_calendar : AvailabilityCalendar or None
+        When the CT perfusion scanner is available. If None (the default),
+        this is built from `ctp_opening_hour`, `ctp_unav_freq` and
+        `ctp_unav_time` in the same way as `sdec_calendar`.
     sdec_unav : bool
-        Indicates whether SDEC is unavailable.
+        Indicates whether SDEC is unavailable. No longer changed by the model,
+        which now tracks this on each `Model` instance.
     ctp_unav : bool
-        Indicates whether CT processing is unavailable.
+        Indicates whether CT processing is unavailable. No longer changed by
+        the model, which now tracks this on each `Model` instance.
     write_to_csv : bool
         Whether the simulation should write results to CSV.
     gen_graph : bool
@@ -127,8 +234,10 @@ class g:
         Internal counter tracking completed simulation replications.
     patient_arrival_gen_1 : bool
         Flag used by the simulation to control one patient arrival stream.
+        No longer changed by the model (see `sdec_unav`).
     patient_arrival_gen_2 : bool
         Flag used by the simulation to control a second patient arrival stream.
+        No longer changed by the model (see `sdec_unav`).
     master_seed : int
         Master random seed used to adjust the underlying seeds used to populate
         the random number streams. Trials run without changing parameters or the
@@ -146,6 +255,33 @@ class g:
     number_of_runs = 10
     warm_up_period = sim_duration / 5
 
+    # Optionally keep adding replications until a precision target or time
+    # budget is met, instead of running a fixed number_of_runs
+
+    replication_targets = None
+    replication_time_budget = None
+    replication_confidence = 0.95
+    replication_min_runs = 5
+    replication_max_runs = 1000
+
+    # Optionally release each model and aggregate results as runs finish,
+    # rather than keeping every model and patient in memory
+
+    streaming_trial = False
+    streaming_patient_data = "summary"
+    streaming_output_dir = "trial_output"
+
+    # Optionally load the results of scenarios that have already been run
+    # from a cache on disk
+
+    result_cache_dir = None
+    result_cache_max_entries = 100
+    result_cache_max_mb = 1024
+
+    # How often (in simulated minutes) runs report their progress, when asked
+
+    progress_interval = 1440 * 7
+
     # TODO: SR query: confirm with John in case this was done in this way for
     # a particular reason, but I've swapped it to a more intuitive use and
     # something that will allow for setting via the app interface too
@@ -153,6 +289,13 @@ class g:
     # patient_inter_night = 5
     patient_inter_day = 200.0
     patient_inter_night = 666.666666666667
+    arrival_sampler = "thinning"
+    precompute_arrivals = False
+    buffered_sampling = False
+    fast_resources = False
+    patient_validation = "all"
+    patient_validation_sample_size = 1000
+    recording_level = "full"
 
     number_of_nurses = 2
     number_of_ctp = 1
@@ -223,6 +366,12 @@ class g:
     sdec_opening_hour = 0
     ctp_opening_hour = 0
 
+    # Optional calendars of opening times, which take precedence over the
+    # opening hour and unavailability settings above when set
+
+    sdec_calendar = None
+    ctp_calendar = None
+
     in_hours_start = 7
     ooh_start = 0
 
@@ -236,7 +385,10 @@ class g:
     out_of_hours_unknown_onset_inside_ctp = 0.4
     out_of_hours_unknown_onset_outside_ctp = 0.4
 
-    # These values are changed by the model itself
+    # These values used to be changed by the model itself. The model now
+    # keeps sdec_unav, ctp_unav and the patient_arrival_gen flags on each
+    # Model instance so that models can run concurrently; they are kept here
+    # so that existing code reading them does not break.
 
     sdec_unav = False
     ctp_unav = False
@@ -252,3 +404,151 @@ class g:
     trace_config = {"tracked": tracked_cases}
 
     master_seed = 42
+
+
+# Attributes of g that were flipped by the model while it ran. These are
+# run-time state rather than scenario parameters, so are not part of a Scenario
+RUNTIME_STATE_ATTRIBUTES = (
+    "sdec_unav",
+    "ctp_unav",
+    "patient_arrival_gen_1",
+    "patient_arrival_gen_2",
+)
+
+# Names of all scenario parameters: every setting defined on g other than the
+# run-time state above
+PARAMETER_NAMES = tuple(
+    name
+    for name in vars(g)
+    if not name.startswith("_") and name not in RUNTIME_STATE_ATTRIBUTES
+)
+
+
+def _freeze(value):
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, (dict, MappingProxyType)):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    return value
+
+
+def _thaw(value):
+    if isinstance(value, tuple):
+        return [_thaw(v) for v in value]
+    if isinstance(value, MappingProxyType):
+        return {k: _thaw(v) for k, v in value.items()}
+    return value
+
+
+# MARK: Scenario
+class Scenario:
+    """
+    Immutable snapshot of the model parameters for a single scenario.
+
+    A `Scenario` has the same parameter attributes as `g` (for example
+    `scenario.number_of_ward_beds`), but they cannot be changed once it has
+    been created. The run-time state that the model used to write back to `g`
+    (`sdec_unav`, `ctp_unav`, `patient_arrival_gen_1` and
+    `patient_arrival_gen_2`) is not part of a scenario; each `Model` keeps its
+    own copy instead. This means several models can run at the same time -
+    in threads, or for different users of the web app - without interfering
+    with one another through `g`.
+
+    Lists and dictionaries (e.g. `tracked_cases`, `trace_config`) are stored
+    as tuples and read-only mappings.
+
+    Parameters
+    ----------
+    source : object, optional
+        Object to take parameter values from, such as `g` or another
+        `Scenario`. Defaults to `g`, so `Scenario()` captures the current
+        values set on `g`.
+    **overrides
+        Parameter values to use instead of those on `source`.
+
+    Raises
+    ------
+    TypeError
+        If an override is given for a name that is not a model parameter.
+
+    Examples
+    --------
+    >>> scenario = Scenario(number_of_ward_beds=49, sdec_beds=8)
+    >>> more_beds = scenario.replace(number_of_ward_beds=60)
+    """
+
+    def __init__(self, source=None, **overrides):
+        if source is None:
+            source = g
+
+        unknown = set(overrides) - set(PARAMETER_NAMES)
+        if unknown:
+            raise TypeError(f"Unknown scenario parameter(s): {sorted(unknown)}")
+
+        for name in PARAMETER_NAMES:
+            value = overrides[name] if name in overrides else getattr(source, name)
+            object.__setattr__(self, name, _freeze(value))
+
+    def __setattr__(self, name, value):
+        raise AttributeError(
+            f"Scenario is immutable - use replace({name}=...) to create a "
+            "modified copy"
+        )
+
+    def __delattr__(self, name):
+        raise AttributeError("Scenario is immutable")
+
+    def __reduce__(self):
+        # Read-only mappings cannot be pickled, so rebuild from plain values
+        # (needed to send scenarios to worker processes)
+        return (_scenario_from_dict, (self.to_dict(),))
+
+    def __eq__(self, other):
+        if not isinstance(other, Scenario):
+            return NotImplemented
+        return all(
+            getattr(self, name) == getattr(other, name) for name in PARAMETER_NAMES
+        )
+
+    __hash__ = None
+
+    def __repr__(self):
+        changed = {
+            name: getattr(self, name)
+            for name in PARAMETER_NAMES
+            if getattr(self, name) != _freeze(getattr(g, name))
+        }
+        args = ", ".join(f"{name}={value!r}" for name, value in changed.items())
+        return f"{self.__class__.__name__}({args})"
+
+    def replace(self, **overrides):
+        """
+        Return a copy of this scenario with some parameters changed.
+
+        Parameters
+        ----------
+        **overrides
+            Parameter values to change.
+
+        Returns
+        -------
+        Scenario
+            A new scenario; this one is left unchanged.
+        """
+        return Scenario(source=self, **overrides)
+
+    def to_dict(self):
+        """
+        Return the scenario parameters as a dictionary of plain values.
+
+        Returns
+        -------
+        dict
+            Mapping of parameter name to value, with tuples and read-only
+            mappings converted back to lists and dictionaries.
+        """
+        return {name: _thaw(getattr(self, name)) for name in PARAMETER_NAMES}
+
+
+def _scenario_from_dict(params):
+    return Scenario(**params)
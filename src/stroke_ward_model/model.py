@@ -2,6 +2,9 @@
 Implements the stroke ward simulation model, processes, and experiment logic.
 """
 
+import math
+from collections import deque
+
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
@@ -15,9 +18,75 @@ from stroke_ward_model.utils import minutes_to_ampm
 from vidigi.resources import VidigiPriorityStore as PriorityResource
 from vidigi.resources import VidigiStore as Resource
 
-from stroke_ward_model.inputs import g
-from stroke_ward_model.entities import Patient
-from stroke_ward_model.distributions import initialise_distributions
+from stroke_ward_model.inputs import Scenario
+from stroke_ward_model.entities import (
+    Patient,
+    PatientRegister,
+    patients_to_dataframe,
+    validate_patients,
+)
+from stroke_ward_model.availability import AvailabilityCalendar
+from stroke_ward_model.distributions import (
+    initialise_distributions,
+    build_arrival_schedule,
+    sample_patient_attributes,
+    PatientAttributeTable,
+    PATIENT_DIAGNOSIS_TYPES,
+)
+from stroke_ward_model.resources import FastPriorityResource
+from stroke_ward_model.results import (
+    KPIAccumulator,
+    ResourceMonitor,
+    ResultsStore,
+    TimeSeriesRecorder,
+)
+
+# Columns of the patient-level results DataFrame, in order, and whether they
+# hold numeric values or strings/status flags
+RESULTS_COLUMNS = {
+    "Q Time Nurse": "numeric",
+    "Time with Nurse": "numeric",
+    "Q Time Ward": "numeric",
+    "Ward LOS": "numeric",
+    "Time with CTP": "numeric",
+    "Time with CT": "numeric",
+    "Time in SDEC": "numeric",
+    "CTP Status": "string",
+    "SDEC Status": "string",
+    "Thrombolysis": "string",
+    "SDEC Occupancy": "numeric",
+    "Admission Avoidance": "string",
+    "SDEC Savings": "numeric",
+    "MRS Type": "numeric",
+    "MRS DC": "numeric",
+    "MRS Change": "numeric",
+    "Onset Type": "numeric",
+    "Diagnosis Type": "string",
+    "Thrombolysis Savings": "numeric",
+    "Ward Occupancy": "numeric",
+    "Arrival Time": "numeric",
+    "Patient Gen 1 Status": "string",
+    "Patient Gen 2 Status": "string",
+}
+
+# Numeric results columns that the run KPIs are calculated from, which are the
+# only ones kept (as running totals) when config.recording_level is "kpi"
+KPI_RESULTS_COLUMNS = [
+    "Q Time Nurse",
+    "Q Time Ward",
+    "Ward LOS",
+    "Thrombolysis Savings",
+    "MRS Change",
+]
+
+# What is recorded during a run at each recording level (see
+# g.recording_level)
+RECORDING_LEVELS = ("kpi", "patient", "full")
+
+
+# Number of patients to sample attributes for at a time when the number of
+# arrivals isn't known in advance
+PATIENT_ATTRIBUTE_BLOCK_SIZE = 1024
 
 
 # MARK: Model
@@ -34,29 +103,79 @@ class Model:
     ----------
     run_number : int
         The unique identifier for the specific simulation run.
+    config : Scenario, optional
+        The parameters to run the model with. Defaults to a snapshot of the
+        current values in `g`.
+    arrival_schedule : ArrivalSchedule, optional
+        Arrivals generated up front to replay instead of sampling arrivals
+        during the run, e.g. to use the same arrivals as a model for another
+        scenario. Must have been generated for the same demand and run
+        number. If not given, arrivals are generated up front only if
+        `config.precompute_arrivals` is True.
 
     Attributes
     ----------
+    config : Scenario
+        The (immutable) parameters this model is run with.
     env : simpy.core.Environment
         The SimPy environment in which the simulation is executed.
     patient_counter : int
         A running count of patients who have entered the system, used as a
         unique ID. This is shared across in-hours and out-of-hours arrivals.
-    nurse : vidigi.resources.VidigiStore
+    nurse : vidigi.resources.VidigiStore or simpy.Resource
         A SimPy resource representing stroke nurses available for assessment.
-    ctp_scanner : vidigi.resources.VidigiPriorityStore
-        A priority resource representing CTP scanners.
-    sdec_bed : vidigi.resources.VidigiPriorityStore
+        A plain `simpy.Resource` if `config.fast_resources` is True.
+    ctp_scanner : vidigi.resources.VidigiPriorityStore or FastPriorityResource
+        A priority resource representing CTP scanners. A
+        `stroke_ward_model.resources.FastPriorityResource` if
+        `config.fast_resources` is True.
+    sdec_bed : vidigi.resources.VidigiPriorityStore or FastPriorityResource
         A priority resource representing Same Day Emergency Care (SDEC) beds.
-    ward_bed : vidigi.resources.VidigiStore
-        A SimPy resource representing standard ward beds.
+        A `FastPriorityResource` if `config.fast_resources` is True.
+    ward_bed : vidigi.resources.VidigiStore or simpy.Resource
+        A SimPy resource representing standard ward beds. A plain
+        `simpy.Resource` if `config.fast_resources` is True.
     run_number : int
         The identifier for the current simulation iteration.
+    ctp_calendar : AvailabilityCalendar
+        When the CTP scanner is available. `config.ctp_calendar` if set,
+        otherwise built from `config.ctp_opening_hour`, `config.ctp_unav_freq`
+        and `config.ctp_unav_time`.
+    sdec_calendar : AvailabilityCalendar
+        When SDEC is open. `config.sdec_calendar` if set, otherwise built from
+        `config.sdec_opening_hour`, `config.sdec_unav_freq` and
+        `config.sdec_unav_time`.
+    ctp_unav : bool
+        Whether the CTP scanner is currently unavailable (read-only, looked up
+        from `ctp_calendar`).
+    sdec_unav : bool
+        Whether SDEC is currently unavailable (read-only, looked up from
+        `sdec_calendar`).
+    patient_arrival_gen_1 : bool
+        Whether patients are currently being generated during the warm-up
+        period.
+    patient_arrival_gen_2 : bool
+        Whether patients are currently being generated after the warm-up
+        period.
+    record_patients : bool
+        Whether patient-level results and patient objects are kept, i.e.
+        `config.recording_level` is "patient" or "full".
+    record_time_series : bool
+        Whether the queue and occupancy time series are recorded, i.e.
+        `config.recording_level` is "full".
+    results_store : ResultsStore or KPIAccumulator
+        Columnar store that patient-level results are recorded into during
+        the run. When `config.recording_level` is "kpi", a `KPIAccumulator`
+        that only keeps running totals of the columns in
+        `KPI_RESULTS_COLUMNS`.
     results_df : pd.DataFrame
         A central data repository for patient-level results, including queue
-        times, lengths of stay, and diagnostic statuses.
+        times, lengths of stay, and diagnostic statuses. Built from
+        `results_store` by `calculate_run_results`. Empty when
+        `config.recording_level` is "kpi".
     sdec_freeze_counter : int
-        Counter tracking the frequency of SDEC capacity freezes.
+        Number of SDEC closures that have ended after the warm-up period so
+        far (read-only, counted from `sdec_calendar`).
     mean_q_time_nurse : float
         The calculated average time patients spent queuing for a nurse.
     mean_q_time_ward : float
@@ -66,23 +185,68 @@ class Model:
     thrombolysis_savings : float
         Aggregated metric representing the savings or benefits derived from
         thrombolysis.
-    q_for_assessment : list
-        A list tracking patients currently waiting in the assessment queue.
+    q_for_assessment : PatientRegister
+        The patients currently waiting in the assessment queue.
+    nurse_q_recorder : TimeSeriesRecorder
+        Recorder that the assessment queue length is appended to during the
+        run.
     nurse_q_graph_df : pd.DataFrame
-        Time-series data for monitoring nurse queue lengths over time.
-    sdec_occupancy : list
-        Historical record of SDEC bed utilization.
+        Time-series data for monitoring nurse queue lengths over time. Built
+        from `nurse_q_recorder` by `calculate_run_results`. Only holds the
+        initial row unless `config.recording_level` is "full".
+    sdec_occupancy : PatientRegister
+        The patients currently in SDEC.
     admission_avoidance : list
         Historical record of patients who avoided inpatient admission.
-    ward_occupancy : list
-        Historical record of ward bed utilization.
+    ward_occupancy : PatientRegister
+        The patients currently in the ward.
     non_admissions : list
         Record of patients classified as non-admissions.
-    occupancy_graph_df : pd.DataFrame
-        Time-series data for monitoring ward occupancy levels.
+    arrival_schedule : ArrivalSchedule or None
+        The arrivals replayed by `generator_patient_arrivals`, or None if
+        arrivals are sampled one at a time during the run.
+    patient_attributes : PatientAttributeTable or None
+        The randomised attributes given to each patient by
+        `set_patient_attributes`, in arrival order. Sampled for every
+        scheduled arrival up front if there is an `arrival_schedule`, and
+        otherwise in blocks of `PATIENT_ATTRIBUTE_BLOCK_SIZE` patients as they
+        are needed, so may have more rows than patients who arrived. None
+        until the first block is sampled.
+    ward_stay_engine : WardStayEngine
+        Samples each patient's ward length of stay and MRS on discharge from
+        the rules for their diagnosis and MRS on admission. Set up by
+        `initialise_distributions`.
+    traced_cases : frozenset or None
+        Identifiers that trace messages are shown for when `config.show_trace`
+        is True, taken from `config.trace_config`. None means all are traced.
+    ward_bed_waiters : collections.deque
+        Events for SDEC patients waiting for a ward bed to be released before
+        they can leave SDEC, in the order they started waiting.
+    ward_block_events_saved : int
+        Number of simulation events saved by waking blocked SDEC patients on
+        ward discharge instead of having them check the ward every minute.
+    ward_occupancy_recorder, sdec_occupancy_recorder : TimeSeriesRecorder
+        Recorders that ward and SDEC occupancy are appended to during the run.
+    ward_occupancy_graph_df, sdec_occupancy_graph_df : pd.DataFrame
+        Time-series data for monitoring ward and SDEC occupancy levels, with
+        whether each value was recorded during the warm-up period. Built from
+        the recorders by `calculate_run_results`. Only hold the initial row
+        unless `config.recording_level` is "full".
+    nurse_monitor, ctp_monitor, sdec_monitor, ward_monitor : ResourceMonitor
+        Time-weighted counts of the stroke nurses, CTP scans, SDEC beds
+        and ward beds in use and of the patients queuing for them, counted
+        from the end of the warm-up period. Patients don't request a CTP
+        scanner, so the CTP counts aren't limited by the number of scanners
+        and there is never a CTP queue. Updated whenever the counts
+        change, so use constant memory however long the run.
+    resource_use : dict
+        Summary of each monitor (see `ResourceMonitor.summary`) at the end of
+        the run, keyed by "nurse", "ctp", "sdec" and "ward". Set by
+        `calculate_run_results`.
     patient_objects : list
         A collection of all `Patient` class instances created during the
-        simulation.
+        simulation. Empty when `config.recording_level` is "kpi", so that
+        patients are freed once they leave the model.
 
     Notes
     -----
@@ -92,10 +256,17 @@ class Model:
     """
 
     initialise_distributions = initialise_distributions
+    build_arrival_schedule = build_arrival_schedule
+    sample_patient_attributes = sample_patient_attributes
 
     # Constructor to set up the model for a run. We pass in a run number when
-    # we create a new model.
-    def __init__(self, run_number):
+    # we create a new model, and optionally the scenario to run.
+    def __init__(self, run_number, config=None, arrival_schedule=None):
+        # Take a snapshot of the parameters for this run. Reading them from
+        # here rather than from g means that changes made to g (e.g. by
+        # another user of the app) cannot affect a model part way through
+        self.config = Scenario() if config is None else config
+
         # Create a SimPy environment
         self.env = simpy.Environment()
 
@@ -103,57 +274,110 @@ class Model:
         self.patient_counter = 0
 
         # Create a SimPy resources to represent stroke nurses, ctp scanners,
-        # sdec beds, and ward beds. Set in class g
+        # sdec beds, and ward beds. Set in the scenario config
 
         # SR: I have replaced these with the Vidigi equivalents, which are
         # functionally identical apart from also allowing the resource ID to be
         # tracked, which is useful for animation
-        # self.nurse = simpy.Resource(self.env, capacity=g.number_of_nurses)
-        self.nurse = Resource(self.env, num_resources=g.number_of_nurses)
+        if not self.config.fast_resources:
+            # self.nurse = simpy.Resource(self.env, capacity=g.number_of_nurses)
+            self.nurse = Resource(
+                self.env, num_resources=self.config.number_of_nurses
+            )
 
-        # self.ctp_scanner = simpy.PriorityResource(self.env, capacity=g.number_of_ctp)
-        self.ctp_scanner = PriorityResource(self.env, num_resources=g.number_of_ctp)
+            # self.ctp_scanner = simpy.PriorityResource(self.env, capacity=g.number_of_ctp)
+            self.ctp_scanner = PriorityResource(
+                self.env, num_resources=self.config.number_of_ctp
+            )
 
-        # self.sdec_bed = simpy.PriorityResource(self.env, capacity=g.sdec_beds)
-        self.sdec_bed = PriorityResource(self.env, num_resources=g.sdec_beds)
+            # self.sdec_bed = simpy.PriorityResource(self.env, capacity=g.sdec_beds)
+            self.sdec_bed = PriorityResource(
+                self.env, num_resources=self.config.sdec_beds
+            )
 
-        # self.ward_bed = simpy.Resource(self.env, capacity=g.number_of_ward_beds)
-        self.ward_bed = Resource(self.env, num_resources=g.number_of_ward_beds)
+            # self.ward_bed = simpy.Resource(self.env, capacity=g.number_of_ward_beds)
+            self.ward_bed = Resource(
+                self.env, num_resources=self.config.number_of_ward_beds
+            )
+
+        # When the resource IDs aren't needed, use lighter-weight resources
+        # that hand out resources in exactly the same order, so the results
+        # are the same
+        else:
+            self.nurse = simpy.Resource(
+                self.env, capacity=self.config.number_of_nurses
+            )
+            self.ctp_scanner = FastPriorityResource(
+                self.env, capacity=self.config.number_of_ctp
+            )
+            self.sdec_bed = FastPriorityResource(
+                self.env, capacity=self.config.sdec_beds
+            )
+            self.ward_bed = simpy.Resource(
+                self.env, capacity=self.config.number_of_ward_beds
+            )
 
         # Store the passed in run number
         self.run_number = run_number
 
-        # Create a Pandas DataFrame that will store a majority of the results
-        # with the patient ID as the index.
-        self.results_df = pd.DataFrame()
-        self.results_df["Patient ID"] = [1]
-        self.results_df["Q Time Nurse"] = [0.0]
-        self.results_df["Time with Nurse"] = [0.0]
-        self.results_df["Q Time Ward"] = [0.0]
-        self.results_df["Ward LOS"] = [0.0]
-        self.results_df["Time with CTP"] = [0.0]
-        self.results_df["Time with CT"] = [0.0]
-        self.results_df["Time in SDEC"] = [0.0]
-        self.results_df["CTP Status"] = [""]
-        self.results_df["SDEC Status"] = [""]
-        self.results_df["Thrombolysis"] = [""]
-        self.results_df["SDEC Occupancy"] = [0.0]
-        self.results_df["Admission Avoidance"] = [""]
-        self.results_df["SDEC Savings"] = [0.0]
-        self.results_df["MRS Type"] = [0.0]
-        self.results_df["MRS DC"] = [0.0]
-        self.results_df["MRS Change"] = [0.0]
-        self.results_df["Onset Type"] = [0.0]
-        self.results_df["Diagnosis Type"] = [""]
-        self.results_df["Thrombolysis Savings"] = [0.0]
-        self.results_df["Ward Occupancy"] = [0.0]
-        self.results_df["Arrival Time"] = [0.0]
-        self.results_df["Patient Gen 1 Status"] = [""]
-        self.results_df["Patient Gen 2 Status"] = [""]
-        self.results_df.set_index("Patient ID", inplace=True)
-
-        # A variable to count the number of SDEC freezes
-        self.sdec_freeze_counter = 0
+        # Calendars of when the CTP scanner and SDEC are open. Patients look
+        # up whether a unit is open directly, so no processes are needed to
+        # open and close them during the run
+        self.ctp_calendar = self.config.ctp_calendar
+        if self.ctp_calendar is None:
+            self.ctp_calendar = AvailabilityCalendar.from_cycle(
+                self.config.ctp_unav_freq,
+                self.config.ctp_unav_time,
+                start=self.config.ctp_opening_hour * 60,
+            )
+
+        self.sdec_calendar = self.config.sdec_calendar
+        if self.sdec_calendar is None:
+            self.sdec_calendar = AvailabilityCalendar.from_cycle(
+                self.config.sdec_unav_freq,
+                self.config.sdec_unav_time,
+                start=self.config.sdec_opening_hour * 60,
+            )
+
+        # Flags for which arrival generator is currently running. These change
+        # during the run, so are held on the model rather than in the shared
+        # config
+        self.patient_arrival_gen_1 = False
+        self.patient_arrival_gen_2 = False
+
+        # How much is recorded during the run. Patient-level results and
+        # patient objects are kept unless only KPIs are wanted, and the
+        # queue and occupancy time series only at the "full" level
+        if self.config.recording_level not in RECORDING_LEVELS:
+            raise ValueError(
+                f"recording_level must be one of {RECORDING_LEVELS}, "
+                f"got {self.config.recording_level!r}"
+            )
+        self.record_patients = self.config.recording_level != "kpi"
+        self.record_time_series = self.config.recording_level == "full"
+
+        if self.record_patients:
+            # Create a results store that will hold a majority of the results
+            # with the patient ID as the index. Writing into preallocated
+            # NumPy buffers avoids enlarging a DataFrame once per patient,
+            # which became slower and slower as long runs progressed. The
+            # DataFrame itself is only built from the store once the run is
+            # complete.
+            self.results_store = ResultsStore(RESULTS_COLUMNS)
+
+            # Add a dummy first row (patient ID 1) with a default value in
+            # each column; this is dropped again in calculate_run_results()
+            for column, column_type in RESULTS_COLUMNS.items():
+                default = 0.0 if column_type == "numeric" else ""
+                self.results_store.record(1, column, default)
+
+            self.results_df = self.results_store.to_dataframe()
+        else:
+            # Only keep running totals of the columns the KPIs are calculated
+            # from. Patient 1's results are left out, as they share the
+            # dummy row that is dropped from the full results.
+            self.results_store = KPIAccumulator(KPI_RESULTS_COLUMNS, ignored_ids=[1])
+            self.results_df = pd.DataFrame(columns=list(RESULTS_COLUMNS))
 
         # Create a variable to store the mean queuing time for the nurse
         self.mean_q_time_nurse = 0
@@ -173,35 +397,77 @@ class Model:
         # Create a variable to store the mean number of thrombolysis savings
         self.thrombolysis_savings = 0
 
-        # set up a list to store the queue for stroke nurse assessment
-        self.q_for_assessment = []
+        # set up a register of the patients in the queue for stroke nurse
+        # assessment
+        self.q_for_assessment = PatientRegister()
 
-        # a PD dataframe for the assessment queue graph
-        self.nurse_q_graph_df = pd.DataFrame()
-        self.nurse_q_graph_df["Time"] = [0.0]
-        self.nurse_q_graph_df["Patients in Assessment Queue"] = [0.0]
+        # Record the length of the assessment queue over time for the
+        # assessment queue graph. As with the results store, rows are
+        # appended to NumPy buffers during the run, and the DataFrame is only
+        # built once the run is complete (in calculate_run_results())
+        self.nurse_q_recorder = TimeSeriesRecorder(
+            {"Time": np.float64, "Patients in Assessment Queue": np.float64}
+        )
+        self.nurse_q_recorder.append(0.0, 0.0)
+        self.nurse_q_graph_df = self.nurse_q_recorder.to_dataframe()
 
-        # a list that will store the number of patients in the SDEC
-        self.sdec_occupancy = []
+        # a register of the patients in the SDEC
+        self.sdec_occupancy = PatientRegister()
 
         # A list that will store the number of admissions avoided
         self.admission_avoidance = []
 
-        # A list that will store the number of patients in the ward
-        self.ward_occupancy = []
+        # A register of the patients in the ward
+        self.ward_occupancy = PatientRegister()
 
         # A list to store the number of patients avoiding admission
         self.non_admissions = []
 
-        self.ward_occupancy_graph_df = pd.DataFrame()
-        self.ward_occupancy_graph_df["Time"] = [0.0]
-        self.ward_occupancy_graph_df["Occupancy"] = [0.0]
-        self.ward_occupancy_graph_df["During Warm-Up"] = True
-
-        self.sdec_occupancy_graph_df = pd.DataFrame()
-        self.sdec_occupancy_graph_df["Time"] = [0.0]
-        self.sdec_occupancy_graph_df["Occupancy"] = [0.0]
-        self.sdec_occupancy_graph_df["During Warm-Up"] = True
+        # Events for SDEC patients who cannot leave SDEC until a ward bed is
+        # free, in the order they started waiting. Each ward discharge wakes
+        # the longest-waiting patient (see notify_ward_bed_released).
+        self.ward_bed_waiters = deque()
+
+        # Count of the simulation events saved by waking blocked SDEC patients
+        # when a ward bed is released rather than having them check the ward
+        # every minute
+        self.ward_block_events_saved = 0
+
+        # Record ward and SDEC occupancy over time in the same way
+        occupancy_columns = {
+            "Time": np.float64,
+            "Occupancy": np.float64,
+            "During Warm-Up": bool,
+        }
+
+        self.ward_occupancy_recorder = TimeSeriesRecorder(occupancy_columns)
+        self.ward_occupancy_recorder.append(0.0, 0.0, True)
+        self.ward_occupancy_graph_df = self.ward_occupancy_recorder.to_dataframe()
+
+        self.sdec_occupancy_recorder = TimeSeriesRecorder(occupancy_columns)
+        self.sdec_occupancy_recorder.append(0.0, 0.0, True)
+        self.sdec_occupancy_graph_df = self.sdec_occupancy_recorder.to_dataframe()
+
+        # Time-weighted use of each resource and the queues for them after
+        # the warm-up period. These are updated as patients start and stop
+        # using each resource, so (unlike the occupancy recorders) they don't
+        # grow with the length of the run. Patients on the CTP pathway don't
+        # request the CTP scanner, so the CTP monitor only counts the scans
+        # going on at once, which isn't limited by the number of scanners,
+        # and the CTP queue is always empty.
+        self.nurse_monitor = ResourceMonitor(
+            self.config.number_of_nurses, start=self.config.warm_up_period
+        )
+        self.ctp_monitor = ResourceMonitor(
+            self.config.number_of_ctp, start=self.config.warm_up_period
+        )
+        self.sdec_monitor = ResourceMonitor(
+            self.config.sdec_beds, start=self.config.warm_up_period
+        )
+        self.ward_monitor = ResourceMonitor(
+            self.config.number_of_ward_beds, start=self.config.warm_up_period
+        )
+        self.resource_use = {}
 
         # A list to store the patient objects
         self.patient_objects = []
@@ -219,11 +485,79 @@ class Model:
         # able to be thrombolysed
         self.additional_thrombolysis_from_ctp = 0
 
+        # Look up the cases to trace once, as a set, so that checking whether
+        # to trace a patient is cheap (None means trace every case)
+        tracked = self.config.trace_config.get("tracked")
+        self.traced_cases = None if tracked is None else frozenset(tracked)
+
         self.initialise_distributions()
 
+        # Optionally generate every arrival for the run up front, so that the
+        # arrivals process only has to replay them
+        if arrival_schedule is not None:
+            if not arrival_schedule.matches(self.config, self.run_number):
+                raise ValueError(
+                    "arrival_schedule was generated for different demand "
+                    f"settings or run number: {arrival_schedule.demand}"
+                )
+            self.arrival_schedule = arrival_schedule
+        elif self.config.precompute_arrivals:
+            self.arrival_schedule = self.build_arrival_schedule()
+        else:
+            self.arrival_schedule = None
+
+        # Patient attributes are sampled in batches and handed out a row at a
+        # time. If the arrivals are known, every patient's are sampled now
+        self.patient_attributes = None
+        self._patient_attribute_rows = iter(())
+        if self.arrival_schedule is not None:
+            self.extend_patient_attributes(len(self.arrival_schedule))
+
+    def extend_patient_attributes(self, n_patients):
+        """
+        Sample the attributes for the next `n_patients` patients and add them
+        to `patient_attributes`.
+
+        Parameters
+        ----------
+        n_patients : int
+            Number of patients to sample attributes for.
+        """
+        block = self.sample_patient_attributes(n_patients)
+        if self.patient_attributes is None:
+            self.patient_attributes = block
+        else:
+            self.patient_attributes = PatientAttributeTable.concat(
+                [self.patient_attributes, block]
+            )
+        self._patient_attribute_rows = block.rows()
+
+    def should_trace(self, identifier):
+        """
+        Check whether a trace message should be shown for an identifier.
+
+        Trace calls in the model are wrapped in this check so that their
+        messages are only formatted when they will actually be displayed,
+        i.e. when `config.show_trace` is True and the identifier is one of the
+        tracked cases in `config.trace_config`.
+
+        Parameters
+        ----------
+        identifier : int or str
+            The patient ID (or other identifier) the message relates to.
+
+        Returns
+        -------
+        bool
+            True if the trace message would be displayed.
+        """
+        return self.config.show_trace and (
+            self.traced_cases is None or identifier in self.traced_cases
+        )
+
     def is_in_hours(self, time_of_day):
-        start = g.in_hours_start * 60
-        end = g.ooh_start * 60
+        start = self.config.in_hours_start * 60
+        end = self.config.ooh_start * 60
 
         if start < end:
             # Normal case (does not cross midnight)
@@ -260,10 +594,10 @@ class Model:
         If out-of-hours, it yields a small timeout before checking again.
 
         Arrival rates are determined by `random.expovariate` using the
-        `g.patient_inter_day` parameter. NOTE that this does not use the
-        `g.patient_inter_day` parameter directly, and instead uses it
+        `config.patient_inter_day` parameter. NOTE that this does not use the
+        `config.patient_inter_day` parameter directly, and instead uses it
         alongside a rate modifier - careful inspection of the code to
-        understand the impacts of changing `g.patient_inter_day` is
+        understand the impacts of changing `config.patient_inter_day` is
         recommended, and this may be adjusted in a future version of the model.
 
         Patients generated here have their `arrived_ooh` attribute set to False.
@@ -271,26 +605,46 @@ class Model:
         This process triggers the `stroke_assessment` process for every
         newly created patient.
 
+        If the model has an `arrival_schedule`, the inter-arrival times,
+        in-hours flags and onset types are replayed from it instead of being
+        sampled here, and the process ends after the last scheduled arrival.
+
         Notes
         -----
         GENAI declaration (SR): this docstring has been generated with the aid
         of Google Gemini Flash.
         All generated content has been thoroughly reviewed.
         """
+        if self.arrival_schedule is not None:
+            scheduled_arrivals = self.arrival_schedule.replay()
+        else:
+            scheduled_arrivals = None
+
         while True:
-            sampled_inter = self.patient_inter_dist.sample(simulation_time=self.env.now)
+            if scheduled_arrivals is None:
+                sampled_inter = self.patient_inter_dist.sample(
+                    simulation_time=self.env.now
+                )
+            else:
+                try:
+                    sampled_inter, arrived_in_hours, onset_type = next(
+                        scheduled_arrivals
+                    )
+                except StopIteration:
+                    return
 
             # Freeze this instance of this function in place until the
             # inter-arrival time has elapsed.
             yield self.env.timeout(sampled_inter)
 
-            trace(
-                time=self.env.now,
-                debug=g.show_trace,
-                msg=f"⏲️ Next patient arriving in {sampled_inter:.1f} minutes",
-                identifier=self.patient_counter,
-                config=g.trace_config,
-            )
+            if self.should_trace(self.patient_counter):
+                trace(
+                    time=self.env.now,
+                    debug=self.config.show_trace,
+                    msg=f"⏲️ Next patient arriving in {sampled_inter:.1f} minutes",
+                    identifier=self.patient_counter,
+                    config=self.config.trace_config,
+                )
 
             # Increment the patient counter by 1 for each new patient
             self.patient_counter += 1
@@ -299,45 +653,57 @@ class Model:
             # defined above. patient counter ID passed from above to patient
             # class.
             p = Patient(self.patient_counter)
-            self.patient_objects.append(p)
-            if self.env.now < g.warm_up_period:
+            if self.record_patients:
+                self.patient_objects.append(p)
+            if self.env.now < self.config.warm_up_period:
                 p.generated_during_warm_up = True
             else:
                 p.generated_during_warm_up = False
 
             time_of_day = self.env.now % 1440
 
-            if self.is_in_hours(time_of_day):
+            if scheduled_arrivals is None:
+                arrived_in_hours = self.is_in_hours(time_of_day)
+
+            if arrived_in_hours:
                 # Change the Global Class variable
-                g.patient_arrival_gen_1 = True
-                g.patient_arrival_gen_2 = False
+                self.patient_arrival_gen_1 = True
+                self.patient_arrival_gen_2 = False
 
-                p.onset_type = self.onset_type_distribution_in_hours.sample()
+                if scheduled_arrivals is None:
+                    p.onset_type = self.onset_type_distribution_in_hours.sample()
+                else:
+                    p.onset_type = onset_type
 
-                trace(
-                    time=self.env.now,
-                    debug=g.show_trace,
-                    msg=f"☀️ IN-HOURS Patient {p.id} generated at {minutes_to_ampm(int(self.env.now % 1440))}. Diagnosis: {p.diagnosis}. MRS type: {p.mrs_type}.",
-                    identifier=p.id,
-                    config=g.trace_config,
-                )
+                if self.should_trace(p.id):
+                    trace(
+                        time=self.env.now,
+                        debug=self.config.show_trace,
+                        msg=f"☀️ IN-HOURS Patient {p.id} generated at {minutes_to_ampm(int(self.env.now % 1440))}. Diagnosis: {p.diagnosis}. MRS type: {p.mrs_type}.",
+                        identifier=p.id,
+                        config=self.config.trace_config,
+                    )
 
                 p.arrived_ooh = False
 
-            elif self.is_out_of_hours(time_of_day):
+            else:
                 # Change the Global Class variable
-                g.patient_arrival_gen_1 = False
-                g.patient_arrival_gen_2 = True
+                self.patient_arrival_gen_1 = False
+                self.patient_arrival_gen_2 = True
 
-                p.onset_type = self.onset_type_distribution_out_of_hours.sample()
+                if scheduled_arrivals is None:
+                    p.onset_type = self.onset_type_distribution_out_of_hours.sample()
+                else:
+                    p.onset_type = onset_type
 
-                trace(
-                    time=self.env.now,
-                    debug=g.show_trace,
-                    msg=f"🌙 OUT OF HOURS Patient {p.id} generated at {minutes_to_ampm(int(self.env.now % 1440))}. Diagnosis: {p.diagnosis}. MRS type: {p.mrs_type}.",
-                    identifier=p.id,
-                    config=g.trace_config,
-                )
+                if self.should_trace(p.id):
+                    trace(
+                        time=self.env.now,
+                        debug=self.config.show_trace,
+                        msg=f"🌙 OUT OF HOURS Patient {p.id} generated at {minutes_to_ampm(int(self.env.now % 1440))}. Diagnosis: {p.diagnosis}. MRS type: {p.mrs_type}.",
+                        identifier=p.id,
+                        config=self.config.trace_config,
+                    )
 
                 p.arrived_ooh = True
 
@@ -346,131 +712,78 @@ class Model:
             # patient's journey through the system)
             self.env.process(self.stroke_assessment(p))
 
-    # MARK: M: Obstruct CTP
-    def obstruct_ctp(self):
-        """
-        Simulates periodic CTP scanner unavailability (off time).
-
-        This process acts as a "blocker" by requesting the CTP scanner resource
-        with a priority of -1. Since patients typically have a priority of 1,
-        this process effectively preempts the queue, preventing patients from
-        using the scanners during this period.
+    # MARK: M: Unit availability
+    @property
+    def ctp_unav(self):
+        """bool: Whether the CTP scanner is closed at the current time."""
+        return not self.ctp_calendar.is_open(self.env.now)
+
+    @property
+    def sdec_unav(self):
+        """bool: Whether SDEC is closed at the current time."""
+        return not self.sdec_calendar.is_open(self.env.now)
+
+    @property
+    def sdec_freeze_counter(self):
+        """int: Number of SDEC closures that have ended since the warm-up."""
+        return self.sdec_calendar.count_openings(
+            self.config.warm_up_period, self.env.now
+        )
 
-        The scanner will not stop a scan that is already in progress;
-        it waits for the current user to finish before taking the
-        resource offline.
+    def trace_availability(self):
+        """
+        Trace the times the CTP scanner and SDEC open and close.
 
-        Frequencies and durations are governed by `g.ctp_unav_freq`
-        and `g.ctp_unav_time`.
+        Availability is looked up from `ctp_calendar` and `sdec_calendar`
+        rather than changed by a process, so this process only exists to
+        write trace messages, and is only started when `config.show_trace`
+        is True.
 
         Yields
         ------
         simpy.events.Timeout
-            Initial offset for opening hours and subsequent intervals
-            between downtime events.
-        simpy.events.ResourceRequest
-            A high-priority request to seize the CTP scanner and take
-            it "offline."
-
-        Notes
-        -----
-        GENAI declaration (SR): this docstring has been generated with the aid
-        of Google Gemini Flash.
-        All generated content has been thoroughly reviewed.
-
+            Delay until the next time either unit opens or closes.
         """
-        # SR: Add initial offset
-        # SR: Patient generators have also been updated
-        # to match with how this is working
-        yield self.env.timeout(g.ctp_opening_hour * 60)
+        calendars = {"ctp": self.ctp_calendar, "sdec": self.sdec_calendar}
+        next_changes = {
+            unit: calendar.next_change(self.env.now)
+            for unit, calendar in calendars.items()
+        }
+
+        while any(change is not None for change in next_changes.values()):
+            unit, change = min(
+                (
+                    (unit, change)
+                    for unit, change in next_changes.items()
+                    if change is not None
+                ),
+                key=lambda item: item[1],
+            )
+            yield self.env.timeout(change - self.env.now)
 
-        while True:
-            yield self.env.timeout(g.ctp_unav_freq)
-            # Once elapsed, this generator requests the ctp scanner with
-            # a priority of -1. As the patient priority is set at 1
-            # the scanner will take priority over any patients waiting.
-            # This method also means that the scanner won't stop mid scan.
-            g.ctp_unav = True
-            with self.ctp_scanner.request(priority=-1) as req:
-                yield req
-                trace(
-                    time=self.env.now,
-                    debug=g.show_trace,
-                    msg=f"🔬 CTP scanner OFFLINE at {minutes_to_ampm(int(self.env.now % 1440))}",
-                    identifier=self.patient_counter,
-                    config=g.trace_config,
+            is_open = calendars[unit].is_open(change)
+            clock_time = minutes_to_ampm(int(change % 1440))
+            if unit == "ctp":
+                status = "back ONLINE" if is_open else "OFFLINE"
+                msg = f"🔬 CTP scanner {status} at {clock_time}"
+            else:
+                status = "OPENS" if is_open else "CLOSES"
+                msg = (
+                    f"🏥 SDEC {status} at {clock_time}. Occupancy at "
+                    f"{'opening' if is_open else 'closure'}: "
+                    f"{len(self.sdec_occupancy)} of {self.config.sdec_beds} beds."
                 )
-                # Freeze with the scanners held in place for the unavailability
-                # time, in the model this means patients admitted in this time
-                # will not have a ctp scan.
-                # freq and unav times are set in the g class
-                yield self.env.timeout(g.ctp_unav_time)
+
+            if self.should_trace(self.patient_counter):
                 trace(
                     time=self.env.now,
-                    debug=g.show_trace,
-                    msg=f"🔬 CTP scanner back ONLINE at {minutes_to_ampm(int(self.env.now % 1440))}",
+                    debug=self.config.show_trace,
+                    msg=msg,
                     identifier=self.patient_counter,
-                    config=g.trace_config,
+                    config=self.config.trace_config,
                 )
-                g.ctp_unav = False
-
-    # MARK: M: Obstruct SDEC
-    def obstruct_sdec(self):
-        """
-        Simulates the scheduled closure or unavailability of the SDEC unit.
-
-        Similar to the CTP obstruction, this process seizes an SDEC bed
-        at a high priority (-1) for a defined duration. This models the
-        real-world scenario where the SDEC unit closes at night or
-        during specific hours, forcing patients to bypass this pathway.
-
-        If a closure occurs after the simulation warm-up period, the
-        `sdec_freeze_counter` is incremented.
-
-        Patients arriving while the SDEC is "obstructed" will be
-        unable to access SDEC resources.
-
-        Notes
-        -----
-        GENAI declaration (SR): this docstring has been generated with the aid
-        of Google Gemini Flash.
-        All generated content has been thoroughly reviewed.
-        """
-        # SR: Add initial offset
-        # SR: Patient generators have also been updated
-        # to match with how this is working
-        yield self.env.timeout(g.sdec_opening_hour * 60)
-
-        while True:
-            yield self.env.timeout(g.sdec_unav_freq)
-            g.sdec_unav = True
-
-            trace(
-                time=self.env.now,
-                debug=g.show_trace,
-                msg=f"🏥 SDEC CLOSES at {minutes_to_ampm(int(self.env.now % 1440))}. Occupancy at closure: {len(self.sdec_occupancy)} of {g.sdec_beds} beds.",
-                identifier=self.patient_counter,
-                config=g.trace_config,
-            )
 
-            # Freeze with the SDEC held in place for the unavailability
-            # time, in the model this means patients admitted in this time
-            # will not have passed through the SDEC.
-            # freq and unav times are set in the g class
-            yield self.env.timeout(g.sdec_unav_time)
-
-            trace(
-                time=self.env.now,
-                debug=g.show_trace,
-                msg=f"🏥 SDEC OPENS at {minutes_to_ampm(int(self.env.now % 1440))}. Occupancy at opening: {len(self.sdec_occupancy)} of {g.sdec_beds} beds.",
-                identifier=self.patient_counter,
-                config=g.trace_config,
-            )
-
-            g.sdec_unav = False
-
-            if self.env.now > g.warm_up_period:
-                self.sdec_freeze_counter += 1
+            next_changes[unit] = calendars[unit].next_change(change)
 
     def set_patient_attributes(self, patient):
         """
@@ -484,81 +797,58 @@ class Model:
         # For now, no-one gets thrombectomy
         patient.thrombectomy = False
 
-        # Populate various patient attributes
-        # patient.mrs_type = min(round(random.expovariate(1.0 / g.mean_mrs)), 5)
-        patient.mrs_type = min(round(self.mrs_type_distribution.sample()), 5)
-        # patient.diagnosis = random.randint(0, 100)
-        patient.diagnosis = self.diagnosis_distribution.sample()
-        # patient.non_admission = random.randint(0, 100)
-        patient.non_admission = self.non_admission_distribution.sample()
-
-        # Define threshold for admission for TIA + stroke mimic patients
-        self.tia_admission_chance = self.tia_admission_chance_distribution.sample()
-
-        self.stroke_mimic_admission_chance = (
-            self.stroke_mimic_admission_chance_distribution.sample()
-        )
-
-        # This code introduces a slight element of randomness into the patient's
-        # diagnosis.
-
-        # self.ich_range = random.normalvariate(g.ich, 1)
-        self.ich_range = self.ich_range_distribution.sample()
-        # self.i_range = max(random.normalvariate(g.i, 1), self.ich_range)
-        self.i_range = max(self.i_range_distribution.sample(), self.ich_range)
-        # self.tia_range = max(random.normalvariate(g.tia, 1), self.i_range)
-        self.tia_range = max(self.tia_range_distribution.sample(), self.i_range)
-        # self.stroke_mimic_range = max(
-        #     random.normalvariate(g.stroke_mimic, 1), self.tia_range
-        # )
-        self.stroke_mimic_range = max(
-            self.stroke_mimic_range_distribution.sample(), self.tia_range
-        )
-        # self.non_stroke_range = max(
-        #     random.normalvariate(g.stroke_mimic, 1), self.stroke_mimic_range
-        # )
-        self.non_stroke_range = max(
-            self.non_stroke_range_distribution.sample(), self.stroke_mimic_range
-        )
-
-        if patient.diagnosis <= self.ich_range:
-            patient.patient_diagnosis = 0
-            patient.patient_diagnosis_type = "ICH"
+        # Populate various patient attributes from the next row of the
+        # patient attribute table, sampling another block if it has run out
+        # (see sample_patient_attributes() for how each is generated)
+        row = next(self._patient_attribute_rows, None)
+        if row is None:
+            self.extend_patient_attributes(PATIENT_ATTRIBUTE_BLOCK_SIZE)
+            row = next(self._patient_attribute_rows)
+
+        # The thresholds for admission for TIA + stroke mimic patients and the
+        # diagnosis thresholds are held on the model, as before
+        (
+            patient.mrs_type,
+            patient.diagnosis,
+            patient.non_admission,
+            self.tia_admission_chance,
+            self.stroke_mimic_admission_chance,
+            self.ich_range,
+            self.i_range,
+            self.tia_range,
+            self.stroke_mimic_range,
+            self.non_stroke_range,
+            patient.patient_diagnosis,
+        ) = row
+        patient.patient_diagnosis_type = PATIENT_DIAGNOSIS_TYPES[
+            patient.patient_diagnosis
+        ]
+
+        if patient.patient_diagnosis == 0:
             self.ich_patients_count += 1
-        elif patient.diagnosis <= self.i_range:
-            patient.patient_diagnosis = 1
-            patient.patient_diagnosis_type = "I"
+        elif patient.patient_diagnosis == 1:
             self.i_patients_count += 1
-        elif patient.diagnosis <= self.tia_range:
-            patient.patient_diagnosis = 2
-            patient.patient_diagnosis_type = "TIA"
+        elif patient.patient_diagnosis == 2:
             self.tia_patients_count += 1
-        elif patient.diagnosis <= self.stroke_mimic_range:
-            patient.patient_diagnosis = 3
-            patient.patient_diagnosis_type = "Stroke Mimic"
+        elif patient.patient_diagnosis == 3:
             self.stroke_mimic_patient_count += 1
-        # SR - this was changed from an elif as was resulting in patients in
-        # between the two thresholds not getting allocated a diagnosis, which
-        # causes errors elsewhere
         else:
-            patient.patient_diagnosis = 4
-            patient.patient_diagnosis_type = "Non Stroke"
             self.non_stroke_patient_count += 1
 
         # The below code records the patients diagnosis attribute, this is
         # added to the DF to check the diagnosis code is working correctly.
         # SR - refactored recording of diagnosis type in results df as that's
         # now recorded as a patient attribute earlier
-        if self.env.now > g.warm_up_period:
-            self.results_df.at[patient.id, "Diagnosis Type"] = (
-                patient.patient_diagnosis_type
+        if self.env.now > self.config.warm_up_period:
+            self.results_store.record(
+                patient.id, "Diagnosis Type", patient.patient_diagnosis_type
             )
 
-            self.results_df.at[patient.id, "Onset Type"] = patient.onset_type
+            self.results_store.record(patient.id, "Onset Type", patient.onset_type)
 
             # This code adds the Patient's MRS to the DF, this can be used to
             # check all code that interacts with this runs correctly.
-            self.results_df.at[patient.id, "MRS Type"] = patient.mrs_type
+            self.results_store.record(patient.id, "MRS Type", patient.mrs_type)
 
     # MARK: M: Stroke assessment
     # A generator function that represents the pathway for a patient going
@@ -577,19 +867,21 @@ class Model:
         """
         self.set_patient_attributes(patient)
 
-        trace(
-            time=self.env.now,
-            debug=g.show_trace,
-            msg=f"Patient {patient.id} Patient Diagnosis (category 1-4): {patient.patient_diagnosis}.",
-            identifier=patient.id,
-            config=g.trace_config,
-        )
+        if self.should_trace(patient.id):
+            trace(
+                time=self.env.now,
+                debug=self.config.show_trace,
+                msg=f"Patient {patient.id} Patient Diagnosis (category 1-4): {patient.patient_diagnosis}.",
+                identifier=patient.id,
+                config=self.config.trace_config,
+            )
 
         # Record the time the patient started queuing for a nurse
         start_q_nurse = self.env.now
         patient.nurse_q_start_time = self.env.now
 
-        self.q_for_assessment.append(patient)
+        self.q_for_assessment.add(patient)
+        self.nurse_monitor.queue.update(self.env.now, len(self.q_for_assessment))
 
         # Add the arrival time to the main DF
         # This is partly to test if the
@@ -598,15 +890,15 @@ class Model:
 
         patient.clock_start = self.env.now
 
-        if self.env.now > g.warm_up_period:
-            self.results_df.at[patient.id, "Arrival Time"] = patient.clock_start
+        if self.env.now > self.config.warm_up_period:
+            self.results_store.record(patient.id, "Arrival Time", patient.clock_start)
 
-            self.results_df.at[patient.id, "Patient Gen 1 Status"] = (
-                g.patient_arrival_gen_1
+            self.results_store.record(
+                patient.id, "Patient Gen 1 Status", self.patient_arrival_gen_1
             )
 
-            self.results_df.at[patient.id, "Patient Gen 2 Status"] = (
-                g.patient_arrival_gen_2
+            self.results_store.record(
+                patient.id, "Patient Gen 2 Status", self.patient_arrival_gen_2
             )
 
         #######################################################################
@@ -621,16 +913,18 @@ class Model:
             nurse_attending = yield req
             # SR - have added recording of the resource ID that's possible as
             # it's now using vidigi resources
-            patient.nurse_attending_id = nurse_attending.id_attribute
+            if not self.config.fast_resources:
+                patient.nurse_attending_id = nurse_attending.id_attribute
             patient.nurse_triage_start_time = self.env.now
 
-            trace(
-                time=self.env.now,
-                debug=g.show_trace,
-                msg=f"👩‍⚕️ Patient {patient.id} is being seen by a nurse at {minutes_to_ampm(int(self.env.now % 1440))}.",
-                identifier=patient.id,
-                config=g.trace_config,
-            )
+            if self.should_trace(patient.id):
+                trace(
+                    time=self.env.now,
+                    debug=self.config.show_trace,
+                    msg=f"👩‍⚕️ Patient {patient.id} is being seen by a nurse at {minutes_to_ampm(int(self.env.now % 1440))}.",
+                    identifier=patient.id,
+                    config=self.config.trace_config,
+                )
 
             # Control is passed back to the generator function once the request
             # is met for a nurse. As the queue for the nurse is finished
@@ -639,24 +933,23 @@ class Model:
             end_q_nurse = self.env.now
 
             self.q_for_assessment.remove(patient)
+            self.nurse_monitor.queue.update(self.env.now, len(self.q_for_assessment))
+            self.nurse_monitor.in_use.add(self.env.now)
 
             # The code below checks if the warm up period has passed before
             # entering data into the df, this code exists when ever data is
             # recorded
 
-            if self.env.now > g.warm_up_period:
-                self.nurse_q_graph_df.loc[len(self.nurse_q_graph_df)] = [
-                    self.env.now,
-                    len(self.q_for_assessment),
-                ]
+            if self.record_time_series and self.env.now > self.config.warm_up_period:
+                self.nurse_q_recorder.append(self.env.now, len(self.q_for_assessment))
 
             # Calculate the time this patient was queuing for the nurse, and
             # record it in the patient's attribute
             patient.q_time_nurse = end_q_nurse - start_q_nurse
 
             # The below code creates a random action time for the nurse based
-            # on the mean in g class, and assigns it ot a variable. Currently
-            # using a Exponential distribution but might need to switch to
+            # on the mean in the scenario config, and assigns it ot a variable.
+            # Currently using a Exponential distribution but might need to switch to
             # a Log normal one (though the intense variation in the real life
             # consult time might mean a exponetial distribution is better)
             # sampled_nurse_act_time = random.expovariate(1.0 / g.mean_n_consult_time)
@@ -673,29 +966,34 @@ class Model:
             # the data that is to be added to the DF, in this case the Nurse
             # Q time
 
-            if self.env.now > g.warm_up_period:
-                self.results_df.at[patient.id, "Q Time Nurse"] = patient.q_time_nurse
-                self.results_df.at[patient.id, "Time with Nurse"] = (
-                    sampled_nurse_act_time
+            if self.env.now > self.config.warm_up_period:
+                self.results_store.record(
+                    patient.id, "Q Time Nurse", patient.q_time_nurse
+                )
+                self.results_store.record(
+                    patient.id, "Time with Nurse", sampled_nurse_act_time
                 )
 
         # TIME WITH NURSE ENDS - NURSE RESOURCE RELEASED HERE FOR NEXT PATIENT
+        self.nurse_monitor.in_use.add(self.env.now, -1)
 
         # MARK: CT and CT Perfusion Scanner Use
         # The if formula below checks to see if the CTP scanner is active
         # and if it is the following code is followed including updating the
         # patient advanced CT pathway attribute
 
-        if g.ctp_unav == False:
-            trace(
-                time=self.env.now,
-                debug=g.show_trace,
-                msg=f"➡️ Patient {patient.id} sent on CTP scanner pathway at {minutes_to_ampm(int(self.env.now % 1440))}.",
-                identifier=patient.id,
-                config=g.trace_config,
-            )
+        if self.ctp_unav == False:
+            if self.should_trace(patient.id):
+                trace(
+                    time=self.env.now,
+                    debug=self.config.show_trace,
+                    msg=f"➡️ Patient {patient.id} sent on CTP scanner pathway at {minutes_to_ampm(int(self.env.now % 1440))}.",
+                    identifier=patient.id,
+                    config=self.config.trace_config,
+                )
 
             patient.ctp_scan_start_time = self.env.now
+            self.ctp_monitor.in_use.add(self.env.now)
 
             patient.advanced_ct_pathway = True
 
@@ -709,33 +1007,38 @@ class Model:
             # sampled above.
             yield self.env.timeout(sampled_ctp_act_time)
 
-            trace(
-                time=self.env.now,
-                debug=g.show_trace,
-                msg=f"➡️ Patient {patient.id} finishes CTP scan at {minutes_to_ampm(int(self.env.now % 1440))} after {sampled_ctp_act_time:.1f} minutes.",
-                identifier=patient.id,
-                config=g.trace_config,
-            )
+            if self.should_trace(patient.id):
+                trace(
+                    time=self.env.now,
+                    debug=self.config.show_trace,
+                    msg=f"➡️ Patient {patient.id} finishes CTP scan at {minutes_to_ampm(int(self.env.now % 1440))} after {sampled_ctp_act_time:.1f} minutes.",
+                    identifier=patient.id,
+                    config=self.config.trace_config,
+                )
 
             patient.ctp_scan_end_time = self.env.now
+            self.ctp_monitor.in_use.add(self.env.now, -1)
 
             # Add data to the DF afer the warm up period.
 
-            if self.env.now > g.warm_up_period:
-                self.results_df.at[patient.id, "Time with CTP"] = sampled_ctp_act_time
+            if self.env.now > self.config.warm_up_period:
+                self.results_store.record(
+                    patient.id, "Time with CTP", sampled_ctp_act_time
+                )
 
         # If the CTP pathway is not active the below code runs, it is the same
         # as the above however adds data to a different column and the patient
         # advanced CT pathway remains False.
 
         else:
-            trace(
-                time=self.env.now,
-                debug=g.show_trace,
-                msg=f"🚫 Patient {patient.id} NOT sent on CTP scanner pathway - normal CT scan commencing at {minutes_to_ampm(int(self.env.now % 1440))}.",
-                identifier=patient.id,
-                config=g.trace_config,
-            )
+            if self.should_trace(patient.id):
+                trace(
+                    time=self.env.now,
+                    debug=self.config.show_trace,
+                    msg=f"🚫 Patient {patient.id} NOT sent on CTP scanner pathway - normal CT scan commencing at {minutes_to_ampm(int(self.env.now % 1440))}.",
+                    identifier=patient.id,
+                    config=self.config.trace_config,
+                )
 
             patient.advanced_ct_pathway = False
 
@@ -747,25 +1050,28 @@ class Model:
 
             yield self.env.timeout(sampled_ct_act_time)
 
-            trace(
-                time=self.env.now,
-                debug=g.show_trace,
-                msg=f"🚫 Patient {patient.id} finishes normal CT scan at {minutes_to_ampm(int(self.env.now % 1440))} after {sampled_ct_act_time:.1f} minutes.",
-                identifier=patient.id,
-                config=g.trace_config,
-            )
+            if self.should_trace(patient.id):
+                trace(
+                    time=self.env.now,
+                    debug=self.config.show_trace,
+                    msg=f"🚫 Patient {patient.id} finishes normal CT scan at {minutes_to_ampm(int(self.env.now % 1440))} after {sampled_ct_act_time:.1f} minutes.",
+                    identifier=patient.id,
+                    config=self.config.trace_config,
+                )
 
             patient.ct_scan_end_time = self.env.now
 
-            if self.env.now > g.warm_up_period:
-                self.results_df.at[patient.id, "Time with CT"] = sampled_ct_act_time
+            if self.env.now > self.config.warm_up_period:
+                self.results_store.record(
+                    patient.id, "Time with CT", sampled_ct_act_time
+                )
 
         # The below code records the status of both the CTP pathway.
         # Both exist as generators and this data is record to ensure they are
         # operating as expected.
 
-        if self.env.now > g.warm_up_period:
-            self.results_df.at[patient.id, "CTP Status"] = g.ctp_unav
+        if self.env.now > self.config.warm_up_period:
+            self.results_store.record(patient.id, "CTP Status", self.ctp_unav)
 
         #############################
         # MARK: Thrombolysis
@@ -797,8 +1103,8 @@ class Model:
         # Thrombolysis status is added to the DF, this is mainly used to check
         # if it is being applied correctly.
 
-        if self.env.now > g.warm_up_period:
-            self.results_df.at[patient.id, "Thrombolysis"] = patient.thrombolysis
+        if self.env.now > self.config.warm_up_period:
+            self.results_store.record(patient.id, "Thrombolysis", patient.thrombolysis)
 
         #########################
         # MARK: SDEC Admission
@@ -808,19 +1114,19 @@ class Model:
         # Both exist as generators and this data is recorded to ensure they are
         # operating as expected.
 
-        if self.env.now > g.warm_up_period:
-            self.results_df.at[patient.id, "SDEC Status"] = g.sdec_unav
+        if self.env.now > self.config.warm_up_period:
+            self.results_store.record(patient.id, "SDEC Status", self.sdec_unav)
 
         # The if statement below checks if the SDEC pathway is active at this
         # given time and if there is space in the SDEC itself.
 
-        if g.sdec_unav:
+        if self.sdec_unav:
             patient.sdec_running_when_required = False
             patient.sdec_full_when_required = False
         else:
             patient.sdec_running_when_required = True
 
-            if len(self.sdec_occupancy) < g.sdec_beds:
+            if len(self.sdec_occupancy) < self.config.sdec_beds:
                 patient.sdec_full_when_required = False
             else:
                 patient.sdec_full_when_required = True
@@ -828,7 +1134,7 @@ class Model:
         # Branch for if SDEC is available
         # SR: Note that I have changed the check from <= to < (so that patients
         # are only allowed to request a bed when a bed is free)
-        if g.sdec_unav == False and len(self.sdec_occupancy) < g.sdec_beds:
+        if self.sdec_unav == False and len(self.sdec_occupancy) < self.config.sdec_beds:
             # If the conditions above are met the patient attribute for the
             # SDEC are changed to True and the patient is added to the SDEC
             # occupancy list.
@@ -839,44 +1145,40 @@ class Model:
             # duration of this code block so that someone else doesn't end up
             # in the same bed!
             with self.sdec_bed.request() as req:
+                self.sdec_monitor.queue.add(self.env.now)
                 sdec_bed_used = yield req
-                patient.sdec_bed_id = sdec_bed_used.id_attribute
+                self.sdec_monitor.queue.add(self.env.now, -1)
+                if not self.config.fast_resources:
+                    patient.sdec_bed_id = sdec_bed_used.id_attribute
 
                 patient.sdec_admit_time = self.env.now
 
-                trace(
-                    time=self.env.now,
-                    debug=g.show_trace,
-                    msg=f"🛏️🏎️ Patient {patient.id} admitted to SDEC (occupancy before admission: {len(self.sdec_occupancy)} of {g.sdec_beds} SDEC beds) at {minutes_to_ampm(int(self.env.now % 1440))}.",
-                    identifier=patient.id,
-                    config=g.trace_config,
-                )
+                if self.should_trace(patient.id):
+                    trace(
+                        time=self.env.now,
+                        debug=self.config.show_trace,
+                        msg=f"🛏️🏎️ Patient {patient.id} admitted to SDEC (occupancy before admission: {len(self.sdec_occupancy)} of {self.config.sdec_beds} SDEC beds) at {minutes_to_ampm(int(self.env.now % 1440))}.",
+                        identifier=patient.id,
+                        config=self.config.trace_config,
+                    )
 
-                self.sdec_occupancy.append(patient)
+                self.sdec_occupancy.add(patient)
+                self.sdec_monitor.in_use.update(self.env.now, len(self.sdec_occupancy))
 
                 # The below code record the SDEC Occupancy as the patient passes
                 # this point to ensure it is working as expected.
 
-                if self.env.now > g.warm_up_period:
-                    self.results_df.at[patient.id, "SDEC Occupancy"] = len(
-                        self.sdec_occupancy
+                if self.env.now > self.config.warm_up_period:
+                    self.results_store.record(
+                        patient.id, "SDEC Occupancy", len(self.sdec_occupancy)
                     )
 
-                    self.sdec_occupancy_graph_df.loc[
-                        len(self.sdec_occupancy_graph_df)
-                    ] = [
-                        self.env.now,
-                        len(self.sdec_occupancy),
-                        False,
-                    ]
-                else:
-                    self.sdec_occupancy_graph_df.loc[
-                        len(self.sdec_occupancy_graph_df)
-                    ] = [
+                if self.record_time_series:
+                    self.sdec_occupancy_recorder.append(
                         self.env.now,
                         len(self.sdec_occupancy),
-                        True,
-                    ]
+                        self.env.now <= self.config.warm_up_period,
+                    )
 
                 patient.sdec_pathway = True
 
@@ -885,7 +1187,7 @@ class Model:
                 # This code checks if the patient is eligible for admission
                 # avoidance depending on if therapy support is enabled.
                 ###########################################################
-                if g.therapy_sdec == False:
+                if self.config.therapy_sdec == False:
                     if (
                         patient.patient_diagnosis < 2
                         and patient.mrs_type < 2
@@ -893,7 +1195,7 @@ class Model:
                     ):
                         patient.admission_avoidance = True
 
-                elif g.therapy_sdec == True:
+                elif self.config.therapy_sdec == True:
                     if (
                         patient.patient_diagnosis < 2
                         and patient.mrs_type <= 3
@@ -917,13 +1219,14 @@ class Model:
                     patient.admission_avoidance = False
                     patient.non_admitted_tia_ns_sm = True
 
-                    trace(
-                        time=self.env.now,
-                        debug=g.show_trace,
-                        msg=f"↩️ TIA Patient {patient.id} avoided admission.",
-                        identifier=patient.id,
-                        config=g.trace_config,
-                    )
+                    if self.should_trace(patient.id):
+                        trace(
+                            time=self.env.now,
+                            debug=self.config.show_trace,
+                            msg=f"↩️ TIA Patient {patient.id} avoided admission.",
+                            identifier=patient.id,
+                            config=self.config.trace_config,
+                        )
 
                 elif (
                     patient.non_admission >= self.stroke_mimic_admission_chance
@@ -931,13 +1234,14 @@ class Model:
                 ):
                     patient.admission_avoidance = False
                     patient.non_admitted_tia_ns_sm = True
-                    trace(
-                        time=self.env.now,
-                        debug=g.show_trace,
-                        msg=f"↩️ Stroke mimic or non-stroke Patient {patient.id} (diagnosis {patient.diagnosis}) avoided admission.",
-                        identifier=patient.id,
-                        config=g.trace_config,
-                    )
+                    if self.should_trace(patient.id):
+                        trace(
+                            time=self.env.now,
+                            debug=self.config.show_trace,
+                            msg=f"↩️ Stroke mimic or non-stroke Patient {patient.id} (diagnosis {patient.diagnosis}) avoided admission.",
+                            identifier=patient.id,
+                            config=self.config.trace_config,
+                        )
                 else:
                     patient.non_admitted_tia_ns_sm = False
 
@@ -950,46 +1254,70 @@ class Model:
 
                 # Freeze this function in place for the activity time we sampled
                 # above.
-                trace(
-                    time=self.env.now,
-                    debug=g.show_trace,
-                    msg=f"Patient {patient.id} (diagnosis {patient.diagnosis} ({patient.patient_diagnosis}), MRS type {patient.mrs_type}) will be in SDEC for {sampled_sdec_stay_time:.1f} minutes ({(sampled_sdec_stay_time / 60 / 24):.1f} days).",
-                    identifier=patient.id,
-                    config=g.trace_config,
-                )
+                if self.should_trace(patient.id):
+                    trace(
+                        time=self.env.now,
+                        debug=self.config.show_trace,
+                        msg=f"Patient {patient.id} (diagnosis {patient.diagnosis} ({patient.patient_diagnosis}), MRS type {patient.mrs_type}) will be in SDEC for {sampled_sdec_stay_time:.1f} minutes ({(sampled_sdec_stay_time / 60 / 24):.1f} days).",
+                        identifier=patient.id,
+                        config=self.config.trace_config,
+                    )
 
                 yield self.env.timeout(sampled_sdec_stay_time)
 
                 # This code checks if the ward is full, if this is the case the
                 # patient will not be released from the SDEC, thus impeding it use
 
+                # Rather than checking the ward every minute, blocked patients
+                # wait to be woken by a ward discharge
                 if (
                     not patient.admission_avoidance
                     and not patient.non_admitted_tia_ns_sm
                 ):
-                    while len(self.ward_occupancy) >= g.number_of_ward_beds:
-                        yield self.env.timeout(1)
+                    block_start = self.env.now
+                    wake_ups = 0
+
+                    while len(self.ward_occupancy) >= self.config.number_of_ward_beds:
+                        ward_bed_released = self.env.event()
+                        # If woken but someone else took the bed, keep our
+                        # place at the front of the queue
+                        if wake_ups:
+                            self.ward_bed_waiters.appendleft(ward_bed_released)
+                        else:
+                            self.ward_bed_waiters.append(ward_bed_released)
+                        yield ward_bed_released
+                        wake_ups += 1
+
+                    if wake_ups:
+                        # Checking every minute would have taken one event per
+                        # started minute; each wake-up takes two (see
+                        # notify_ward_bed_released)
+                        self.ward_block_events_saved += (
+                            math.ceil(self.env.now - block_start) - 2 * wake_ups
+                        )
 
                 # Once the above code is complete the patient is removed from the
                 # SDEC occupancy list.
 
                 self.sdec_occupancy.remove(patient)
+                self.sdec_monitor.in_use.update(self.env.now, len(self.sdec_occupancy))
                 patient.sdec_discharge_time = self.env.now
 
                 # Code to record the SDEC stay time in the results DataFrame.
-                if self.env.now > g.warm_up_period:
-                    self.results_df.at[patient.id, "Time in SDEC"] = (
-                        sampled_sdec_stay_time
+                if self.env.now > self.config.warm_up_period:
+                    self.results_store.record(
+                        patient.id, "Time in SDEC", sampled_sdec_stay_time
                     )
 
                 # MARK: Discharged from SDEC
-                trace(
-                    time=self.env.now,
-                    debug=g.show_trace,
-                    msg=f"🏎️ Patient {patient.id} discharged from SDEC at {minutes_to_ampm(int(self.env.now % 1440))} after {patient.sdec_los:.1f} minutes ({(patient.sdec_los / 60 / 24):.1f} days). Occupancy after discharge: {len(self.sdec_occupancy)} of {g.sdec_beds} SDEC beds",
-                    identifier=patient.id,
-                    config=g.trace_config,
-                )
+                if self.should_trace(patient.id):
+                    trace(
+                        time=self.env.now,
+                        debug=self.config.show_trace,
+                        msg=f"🏎️ Patient {patient.id} discharged from SDEC at {minutes_to_ampm(int(self.env.now % 1440))} after {patient.sdec_los:.1f} minutes ({(patient.sdec_los / 60 / 24):.1f} days). Occupancy after discharge: {len(self.sdec_occupancy)} of {self.config.sdec_beds} SDEC beds",
+                        identifier=patient.id,
+                        config=self.config.trace_config,
+                    )
 
             ##########################################
             # MARK: Admission Avoidance cost savings
@@ -998,22 +1326,30 @@ class Model:
 
             if patient.admission_avoidance == True and patient.patient_diagnosis < 2:
                 # Update savings value in model results
-                if self.env.now > g.warm_up_period:
-                    self.results_df.at[patient.id, "Admission Avoidance"] = (
-                        patient.sdec_pathway
+                if self.env.now > self.config.warm_up_period:
+                    self.results_store.record(
+                        patient.id, "Admission Avoidance", patient.sdec_pathway
                     )
 
-                    last_index = self.results_df["SDEC Savings"].last_valid_index()
-                    last_value = self.results_df.loc[last_index, "SDEC Savings"]
-                    if last_index > 0 and pd.notnull:
-                        self.results_df.at[patient.id, "SDEC Savings"] = (
-                            last_value + g.inpatient_bed_cost
-                        )
-
-                    else:
-                        self.results_df.at[patient.id, "SDEC Savings"] = (
-                            g.inpatient_bed_cost
+                    # The running total of savings is only kept in the
+                    # patient-level results
+                    if self.record_patients:
+                        last_index, last_value = self.results_store.last_valid(
+                            "SDEC Savings"
                         )
+                        if last_index > 0 and pd.notnull:
+                            self.results_store.record(
+                                patient.id,
+                                "SDEC Savings",
+                                last_value + self.config.inpatient_bed_cost,
+                            )
+
+                        else:
+                            self.results_store.record(
+                                patient.id,
+                                "SDEC Savings",
+                                self.config.inpatient_bed_cost,
+                            )
 
                 # Regardless of whether the warm-up has passed, recording in
                 # patient object that this patient's journey was completed
@@ -1025,7 +1361,7 @@ class Model:
                 if (
                     patient.admission_avoidance == True
                     and patient.patient_diagnosis < 2
-                    and self.env.now > g.warm_up_period
+                    and self.env.now > self.config.warm_up_period
                 ):
                     self.admission_avoidance.append(patient)
 
@@ -1054,13 +1390,14 @@ class Model:
             ):
                 patient.admission_avoidance = False
                 patient.non_admitted_tia_ns_sm = True
-                trace(
-                    time=self.env.now,
-                    debug=g.show_trace,
-                    msg=f"↩️ TIA Patient {patient.id} avoided admission.",
-                    identifier=patient.id,
-                    config=g.trace_config,
-                )
+                if self.should_trace(patient.id):
+                    trace(
+                        time=self.env.now,
+                        debug=self.config.show_trace,
+                        msg=f"↩️ TIA Patient {patient.id} avoided admission.",
+                        identifier=patient.id,
+                        config=self.config.trace_config,
+                    )
 
             elif (
                 patient.non_admission >= self.stroke_mimic_admission_chance
@@ -1068,13 +1405,14 @@ class Model:
             ):
                 patient.admission_avoidance = False
                 patient.non_admitted_tia_ns_sm = True
-                trace(
-                    time=self.env.now,
-                    debug=g.show_trace,
-                    msg=f"↩️ Stroke mimic or non-stroke Patient {patient.id} (diagnosis {patient.diagnosis}) avoided admission.",
-                    identifier=patient.id,
-                    config=g.trace_config,
-                )
+                if self.should_trace(patient.id):
+                    trace(
+                        time=self.env.now,
+                        debug=self.config.show_trace,
+                        msg=f"↩️ Stroke mimic or non-stroke Patient {patient.id} (diagnosis {patient.diagnosis}) avoided admission.",
+                        identifier=patient.id,
+                        config=self.config.trace_config,
+                    )
             else:
                 patient.non_admitted_tia_ns_sm = False
 
@@ -1112,42 +1450,37 @@ class Model:
             # is met.
 
             with self.ward_bed.request() as req:
+                self.ward_monitor.queue.add(self.env.now)
                 ward_bed_used = yield req
-                patient.ward_bed_id = ward_bed_used.id_attribute
+                self.ward_monitor.queue.add(self.env.now, -1)
+                if not self.config.fast_resources:
+                    patient.ward_bed_id = ward_bed_used.id_attribute
                 # Add patient to the ward list
 
-                self.ward_occupancy.append(patient)
-                trace(
-                    time=self.env.now,
-                    debug=g.show_trace,
-                    msg=f"🛏️ Patient {patient.id} admitted to main ward at {minutes_to_ampm(int(self.env.now % 1440))}. Occupancy after admission: {len(self.ward_occupancy)} of {g.number_of_ward_beds} ward beds",
-                    identifier=patient.id,
-                    config=g.trace_config,
-                )
+                self.ward_occupancy.add(patient)
+                self.ward_monitor.in_use.update(self.env.now, len(self.ward_occupancy))
+                if self.should_trace(patient.id):
+                    trace(
+                        time=self.env.now,
+                        debug=self.config.show_trace,
+                        msg=f"🛏️ Patient {patient.id} admitted to main ward at {minutes_to_ampm(int(self.env.now % 1440))}. Occupancy after admission: {len(self.ward_occupancy)} of {self.config.number_of_ward_beds} ward beds",
+                        identifier=patient.id,
+                        config=self.config.trace_config,
+                    )
 
                 patient.ward_admit_time = self.env.now
 
-                if self.env.now > g.warm_up_period:
-                    self.results_df.at[patient.id, "Ward Occupancy"] = len(
-                        self.ward_occupancy
+                if self.env.now > self.config.warm_up_period:
+                    self.results_store.record(
+                        patient.id, "Ward Occupancy", len(self.ward_occupancy)
                     )
 
-                if self.env.now > g.warm_up_period:
-                    self.ward_occupancy_graph_df.loc[
-                        len(self.ward_occupancy_graph_df)
-                    ] = [
-                        self.env.now,
-                        len(self.ward_occupancy),
-                        False,
-                    ]
-                else:
-                    self.ward_occupancy_graph_df.loc[
-                        len(self.ward_occupancy_graph_df)
-                    ] = [
+                if self.record_time_series:
+                    self.ward_occupancy_recorder.append(
                         self.env.now,
                         len(self.ward_occupancy),
-                        True,
-                    ]
+                        self.env.now <= self.config.warm_up_period,
+                    )
 
                 # The patient attribute for the queuing time in the ward is
                 # assigned here.
@@ -1156,431 +1489,43 @@ class Model:
 
                 patient.q_time_ward = end_q_ward - start_q_ward
 
-                # The below code checks the patients diagnosis and MRS,
-                # adjusting MRS change and LOS baised on these. This code is
-                # for ICH patients.
-
-                ###############################
-                # MARK: Patient diagnosis = 0 #
-                # Intracerebral haemorrhage   #
-                # Unsuitable for thrombolysis #
-                ###############################
-
-                if patient.patient_diagnosis == 0 and patient.mrs_type == 0:
-                    # sampled_ward_act_time = random.expovariate(
-                    #     1.0 / g.mean_n_ich_ward_time_mrs_0
-                    # )
-                    sampled_ward_act_time = self.ich_ward_time_mrs_0_dist.sample()
-                    patient.mrs_discharge = patient.mrs_type
-                    trace(
-                        time=self.env.now,
-                        debug=g.show_trace,
-                        msg=f"Patient {patient.id} (diagnosis {patient.diagnosis} ({patient.patient_diagnosis}), MRS type {patient.mrs_type}) will be in ward for {sampled_ward_act_time:.1f} minutes ({(sampled_ward_act_time / 60 / 24):.1f} days).",
-                        identifier=patient.id,
-                        config=g.trace_config,
-                    )
-                    patient.ward_los = sampled_ward_act_time
-                    yield self.env.timeout(sampled_ward_act_time)
-                    patient.ward_discharge_time = self.env.now
-                    self.ward_occupancy.remove(patient)
-
-                elif patient.patient_diagnosis == 0 and patient.mrs_type == 1:
-                    # sampled_ward_act_time = random.expovariate(
-                    #     1.0 / g.mean_n_ich_ward_time_mrs_1
-                    # )
-                    sampled_ward_act_time = self.ich_ward_time_mrs_1_dist.sample()
-                    # patient.mrs_discharge = patient.mrs_type - random.randint(0, 1)
-                    patient.mrs_discharge = (
-                        patient.mrs_type - self.mrs_reduction_during_stay.sample()
-                    )
-                    trace(
-                        time=self.env.now,
-                        debug=g.show_trace,
-                        msg=f"Patient {patient.id} (diagnosis {patient.diagnosis} ({patient.patient_diagnosis}), MRS type {patient.mrs_type}) will be in ward for {sampled_ward_act_time:.1f} minutes ({(sampled_ward_act_time / 60 / 24):.1f} days).",
-                        identifier=patient.id,
-                        config=g.trace_config,
-                    )
-                    patient.ward_los = sampled_ward_act_time
-                    yield self.env.timeout(sampled_ward_act_time)
-                    patient.ward_discharge_time = self.env.now
-                    self.ward_occupancy.remove(patient)
-
-                elif patient.patient_diagnosis == 0 and patient.mrs_type == 2:
-                    # sampled_ward_act_time = random.expovariate(
-                    #     1.0 / g.mean_n_ich_ward_time_mrs_2
-                    # )
-                    sampled_ward_act_time = self.ich_ward_time_mrs_2_dist.sample()
-                    # patient.mrs_discharge = patient.mrs_type - random.randint(0, 1)
-                    patient.mrs_discharge = (
-                        patient.mrs_type - self.mrs_reduction_during_stay.sample()
-                    )
-                    trace(
-                        time=self.env.now,
-                        debug=g.show_trace,
-                        msg=f"Patient {patient.id} (diagnosis {patient.diagnosis} ({patient.patient_diagnosis}), MRS type {patient.mrs_type}) will be in ward for {sampled_ward_act_time:.1f} minutes ({(sampled_ward_act_time / 60 / 24):.1f} days).",
-                        identifier=patient.id,
-                        config=g.trace_config,
-                    )
-                    patient.ward_los = sampled_ward_act_time
-                    yield self.env.timeout(sampled_ward_act_time)
-                    patient.ward_discharge_time = self.env.now
-                    self.ward_occupancy.remove(patient)
-
-                elif patient.patient_diagnosis == 0 and patient.mrs_type == 3:
-                    # sampled_ward_act_time = random.expovariate(
-                    #     1.0 / g.mean_n_ich_ward_time_mrs_3
-                    # )
-                    sampled_ward_act_time = self.ich_ward_time_mrs_3_dist.sample()
-                    # patient.mrs_discharge = patient.mrs_type - random.randint(0, 1)
-                    patient.mrs_discharge = (
-                        patient.mrs_type - self.mrs_reduction_during_stay.sample()
-                    )
-                    trace(
-                        time=self.env.now,
-                        debug=g.show_trace,
-                        msg=f"Patient {patient.id} (diagnosis {patient.diagnosis} ({patient.patient_diagnosis}), MRS type {patient.mrs_type}) will be in ward for {sampled_ward_act_time:.1f} minutes ({(sampled_ward_act_time / 60 / 24):.1f} days).",
-                        identifier=patient.id,
-                        config=g.trace_config,
-                    )
-                    patient.ward_los = sampled_ward_act_time
-                    yield self.env.timeout(sampled_ward_act_time)
-                    patient.ward_discharge_time = self.env.now
-                    self.ward_occupancy.remove(patient)
-
-                elif patient.patient_diagnosis == 0 and patient.mrs_type == 4:
-                    # sampled_ward_act_time = random.expovariate(
-                    #     1.0 / g.mean_n_ich_ward_time_mrs_4
-                    # )
-                    sampled_ward_act_time = self.ich_ward_time_mrs_4_dist.sample()
-                    # patient.mrs_discharge = patient.mrs_type - random.randint(0, 1)
-                    patient.mrs_discharge = (
-                        patient.mrs_type - self.mrs_reduction_during_stay.sample()
-                    )
-                    trace(
-                        time=self.env.now,
-                        debug=g.show_trace,
-                        msg=f"Patient {patient.id} (diagnosis {patient.diagnosis} ({patient.patient_diagnosis}), MRS type {patient.mrs_type}) will be in ward for {sampled_ward_act_time:.1f} minutes ({(sampled_ward_act_time / 60 / 24):.1f} days).",
-                        identifier=patient.id,
-                        config=g.trace_config,
-                    )
-                    patient.ward_los = sampled_ward_act_time
-                    yield self.env.timeout(sampled_ward_act_time)
-                    patient.ward_discharge_time = self.env.now
-                    self.ward_occupancy.remove(patient)
-
-                elif patient.patient_diagnosis == 0 and patient.mrs_type == 5:
-                    # sampled_ward_act_time = random.expovariate(
-                    #     1.0 / g.mean_n_ich_ward_time_mrs_5
-                    # )
-                    sampled_ward_act_time = self.ich_ward_time_mrs_5_dist.sample()
-                    # patient.mrs_discharge = patient.mrs_type - random.randint(0, 1)
-                    patient.mrs_discharge = (
-                        patient.mrs_type - self.mrs_reduction_during_stay.sample()
-                    )
-                    trace(
-                        time=self.env.now,
-                        debug=g.show_trace,
-                        msg=f"Patient {patient.id} (diagnosis {patient.diagnosis} ({patient.patient_diagnosis}), MRS type {patient.mrs_type}) will be in ward for {sampled_ward_act_time:.1f} minutes ({(sampled_ward_act_time / 60 / 24):.1f} days).",
-                        identifier=patient.id,
-                        config=g.trace_config,
-                    )
-                    patient.ward_los = sampled_ward_act_time
-                    yield self.env.timeout(sampled_ward_act_time)
-                    patient.ward_discharge_time = self.env.now
-                    self.ward_occupancy.remove(patient)
-
-                ###############################
-                # MARK: Patient diagnosis = 1 #
-                # Ischaemic Stroke            #
-                # Some may be suitable for    #
-                # thrombolysis                #
-                ###############################
-
-                # The below code checks the patients diagnosis and MRS,
-                # adjusting MRS change and LOS baised on these. This code is
-                # for I patients amd also checks for thrombolysis and adjusts
-                # LOS and associated savings accordingly.
-
-                if patient.patient_diagnosis == 1 and patient.mrs_type == 0:
-                    # sampled_ward_act_time = random.expovariate(
-                    #     1.0 / g.mean_n_i_ward_time_mrs_0
-                    # )
-                    sampled_ward_act_time = self.i_ward_time_mrs_0_dist.sample()
-                    patient.mrs_discharge = patient.mrs_type
-                    trace(
-                        time=self.env.now,
-                        debug=g.show_trace,
-                        msg=f"Patient {patient.id} (diagnosis {patient.diagnosis} ({patient.patient_diagnosis}), MRS type {patient.mrs_type}) will be in ward for {sampled_ward_act_time:.1f} minutes ({(sampled_ward_act_time / 60 / 24):.1f} days).",
-                        identifier=patient.id,
-                        config=g.trace_config,
-                    )
-                    patient.ward_los = sampled_ward_act_time
-                    yield self.env.timeout(sampled_ward_act_time)
-                    patient.ward_discharge_time = self.env.now
-                    self.ward_occupancy.remove(patient)
-
-                elif patient.patient_diagnosis == 1 and patient.mrs_type == 1:
-                    # sampled_ward_act_time = random.expovariate(
-                    #     1.0 / g.mean_n_i_ward_time_mrs_1
-                    # )
-                    sampled_ward_act_time = self.i_ward_time_mrs_1_dist.sample()
-                    if patient.thrombolysis == True:
-                        sampled_ward_act_time_thrombolysis = (
-                            sampled_ward_act_time * g.thrombolysis_los_save
-                        )
-                        # patient.mrs_discharge = patient.mrs_type - random.randint(0, 1)
-                        patient.mrs_discharge = (
-                            patient.mrs_type - self.mrs_reduction_during_stay.sample()
-                        )
-                        trace(
-                            time=self.env.now,
-                            debug=g.show_trace,
-                            msg=f"💉 Patient {patient.id} (diagnosis {patient.diagnosis} ({patient.patient_diagnosis}), MRS type {patient.mrs_type}) THROMBOLYSED. Will be in ward for {sampled_ward_act_time_thrombolysis:.1f} minutes ({(sampled_ward_act_time_thrombolysis / 24 / 60):.1f} days).",
-                            identifier=patient.id,
-                            config=g.trace_config,
-                        )
-                        patient.ward_los_thrombolysis = (
-                            sampled_ward_act_time_thrombolysis
-                        )
-                        yield self.env.timeout(sampled_ward_act_time_thrombolysis)
-                        if (
-                            self.env.now > g.warm_up_period
-                            and patient.advanced_ct_pathway == True
-                        ):
-                            self.results_df.at[patient.id, "Thrombolysis Savings"] = (
-                                (
-                                    (
-                                        sampled_ward_act_time
-                                        - sampled_ward_act_time_thrombolysis
-                                    )
-                                    / 60
-                                )
-                                / 24
-                            ) * g.inpatient_bed_cost_thrombolysis
-                        patient.ward_discharge_time = self.env.now
-                        self.ward_occupancy.remove(patient)
-                    else:
-                        # patient.mrs_discharge = patient.mrs_type - random.randint(0, 1)
-                        patient.mrs_discharge = (
-                            patient.mrs_type - self.mrs_reduction_during_stay.sample()
-                        )
-                        trace(
-                            time=self.env.now,
-                            debug=g.show_trace,
-                            msg=f"Patient {patient.id} (diagnosis {patient.diagnosis} ({patient.patient_diagnosis}), MRS type {patient.mrs_type}) will be in ward for {sampled_ward_act_time:.1f} minutes ({(sampled_ward_act_time / 60 / 24):.1f} days).",
-                            identifier=patient.id,
-                            config=g.trace_config,
-                        )
-                        patient.ward_los = sampled_ward_act_time
-                        yield self.env.timeout(sampled_ward_act_time)
-                        patient.ward_discharge_time = self.env.now
-                        self.ward_occupancy.remove(patient)
-
-                elif patient.patient_diagnosis == 1 and patient.mrs_type == 2:
-                    # sampled_ward_act_time = random.expovariate(
-                    #     1.0 / g.mean_n_i_ward_time_mrs_2
-                    # )
-                    sampled_ward_act_time = self.i_ward_time_mrs_2_dist.sample()
-                    if patient.thrombolysis == True:
-                        sampled_ward_act_time_thrombolysis = (
-                            sampled_ward_act_time * g.thrombolysis_los_save
-                        )
-                        # patient.mrs_discharge = patient.mrs_type - random.randint(0, 2)
-                        patient.mrs_discharge = (
-                            patient.mrs_type
-                            - self.mrs_reduction_during_stay_thrombolysed.sample()
-                        )
-                        trace(
-                            time=self.env.now,
-                            debug=g.show_trace,
-                            msg=f"💉 Patient {patient.id} (diagnosis {patient.diagnosis} ({patient.patient_diagnosis}), MRS type {patient.mrs_type}) THROMBOLYSED. Will be in ward for {sampled_ward_act_time_thrombolysis:.1f} minutes ({(sampled_ward_act_time_thrombolysis / 24 / 60):.1f} days).",
-                            identifier=patient.id,
-                            config=g.trace_config,
-                        )
-                        patient.ward_los_thrombolysis = (
-                            sampled_ward_act_time_thrombolysis
-                        )
-                        yield self.env.timeout(sampled_ward_act_time_thrombolysis)
-                        if (
-                            self.env.now > g.warm_up_period
-                            and patient.advanced_ct_pathway == True
-                        ):
-                            self.results_df.at[patient.id, "Thrombolysis Savings"] = (
-                                (
-                                    (
-                                        sampled_ward_act_time
-                                        - sampled_ward_act_time_thrombolysis
-                                    )
-                                    / 60
-                                )
-                                / 24
-                            ) * g.inpatient_bed_cost_thrombolysis
-                        patient.ward_discharge_time = self.env.now
-                        self.ward_occupancy.remove(patient)
-                    else:
-                        # patient.mrs_discharge = patient.mrs_type - random.randint(0, 1)
-                        patient.mrs_discharge = (
-                            patient.mrs_type - self.mrs_reduction_during_stay.sample()
-                        )
-                        trace(
-                            time=self.env.now,
-                            debug=g.show_trace,
-                            msg=f"Patient {patient.id} (diagnosis {patient.diagnosis} ({patient.patient_diagnosis}), MRS type {patient.mrs_type}) will be in ward for {sampled_ward_act_time:.1f} minutes ({(sampled_ward_act_time / 60 / 24):.1f} days).",
-                            identifier=patient.id,
-                            config=g.trace_config,
-                        )
-                        patient.ward_los = sampled_ward_act_time
-                        yield self.env.timeout(sampled_ward_act_time)
-                        patient.ward_discharge_time = self.env.now
-                        self.ward_occupancy.remove(patient)
-
-                elif patient.patient_diagnosis == 1 and patient.mrs_type == 3:
-                    # sampled_ward_act_time = random.expovariate(
-                    #     1.0 / g.mean_n_i_ward_time_mrs_3
-                    # )
-                    sampled_ward_act_time = self.i_ward_time_mrs_3_dist.sample()
-                    if patient.thrombolysis == True:
-                        sampled_ward_act_time_thrombolysis = (
-                            sampled_ward_act_time * g.thrombolysis_los_save
-                        )
-                        # patient.mrs_discharge = patient.mrs_type - random.randint(0, 2)
-                        patient.mrs_discharge = (
-                            patient.mrs_type
-                            - self.mrs_reduction_during_stay_thrombolysed.sample()
-                        )
-                        trace(
-                            time=self.env.now,
-                            debug=g.show_trace,
-                            msg=f"💉 Patient {patient.id} (diagnosis {patient.diagnosis} ({patient.patient_diagnosis}), MRS type {patient.mrs_type}) THROMBOLYSED. Will be in ward for {sampled_ward_act_time_thrombolysis:.1f} minutes ({(sampled_ward_act_time_thrombolysis / 24 / 60):.1f} days).",
-                            identifier=patient.id,
-                            config=g.trace_config,
-                        )
-                        patient.ward_los_thrombolysis = (
-                            sampled_ward_act_time_thrombolysis
-                        )
-                        yield self.env.timeout(sampled_ward_act_time_thrombolysis)
-                        if (
-                            self.env.now > g.warm_up_period
-                            and patient.advanced_ct_pathway == True
-                        ):
-                            self.results_df.at[patient.id, "Thrombolysis Savings"] = (
-                                (
-                                    (
-                                        sampled_ward_act_time
-                                        - sampled_ward_act_time_thrombolysis
-                                    )
-                                    / 60
-                                )
-                                / 24
-                            ) * g.inpatient_bed_cost_thrombolysis
-                        patient.ward_discharge_time = self.env.now
-                        self.ward_occupancy.remove(patient)
-                    else:
-                        # patient.mrs_discharge = patient.mrs_type - random.randint(0, 1)
-                        patient.mrs_discharge = (
-                            patient.mrs_type - self.mrs_reduction_during_stay.sample()
-                        )
-                        trace(
-                            time=self.env.now,
-                            debug=g.show_trace,
-                            msg=f"Patient {patient.id} (diagnosis {patient.diagnosis} ({patient.patient_diagnosis}), MRS type {patient.mrs_type}) will be in ward for {sampled_ward_act_time:.1f} minutes ({(sampled_ward_act_time / 60 / 24):.1f} days).",
-                            identifier=patient.id,
-                            config=g.trace_config,
-                        )
-                        patient.ward_los = sampled_ward_act_time
-                        yield self.env.timeout(sampled_ward_act_time)
-                        patient.ward_discharge_time = self.env.now
-                        self.ward_occupancy.remove(patient)
-
-                elif patient.patient_diagnosis == 1 and patient.mrs_type == 4:
-                    # sampled_ward_act_time = random.expovariate(
-                    #     1.0 / g.mean_n_i_ward_time_mrs_4
-                    # )
-                    sampled_ward_act_time = self.i_ward_time_mrs_4_dist.sample()
-                    if patient.thrombolysis == True:
-                        sampled_ward_act_time_thrombolysis = (
-                            sampled_ward_act_time * g.thrombolysis_los_save
-                        )
-                        # patient.mrs_discharge = patient.mrs_type - random.randint(0, 2)
-                        patient.mrs_discharge = (
-                            patient.mrs_type
-                            - self.mrs_reduction_during_stay_thrombolysed.sample()
-                        )
-                        trace(
-                            time=self.env.now,
-                            debug=g.show_trace,
-                            msg=f"💉 Patient {patient.id} (diagnosis {patient.diagnosis} ({patient.patient_diagnosis}), MRS type {patient.mrs_type}) THROMBOLYSED. Will be in ward for {sampled_ward_act_time_thrombolysis:.1f} minutes ({(sampled_ward_act_time_thrombolysis / 24 / 60):.1f} days).",
-                            identifier=patient.id,
-                            config=g.trace_config,
-                        )
-                        patient.ward_los_thrombolysis = (
-                            sampled_ward_act_time_thrombolysis
-                        )
-                        yield self.env.timeout(sampled_ward_act_time_thrombolysis)
-                        if (
-                            self.env.now > g.warm_up_period
-                            and patient.advanced_ct_pathway == True
-                        ):
-                            self.results_df.at[patient.id, "Thrombolysis Savings"] = (
-                                (
-                                    (
-                                        sampled_ward_act_time
-                                        - sampled_ward_act_time_thrombolysis
-                                    )
-                                    / 60
-                                )
-                                / 24
-                            ) * g.inpatient_bed_cost_thrombolysis
-                        patient.ward_discharge_time = self.env.now
-                        self.ward_occupancy.remove(patient)
-                    else:
-                        # patient.mrs_discharge = patient.mrs_type - random.randint(0, 1)
-                        patient.mrs_discharge = (
-                            patient.mrs_type - self.mrs_reduction_during_stay.sample()
-                        )
-                        trace(
-                            time=self.env.now,
-                            debug=g.show_trace,
-                            msg=f"Patient {patient.id} (diagnosis {patient.diagnosis} ({patient.patient_diagnosis}), MRS type {patient.mrs_type}) will be in ward for {sampled_ward_act_time:.1f} minutes ({(sampled_ward_act_time / 60 / 24):.1f} days).",
-                            identifier=patient.id,
-                            config=g.trace_config,
-                        )
-                        patient.ward_los = sampled_ward_act_time
-                        yield self.env.timeout(sampled_ward_act_time)
-                        patient.ward_discharge_time = self.env.now
-                        self.ward_occupancy.remove(patient)
-
-                elif patient.patient_diagnosis == 1 and patient.mrs_type == 5:
-                    # sampled_ward_act_time = random.expovariate(
-                    #     1.0 / g.mean_n_i_ward_time_mrs_5
-                    # )
-                    sampled_ward_act_time = self.i_ward_time_mrs_5_dist.sample()
-                    if patient.thrombolysis == True:
-                        sampled_ward_act_time_thrombolysis = (
-                            sampled_ward_act_time * g.thrombolysis_los_save
-                        )
-                        # patient.mrs_discharge = patient.mrs_type - random.randint(0, 2)
-                        patient.mrs_discharge = (
-                            patient.mrs_type
-                            - self.mrs_reduction_during_stay_thrombolysed.sample()
-                        )
+                # The patient's length of stay and MRS on discharge depend on
+                # their diagnosis and MRS on admission, and for some patients
+                # on whether they were thrombolysed. The rules for each are
+                # set out in WARD_STAY_RULES (see distributions.py).
+                (
+                    sampled_ward_act_time,
+                    sampled_ward_act_time_thrombolysis,
+                    mrs_discharge,
+                ) = self.ward_stay_engine.sample(
+                    patient.patient_diagnosis,
+                    patient.mrs_type,
+                    thrombolysis=patient.thrombolysis == True,
+                )
+
+                if mrs_discharge is not None:
+                    patient.mrs_discharge = mrs_discharge
+
+                if sampled_ward_act_time_thrombolysis is not None:
+                    # Thrombolysis has shortened the patient's stay
+                    if self.should_trace(patient.id):
                         trace(
                             time=self.env.now,
-                            debug=g.show_trace,
+                            debug=self.config.show_trace,
                             msg=f"💉 Patient {patient.id} (diagnosis {patient.diagnosis} ({patient.patient_diagnosis}), MRS type {patient.mrs_type}) THROMBOLYSED. Will be in ward for {sampled_ward_act_time_thrombolysis:.1f} minutes ({(sampled_ward_act_time_thrombolysis / 24 / 60):.1f} days).",
                             identifier=patient.id,
-                            config=g.trace_config,
-                        )
-                        # Record generated LOS in patient object
-                        patient.ward_los_thrombolysis = (
-                            sampled_ward_act_time_thrombolysis
+                            config=self.config.trace_config,
                         )
-                        yield self.env.timeout(sampled_ward_act_time_thrombolysis)
-                        if (
-                            self.env.now > g.warm_up_period
-                            and patient.advanced_ct_pathway == True
-                        ):
-                            self.results_df.at[patient.id, "Thrombolysis Savings"] = (
+                    patient.ward_los_thrombolysis = sampled_ward_act_time_thrombolysis
+                    yield self.env.timeout(sampled_ward_act_time_thrombolysis)
+                    if (
+                        self.env.now > self.config.warm_up_period
+                        and patient.advanced_ct_pathway == True
+                    ):
+                        self.results_store.record(
+                            patient.id,
+                            "Thrombolysis Savings",
+                            (
                                 (
                                     (
                                         sampled_ward_act_time
@@ -1589,104 +1534,58 @@ class Model:
                                     / 60
                                 )
                                 / 24
-                            ) * g.inpatient_bed_cost_thrombolysis
-                        patient.ward_discharge_time = self.env.now
-                        self.ward_occupancy.remove(patient)
-                    else:
-                        # patient.mrs_discharge = patient.mrs_type - random.randint(0, 1)
-                        patient.mrs_discharge = (
-                            patient.mrs_type - self.mrs_reduction_during_stay.sample()
+                            )
+                            * self.config.inpatient_bed_cost_thrombolysis,
                         )
+                else:
+                    if self.should_trace(patient.id):
                         trace(
                             time=self.env.now,
-                            debug=g.show_trace,
+                            debug=self.config.show_trace,
                             msg=f"Patient {patient.id} (diagnosis {patient.diagnosis} ({patient.patient_diagnosis}), MRS type {patient.mrs_type}) will be in ward for {sampled_ward_act_time:.1f} minutes ({(sampled_ward_act_time / 60 / 24):.1f} days).",
                             identifier=patient.id,
-                            config=g.trace_config,
+                            config=self.config.trace_config,
                         )
-                        # Record generated LOS in patient object
-                        patient.ward_los = sampled_ward_act_time
-                        yield self.env.timeout(sampled_ward_act_time)
-                        patient.ward_discharge_time = self.env.now
-                        self.ward_occupancy.remove(patient)
-
-                #################################
-                # MARK: Patient diagnosis = 2   #
-                # Transient Ischaemic Attack    #
-                # Not suitable for thrombolysis #
-                #################################
-                # The below code is for the non stroke diagnosis.
-
-                if patient.patient_diagnosis == 2:
-                    # sampled_ward_act_time = random.expovariate(
-                    #     1.0 / g.mean_n_tia_ward_time
-                    # )
-                    sampled_ward_act_time = self.tia_ward_time_dist.sample()
-                    trace(
-                        time=self.env.now,
-                        debug=g.show_trace,
-                        msg=f"Patient {patient.id} (diagnosis {patient.diagnosis} ({patient.patient_diagnosis}), MRS type {patient.mrs_type}) will be in ward for {sampled_ward_act_time:.1f} minutes ({(sampled_ward_act_time / 60 / 24):.1f} days).",
-                        identifier=patient.id,
-                        config=g.trace_config,
-                    )
                     # Record generated LOS in patient object
                     patient.ward_los = sampled_ward_act_time
                     yield self.env.timeout(sampled_ward_act_time)
-                    patient.ward_discharge_time = self.env.now
-                    self.ward_occupancy.remove(patient)
-
-                ###############################
-                # MARK: Patient diagnosis > 2 #
-                # Stroke mimic OR non-stroke  #
-                ###############################
-                if patient.patient_diagnosis > 2:
-                    # sampled_ward_act_time = random.expovariate(
-                    #     1.0 / g.mean_n_non_stroke_ward_time
-                    # )
-                    sampled_ward_act_time = self.non_stroke_ward_time_dist.sample()
 
-                    trace(
-                        time=self.env.now,
-                        debug=g.show_trace,
-                        msg=f"Patient {patient.id} (diagnosis {patient.diagnosis} ({patient.patient_diagnosis}), MRS type {patient.mrs_type}) will be in ward for {sampled_ward_act_time:.1f} minutes ({(sampled_ward_act_time / 60 / 24):.1f} days).",
-                        identifier=patient.id,
-                        config=g.trace_config,
-                    )
+                patient.ward_discharge_time = self.env.now
+                self.ward_occupancy.remove(patient)
+                self.ward_monitor.in_use.update(self.env.now, len(self.ward_occupancy))
 
-                    # Record generated LOS in patient object
-                    patient.ward_los = sampled_ward_act_time
-                    yield self.env.timeout(sampled_ward_act_time)
-                    patient.ward_discharge_time = self.env.now
-                    self.ward_occupancy.remove(patient)
+            # The ward bed has been released, so let a patient who is stuck in
+            # SDEC waiting for one know
+            self.notify_ward_bed_released()
 
             # Relevent information is recorded in the results DataFrame.
-            if self.env.now > g.warm_up_period:
-                self.results_df.at[patient.id, "Q Time Ward"] = patient.q_time_ward
+            if self.env.now > self.config.warm_up_period:
+                self.results_store.record(
+                    patient.id, "Q Time Ward", patient.q_time_ward
+                )
 
-            # TODO: SR: I've tweaked this to take whichever of the ward_los or thrombolysis los is generated
-            # TODO SR: It would be better to take a more robust approach to this step.
-            try:
-                final_ward_los = sampled_ward_act_time
-            except:
-                final_ward_los = sampled_ward_act_time_thrombolysis
+            # The LOS recorded is the one sampled before any reduction from
+            # thrombolysis (the reduced LOS is in patient.ward_los_thrombolysis)
+            final_ward_los = sampled_ward_act_time
 
-            if self.env.now > g.warm_up_period:
-                self.results_df.at[patient.id, "Ward LOS"] = final_ward_los
+            if self.env.now > self.config.warm_up_period:
+                self.results_store.record(patient.id, "Ward LOS", final_ward_los)
 
-                self.results_df.at[patient.id, "MRS DC"] = patient.mrs_discharge
+                self.results_store.record(patient.id, "MRS DC", patient.mrs_discharge)
 
-                self.results_df.at[patient.id, "MRS Change"] = (
-                    patient.mrs_type - patient.mrs_discharge
+                self.results_store.record(
+                    patient.id, "MRS Change", patient.mrs_type - patient.mrs_discharge
                 )
 
             # MARK: Discharged from main ward
-            trace(
-                time=self.env.now,
-                debug=g.show_trace,
-                msg=f"🚗 Patient {patient.id} discharged from main ward at {minutes_to_ampm(int(self.env.now % 1440))} after {final_ward_los:.1f} minutes ({(final_ward_los / 24 / 60):.1f} days). Occupancy after discharge: {len(self.ward_occupancy)} of {g.number_of_ward_beds} ward beds",
-                identifier=patient.id,
-                config=g.trace_config,
-            )
+            if self.should_trace(patient.id):
+                trace(
+                    time=self.env.now,
+                    debug=self.config.show_trace,
+                    msg=f"🚗 Patient {patient.id} discharged from main ward at {minutes_to_ampm(int(self.env.now % 1440))} after {final_ward_los:.1f} minutes ({(final_ward_los / 24 / 60):.1f} days). Occupancy after discharge: {len(self.ward_occupancy)} of {self.config.number_of_ward_beds} ward beds",
+                    identifier=patient.id,
+                    config=self.config.trace_config,
+                )
 
             patient.exit_time = self.env.now
             patient.journey_completed = True
@@ -1695,6 +1594,22 @@ class Model:
         patient.exit_time = self.env.now
         patient.journey_completed = True
 
+    def notify_ward_bed_released(self):
+        """
+        Wake the SDEC patient who has been waiting longest for a ward bed.
+
+        Called each time a patient is discharged from the ward. The wake-up is
+        deferred by a zero-length timeout so that any patient already queuing
+        for a ward bed is given it first, as happened when blocked SDEC
+        patients checked the ward every minute. The woken patient checks the
+        ward occupancy again and goes back to waiting if it is still full.
+        """
+        if self.ward_bed_waiters:
+            ward_bed_released = self.ward_bed_waiters.popleft()
+            self.env.timeout(0).callbacks.append(
+                lambda _: ward_bed_released.succeed()
+            )
+
     # MARK: M: Run result calculation
     # This method calculates results over a single run.
     def calculate_run_results(self):
@@ -1708,8 +1623,14 @@ class Model:
         results dataframe and updates class-level attributes for use in
         trial-level reporting.
 
-        - **Data Cleaning**: Removes the initial dummy row (index label 1) used
-          to initialize the `results_df`.
+        - **Data Cleaning**: Builds `results_df` from `results_store` and
+          removes the initial dummy row (index label 1) used to initialize it.
+          Also builds `nurse_q_graph_df`, `ward_occupancy_graph_df` and
+          `sdec_occupancy_graph_df` from their recorders. When
+          `config.recording_level` is "kpi" there is no `results_df`, and the
+          KPIs are calculated from the running totals in `results_store`
+          instead, which match those from `results_df` to within
+          floating-point rounding.
         - **Unit Conversions**: Automatically converts ward-related timings
           (Queue Time and Length of Stay) from minutes to hours for reporting.
         - **SDEC Logic**: Financial staff costs for SDEC are adjusted based on
@@ -1728,7 +1649,12 @@ class Model:
         mean_q_time_ward : float
             Average wait time for a ward bed in hours.
         mean_ward_occupancy : float
-            The average number of beds occupied during the run.
+            The time-weighted average number of ward beds occupied after the
+            warm-up period (NaN if the run hasn't passed the warm-up period).
+        resource_use : dict
+            Time-weighted utilisation, time at capacity and queue lengths of
+            the nurses, SDEC beds and ward beds after the warm-up period, and
+            the mean number of CTP scans at once, from their monitors.
         admission_delays : int
             Total number of patients who experienced any wait time for a ward
             bed.
@@ -1751,31 +1677,67 @@ class Model:
         of Google Gemini Flash.
         All generated content has been thoroughly reviewed.
         """
-        # Drop the first row of the results DataFrame, as this is just a dummy
-        # and will take on the value of zero.
-        self.results_df.drop([1], inplace=True)
+        # Build the queue and occupancy time series DataFrames from their
+        # recorders
+        self.nurse_q_graph_df = self.nurse_q_recorder.to_dataframe()
+        self.ward_occupancy_graph_df = self.ward_occupancy_recorder.to_dataframe()
+        self.sdec_occupancy_graph_df = self.sdec_occupancy_recorder.to_dataframe()
+
+        if self.record_patients:
+            # Build the results DataFrame from the values recorded during the
+            # run
+            self.results_df = self.results_store.to_dataframe()
+
+            # Drop the first row of the results DataFrame, as this is just a
+            # dummy and will take on the value of zero.
+            self.results_df.drop([1], inplace=True)
+
+            columns = {
+                column: {
+                    "mean": self.results_df[column].mean(),
+                    "max": self.results_df[column].max(),
+                    "sum": self.results_df[column].sum(),
+                    "positive": int((self.results_df[column] > 0).sum()),
+                }
+                for column in KPI_RESULTS_COLUMNS
+            }
+        else:
+            # Only the running totals of these columns were kept
+            columns = self.results_store.summary()
 
         # The below code calculates the average or cumulative values the model
         # is concerned with.
 
-        self.mean_q_time_nurse = round(self.results_df["Q Time Nurse"].mean(), 0)
+        self.mean_q_time_nurse = round(columns["Q Time Nurse"]["mean"], 0)
 
-        self.max_q_time_nurse = round(self.results_df["Q Time Nurse"].max(), 0)
+        self.max_q_time_nurse = round(columns["Q Time Nurse"]["max"], 0)
 
         self.number_of_admissions_avoided = len(self.admission_avoidance)
 
-        self.mean_q_time_ward = round(self.results_df["Q Time Ward"].mean() / 60, 0)
+        self.mean_q_time_ward = round(columns["Q Time Ward"]["mean"] / 60, 0)
 
-        self.max_q_time_ward = round(self.results_df["Q Time Ward"].max() / 60, 0)
+        self.max_q_time_ward = round(columns["Q Time Ward"]["max"] / 60, 0)
 
-        try:
-            self.mean_ward_occupancy = round(self.results_df["Ward Occupancy"].mean())
-        except ValueError:
-            self.mean_ward_occupancy = np.NaN
+        # Summarise the time-weighted resource use from the end of the
+        # warm-up period to the end of the run
+        self.resource_use = {
+            name: monitor.summary(self.env.now)
+            for name, monitor in [
+                ("nurse", self.nurse_monitor),
+                ("ctp", self.ctp_monitor),
+                ("sdec", self.sdec_monitor),
+                ("ward", self.ward_monitor),
+            ]
+        }
+
+        # The mean number of ward beds in use over time. (Averaging the ward
+        # occupancy recorded at each admission over-represented busy periods,
+        # which have more admissions.)
+        self.mean_ward_occupancy = round(self.resource_use["ward"]["mean_in_use"], 2)
 
-        self.admission_delays = len(self.results_df[self.results_df["Q Time Ward"] > 0])
+        self.admission_delays = columns["Q Time Ward"]["positive"]
 
-        self.mean_los_ward = round(self.results_df["Ward LOS"].mean() / 60, 0)
+        self.mean_los_ward = round(columns["Ward LOS"]["mean"] / 60, 0)
 
         # Note that this is using the admission avoidance MODEL attribute,
         # which is populated entirely separately from the patient-level
@@ -1783,7 +1745,7 @@ class Model:
         # patients who are explicitly benefitting from admission avoidance
         # via SDEC will be counted here
         self.sdec_financial_savings = (
-            len(self.admission_avoidance) * g.inpatient_bed_cost
+            len(self.admission_avoidance) * self.config.inpatient_bed_cost
         )
 
         # The below code ensures that the SDEC incurs no cost if it is not
@@ -1791,12 +1753,14 @@ class Model:
         # it to return small values even if the SDEC was not running. This is
         # now fixed, but the code works so I have left it in place.
 
-        if g.sdec_unav_freq == 0:
+        if self.config.sdec_unav_freq == 0:
             self.medical_staff_cost = 0
         else:
             self.medical_staff_cost = round(
-                g.sdec_dr_cost_min * (g.sim_duration)
-                - g.sdec_dr_cost_min * self.sdec_freeze_counter * g.sdec_unav_time,
+                self.config.sdec_dr_cost_min * (self.config.sim_duration)
+                - self.config.sdec_dr_cost_min
+                * self.sdec_freeze_counter
+                * self.config.sdec_unav_time,
                 0,
             )
 
@@ -1804,12 +1768,10 @@ class Model:
             self.sdec_financial_savings - self.medical_staff_cost, 0
         )
 
-        self.thrombolysis_savings = round(
-            self.results_df["Thrombolysis Savings"].sum(), 0
-        )
+        self.thrombolysis_savings = round(columns["Thrombolysis Savings"]["sum"], 0)
         self.total_savings = self.thrombolysis_savings + self.savings_sdec
 
-        self.mean_mrs_change = round(self.results_df["MRS Change"].mean(), 2)
+        self.mean_mrs_change = round(columns["MRS Change"]["mean"], 2)
 
     # MARK: M: per-run plotting
     # This method plots the stroke nurse assessment queue graph, as it is after
@@ -1823,7 +1785,7 @@ class Model:
         This method creates a line plot of the Stroke Ward occupancy over the
         duration of the simulation. It includes both the raw occupancy data
         and a linear trend line to help identify long-term capacity issues.
-        Execution is dependent on the global `g.gen_graph` toggle.
+        Execution is dependent on the global `config.gen_graph` toggle.
 
         - **Data Cleaning**: Automatically drops the first row (index 0) of
           `occupancy_graph_df`, which is typically used as a placeholder.
@@ -1846,7 +1808,7 @@ class Model:
         -------
         matplotlib.figure.Figure or None
             Returns a Matplotlib Figure object if `plot` is False.
-            Returns None if `plot` is True or if `g.gen_graph` is False.
+            Returns None if `plot` is True or if `config.gen_graph` is False.
 
 
         See Also
@@ -1860,7 +1822,7 @@ class Model:
         of Google Gemini Flash.
         All generated content has been thoroughly reviewed.
         """
-        if g.gen_graph == True:
+        if self.config.gen_graph == True:
             # Queue for Nurse Assessment Graph (Currently Commented Out)
 
             # self.nurse_q_graph_df.drop([0], inplace=True)
@@ -1896,7 +1858,7 @@ class Model:
             ax.set_ylabel("Stroke Ward Occupancy")
             ax.set_title(
                 f"Trial "
-                f"{g.trials_run_counter}\
+                f"{self.config.trials_run_counter}\
                          Ward Occupancy Over Time "
                 f"{self.run_number}"
             )
@@ -1935,10 +1897,10 @@ class Model:
 
         - The day calculation is performed using floor division:
           `self.env.now // 1440`.
-        - The trace message visibility depends on the `g.show_trace` flag and
-          the `g.tracked_cases` configuration.
-        - This process runs concurrently with patient arrivals and clinical
-          obstructions without interfering with their logic.
+        - The trace message visibility depends on the `config.show_trace` flag and
+          the `config.tracked_cases` configuration.
+        - This process runs concurrently with patient arrivals without
+          interfering with their logic.
 
         Notes
         -----
@@ -1947,21 +1909,59 @@ class Model:
         All generated content has been thoroughly reviewed.
         """
         # Print a debugging message every day
-        while self.env.now <= g.sim_duration:
+        while self.env.now <= self.config.sim_duration:
             # TODO: this doesn't always reliably appear depending on number of tracked cases
-            trace(
-                msg=f"========= DAY {(self.env.now // 1440):.0f} ===============",
-                time=self.env.now,
-                debug=g.show_trace,
-                identifier=max(g.tracked_cases),
-                config=g.trace_config,
-            )
+            if self.should_trace(max(self.config.tracked_cases)):
+                trace(
+                    msg=f"========= DAY {(self.env.now // 1440):.0f} ===============",
+                    time=self.env.now,
+                    debug=self.config.show_trace,
+                    identifier=max(self.config.tracked_cases),
+                    config=self.config.trace_config,
+                )
             yield self.env.timeout(1440)
 
+    # MARK: M: validate patients
+    def validate_completed_patients(self):
+        """
+        Check that every patient who completed their journey has all of their
+        required attributes set.
+
+        All of the patients (or, if `config.patient_validation` is "sample",
+        a random sample of `config.patient_validation_sample_size` of them)
+        are checked at once by `validate_patients()`.
+
+        Raises
+        ------
+        ValueError
+            If any patient checked is missing a required attribute, naming
+            the patient IDs and missing attributes.
+        """
+        if self.config.patient_validation not in ("all", "sample", "none"):
+            raise ValueError(
+                "patient_validation must be 'all', 'sample' or 'none', "
+                f"got {self.config.patient_validation!r}"
+            )
+
+        completed = [p for p in self.patient_objects if p.journey_completed]
+
+        sample_size = self.config.patient_validation_sample_size
+        if self.config.patient_validation == "sample" and sample_size < len(completed):
+            rows = self.validation_rng.choice(
+                len(completed), size=sample_size, replace=False
+            )
+            completed = [completed[row] for row in sorted(rows)]
+
+        validate_patients(
+            patients_to_dataframe(
+                completed, columns=["id", *Patient._required_fields]
+            )
+        )
+
     # MARK: M: run model
     # The run method starts up the DES entity generators, runs the simulation,
     # and in turns calls anything we need to generate results for the run
-    def run(self):
+    def run(self, progress=None):
         """
         Execute the simulation run lifecycle.
 
@@ -1970,14 +1970,14 @@ class Model:
         and performs post-simulation data processing and export tasks.
 
         The execution sequence is as follows:
-        1. Register time-tracking, patient arrival, and resource obstruction
-           generators as SimPy processes.
+        1. Register time-tracking and patient arrival generators (and, when
+           tracing, the availability trace) as SimPy processes.
         2. Execute the simulation engine until the combined limit of the
            warm-up period and active simulation duration is reached.
         3. Trigger final calculation of run-level results.
         4. (Optional) Export patient-level results to a CSV file.
 
-        - **Warm-up Period**: The total runtime includes `g.warm_up_period`. This
+        - **Warm-up Period**: The total runtime includes `config.warm_up_period`. This
           is crucial for allowing the model to reach a 'steady state' before
           results are recorded as valid.
         - **Concurrency**: All methods passed to `self.env.process()` run
@@ -1985,6 +1985,16 @@ class Model:
         - **Post-Processing**: This method must be called for `results_df`
           and other KPIs to be populated with final values.
 
+        Parameters
+        ----------
+        progress : callable, optional
+            Called as `progress(time, end_time)` every
+            `config.progress_interval` simulated minutes, and once the run
+            reaches its end, where `end_time` is the warm-up period plus
+            `config.sim_duration`. The event loop is run up to each of these
+            times in turn, which doesn't change the results. An exception
+            raised by `progress` stops the run (e.g. to cancel it).
+
         See Also
         --------
         track_days : The background process that logs day transitions.
@@ -1992,11 +2002,8 @@ class Model:
         generator_patient_arrivals: generates in-hours patients and sends them
             through the assessment pathway.
 
-        obstruct_ctp: ensures the ctp scanner is only available for the
-            specified times.
-
-        obstruct_sdec: ensures the sdec is only available for the specified
-            times.
+        trace_availability: traces the CTP scanner and SDEC opening and
+            closing (only when `config.show_trace` is True).
 
         calculate_run_results : The method called to process data after the
             event loop finishes.
@@ -2011,18 +2018,31 @@ class Model:
 
         self.env.process(self.track_days())
         self.env.process(self.generator_patient_arrivals())
-        self.env.process(self.obstruct_ctp())
-        self.env.process(self.obstruct_sdec())
+        if self.config.show_trace:
+            self.env.process(self.trace_availability())
 
-        # Run the model for the duration specified in g class
-        self.env.run(until=(g.sim_duration + g.warm_up_period))
+        # Run the model for the duration specified in the scenario config
+        end_time = self.config.sim_duration + self.config.warm_up_period
+        if progress is None:
+            self.env.run(until=end_time)
+        else:
+            # Stopping the event loop at a time only stops it before any
+            # events at that time, so the events still happen in the same
+            # order as in a single run to the end
+            while self.env.now < end_time:
+                self.env.run(
+                    until=min(self.env.now + self.config.progress_interval, end_time)
+                )
+                progress(self.env.now, end_time)
 
         # Check that all patient objects generated are valid
         # This can highlight errors with patients who don't get all of their attributes set,
         # which can indicate issues with logic branches
         # Only check for patients with a completed journey as those with incomplete journeys
         # may simply have not reached the point in the model where the relevant attribute was set
-        [p.validate() for p in self.patient_objects if p.journey_completed]
+        # Patient objects aren't kept (so can't be checked) when only KPIs are recorded
+        if self.config.patient_validation != "none" and self.record_patients:
+            self.validate_completed_patients()
 
         # Now the simulation run has finished, call the method that calculates
         # run results
@@ -2034,9 +2054,9 @@ class Model:
         # print (f"Run Number {self.run_number}")
         # print (self.results_df)
 
-        if g.write_to_csv == True:
+        if self.config.write_to_csv == True:
             self.results_df.to_csv(
-                f"trial {g.trials_run_counter} output {self.run_number}.csv",
+                f"trial {self.config.trials_run_counter} output {self.run_number}.csv",
                 index=False,
             )
 
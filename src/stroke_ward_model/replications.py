@@ -0,0 +1,273 @@
+"""
+Provides running statistics for deciding how many replications of the model
+to run.
+"""
+
+import math
+import time
+
+from scipy import stats
+
+
+# MARK: RunningStatistics
+class RunningStatistics:
+    """
+    Running mean and variance of a series of values.
+
+    Uses Welford's algorithm, so each value is added in constant time and
+    memory without keeping the values, and without the loss of precision of
+    summing squares.
+
+    Attributes
+    ----------
+    count : int
+        Number of values added.
+    mean : float
+        Mean of the values added (NaN if there are none).
+    minimum, maximum : float
+        Smallest and largest values added (NaN if there are none).
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = math.nan
+        self.minimum = math.nan
+        self.maximum = math.nan
+        self._sum_sq_diff = 0.0
+
+    def add(self, value):
+        """
+        Add a value. Missing (NaN) values are ignored, as in pandas.
+
+        Parameters
+        ----------
+        value : float
+        """
+        if math.isnan(value):
+            return
+
+        self.count += 1
+        if self.count == 1:
+            self.mean = float(value)
+            self.minimum = self.maximum = value
+            return
+
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._sum_sq_diff += delta * (value - self.mean)
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+
+    @property
+    def variance(self):
+        """float: Sample variance (NaN for fewer than two values)."""
+        if self.count < 2:
+            return math.nan
+        return self._sum_sq_diff / (self.count - 1)
+
+    @property
+    def std(self):
+        """float: Sample standard deviation (NaN for fewer than two values)."""
+        return math.sqrt(self.variance)
+
+    def ci_half_width(self, confidence=0.95):
+        """
+        Half-width of the t-distribution confidence interval for the mean.
+
+        Parameters
+        ----------
+        confidence : float, optional
+            Confidence level. Default 0.95.
+
+        Returns
+        -------
+        float
+            NaN for fewer than two values.
+        """
+        if self.count < 2:
+            return math.nan
+        t_value = stats.t.ppf((1 + confidence) / 2, self.count - 1)
+        return t_value * self.std / math.sqrt(self.count)
+
+    def relative_ci_half_width(self, confidence=0.95):
+        """
+        Confidence interval half-width as a proportion of the mean.
+
+        Returns
+        -------
+        float
+            0 if every value is the same (so there is no uncertainty), inf if
+            the mean is 0 but the values vary, and NaN for fewer than two
+            values.
+        """
+        half_width = self.ci_half_width(confidence)
+        if half_width == 0:
+            return 0.0
+        if self.mean == 0:
+            return math.inf
+        return half_width / abs(self.mean)
+
+    def __repr__(self):
+        return (
+            f"RunningStatistics(count={self.count}, mean={self.mean}, "
+            f"std={self.std if self.count > 1 else math.nan})"
+        )
+
+
+# MARK: ReplicationController
+class ReplicationController:
+    """
+    Decides when enough replications of the model have been run.
+
+    Replications are added one at a time (or a batch at a time) with
+    `add_run`, which updates a `RunningStatistics` for each KPI with a
+    precision target. `should_stop` then reports whether to stop, which is
+    when any of these is true:
+
+    - every KPI's confidence interval half-width, relative to its mean, is at
+      or below its target (after at least `min_runs` runs);
+    - the wall-clock time since the controller was started has reached
+      `time_budget` (after at least one run);
+    - `max_runs` runs have been carried out.
+
+    Parameters
+    ----------
+    targets : dict, optional
+        Mapping of KPI name (a column of `Trial.df_trial_results`, e.g.
+        "Mean Q Time Ward (Hour)") to the target relative confidence interval
+        half-width, e.g. 0.05 for ±5% of the mean.
+    time_budget : float, optional
+        Wall-clock time in seconds after which to stop adding runs.
+    confidence : float, optional
+        Confidence level of the intervals. Default 0.95.
+    min_runs : int, optional
+        Runs to carry out before checking the precision targets. Default 5.
+    max_runs : int, optional
+        Most runs to carry out. Default 1000.
+
+    Attributes
+    ----------
+    statistics : dict
+        `RunningStatistics` for each KPI in `targets`.
+    runs : int
+        Number of runs added.
+    stop_reason : str or None
+        "precision", "time_budget" or "max_runs" once `should_stop` has
+        returned True, otherwise None.
+
+    Raises
+    ------
+    ValueError
+        If neither `targets` nor `time_budget` is given.
+    """
+
+    def __init__(
+        self,
+        targets=None,
+        time_budget=None,
+        confidence=0.95,
+        min_runs=5,
+        max_runs=1000,
+    ):
+        if not targets and time_budget is None:
+            raise ValueError("At least one of targets or time_budget must be set")
+
+        self.targets = dict(targets or {})
+        self.time_budget = time_budget
+        self.confidence = confidence
+        self.min_runs = max(min_runs, 2) if self.targets else 1
+        self.max_runs = max_runs
+
+        self.statistics = {kpi: RunningStatistics() for kpi in self.targets}
+        self.runs = 0
+        self.stop_reason = None
+        self._start_time = None
+
+    @classmethod
+    def from_config(cls, config):
+        """
+        Create a controller from the `replication_*` settings of a scenario.
+
+        Returns
+        -------
+        ReplicationController or None
+            None if the scenario has neither precision targets nor a time
+            budget, i.e. a fixed `number_of_runs` should be run.
+        """
+        if not config.replication_targets and config.replication_time_budget is None:
+            return None
+        return cls(
+            targets=config.replication_targets,
+            time_budget=config.replication_time_budget,
+            confidence=config.replication_confidence,
+            min_runs=config.replication_min_runs,
+            max_runs=config.replication_max_runs,
+        )
+
+    def start(self):
+        """Start the clock for the time budget."""
+        self._start_time = time.perf_counter()
+
+    @property
+    def elapsed(self):
+        """float: Seconds since `start` was called."""
+        if self._start_time is None:
+            return 0.0
+        return time.perf_counter() - self._start_time
+
+    def add_run(self, kpis):
+        """
+        Update the running statistics with the KPIs of a completed run.
+
+        Parameters
+        ----------
+        kpis : dict or pd.Series
+            KPI values of the run, keyed by name. Must include every KPI in
+            `targets`.
+        """
+        self.runs += 1
+        for kpi, statistics in self.statistics.items():
+            statistics.add(kpis[kpi])
+
+    def precision(self):
+        """
+        Return the current relative confidence interval half-width of each
+        KPI with a target.
+
+        Returns
+        -------
+        dict
+        """
+        return {
+            kpi: statistics.relative_ci_half_width(self.confidence)
+            for kpi, statistics in self.statistics.items()
+        }
+
+    def precision_met(self):
+        """Return whether every KPI has reached its precision target."""
+        if not self.targets or self.runs < self.min_runs:
+            return False
+        precision = self.precision()
+        return all(precision[kpi] <= target for kpi, target in self.targets.items())
+
+    def should_stop(self):
+        """
+        Return whether to stop adding runs, recording why in `stop_reason`.
+
+        Returns
+        -------
+        bool
+        """
+        if self.precision_met():
+            self.stop_reason = "precision"
+        elif (
+            self.time_budget is not None
+            and self.runs > 0
+            and self.elapsed >= self.time_budget
+        ):
+            self.stop_reason = "time_budget"
+        elif self.runs >= self.max_runs:
+            self.stop_reason = "max_runs"
+        else:
+            return False
+        return True
@@ -0,0 +1,109 @@
+"""
+Provides lightweight resources for runs that don't need to track which
+individual resource each patient used.
+"""
+
+from bisect import insort_right
+
+
+# MARK: FastPriorityResource
+class FastPriorityResource:
+    """
+    Counter-based priority resource that doesn't identify individual
+    resources.
+
+    Behaves in the same way as Vidigi's `VidigiPriorityStore` - requests are
+    served in priority order (lower values first, then first come first
+    served), and a released resource is handed straight to the next waiting
+    request - so a model gives exactly the same results with either. Unlike
+    the store, it only keeps a count of the free resources rather than a
+    resource object for each, so the value of a granted request is None
+    rather than a resource with an `id_attribute`.
+
+    Parameters
+    ----------
+    env : simpy.Environment
+        The simulation environment.
+    capacity : int
+        Number of resources.
+
+    Attributes
+    ----------
+    capacity : int
+        Number of resources.
+    available : int
+        Number of resources not currently in use.
+    get_queue : list
+        Requests waiting for a resource, in the order they will be served.
+    """
+
+    def __init__(self, env, capacity):
+        self.env = env
+        self.capacity = capacity
+        self.available = capacity
+        self.get_queue = []
+        # Ties on priority are broken by the order the requests were made
+        self._request_counter = 0
+
+    def request(self, priority=0):
+        """
+        Request a resource, to be used as a context manager.
+
+        The resource is released when the `with` block is left, or the
+        request withdrawn if it hasn't been granted by then.
+
+        Parameters
+        ----------
+        priority : int, optional
+            Lower values are served first. Default 0.
+
+        Returns
+        -------
+        context manager
+            Yields the request event, which succeeds when a resource is
+            available.
+        """
+        return _FastPriorityRequest(self, priority)
+
+    def _get(self, priority):
+        event = self.env.event()
+        if self.available > 0:
+            self.available -= 1
+            event.succeed()
+        else:
+            insort_right(self.get_queue, (priority, self._request_counter, event))
+            self._request_counter += 1
+        return event
+
+    def _release(self):
+        if self.get_queue:
+            # Hand the resource straight to the next request
+            self.get_queue.pop(0)[2].succeed()
+        else:
+            self.available += 1
+
+    def _cancel(self, event):
+        for position, (_, _, waiting) in enumerate(self.get_queue):
+            if waiting is event:
+                del self.get_queue[position]
+                return
+
+
+class _FastPriorityRequest:
+    def __init__(self, resource, priority):
+        self.resource = resource
+        self.event = resource._get(priority)
+
+    def __enter__(self):
+        return self.event
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if self.event.triggered:
+            # The request was granted, so the resource is released
+            self.resource._release()
+        else:
+            # The block was left while still waiting (e.g. the process was
+            # interrupted), so the request is withdrawn, as simpy requests
+            # are
+            self.resource._cancel(self.event)
+        return False
@@ -0,0 +1,534 @@
+"""
+Provides efficient containers for recording patient-level results and resource
+use during a simulation run.
+"""
+
+import math
+
+import numpy as np
+import pandas as pd
+
+
+# MARK: ResultsStore
+class ResultsStore:
+    """
+    Columnar store for patient-level results, indexed by patient ID.
+
+    Each column is backed by a preallocated NumPy buffer (`float64` for
+    numeric columns, `object` for everything else) which doubles in size
+    when it runs out of space. Rows are allocated the first time a patient
+    ID is written to, so the row order of the final DataFrame matches the
+    order in which patients were first recorded - the same as enlarging a
+    DataFrame one cell at a time with `DataFrame.at`, but in amortised
+    constant time per write.
+
+    Parameters
+    ----------
+    columns : dict
+        Mapping of column name to column type, in the order the columns
+        should appear in the final DataFrame. Column types are either
+        `"numeric"` (stored as float64) or `"string"` (stored as object, which
+        also accommodates the boolean status flags recorded by the model).
+    index_name : str, optional
+        Name given to the index of the DataFrame built by `to_dataframe`.
+        Default is "Patient ID".
+    initial_capacity : int, optional
+        Number of rows to preallocate. Default is 1024.
+
+    Attributes
+    ----------
+    columns : list of str
+        Column names, in order.
+    index_name : str
+        Name of the index of the exported DataFrame.
+    """
+
+    def __init__(self, columns, index_name="Patient ID", initial_capacity=1024):
+        unknown_types = set(columns.values()) - {"numeric", "string"}
+        if unknown_types:
+            raise ValueError(
+                f"Column types must be 'numeric' or 'string', got {unknown_types}"
+            )
+
+        self.columns = list(columns)
+        self.index_name = index_name
+
+        self._column_types = dict(columns)
+        self._capacity = max(int(initial_capacity), 1)
+        self._ids = []
+        self._rows = {}
+        self._buffers = {
+            name: self._new_buffer(col_type, self._capacity)
+            for name, col_type in self._column_types.items()
+        }
+        # Position of the last row holding a non-missing value in each column
+        self._last_valid_row = {name: -1 for name in self.columns}
+
+    @staticmethod
+    def _new_buffer(col_type, size):
+        if col_type == "numeric":
+            return np.full(size, np.nan, dtype=np.float64)
+        buffer = np.empty(size, dtype=object)
+        buffer.fill(np.nan)
+        return buffer
+
+    def _grow(self):
+        new_capacity = self._capacity * 2
+        for name, old in self._buffers.items():
+            new = self._new_buffer(self._column_types[name], new_capacity)
+            new[: self._capacity] = old
+            self._buffers[name] = new
+        self._capacity = new_capacity
+
+    def _row_for(self, patient_id):
+        row = self._rows.get(patient_id)
+        if row is None:
+            row = len(self._ids)
+            if row == self._capacity:
+                self._grow()
+            self._rows[patient_id] = row
+            self._ids.append(patient_id)
+        return row
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __contains__(self, patient_id):
+        return patient_id in self._rows
+
+    def record(self, patient_id, column, value):
+        """
+        Record a single value for a patient, allocating a row if required.
+
+        Parameters
+        ----------
+        patient_id : int
+            Patient identifier (row label).
+        column : str
+            Name of the column to write to.
+        value : object
+            Value to store. Numeric columns coerce the value to float.
+        """
+        row = self._row_for(patient_id)
+        self._buffers[column][row] = value
+
+        if not pd.isna(value):
+            if row > self._last_valid_row[column]:
+                self._last_valid_row[column] = row
+        elif row == self._last_valid_row[column]:
+            valid = np.flatnonzero(pd.notna(self._buffers[column][:row]))
+            self._last_valid_row[column] = valid[-1] if len(valid) else -1
+
+    def get(self, patient_id, column):
+        """
+        Return the value recorded for a patient in a given column.
+
+        Raises
+        ------
+        KeyError
+            If nothing has been recorded for `patient_id`.
+        """
+        return self._buffers[column][self._rows[patient_id]]
+
+    def last_valid(self, column):
+        """
+        Return the most recently allocated row holding a value in a column.
+
+        This mirrors `Series.last_valid_index()` on the exported DataFrame,
+        without needing to build it.
+
+        Parameters
+        ----------
+        column : str
+            Name of the column to inspect.
+
+        Returns
+        -------
+        tuple
+            `(patient_id, value)`, or `(None, nan)` if the column holds no
+            values.
+        """
+        row = self._last_valid_row[column]
+        if row < 0:
+            return None, np.nan
+        return self._ids[row], self._buffers[column][row]
+
+    def to_dataframe(self):
+        """
+        Build a DataFrame of all recorded results.
+
+        Returns
+        -------
+        pd.DataFrame
+            One row per patient ID in first-recorded order, with the columns
+            in the order given at construction and the index named
+            `index_name`. Cells that were never written to are NaN.
+        """
+        n = len(self._ids)
+        df = pd.DataFrame(
+            {name: self._buffers[name][:n].copy() for name in self.columns},
+            index=pd.Index(self._ids, dtype=np.int64, name=self.index_name),
+        )
+        return df
+
+
+# MARK: KPIAccumulator
+class KPIAccumulator:
+    """
+    Running totals of a few numeric results columns, in place of a
+    `ResultsStore`.
+
+    Values are recorded in the same way as with `ResultsStore.record`, but
+    only the count, total, maximum and number of positive values of each
+    column in `columns` are kept, and values for other columns are
+    discarded. Memory use is therefore constant however many patients there
+    are, for runs where only run-level KPIs are needed.
+
+    Parameters
+    ----------
+    columns : iterable of str
+        Names of the columns to keep totals of.
+    ignored_ids : iterable of int, optional
+        Patient IDs whose values are discarded, e.g. to match a results
+        DataFrame that has those rows dropped.
+
+    Attributes
+    ----------
+    columns : list of str
+        Names of the columns totals are kept of.
+    """
+
+    def __init__(self, columns, ignored_ids=()):
+        self.columns = list(columns)
+        self._ignored_ids = frozenset(ignored_ids)
+        self._count = dict.fromkeys(self.columns, 0)
+        self._total = dict.fromkeys(self.columns, 0.0)
+        self._maximum = dict.fromkeys(self.columns, np.nan)
+        self._positive = dict.fromkeys(self.columns, 0)
+
+    def record(self, patient_id, column, value):
+        """
+        Add a value to the totals of its column.
+
+        Takes the same arguments as `ResultsStore.record`. Values for other
+        columns or ignored patients, and missing values, are discarded. Each
+        patient is assumed to have at most one value recorded per column.
+        """
+        if (
+            column not in self._count
+            or patient_id in self._ignored_ids
+            or pd.isna(value)
+        ):
+            return
+        self._count[column] += 1
+        self._total[column] += value
+        if not value <= self._maximum[column]:
+            self._maximum[column] = value
+        if value > 0:
+            self._positive[column] += 1
+
+    def summary(self):
+        """
+        Summarise each column.
+
+        Returns
+        -------
+        dict
+            For each column, a dict of the "mean" (NaN if nothing was
+            recorded), "max" (likewise), "sum" and number of values greater
+            than 0 ("positive"), as given by pandas for a column of a results
+            DataFrame.
+        """
+        return {
+            column: {
+                "mean": (
+                    self._total[column] / self._count[column]
+                    if self._count[column]
+                    else np.nan
+                ),
+                "max": self._maximum[column],
+                "sum": self._total[column],
+                "positive": self._positive[column],
+            }
+            for column in self.columns
+        }
+
+
+# MARK: TimeSeriesRecorder
+class TimeSeriesRecorder:
+    """
+    Columnar recorder for a time series, one row per recorded event.
+
+    Each column is backed by a preallocated, typed NumPy buffer which doubles
+    in size when it runs out of space, so appending a row takes amortised
+    constant time - unlike enlarging a DataFrame with `df.loc[len(df)] = row`,
+    which copies the whole DataFrame every time. The DataFrame is only built
+    once, by `to_dataframe`.
+
+    Parameters
+    ----------
+    columns : dict
+        Mapping of column name to NumPy dtype (e.g. `np.float64` or `bool`),
+        in the order the columns should appear in the final DataFrame.
+    initial_capacity : int, optional
+        Number of rows to preallocate. Default is 1024.
+
+    Attributes
+    ----------
+    columns : list of str
+        Column names, in order.
+    """
+
+    def __init__(self, columns, initial_capacity=1024):
+        self.columns = list(columns)
+
+        self._dtypes = {name: np.dtype(dtype) for name, dtype in columns.items()}
+        self._capacity = max(int(initial_capacity), 1)
+        self._length = 0
+        self._buffers = [
+            np.empty(self._capacity, dtype=self._dtypes[name]) for name in self.columns
+        ]
+
+    def _grow(self):
+        new_capacity = self._capacity * 2
+        for i, old in enumerate(self._buffers):
+            new = np.empty(new_capacity, dtype=old.dtype)
+            new[: self._capacity] = old
+            self._buffers[i] = new
+        self._capacity = new_capacity
+
+    def __len__(self):
+        return self._length
+
+    def append(self, *values):
+        """
+        Record a row.
+
+        Parameters
+        ----------
+        *values
+            One value per column, in column order. Values are converted to
+            the dtype of their column.
+        """
+        if len(values) != len(self._buffers):
+            raise ValueError(
+                f"Expected {len(self._buffers)} values (one per column), "
+                f"got {len(values)}"
+            )
+        row = self._length
+        if row == self._capacity:
+            self._grow()
+        for buffer, value in zip(self._buffers, values):
+            buffer[row] = value
+        self._length = row + 1
+
+    def to_dataframe(self):
+        """
+        Build a DataFrame of all recorded rows.
+
+        Returns
+        -------
+        pd.DataFrame
+            One row per recorded event in the order recorded, with a default
+            integer index and the columns in the order given at construction.
+        """
+        n = self._length
+        return pd.DataFrame(
+            {
+                name: buffer[:n].copy()
+                for name, buffer in zip(self.columns, self._buffers)
+            }
+        )
+
+
+# MARK: TimeWeightedStatistic
+class TimeWeightedStatistic:
+    """
+    Running time-weighted mean of a value that changes at discrete times.
+
+    Quantities such as the number of beds in use or the length of a queue are
+    constant between events, so their mean over a period is the integral of
+    the value over time divided by the length of the period. The integral is
+    accumulated each time the value changes rather than by recording every
+    change, so updating and reading the statistic take constant time and
+    memory however long the run.
+
+    Only time from `start` onwards is counted, so a warm-up period can be
+    excluded without resetting the statistic part way through the run. This
+    is unlike averaging the value at the times it changes (e.g. on each
+    admission), which over-represents busy periods, when changes are more
+    frequent.
+
+    Parameters
+    ----------
+    capacity : float, optional
+        Value at or above which the quantity is at capacity (e.g. the number
+        of beds). If None (the default), the time at capacity is always 0.
+    start : float, optional
+        Time from which to count. Default 0.
+    initial_value : float, optional
+        Value at time 0. Default 0.
+
+    Attributes
+    ----------
+    value : float
+        The current value.
+    capacity : float or None
+        Value at or above which the quantity is at capacity.
+    start : float
+        Time from which the value is counted.
+    """
+
+    def __init__(self, capacity=None, start=0.0, initial_value=0.0):
+        self.value = initial_value
+        self.capacity = capacity
+        self.start = start
+
+        self._last_time = 0.0
+        self._area = 0.0
+        self._time_at_capacity = 0.0
+        self._maximum = math.nan
+
+    def _totals(self, time):
+        # Area, time at capacity and maximum up to `time`, including the
+        # period the current value has been held for
+        counted_from = max(self._last_time, self.start)
+        area, time_at_capacity, maximum = (
+            self._area,
+            self._time_at_capacity,
+            self._maximum,
+        )
+        if time > counted_from:
+            duration = time - counted_from
+            area += self.value * duration
+            if self.capacity is not None and self.value >= self.capacity:
+                time_at_capacity += duration
+            if not self.value <= maximum:
+                maximum = self.value
+        return area, time_at_capacity, maximum
+
+    def update(self, time, value):
+        """
+        Record that the value changed at a given time.
+
+        Parameters
+        ----------
+        time : float
+            Time of the change. Must not be before the previous change.
+        value : float
+            The new value.
+        """
+        if time < self._last_time:
+            raise ValueError(
+                f"Cannot update at time {time}, before the last update at "
+                f"{self._last_time}"
+            )
+        self._area, self._time_at_capacity, self._maximum = self._totals(time)
+        self._last_time = time
+        self.value = value
+
+    def add(self, time, change=1):
+        """Record that the value changed by `change` at a given time."""
+        self.update(time, self.value + change)
+
+    def duration(self, time):
+        """Return the length of time counted up to `time`."""
+        return max(time - self.start, 0.0)
+
+    def mean(self, time):
+        """
+        Return the time-weighted mean from `start` up to a given time.
+
+        Parameters
+        ----------
+        time : float
+            End of the period, e.g. the end of the run.
+
+        Returns
+        -------
+        float
+            NaN if no time has been counted.
+        """
+        duration = self.duration(time)
+        if duration == 0:
+            return math.nan
+        return self._totals(time)[0] / duration
+
+    def time_at_capacity(self, time):
+        """Return the time spent at or above capacity up to a given time."""
+        return self._totals(time)[1]
+
+    def proportion_at_capacity(self, time):
+        """
+        Return the proportion of the time counted that was spent at or above
+        capacity (NaN if no time has been counted).
+        """
+        duration = self.duration(time)
+        if duration == 0:
+            return math.nan
+        return self.time_at_capacity(time) / duration
+
+    def maximum(self, time):
+        """
+        Return the largest value held for any length of time between `start`
+        and a given time (NaN if no time has been counted).
+        """
+        return self._totals(time)[2]
+
+
+# MARK: ResourceMonitor
+class ResourceMonitor:
+    """
+    Time-weighted use of a resource: how many are in use and how many
+    patients are queuing for one.
+
+    Parameters
+    ----------
+    capacity : int
+        Number of units of the resource (e.g. beds).
+    start : float, optional
+        Time from which to count, e.g. the end of the warm-up period.
+        Default 0.
+
+    Attributes
+    ----------
+    capacity : int
+        Number of units of the resource.
+    in_use : TimeWeightedStatistic
+        Number of units in use, which is at capacity when every unit is in
+        use.
+    queue : TimeWeightedStatistic
+        Number of patients waiting for a unit.
+    """
+
+    def __init__(self, capacity, start=0.0):
+        self.capacity = capacity
+        self.in_use = TimeWeightedStatistic(capacity=capacity, start=start)
+        self.queue = TimeWeightedStatistic(start=start)
+
+    def summary(self, time):
+        """
+        Summarise the use of the resource up to a given time.
+
+        Parameters
+        ----------
+        time : float
+            End of the period, e.g. the end of the run.
+
+        Returns
+        -------
+        dict
+            "mean_in_use", "utilisation" (mean in use as a proportion of
+            capacity, NaN if the capacity is 0), "proportion_at_capacity",
+            "mean_queue_length" and "max_queue_length".
+        """
+        mean_in_use = self.in_use.mean(time)
+        return {
+            "mean_in_use": mean_in_use,
+            "utilisation": (
+                mean_in_use / self.capacity if self.capacity > 0 else math.nan
+            ),
+            "proportion_at_capacity": self.in_use.proportion_at_capacity(time),
+            "mean_queue_length": self.queue.mean(time),
+            "max_queue_length": self.queue.maximum(time),
+        }
@@ -0,0 +1,266 @@
+"""
+Runs a grid of scenarios with common random numbers and compares each of them
+with a baseline scenario.
+"""
+
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from stroke_ward_model.inputs import g, Scenario
+from stroke_ward_model.replications import RunningStatistics
+from stroke_ward_model.trial import Trial, _run_replication
+
+
+def _run_sweep_replication(task):
+    """
+    Run one replication of one scenario, returning its run-level results.
+
+    This is defined at module level so that it can be sent to worker
+    processes.
+    """
+    config, run = task
+    return _run_replication(run, config)["results"]
+
+
+# MARK: Sweep
+class Sweep:
+    """
+    Every combination of a grid of parameter values, run with common random
+    numbers.
+
+    Replication `r` of every scenario seeds its random number streams from
+    `master_seed + r`, and each source of randomness (arrivals, each
+    activity time, each patient attribute) has its own stream. So the
+    scenarios see the same patients arriving at the same times with the same
+    attributes in each replication, and the differences between them in a
+    replication are down to the parameters that differ rather than chance.
+    Comparing the scenarios replication by replication (paired differences)
+    therefore needs far fewer replications for the same precision than
+    comparing independent trials.
+
+    Each replication of each scenario is a separate task, so `run` can share
+    them all between worker processes. The models record only the running
+    totals needed for the run-level results (`recording_level` "kpi"), as
+    patient-level data aren't returned.
+
+    Parameters
+    ----------
+    grid : dict
+        Mapping of `g` parameter name to a list of values, e.g.
+        `{"number_of_ward_beds": [40, 45, 49], "therapy_sdec": [False, True]}`.
+        Every combination of the values is a scenario.
+    base : Scenario, optional
+        The parameters shared by every scenario, including `number_of_runs`
+        and `master_seed`. Defaults to a snapshot of the current values in
+        `g`.
+    baseline : int or dict, optional
+        The scenario the others are compared with: either its position in
+        `scenarios`, or the grid values that identify it (e.g.
+        `{"number_of_ward_beds": 49, "therapy_sdec": False}`). Defaults to
+        the first scenario, which has the first value of each grid
+        parameter.
+
+    Attributes
+    ----------
+    scenarios : list of Scenario
+        A scenario for each combination of the grid values, in the order
+        given by `itertools.product`.
+    parameters : pd.DataFrame
+        The grid values of each scenario, indexed by scenario number (its
+        position in `scenarios`).
+    baseline : int
+        Scenario number of the baseline scenario.
+    kpis : list of str
+        The run-level results compared, which are the columns of
+        `Trial.df_trial_results`.
+    results : pd.DataFrame or None
+        The results returned by the last call to `run`.
+
+    Raises
+    ------
+    ValueError
+        If the grid varies `number_of_runs` or `master_seed` (which would
+        stop the replications being paired), or `baseline` doesn't match
+        exactly one scenario.
+    TypeError
+        If the grid has a parameter that isn't in `g`.
+    """
+
+    def __init__(self, grid, base=None, baseline=0):
+        for name in ("number_of_runs", "master_seed"):
+            if len(grid.get(name, [])) > 1:
+                raise ValueError(
+                    f"{name} can't vary between the scenarios of a sweep, as "
+                    f"their replications are paired"
+                )
+
+        self.base = Scenario(source=g) if base is None else base
+        combinations = [
+            dict(zip(grid, values)) for values in itertools.product(*grid.values())
+        ]
+        self.scenarios = [
+            self.base.replace(**combination) for combination in combinations
+        ]
+        self.parameters = pd.DataFrame(combinations, columns=list(grid))
+        self.parameters.index.name = "Scenario"
+        self.baseline = self._find_baseline(baseline)
+        self.kpis = list(Trial(self.base).df_trial_results.columns)
+        self.results = None
+
+    def _find_baseline(self, baseline):
+        if isinstance(baseline, dict):
+            unknown = set(baseline) - set(self.parameters.columns)
+            if unknown:
+                raise ValueError(
+                    f"baseline can only be given by grid parameters, got "
+                    f"{sorted(unknown)}"
+                )
+            matches = self.parameters.index[
+                (
+                    self.parameters[list(baseline)] == pd.Series(baseline)
+                ).all(axis=1)
+            ]
+            if len(matches) != 1:
+                raise ValueError(
+                    f"baseline must match exactly one scenario, but {baseline} "
+                    f"matches {len(matches)}"
+                )
+            return int(matches[0])
+
+        if not 0 <= baseline < len(self.scenarios):
+            raise ValueError(
+                f"baseline must be a scenario number from 0 to "
+                f"{len(self.scenarios) - 1}, got {baseline}"
+            )
+        return baseline
+
+    # MARK: M: run
+    def run(self, workers=None):
+        """
+        Run every replication of every scenario.
+
+        Parameters
+        ----------
+        workers : int, optional
+            Number of worker processes to share the replications between. If
+            None or 1 (the default), they are run one after another in this
+            process. The results are the same either way.
+
+        Returns
+        -------
+        pd.DataFrame
+            One row per scenario, replication and KPI (a "tidy" table), with
+            columns:
+
+            - "Scenario": the scenario number;
+            - a column for each grid parameter, holding its value;
+            - "Run": the replication (zero-indexed);
+            - "KPI": the name of the result (a column of
+              `Trial.df_trial_results`);
+            - "Value": the result;
+            - "Baseline Value": the result of the same replication of the
+              baseline scenario;
+            - "Difference": the paired difference, "Value" minus "Baseline
+              Value".
+
+            Also stored in `results`.
+        """
+        configs = [config.replace(recording_level="kpi") for config in self.scenarios]
+        task_numbers = [
+            (scenario, run)
+            for scenario in range(len(configs))
+            for run in range(self.base.number_of_runs)
+        ]
+        tasks = [(configs[scenario], run) for scenario, run in task_numbers]
+
+        if workers is not None and workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                # Send several tasks to a worker at a time, as there can be
+                # many short ones
+                chunksize = max(1, len(tasks) // (workers * 4))
+                run_results = list(
+                    executor.map(_run_sweep_replication, tasks, chunksize=chunksize)
+                )
+        else:
+            run_results = [_run_sweep_replication(task) for task in tasks]
+
+        wide = pd.DataFrame(run_results, columns=self.kpis)
+        wide.insert(0, "Scenario", [scenario for scenario, _ in task_numbers])
+        wide.insert(1, "Run", [run for _, run in task_numbers])
+
+        results = wide.melt(
+            id_vars=["Scenario", "Run"], var_name="KPI", value_name="Value"
+        )
+        baseline = results.loc[
+            results["Scenario"] == self.baseline, ["Run", "KPI", "Value"]
+        ].rename(columns={"Value": "Baseline Value"})
+        results = results.merge(baseline, on=["Run", "KPI"], how="left")
+        results["Difference"] = results["Value"] - results["Baseline Value"]
+
+        results = self.parameters.reset_index().merge(results, on="Scenario")
+        self.results = results.sort_values(
+            ["Scenario", "Run"], kind="stable", ignore_index=True
+        )
+        return self.results
+
+    # MARK: M: summarise
+    def summarise(self, confidence=0.95):
+        """
+        Summarise each scenario's results and its differences from the
+        baseline across the replications.
+
+        Parameters
+        ----------
+        confidence : float, optional
+            Confidence level of the intervals. Default 0.95.
+
+        Returns
+        -------
+        pd.DataFrame
+            One row per scenario and KPI, with the grid parameter values,
+            "Mean" (of the results), "Mean Difference" (from the baseline)
+            and the lower and upper limits of the paired t confidence
+            interval for the mean difference ("Difference CI Lower" and
+            "Difference CI Upper").
+
+        Raises
+        ------
+        RuntimeError
+            If `run` hasn't been called.
+        """
+        if self.results is None:
+            raise RuntimeError("The sweep must be run before it is summarised")
+
+        rows = []
+        group_columns = ["Scenario", *self.parameters.columns, "KPI"]
+        for keys, group in self.results.groupby(
+            group_columns, sort=False, dropna=False
+        ):
+            values = RunningStatistics()
+            differences = RunningStatistics()
+            for value, difference in zip(group["Value"], group["Difference"]):
+                values.add(value)
+                differences.add(difference)
+            half_width = differences.ci_half_width(confidence)
+            rows.append(
+                [
+                    *keys,
+                    values.mean,
+                    differences.mean,
+                    differences.mean - half_width,
+                    differences.mean + half_width,
+                ]
+            )
+
+        return pd.DataFrame(
+            rows,
+            columns=[
+                *group_columns,
+                "Mean",
+                "Mean Difference",
+                "Difference CI Lower",
+                "Difference CI Upper",
+            ],
+        )
@@ -2,9 +2,221 @@
 Runs multiple simulation replications and aggregates run-level results.
 """
 
-from stroke_ward_model.inputs import g
+import gc
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from pathlib import Path
+
+from stroke_ward_model.cache import ResultCache, scenario_key
+from stroke_ward_model.entities import patients_to_dataframe
+from stroke_ward_model.inputs import g, Scenario
 from stroke_ward_model.model import Model
+from stroke_ward_model.replications import ReplicationController, RunningStatistics
 import pandas as pd
+
+# Time-weighted resource use results added to each run's results, as
+# (resource, key of Model.resource_use[resource], df_trial_results column)
+def _resource_use_results(resource, name):
+    return [
+        (resource, "utilisation", f"{name} Utilisation"),
+        (resource, "mean_queue_length", f"Mean {name} Queue Length"),
+        (
+            resource,
+            "proportion_at_capacity",
+            f"Proportion of Time {name} at Capacity",
+        ),
+    ]
+
+
+RESOURCE_USE_RESULTS = [
+    *_resource_use_results("nurse", "Nurse"),
+    # Patients on the CTP pathway don't request the CTP scanner, so the
+    # number of scans at once isn't limited by the number of scanners and
+    # nobody queues. Only the mean number of scans at once is meaningful.
+    ("ctp", "mean_in_use", "Mean Concurrent CTP Scans"),
+    *_resource_use_results("sdec", "SDEC"),
+    *_resource_use_results("ward", "Ward"),
+]
+
+# Trial attributes that hold the outputs of its runs, which are what is stored
+# in the result cache
+CACHED_TRIAL_ATTRIBUTES = (
+    "df_trial_results",
+    "trial_patient_df",
+    "ward_occupancy_df",
+    "sdec_occupancy_df",
+    "trial_statistics",
+    "patient_data_files",
+    "replication_controller",
+)
+
+
+class TrialCancelled(Exception):
+    """Raised inside a trial's runs to stop it once it has been cancelled."""
+
+
+# MARK: Replications
+def _reduce_patient_data(patient_dataframe, run):
+    """
+    Reduce a run's patient-level data to a single row: the number of
+    patients and the mean of each numeric attribute.
+    """
+    summary = patient_dataframe.mean(numeric_only=True).drop("run")
+    summary["Number of Patients"] = len(patient_dataframe)
+    summary["run"] = run + 1
+    return summary.to_frame().T
+
+
+def _summarise_run(my_model, run, config=None):
+    """
+    Collect the outputs of a completed model run that a Trial keeps.
+
+    Parameters
+    ----------
+    my_model : Model
+        A model that has been run.
+    run : int
+        The run number of the model (zero-indexed).
+    config : Scenario, optional
+        The trial's parameters. If `config.streaming_trial` is True, the
+        patient-level and occupancy data are dropped, written to disk or
+        reduced as set by `config.streaming_patient_data`. Otherwise (or if
+        not given), they are all kept. Only data recorded at
+        `config.recording_level` is collected.
+
+    Returns
+    -------
+    dict
+        The run-level results row ("results"), the patient-level DataFrame
+        ("patients") and the ward and SDEC occupancy audits
+        ("ward_occupancy", "sdec_occupancy"), each tagged with the one-indexed
+        run number in a "run" column. When streaming, any of the DataFrames
+        that are not kept are None; if they are written to disk, "files"
+        lists the paths written. The patient-level data are None if
+        `config.recording_level` is "kpi", and the occupancy audits are None
+        unless it is "full".
+    """
+    recording_level = "full" if config is None else config.recording_level
+
+    patient_dataframe = None
+    if recording_level != "kpi":
+        patient_dataframe = patients_to_dataframe(my_model.patient_objects)
+        patient_dataframe["run"] = run + 1
+
+    occupancy = {"ward_occupancy": None, "sdec_occupancy": None}
+    if recording_level == "full":
+        my_model.ward_occupancy_graph_df["run"] = run + 1
+        my_model.sdec_occupancy_graph_df["run"] = run + 1
+
+        occupancy = {
+            "ward_occupancy": my_model.ward_occupancy_graph_df,
+            "sdec_occupancy": my_model.sdec_occupancy_graph_df,
+        }
+    files = []
+
+    if config is not None and config.streaming_trial:
+        if config.streaming_patient_data == "disk":
+            # Each scenario writes to its own subdirectory, so trials of
+            # different scenarios (e.g. run at the same time by the batch
+            # runner) don't overwrite each other's files
+            output_dir = Path(config.streaming_output_dir) / scenario_key(config)
+            output_dir.mkdir(parents=True, exist_ok=True)
+            for name, df in [("patients", patient_dataframe), *occupancy.items()]:
+                if df is None:
+                    continue
+                path = output_dir / f"{name}_run_{run + 1}.parquet"
+                df.to_parquet(path)
+                files.append(str(path))
+            patient_dataframe = None
+        elif config.streaming_patient_data == "summary":
+            if patient_dataframe is not None:
+                patient_dataframe = _reduce_patient_data(patient_dataframe, run)
+        elif config.streaming_patient_data == "drop":
+            patient_dataframe = None
+        else:
+            raise ValueError(
+                "streaming_patient_data must be 'drop', 'disk' or 'summary', "
+                f"got {config.streaming_patient_data!r}"
+            )
+        occupancy = {name: None for name in occupancy}
+
+    return {
+        "results": [
+            my_model.mean_q_time_nurse,
+            my_model.max_q_time_nurse,
+            my_model.number_of_admissions_avoided,
+            my_model.mean_q_time_ward,
+            my_model.max_q_time_ward,
+            my_model.mean_ward_occupancy,
+            my_model.admission_delays,
+            my_model.mean_los_ward,
+            my_model.sdec_financial_savings,
+            my_model.medical_staff_cost,
+            my_model.savings_sdec,
+            my_model.thrombolysis_savings,
+            my_model.total_savings,
+            my_model.mean_mrs_change,
+            my_model.patient_counter,
+            my_model.ich_patients_count,
+            my_model.i_patients_count,
+            my_model.tia_patients_count,
+            my_model.stroke_mimic_patient_count,
+            my_model.non_stroke_patient_count,
+            my_model.additional_thrombolysis_from_ctp,
+            *(
+                my_model.resource_use[resource][key]
+                for resource, key, _ in RESOURCE_USE_RESULTS
+            ),
+        ],
+        "patients": patient_dataframe,
+        **occupancy,
+        "files": files,
+    }
+
+
+def _run_replication(run, config):
+    """
+    Run a single replication and return its summarised outputs.
+
+    This is defined at module level so that it can be sent to worker
+    processes. Each replication seeds its own random number generators from
+    `config.master_seed + run`, so the results do not depend on which
+    process runs it or in what order.
+
+    Parameters
+    ----------
+    run : int
+        The run number (zero-indexed).
+    config : Scenario
+        The parameters to run the model with.
+
+    Returns
+    -------
+    dict
+        See `_summarise_run`.
+    """
+    my_model = Model(run, config)
+    my_model.run()
+    run_output = _summarise_run(my_model, run, config)
+    if config.streaming_trial:
+        del my_model
+        _collect_released_models()
+    return run_output
+
+
+def _collect_released_models():
+    """
+    Free models that are no longer referenced.
+
+    A model refers to itself through the SimPy processes running its methods,
+    so it is only freed by the garbage collector rather than as soon as it is
+    no longer used. Collecting straight away stops finished models building
+    up between collections.
+    """
+    gc.collect()
+
+
 # Class representing a Trial for our simulation - a batch of simulation runs.
 
 
@@ -15,28 +227,71 @@ class Trial:
     aggregating results.
 
     The Trial class manages the execution of multiple `Model` instances as
-    defined in the global configuration. It collects performance metrics,
+    defined in the scenario it is given. It collects performance metrics,
     financial data, and patient-level logs from each individual run into
     centralised DataFrames for cross-run analysis.
 
+    Parameters
+    ----------
+    config : Scenario, optional
+        The parameters to run every model in the trial with. Defaults to a
+        snapshot of the current values in `g`, taken when the trial is created.
+
     Attributes
     ----------
+    config : Scenario
+        The parameters the trial is run with.
     df_trial_results : pd.DataFrame
         A summary DataFrame where each row represents a single simulation run.
         Tracks metrics such as mean queue times, occupancy, and financial
-        savings.
+        savings, and the time-weighted utilisation, mean queue length and
+        proportion of time at capacity of each resource (see
+        `Model.resource_use`).
     model_objects : list
         A collection of `Model` instances created during the trial, allowing
-        for post-hoc inspection of specific run states.
+        for post-hoc inspection of specific run states. Only populated when
+        the runs are carried out in this process (i.e. not when `run_trial`
+        is called with `workers` greater than 1), as models cannot be
+        passed back from worker processes, and `config.streaming_trial` is
+        False.
     trial_patient_dataframes : list
         A list of DataFrames, each containing detailed attribute data for every
-        patient in a specific run.
+        patient in a specific run. When `config.streaming_trial` is True, this
+        holds one summary row per run if `config.streaming_patient_data` is
+        "summary", and is otherwise empty.
     trial_patient_df : pd.DataFrame
         The master DataFrame created by concatenating all patient-level data
-        across all runs in the trial.
+        across all runs in the trial (or their summary rows, when streaming
+        with `config.streaming_patient_data` set to "summary").
     trial_info : str
         A descriptive string containing the configuration settings used for
         the current trial (e.g., SDEC therapy status and resource availability).
+    trial_summary : dict
+        Trial-level means (or maxima) of the run results, keyed by the same
+        names as the `g.trial_*` dictionaries (e.g. "trial_mean_q_time_nurse").
+    trial_statistics : dict
+        Running statistics (`RunningStatistics`) of each column of
+        `df_trial_results`, updated as each run finishes.
+    patient_data_files : list of str
+        Paths of the files the patient-level and occupancy data of each run
+        were written to, when `config.streaming_trial` is True and
+        `config.streaming_patient_data` is "disk".
+    replication_controller : ReplicationController or None
+        The controller that decided how many runs to carry out, holding the
+        running statistics of the KPIs with precision targets and why it
+        stopped. None if a fixed `config.number_of_runs` was run.
+    loaded_from_cache : bool
+        Whether `run_trial` loaded the results from the result cache (see
+        `config.result_cache_dir`) rather than running the model. If so,
+        `model_objects` and the per-run lists of DataFrames are empty. A
+        cached trial whose run data were written to disk (see
+        `patient_data_files`) is run again if any of the files are missing.
+    completed_runs : int
+        Number of runs whose results have been added to the trial so far.
+    cancelled : bool
+        Whether the last call to `run_trial` was stopped early by `cancel`.
+        If so, the results only cover the `completed_runs` runs that
+        finished before it stopped.
 
     Notes
     -----
@@ -48,7 +303,9 @@ class Trial:
     # The constructor sets up a pandas dataframe that will store the key
     # results from each run with run number as the index.
 
-    def __init__(self):
+    def __init__(self, config=None):
+        self.config = Scenario(source=g) if config is None else config
+
         self.df_trial_results = pd.DataFrame()
         self.df_trial_results["Run Number"] = [0]
         self.df_trial_results["Mean Q Time Nurse (Mins)"] = [0.0]
@@ -74,6 +331,8 @@ class Trial:
         self.df_trial_results[
             "Mean Additional Thrombolysed Patients From CTP Running"
         ] = [0.0]
+        for _, _, column in RESOURCE_USE_RESULTS:
+            self.df_trial_results[column] = [0.0]
         self.df_trial_results.set_index("Run Number", inplace=True)
 
         self.ward_occupancy_audits = []
@@ -88,30 +347,297 @@ class Trial:
         self.trial_patient_dataframes = []
         self.trial_patient_df = pd.DataFrame()
 
+        self.trial_summary = {}
+
+        self.replication_controller = None
+
+        self.trial_statistics = {}
+        self.patient_data_files = []
+
+        self.loaded_from_cache = False
+
+        self.completed_runs = 0
+        self.cancelled = False
+        self._cancel_requested = threading.Event()
+        self._run_progress = None
+        self._model_progress = None
+
+    def cancel(self):
+        """
+        Stop the trial that is running as soon as possible.
+
+        Can be called from a progress callback given to `run_trial`, or from
+        another thread. A run being carried out in this process stops at its
+        next progress check (every `config.progress_interval` simulated
+        minutes) and its results are discarded; runs in worker processes that
+        have already started are allowed to finish, and those that haven't
+        started are not run. `run_trial` then returns normally with the
+        results of the runs that had finished, and sets `cancelled`.
+        """
+        self._cancel_requested.set()
+
+    def _check_cancelled(self):
+        if self._cancel_requested.is_set():
+            raise TrialCancelled("The trial was cancelled")
+
+    def _progress_hook(self, run):
+        """
+        Return the function passed to `Model.run` for a run carried out in
+        this process, which reports its progress and stops it if the trial
+        has been cancelled.
+        """
+
+        def progress(time, end_time):
+            if self._model_progress is not None:
+                self._model_progress(run, time, end_time)
+            self._check_cancelled()
+
+        return progress
+
+    def _run_in_process(self, run):
+        my_model = Model(run, self.config)
+        my_model.run(progress=self._progress_hook(run))
+
+        run_output = _summarise_run(my_model, run, self.config)
+
+        # When streaming, the model is released once its outputs have been
+        # summarised
+        if self.config.streaming_trial:
+            del my_model
+            _collect_released_models()
+        else:
+            self.model_objects.append(my_model)
+
+        return run_output
+
+    def _record_run(self, run, run_output):
+        """
+        Add the summarised outputs of a run to the trial's results, then
+        report progress and stop the trial if it has been cancelled.
+
+        Parameters
+        ----------
+        run : int
+            The run number (zero-indexed).
+        run_output : dict
+            See `_summarise_run`.
+
+        Raises
+        ------
+        TrialCancelled
+            If `cancel` has been called.
+        """
+        self.df_trial_results.loc[run] = run_output["results"]
+        for statistics, value in zip(
+            self.trial_statistics.values(), run_output["results"]
+        ):
+            statistics.add(value)
+
+        if run_output["patients"] is not None:
+            self.trial_patient_dataframes.append(run_output["patients"])
+        if run_output["ward_occupancy"] is not None:
+            self.ward_occupancy_audits.append(run_output["ward_occupancy"])
+        if run_output["sdec_occupancy"] is not None:
+            self.sdec_occupancy_audits.append(run_output["sdec_occupancy"])
+        self.patient_data_files.extend(run_output["files"])
+
+        self.completed_runs += 1
+        if self._run_progress is not None:
+            self._run_progress(self, run)
+        self._check_cancelled()
+
+    # MARK: M: sequential replications
+    def _run_until_stopped(self, workers=None):
+        """
+        Keep adding runs until the replication controller says to stop.
+
+        Runs are carried out one at a time, or in batches of `workers` runs
+        if `workers` is greater than 1. After each run (or batch) the running
+        statistics of the KPIs with precision targets are updated and the
+        controller checks whether to stop.
+
+        Parameters
+        ----------
+        workers : int, optional
+            Number of worker processes to run replications in.
+
+        Each run's outputs are added to the trial's results (see
+        `_record_run`) as soon as they are returned.
+        """
+        controller = self.replication_controller
+        kpi_names = list(self.df_trial_results.columns)
+
+        unknown = set(controller.targets) - set(kpi_names)
+        if unknown:
+            raise ValueError(
+                f"Replication targets must be columns of df_trial_results, "
+                f"got {sorted(unknown)}"
+            )
+
+        batch_size = workers if workers is not None and workers > 1 else 1
+        executor = (
+            ProcessPoolExecutor(max_workers=workers) if batch_size > 1 else None
+        )
+
+        controller.start()
+        try:
+            while not controller.should_stop():
+                runs = range(
+                    controller.runs,
+                    min(controller.runs + batch_size, controller.max_runs),
+                )
+                if executor is not None:
+                    batch_outputs = executor.map(
+                        _run_replication, runs, repeat(self.config)
+                    )
+                else:
+                    batch_outputs = (self._run_in_process(run) for run in runs)
+
+                for run, run_output in zip(runs, batch_outputs):
+                    controller.add_run(dict(zip(kpi_names, run_output["results"])))
+                    self._record_run(run, run_output)
+        finally:
+            if executor is not None:
+                # Runs that haven't started (if the trial was stopped part
+                # way through a batch) are not carried out
+                executor.shutdown(cancel_futures=True)
+
+    def _run_in_workers(self, workers):
+        """
+        Carry out `config.number_of_runs` runs in worker processes.
+
+        Parameters
+        ----------
+        workers : int
+            Number of worker processes to run replications in.
+        """
+        # Models hold running SimPy processes so cannot be sent back from
+        # the workers; only their summarised outputs are returned
+        executor = ProcessPoolExecutor(max_workers=workers)
+        try:
+            run_outputs = executor.map(
+                _run_replication,
+                range(self.config.number_of_runs),
+                repeat(self.config),
+            )
+            # executor.map returns results in run order, so the outputs
+            # are merged in the same order whether or not worker
+            # processes were used
+            for run, run_output in enumerate(run_outputs):
+                self._record_run(run, run_output)
+        finally:
+            # If the trial is stopped early, runs that haven't started are
+            # not carried out
+            executor.shutdown(cancel_futures=True)
+
+    # MARK: M: run replications
+    def _run_replications(self, workers=None):
+        """
+        Carry out the trial's runs and collect their outputs (steps 1 to 4
+        of `run_trial`).
+
+        Parameters
+        ----------
+        workers : int, optional
+            Number of worker processes to run replications in.
+        """
+        # Run the simulation for the number of runs specified in the config.
+        # For each run, we create a new instance of the Model class and call its
+        # run method, which sets everything else in motion.  Once the run has
+        # completed, we grab out the stored run results
+        # and store it against the run number in the trial results dataframe.
+
+        self.replication_controller = ReplicationController.from_config(self.config)
+
+        self.trial_statistics = {
+            col: RunningStatistics() for col in self.df_trial_results.columns
+        }
+
+        try:
+            if self.replication_controller is not None:
+                self._run_until_stopped(workers)
+            elif workers is not None and workers > 1:
+                self._run_in_workers(workers)
+            else:
+                for run in range(self.config.number_of_runs):
+                    self._record_run(run, self._run_in_process(run))
+        except TrialCancelled:
+            self.cancelled = True
+            if self.completed_runs == 0:
+                # Remove the placeholder row
+                self.df_trial_results = self.df_trial_results.iloc[0:0]
+
+        for attr, frames in [
+            ("trial_patient_df", self.trial_patient_dataframes),
+            ("ward_occupancy_df", self.ward_occupancy_audits),
+            ("sdec_occupancy_df", self.sdec_occupancy_audits),
+        ]:
+            if frames:
+                setattr(self, attr, pd.concat(frames))
+
     # MARK: M: run_trial
     # Method to run a trial
 
-    def run_trial(self):
+    def run_trial(self, workers=None, run_progress=None, model_progress=None):
         """
         Executes the batch of simulation runs and aggregates the resulting data.
 
-        This method performs the following steps:
+        This method performs the following steps (if `config.result_cache_dir`
+        is set and the same scenario has already been run, steps 1 to 4 are
+        skipped and their outputs loaded from the cache instead - see
+        `ResultCache`):
 
-        1. Loops through the number of runs specified in `g.number_of_runs`.
+        1. Loops through the number of runs specified in `config.number_of_runs`
+        (or, if `config.replication_targets` or `config.replication_time_budget`
+        is set, keeps adding runs until the precision targets or time budget
+        are met - see `ReplicationController`).
 
-        2. Instantiates and executes a `Model` for each run.
+        2. Instantiates and executes a `Model` for each run, passing it `config`.
+        If `workers` is greater than 1 the runs are shared between that many
+        worker processes.
 
         3. Collects summary metrics (e.g., queue times, savings) into `df_trial_results`.
 
         4. Flattens patient-level data into a single master DataFrame.
-
-        5. Calculates trial-level means and updates the global `g` class attributes.
-
-        6. Optionally exports results to a CSV file if `g.write_to_csv` is True.
-
-        This method dynamically updates the global configuration class `g` by
-        calculating the mean of results across all runs and storing them in
-        dictionaries keyed by the trial counter.
+        If `config.streaming_trial` is True, each model is released as soon
+        as its run has been summarised, and its patient-level and occupancy
+        data are dropped, written to disk or reduced to a summary row (see
+        `config.streaming_patient_data`), so memory use does not grow with
+        the number of runs beyond one row of `df_trial_results` per run.
+
+        5. Calculates trial-level means into `trial_summary` (from the running
+        statistics in `trial_statistics` when streaming), and also updates
+        the global `g` class attributes.
+
+        6. Optionally exports results to a CSV file if `config.write_to_csv` is True.
+
+        The trial-level means are stored in `trial_summary`. For compatibility
+        with existing scripts they are also stored in dictionaries on the
+        global configuration class `g`, keyed by the trial counter; code that
+        may run several trials at once should read `trial_summary` instead.
+
+        Parameters
+        ----------
+        workers : int, optional
+            Number of worker processes to run replications in. If None or 1
+            (the default), runs are carried out one after another in this
+            process. Results are identical either way, as each run is seeded
+            from `config.master_seed` plus its run number and results are
+            merged in run order; however, `model_objects` is left empty when
+            worker processes are used.
+        run_progress : callable, optional
+            Called as `run_progress(trial, run)` each time a run's results
+            have been added to the trial, e.g. to show a progress bar (using
+            `completed_runs`) or early estimates of the results (from
+            `trial_statistics`).
+        model_progress : callable, optional
+            Called as `model_progress(run, time, end_time)` during each run
+            carried out in this process, every `config.progress_interval`
+            simulated minutes (see `Model.run`). Not called for runs in
+            worker processes.
+
+        Either callback may call `cancel` to stop the trial early. Exceptions
+        raised by them are not caught, and also stop the trial.
 
         See Also
         --------
@@ -123,62 +649,47 @@ class Trial:
         of Google Gemini Flash.
         All generated content has been thoroughly reviewed.
         """
-        # Run the simulation for the number of runs specified in g class.
-        # For each run, we create a new instance of the Model class and call its
-        # run method, which sets everything else in motion.  Once the run has
-        # completed, we grab out the stored run results
-        # and store it against the run number in the trial results dataframe.
-
-        for run in range(g.number_of_runs):
-            my_model = Model(run)
-            my_model.run()
-
-            self.model_objects.append(my_model)
-
-            self.df_trial_results.loc[run] = [
-                my_model.mean_q_time_nurse,
-                my_model.max_q_time_nurse,
-                my_model.number_of_admissions_avoided,
-                my_model.mean_q_time_ward,
-                my_model.max_q_time_ward,
-                my_model.mean_ward_occupancy,
-                my_model.admission_delays,
-                my_model.mean_los_ward,
-                my_model.sdec_financial_savings,
-                my_model.medical_staff_cost,
-                my_model.savings_sdec,
-                my_model.thrombolysis_savings,
-                my_model.total_savings,
-                my_model.mean_mrs_change,
-                my_model.patient_counter,
-                my_model.ich_patients_count,
-                my_model.i_patients_count,
-                my_model.tia_patients_count,
-                my_model.stroke_mimic_patient_count,
-                my_model.non_stroke_patient_count,
-                my_model.additional_thrombolysis_from_ctp,
-            ]
-
-            # self.patient_objects[run] = my_model.patient_objects
-            patient_dataframe = pd.DataFrame(
-                [p.__dict__ for p in my_model.patient_objects]
-            )
-            patient_dataframe["run"] = run + 1
-            self.trial_patient_dataframes.append(patient_dataframe)
-
-            my_model.ward_occupancy_graph_df["run"] = run + 1
-            self.ward_occupancy_audits.append(my_model.ward_occupancy_graph_df)
-
-            my_model.sdec_occupancy_graph_df["run"] = run + 1
-            self.sdec_occupancy_audits.append(my_model.sdec_occupancy_graph_df)
+        self._cancel_requested.clear()
+        self.cancelled = False
+        self._run_progress = run_progress
+        self._model_progress = model_progress
+
+        # If this scenario has already been run, load its results from the
+        # cache instead of running it again
+        cache = ResultCache.from_config(self.config)
+        cached_outputs = None if cache is None else cache.get(self.config)
+        # The cache only holds the paths of run data written to disk, so
+        # the entry can't be used if any of the files have been removed
+        if cached_outputs is not None and not all(
+            Path(path).exists()
+            for path in cached_outputs.get("patient_data_files", [])
+        ):
+            cached_outputs = None
+
+        self.loaded_from_cache = cached_outputs is not None
+        if cached_outputs is not None:
+            for attr, value in cached_outputs.items():
+                setattr(self, attr, value)
+            self.completed_runs = len(self.df_trial_results)
+        else:
+            try:
+                self._run_replications(workers)
+            finally:
+                self._run_progress = None
+                self._model_progress = None
+            # The results of a cancelled trial are incomplete, so aren't
+            # cached
+            if cache is not None and not self.cancelled:
+                cache.put(
+                    self.config,
+                    {attr: getattr(self, attr) for attr in CACHED_TRIAL_ATTRIBUTES},
+                )
 
-        self.trial_patient_df = pd.concat(self.trial_patient_dataframes)
-        self.ward_occupancy_df = pd.concat(self.ward_occupancy_audits)
-        self.sdec_occupancy_df = pd.concat(self.sdec_occupancy_audits)
+        trials_run_counter = self.config.trials_run_counter
 
-        if g.write_to_csv == True:
+        if self.config.write_to_csv == True:
             self.df_trial_results.to_csv(
-                f"trial {g.trials_run_counter} trial results.csv", index=False
+                f"trial {trials_run_counter} trial results.csv", index=False
             )
 
         # TODO: SR: FIX appending of per-run graphs to trial class
@@ -192,6 +703,8 @@ class Trial:
         # (eg "trial_mean_q_time_nurse")
 
         # The mean is stored against the key of g.trials_run_counter.
+        # The same values are also kept on the trial itself in trial_summary,
+        # which is what should be read when several trials run at once.
 
         for attr, col in [
             ("trial_mean_q_time_nurse", "Mean Q Time Nurse (Mins)"),
@@ -223,84 +736,88 @@ class Trial:
             # create it. Creates a mean of each trial and creates a dictionary
             # that can be read later.
 
+            if self.config.streaming_trial:
+                # Use the running statistics updated as each run finished
+                statistics = self.trial_statistics[col]
+                value = statistics.maximum if "max" in attr else statistics.mean
+            elif "max" in attr:
+                value = self.df_trial_results[col].max()
+            else:
+                value = self.df_trial_results[col].mean()
+            self.trial_summary[attr] = round(value, 2)
+
             if not hasattr(g, attr):
                 setattr(g, attr, {})
-            if "max" in attr:
-                getattr(g, attr)[g.trials_run_counter] = round(
-                    self.df_trial_results[col].max(), 2
-                )
-            else:
-                getattr(g, attr)[g.trials_run_counter] = round(
-                    self.df_trial_results[col].mean(), 2
-                )
+            getattr(g, attr)[trials_run_counter] = self.trial_summary[attr]
 
         # Code to store the configuration that was used for this trial.
         self.trial_info = (
-            f"Trial {g.trials_run_counter}, SDEC Therapy = {g.therapy_sdec},"
-            f" SDEC Open % = {g.sdec_value}, CTP Open % = {g.ctp_value}"
+            f"Trial {trials_run_counter}, SDEC Therapy = {self.config.therapy_sdec},"
+            f" SDEC Open % = {self.config.sdec_value},"
+            f" CTP Open % = {self.config.ctp_value}"
         )
 
         print("---------------------------------------------------")
         print(f"{self.trial_info}")
-        print(f"Trial {g.trials_run_counter} Results:")
+        print(f"Trial {trials_run_counter} Results:")
         print(" ")
         print(
             f"Trial Mean Q Time Nurse (Mins):     \
-              {g.trial_mean_q_time_nurse[g.trials_run_counter]}"
+              {self.trial_summary['trial_mean_q_time_nurse']}"
         )
         print(
             f"Trial Max Q Time Nurse (Mins):     \
-              {g.trial_max_q_time_nurse[g.trials_run_counter]}"
+              {self.trial_summary['trial_max_q_time_nurse']}"
         )
         print(
             f"Trial Number of Admissions Avoided: \
-              {g.trial_number_of_admissions_avoided[g.trials_run_counter]}"
+              {self.trial_summary['trial_number_of_admissions_avoided']}"
         )
         print(
             f"Trial Mean Q Time Ward (Hours):     \
-              {g.trial_mean_q_time_ward[g.trials_run_counter]}"
+              {self.trial_summary['trial_mean_q_time_ward']}"
         )
         print(
             f"Trial Max Q Time Ward (Hours):     \
-              {g.trial_max_q_time_ward[g.trials_run_counter]}"
+              {self.trial_summary['trial_max_q_time_ward']}"
         )
         print(
             f"Trial Mean Ward Occupancy:          \
-              {g.trial_mean_occupancy[g.trials_run_counter]}"
+              {self.trial_summary['trial_mean_occupancy']}"
         )
         print(
             f"Trial Number of Admission Delays:   \
-              {g.trial_number_of_admission_delays[g.trials_run_counter]}"
+              {self.trial_summary['trial_number_of_admission_delays']}"
         )
         print(
             f"Trial SDEC Total Savings (£):       \
-              {g.trial_financial_savings_of_a_a[g.trials_run_counter]}"
+              {self.trial_summary['trial_financial_savings_of_a_a']}"
         )
         print(
             f"Trial SDEC Medical Cost (£):        \
-              {g.sdec_medical_cost[g.trials_run_counter]}"
+              {self.trial_summary['sdec_medical_cost']}"
         )
         print(
             f"Trial SDEC Savings - Cost (£):      \
-              {g.trial_sdec_financial_savings[g.trials_run_counter]}"
+              {self.trial_summary['trial_sdec_financial_savings']}"
         )
         print(
             f"Trial Thrombolysis Savings (£):     \
-              {g.trial_thrombolysis_savings[g.trials_run_counter]}"
+              {self.trial_summary['trial_thrombolysis_savings']}"
         )
         print(
             f"Trial Total Savings (£):            \
-              {g.trial_total_savings[g.trials_run_counter]}"
+              {self.trial_summary['trial_total_savings']}"
         )
         print(
             f"Mean MRS Change:                    \
-              {g.trial_mrs_change[g.trials_run_counter]}"
+              {self.trial_summary['trial_mrs_change']}"
         )
         print(
             f"Mean Assessed Patients:                    \
-              {g.trial_patient_count[g.trials_run_counter]}"
+              {self.trial_summary['trial_patient_count']}"
         )
         print(
             f"Mean Additional Thrombolysed Patients From CTP Running:                    \
-              {g.trial_additional_thrombolysis_from_ctp[g.trials_run_counter]}"
+              {self.trial_summary['trial_additional_thrombolysis_from_ctp']}"
         )
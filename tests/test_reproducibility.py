@@ -94,3 +94,31 @@ def test_different_seed_different_results():
         df_patient_log_1,
         df_patient_log_2,
     )
+
+
+def test_parallel_matches_serial():
+    """Running replications in worker processes gives identical results."""
+    _configure_for_trial()
+    g.number_of_runs = 3
+
+    serial_trial = Trial()
+    serial_trial.run_trial()
+
+    parallel_trial = Trial()
+    parallel_trial.run_trial(workers=2)
+
+    for attr in [
+        "df_trial_results",
+        "trial_patient_df",
+        "ward_occupancy_df",
+        "sdec_occupancy_df",
+    ]:
+        pd.testing.assert_frame_equal(
+            getattr(serial_trial, attr),
+            getattr(parallel_trial, attr),
+            check_exact=True,
+        )
+
+    assert parallel_trial.trial_summary == serial_trial.trial_summary
+    # Models are not returned from worker processes
+    assert parallel_trial.model_objects == []
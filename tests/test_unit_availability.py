@@ -0,0 +1,158 @@
+"""
+Unit tests for availability.py
+"""
+
+import numpy as np
+import pytest
+
+from stroke_ward_model.availability import AvailabilityCalendar
+
+
+# ----------------------------------------------------------------------------
+# Construction
+# ----------------------------------------------------------------------------
+
+
+def test_calendar_merges_and_wraps_windows():
+    """Overlapping windows merge and windows past the period wrap around."""
+    calendar = AvailabilityCalendar([(600, 720), (700, 800), (1380, 1500)])
+
+    assert calendar.open_windows == ((0, 60), (600, 800), (1380, 1440))
+
+
+@pytest.mark.parametrize(
+    "windows, period",
+    [
+        ([(100, 50)], 1440),  # ends before it starts
+        ([(0, 2000)], 1440),  # longer than the period
+        ([(0, 10)], 0),  # no period
+    ],
+)
+def test_calendar_rejects_invalid_windows(windows, period):
+    with pytest.raises(ValueError):
+        AvailabilityCalendar(windows, period=period)
+
+
+def test_calendar_equality_and_hash():
+    calendar = AvailabilityCalendar.from_opening_hours([(8, 20)])
+
+    assert calendar == AvailabilityCalendar([(480, 1200)])
+    assert hash(calendar) == hash(AvailabilityCalendar([(480, 1200)]))
+    assert calendar != AvailabilityCalendar([(480, 1200)], origin=10)
+
+
+# ----------------------------------------------------------------------------
+# is_open()
+# ----------------------------------------------------------------------------
+
+
+def test_calendar_is_open_matches_windows():
+    """The minute lookup table should agree with checking the windows."""
+    windows = [(480.5, 720.25), (780, 1200)]
+    calendar = AvailabilityCalendar(windows)
+
+    times = np.random.default_rng(1).uniform(0, 1440 * 10, 5000)
+    times = np.concatenate([times, [480.5, 720.25, 780, 1200, 1440 + 480.4]])
+    for time in times:
+        expected = any(start <= time % 1440 < end for start, end in windows)
+        assert calendar.is_open(time) == expected
+        assert calendar.is_closed(time) != expected
+
+
+def test_calendar_open_before_origin():
+    calendar = AvailabilityCalendar([(0, 10)], period=40, origin=100)
+
+    assert calendar.is_open(50)
+    assert calendar.is_open(105)
+    assert calendar.is_closed(115)
+    assert calendar.is_open(140)
+
+
+@pytest.mark.parametrize(
+    "open_time, closed_time, start",
+    [(10, 30, 0), (480, 960, 420), (1440 * 0.333, 1440 * 0.667, 60), (60, 10, 0)],
+)
+def test_calendar_from_cycle_matches_alternating_process(
+    open_time, closed_time, start
+):
+    """
+    A cycle calendar should match a unit that waits until `start`, then
+    alternates between staying open for `open_time` and closing for
+    `closed_time`.
+    """
+    calendar = AvailabilityCalendar.from_cycle(open_time, closed_time, start=start)
+
+    changes = []
+    time = start
+    while time < 1440 * 5:
+        time += open_time
+        changes.append((time, False))
+        time += closed_time
+        changes.append((time, True))
+
+    for time in np.random.default_rng(2).uniform(0, 1440 * 5, 2000):
+        previous = [is_open for change, is_open in changes if change <= time]
+        expected = previous[-1] if previous else True
+        assert calendar.is_open(time) == expected
+
+
+def test_calendar_from_cycle_edge_cases():
+    assert AvailabilityCalendar.from_cycle(0, 0) == AvailabilityCalendar.always_open()
+    assert AvailabilityCalendar.from_cycle(1440, 0).is_open(1e7)
+    assert AvailabilityCalendar.from_cycle(0, 100, start=60).is_closed(1e7)
+
+
+def test_calendar_weekend_opening_hours():
+    calendar = AvailabilityCalendar.from_opening_hours(
+        [(8, 12), (14, 20)], weekend_hours=[(10, 16)], first_weekday=4
+    )
+
+    # Day 0 is a Friday, days 1 and 2 are the weekend
+    assert calendar.is_open(9 * 60)
+    assert calendar.is_closed(13 * 60)
+    assert calendar.is_closed(1440 + 9 * 60)
+    assert calendar.is_open(1440 + 13 * 60)
+    assert calendar.is_open(1440 * 3 + 9 * 60)
+    # The week repeats
+    assert calendar.is_open(1440 * 8 + 13 * 60)
+
+
+def test_calendar_overnight_opening_hours():
+    calendar = AvailabilityCalendar.from_opening_hours([(20, 30)])
+
+    assert calendar.is_open(23 * 60)
+    assert calendar.is_open(1440 + 5 * 60)
+    assert calendar.is_closed(1440 + 7 * 60)
+
+
+# ----------------------------------------------------------------------------
+# count_openings() and next_change()
+# ----------------------------------------------------------------------------
+
+
+def test_calendar_count_openings():
+    calendar = AvailabilityCalendar.from_cycle(10, 30, start=0)
+
+    # Reopens at 40, 80, 120, ...
+    assert calendar.count_openings(0, 40) == 0
+    assert calendar.count_openings(0, 41) == 1
+    assert calendar.count_openings(40, 200) == 3
+    assert calendar.count_openings(0, 0) == 0
+    assert AvailabilityCalendar.always_open().count_openings(0, 1e6) == 0
+
+    # A window that doesn't start at the beginning of the period
+    daily = AvailabilityCalendar.from_opening_hours([(8, 20)])
+    assert daily.count_openings(0, 1440 * 3) == 3
+
+
+def test_calendar_next_change():
+    calendar = AvailabilityCalendar.from_cycle(10, 30, start=100)
+
+    assert calendar.next_change(0) == 110
+    assert calendar.next_change(110) == 140
+    assert calendar.next_change(145) == 150
+    assert AvailabilityCalendar.always_open().next_change(0) is None
+
+    daily = AvailabilityCalendar.from_opening_hours([(8, 20)])
+    assert daily.next_change(0) == 480
+    assert daily.next_change(1300) == 1440 + 480
@@ -0,0 +1,236 @@
+"""
+Unit tests for batch.py
+"""
+
+import json
+
+import pandas as pd
+import pytest
+
+from stroke_ward_model.batch import (
+    COMBINED_RESULTS,
+    load_scenarios,
+    main,
+    run_scenarios,
+)
+from stroke_ward_model.inputs import Scenario
+from stroke_ward_model.trial import Trial
+
+# Short trials, so the tests run quickly
+SHORT_TRIAL = {
+    "show_trace": False,
+    "number_of_runs": 2,
+    "sim_duration": 1440 * 20,
+    "warm_up_period": 1440 * 5,
+}
+
+
+def _write_json(path, contents):
+    path.write_text(json.dumps(contents))
+    return path
+
+
+# ----------------------------------------------------------------------------
+# load_scenarios()
+# ----------------------------------------------------------------------------
+
+
+def test_load_scenarios_from_list(tmp_path):
+    path = _write_json(
+        tmp_path / "scenarios.json",
+        [{"number_of_ward_beds": 40}, {"name": "Big ward", "number_of_ward_beds": 60}],
+    )
+    names, scenarios = load_scenarios(path)
+
+    assert names == [None, "Big ward"]
+    assert [s.number_of_ward_beds for s in scenarios] == [40, 60]
+    assert [s.trials_run_counter for s in scenarios] == [1, 2]
+    assert scenarios[0] == Scenario(number_of_ward_beds=40, trials_run_counter=1)
+
+
+def test_load_scenarios_expands_grid_for_each_scenario(tmp_path):
+    path = _write_json(
+        tmp_path / "scenarios.json",
+        {
+            "base": {"number_of_runs": 3, "sdec_beds": 4},
+            "scenarios": [{"therapy_sdec": False}, {"therapy_sdec": True}],
+            "grid": {"number_of_ward_beds": [40, 49], "sdec_beds": [5, 6]},
+        },
+    )
+    _, scenarios = load_scenarios(path)
+
+    assert len(scenarios) == 8
+    assert all(s.number_of_runs == 3 for s in scenarios)
+    assert [
+        (s.therapy_sdec, s.number_of_ward_beds, s.sdec_beds) for s in scenarios[:4]
+    ] == [(False, 40, 5), (False, 40, 6), (False, 49, 5), (False, 49, 6)]
+    assert all(s.therapy_sdec for s in scenarios[4:])
+
+
+def test_load_scenarios_converts_opening_percentages(tmp_path):
+    path = _write_json(
+        tmp_path / "scenarios.json",
+        [
+            {"sdec_value": 25, "ctp_value": 100},
+            # An opening cycle given directly isn't changed
+            {"sdec_value": 25, "sdec_unav_freq": 60, "sdec_unav_time": 60},
+        ],
+    )
+    _, (converted, direct) = load_scenarios(path)
+
+    assert converted.sdec_unav_freq == 360
+    assert converted.sdec_unav_time == 1080
+    assert converted.ctp_unav_freq == 1440
+    assert converted.ctp_unav_time == 0
+    assert (direct.sdec_unav_freq, direct.sdec_unav_time) == (60, 60)
+
+
+def test_load_scenarios_from_csv(tmp_path):
+    path = tmp_path / "scenarios.csv"
+    path.write_text(
+        "name,number_of_ward_beds,therapy_sdec,sdec_beds\n"
+        "a,40,True,\n"
+        "b,45,False,6\n"
+    )
+    names, scenarios = load_scenarios(path)
+
+    assert names == ["a", "b"]
+    assert [s.number_of_ward_beds for s in scenarios] == [40, 45]
+    assert type(scenarios[0].number_of_ward_beds) is int
+    assert [s.therapy_sdec for s in scenarios] == [True, False]
+    # Empty cells are left at their default
+    assert scenarios[0].sdec_beds == Scenario().sdec_beds
+    assert scenarios[1].sdec_beds == 6
+
+
+def test_load_scenarios_from_csv_keeps_integers_with_empty_cells(tmp_path):
+    path = tmp_path / "scenarios.csv"
+    path.write_text(
+        "name,number_of_ward_beds,therapy_sdec\n"
+        "a,40,True\n"
+        "b,,False\n"
+    )
+    _, scenarios = load_scenarios(path)
+
+    assert scenarios[0].number_of_ward_beds == 40
+    assert type(scenarios[0].number_of_ward_beds) is int
+    assert scenarios[1].number_of_ward_beds == Scenario().number_of_ward_beds
+
+    # The scenarios can be run
+    combined = run_scenarios(
+        [scenario.replace(**SHORT_TRIAL) for scenario in scenarios], quiet=True
+    )
+    assert len(combined) == 2
+
+
+def test_load_scenarios_from_yaml(tmp_path):
+    pytest.importorskip("yaml")
+    path = tmp_path / "scenarios.yaml"
+    path.write_text(
+        "base:\n"
+        "  number_of_runs: 4\n"
+        "grid:\n"
+        "  number_of_ward_beds: [30, 35]\n"
+    )
+    _, scenarios = load_scenarios(path)
+
+    assert [(s.number_of_runs, s.number_of_ward_beds) for s in scenarios] == [
+        (4, 30),
+        (4, 35),
+    ]
+
+
+def test_load_scenarios_applies_overrides(tmp_path):
+    path = _write_json(tmp_path / "scenarios.json", [{"result_cache_dir": "a"}])
+    _, (scenario,) = load_scenarios(path, result_cache_dir="b")
+    assert scenario.result_cache_dir == "b"
+
+
+@pytest.mark.parametrize(
+    "filename, contents, error",
+    [
+        ("scenarios.txt", "[]", ValueError),
+        ("scenarios.json", '{"scenario": []}', ValueError),
+        ("scenarios.json", '[{"sdec_value": 120}]', ValueError),
+        ("scenarios.json", '[{"ward_beds": 40}]', TypeError),
+    ],
+)
+def test_load_scenarios_rejects_invalid_files(tmp_path, filename, contents, error):
+    path = tmp_path / filename
+    path.write_text(contents)
+    with pytest.raises(error):
+        load_scenarios(path)
+
+
+# ----------------------------------------------------------------------------
+# run_scenarios() and main()
+# ----------------------------------------------------------------------------
+
+
+@pytest.fixture(scope="module")
+def short_scenarios():
+    return [
+        Scenario(number_of_ward_beds=beds, trials_run_counter=number, **SHORT_TRIAL)
+        for number, beds in enumerate([8, 12], start=1)
+    ]
+
+
+@pytest.fixture(scope="module")
+def combined_results(short_scenarios):
+    return run_scenarios(short_scenarios, names=["small", "large"], quiet=True)
+
+
+def test_run_scenarios_combines_trial_summaries(short_scenarios, combined_results):
+    assert list(combined_results.index) == [1, 2]
+    assert combined_results.index.name == "Trial Number"
+    assert list(combined_results.columns) == [
+        "Scenario",
+        "number_of_ward_beds",
+    ] + [column for _, column in COMBINED_RESULTS]
+    assert list(combined_results["Scenario"]) == ["small", "large"]
+
+    for number, scenario in zip([1, 2], short_scenarios):
+        trial = Trial(scenario)
+        trial.run_trial()
+        for key, column in COMBINED_RESULTS:
+            assert combined_results.loc[number, column] == pytest.approx(
+                trial.trial_summary[key]
+            )
+
+
+def test_run_scenarios_in_workers_gives_same_results(
+    short_scenarios, combined_results
+):
+    parallel = run_scenarios(
+        short_scenarios, names=["small", "large"], workers=2, quiet=True
+    )
+    pd.testing.assert_frame_equal(parallel, combined_results)
+
+
+def test_main_writes_combined_results(tmp_path, short_scenarios, combined_results):
+    path = _write_json(
+        tmp_path / "scenarios.json",
+        {
+            "base": SHORT_TRIAL,
+            "scenarios": [
+                {"name": "small", "number_of_ward_beds": 8},
+                {"name": "large", "number_of_ward_beds": 12},
+            ],
+        },
+    )
+    output = tmp_path / "out" / "results.csv"
+
+    assert main([str(path), "--output", str(output), "--quiet"]) == 0
+
+    written = pd.read_csv(output, index_col="Trial Number")
+    pd.testing.assert_frame_equal(written, combined_results, check_dtype=False)
+
+
+def test_main_uses_result_cache(tmp_path):
+    path = _write_json(tmp_path / "scenarios.json", [SHORT_TRIAL])
+    cache_dir = tmp_path / "cache"
+    args = [str(path), "--output", str(tmp_path / "results.csv"), "--quiet"]
+
+    main(args + ["--cache-dir", str(cache_dir)])
+
+    assert len(list(cache_dir.glob("*/*.pkl"))) == 1
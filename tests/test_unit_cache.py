@@ -0,0 +1,150 @@
+"""
+Unit tests for cache.py
+"""
+
+import os
+
+import pandas as pd
+
+from stroke_ward_model.availability import AvailabilityCalendar
+from stroke_ward_model.cache import ResultCache, model_version, scenario_key
+from stroke_ward_model.inputs import Scenario
+
+
+# ----------------------------------------------------------------------------
+# scenario_key() and model_version()
+# ----------------------------------------------------------------------------
+
+
+def test_scenario_key_depends_on_results_parameters():
+    scenario = Scenario(number_of_ward_beds=20)
+
+    assert scenario_key(scenario) == scenario_key(Scenario(number_of_ward_beds=20))
+    for changed in [
+        scenario.replace(number_of_ward_beds=21),
+        scenario.replace(master_seed=43),
+        scenario.replace(number_of_runs=11),
+        scenario.replace(sdec_calendar=AvailabilityCalendar([(480, 1200)])),
+    ]:
+        assert scenario_key(changed) != scenario_key(scenario)
+
+
+def test_scenario_key_ignores_output_settings():
+    scenario = Scenario()
+
+    assert scenario_key(scenario) == scenario_key(
+        scenario.replace(show_trace=True, trials_run_counter=5, result_cache_dir="x")
+    )
+
+
+def test_model_version_includes_package_version_and_source():
+    version = model_version()
+    package_version, fingerprint = version.split("+")
+
+    assert package_version
+    assert len(fingerprint) == 12
+    assert model_version() == version
+
+
+# ----------------------------------------------------------------------------
+# ResultCache
+# ----------------------------------------------------------------------------
+
+
+def _outputs(value):
+    return {"df_trial_results": pd.DataFrame({"Total Savings": [value]})}
+
+
+def test_result_cache_round_trip(tmp_path):
+    cache = ResultCache(tmp_path, version="1")
+    scenario = Scenario()
+
+    assert cache.get(scenario) is None
+    assert scenario not in cache
+
+    cache.put(scenario, _outputs(1.0))
+
+    assert scenario in cache
+    assert len(cache) == 1
+    pd.testing.assert_frame_equal(
+        cache.get(scenario)["df_trial_results"], _outputs(1.0)["df_trial_results"]
+    )
+    assert cache.get(scenario.replace(master_seed=1)) is None
+
+
+def _set_last_used(cache, scenario, time):
+    path = cache._path(scenario)
+    os.utime(path, ns=(time, time))
+
+
+def test_result_cache_evicts_least_recently_used(tmp_path):
+    cache = ResultCache(tmp_path, max_entries=2, version="1")
+    scenarios = [Scenario(master_seed=seed) for seed in range(3)]
+
+    cache.put(scenarios[0], _outputs(0))
+    cache.put(scenarios[1], _outputs(1))
+    _set_last_used(cache, scenarios[0], 1_000)
+    _set_last_used(cache, scenarios[1], 2_000)
+
+    # Reading scenario 0 makes scenario 1 the least recently used
+    cache.get(scenarios[0])
+    cache.put(scenarios[2], _outputs(2))
+
+    assert len(cache) == 2
+    assert scenarios[0] in cache
+    assert scenarios[1] not in cache
+    assert scenarios[2] in cache
+
+
+def test_result_cache_evicts_by_size(tmp_path):
+    cache = ResultCache(tmp_path, version="1")
+    path = cache.put(Scenario(master_seed=0), _outputs(0))
+    _set_last_used(cache, Scenario(master_seed=0), 1_000)
+
+    cache.max_bytes = path.stat().st_size * 1.5
+    cache.put(Scenario(master_seed=1), _outputs(1))
+
+    assert len(cache) == 1
+    assert Scenario(master_seed=1) in cache
+
+
+def test_result_cache_versions_are_separate(tmp_path):
+    old = ResultCache(tmp_path, version="old")
+    new = ResultCache(tmp_path, version="new")
+    scenario = Scenario()
+
+    old.put(scenario, _outputs(1.0))
+    assert new.get(scenario) is None
+
+    new.put(scenario, _outputs(2.0))
+    new.invalidate_other_versions()
+    assert scenario not in old
+    assert scenario in new
+
+    new.invalidate()
+    assert len(new) == 0
+
+
+def test_result_cache_removes_unreadable_entries(tmp_path):
+    cache = ResultCache(tmp_path, version="1")
+    path = cache.put(Scenario(), _outputs(1.0))
+    path.write_bytes(b"not a pickle")
+
+    assert cache.get(Scenario()) is None
+    assert not path.exists()
+
+
+def test_result_cache_from_config(tmp_path):
+    assert ResultCache.from_config(Scenario(result_cache_dir=None)) is None
+
+    cache = ResultCache.from_config(
+        Scenario(
+            result_cache_dir=str(tmp_path),
+            result_cache_max_entries=3,
+            result_cache_max_mb=2,
+        )
+    )
+    assert cache.directory == tmp_path
+    assert cache.max_entries == 3
+    assert cache.max_bytes == 2 * 1024**2
+    assert cache.version == model_version()
@@ -3,16 +3,32 @@ Unit tests for distributions.py
 """
 
 import numpy as np
+import pandas as pd
 import pytest
 from sim_tools.time_dependent import nspp_simulation
+from sim_tools.distributions import DiscreteEmpirical, Exponential, Normal
 
-from stroke_ward_model.inputs import g
-from stroke_ward_model.distributions import initialise_distributions
+from stroke_ward_model.inputs import g, Scenario
+from stroke_ward_model.distributions import (
+    initialise_distributions,
+    BufferedSampler,
+    generate_arrival_schedule,
+    generate_patient_attribute_table,
+    sample_patient_attributes,
+    ArrivalSchedule,
+    PatientAttributeTable,
+    WardStayEngine,
+    WardStayRule,
+    WARD_STAY_RULES,
+    NSPPPiecewiseConstant,
+    NSPPThinningModified,
+)
 
 
 class Dummy:
-    def __init__(self, run_number=0):
+    def __init__(self, run_number=0, **config_overrides):
         self.run_number = run_number
+        self.config = Scenario(**config_overrides)
 
 
 @pytest.mark.parametrize(
@@ -132,3 +148,395 @@ def test_nspp():
             rtol=0.15,  # 15% relative tolerance
             atol=0.02,
         )
+
+
+@pytest.mark.parametrize(
+    "arrival_sampler, expected_class",
+    [
+        ("thinning", NSPPThinningModified),
+        ("inversion", NSPPPiecewiseConstant),
+    ],
+)
+def test_arrival_sampler_selection(arrival_sampler, expected_class):
+    """The arrival sampler used should follow config.arrival_sampler."""
+    dummy = Dummy(run_number=0, arrival_sampler=arrival_sampler)
+    initialise_distributions(dummy)
+
+    assert isinstance(dummy.patient_inter_dist, expected_class)
+
+
+def test_arrival_sampler_invalid():
+    """An unknown arrival sampler should raise an error."""
+    dummy = Dummy(run_number=0, arrival_sampler="rejection")
+
+    with pytest.raises(ValueError):
+        initialise_distributions(dummy)
+
+
+def _iat_table():
+    t = np.arange(0, 24 * 60, 60)
+    return pd.DataFrame({"t": t, "mean_iat": np.where(t >= 7 * 60, 200.0, 666.67)})
+
+
+@pytest.mark.parametrize(
+    "time", [0.0, 59.9, 60.0, 419.5, 1439.99, 1440.0, 98765.4]
+)
+def test_nspp_piecewise_constant_inverse_hazard(time):
+    """inverse_hazard() should undo hazard()."""
+    dist = NSPPPiecewiseConstant(data=_iat_table(), interval_width=60)
+
+    assert dist.inverse_hazard(dist.hazard(time)) == pytest.approx(time)
+
+
+def test_nspp_piecewise_constant_hazard_over_a_day():
+    """The hazard over a day is the expected number of arrivals in a day."""
+    data = _iat_table()
+    dist = NSPPPiecewiseConstant(data=data, interval_width=60)
+
+    expected = (60 / data["mean_iat"]).sum()
+    assert dist.hazard(1440) == pytest.approx(expected)
+    assert dist.hazard(1440 * 3) == pytest.approx(3 * expected)
+
+
+def test_nspp_piecewise_constant_arrival_rates():
+    """Simulated arrivals per hour should match the rate in each hour."""
+    data = _iat_table()
+    dist = NSPPPiecewiseConstant(data=data, interval_width=60, random_seed=42)
+
+    days = 365 * 5
+    now = 0.0
+    arrival_times = []
+    while now < 1440 * days:
+        now += dist.sample(simulation_time=now)
+        arrival_times.append(now)
+        assert dist.rejects_last_sample == 0
+
+    arrival_times = np.array(arrival_times[:-1])
+    hours = ((arrival_times % 1440) // 60).astype(int)
+    simulated = np.bincount(hours, minlength=24) / days
+    expected = 60 / data["mean_iat"].to_numpy()
+
+    np.testing.assert_allclose(simulated, expected, rtol=0.15, atol=0.02)
+
+
+def _sample_one_at_a_time(dist, run_length):
+    now = 0.0
+    interarrival_times = []
+    while True:
+        sampled = dist.sample(simulation_time=now)
+        if now + sampled >= run_length:
+            return np.array(interarrival_times)
+        interarrival_times.append(sampled)
+        now += sampled
+
+
+def test_nspp_thinning_vectorised_matches_sample():
+    """Vectorised thinning should give the same arrivals as sample()."""
+    run_length = 1440 * 60
+    dist_1 = NSPPThinningModified(_iat_table(), 60, random_seed1=1, random_seed2=2)
+    dist_2 = NSPPThinningModified(_iat_table(), 60, random_seed1=1, random_seed2=2)
+
+    np.testing.assert_array_equal(
+        dist_1.sample_interarrival_times(run_length),
+        _sample_one_at_a_time(dist_2, run_length),
+    )
+
+
+def test_nspp_piecewise_constant_vectorised_matches_sample():
+    """Vectorised inversion should give the same arrivals as sample()."""
+    run_length = 1440 * 60
+    dist_1 = NSPPPiecewiseConstant(_iat_table(), 60, random_seed=1)
+    dist_2 = NSPPPiecewiseConstant(_iat_table(), 60, random_seed=1)
+
+    vectorised = dist_1.sample_interarrival_times(run_length)
+    one_at_a_time = _sample_one_at_a_time(dist_2, run_length)
+
+    # Equal up to floating-point rounding
+    assert len(vectorised) == len(one_at_a_time)
+    np.testing.assert_allclose(
+        np.cumsum(vectorised), np.cumsum(one_at_a_time), rtol=1e-9
+    )
+
+
+def test_generate_arrival_schedule():
+    """The schedule covers the whole run, with consistent attributes."""
+    config = Scenario(sim_duration=1440 * 30, warm_up_period=1440 * 5)
+    schedule = generate_arrival_schedule(config, run_number=0)
+
+    assert isinstance(schedule, ArrivalSchedule)
+    assert len(schedule) > 0
+    assert schedule.arrival_times[-1] < 1440 * 35
+    assert set(np.unique(schedule.onset_type)) <= {0, 1, 2}
+
+    # In-hours flags follow the in-hours and out-of-hours start times
+    hour = (schedule.arrival_times % 1440) // 60
+    np.testing.assert_array_equal(
+        schedule.in_hours,
+        (hour >= config.in_hours_start) | (hour < config.ooh_start),
+    )
+
+    df = schedule.to_dataframe()
+    assert list(df.columns) == [
+        "arrival_time",
+        "interarrival_time",
+        "in_hours",
+        "onset_type",
+    ]
+    assert df.index[0] == 1 and len(df) == len(schedule)
+
+
+def test_arrival_schedule_matches_demand():
+    """Schedules can be shared only between scenarios with the same demand."""
+    config = Scenario(sim_duration=1440 * 30, warm_up_period=1440 * 5)
+    schedule = generate_arrival_schedule(config, run_number=0)
+
+    assert schedule.matches(config, 0)
+    assert schedule.matches(config.replace(number_of_ward_beds=20), 0)
+    assert not schedule.matches(config, 1)
+    assert not schedule.matches(config.replace(patient_inter_day=100.0), 0)
+
+
+@pytest.mark.parametrize(
+    "make_dist",
+    [
+        lambda: Exponential(mean=10, random_seed=42),
+        lambda: Normal(mean=5, sigma=3, minimum=0, random_seed=42),
+        lambda: DiscreteEmpirical(values=[0, 1, 2], freq=[1, 2, 3], random_seed=42),
+    ],
+)
+def test_buffered_sampler_matches_unbuffered(make_dist):
+    """Buffered samples should equal unbuffered samples for the same seed."""
+    unbuffered = make_dist()
+    buffered = BufferedSampler(make_dist(), block_size=7)
+
+    expected = [unbuffered.sample() for _ in range(30)]
+    # Mix single values with blocks which cross the end of the buffer
+    result = [buffered.sample() for _ in range(5)]
+    result += buffered.sample(size=20).tolist()
+    result += [buffered.sample() for _ in range(5)]
+
+    assert result == expected
+    assert [type(v) for v in result] == [type(v) for v in expected]
+
+
+def test_buffered_sampler_delegates_attributes():
+    """Attributes of the wrapped distribution should still be available."""
+    dist = DiscreteEmpirical(values=[0, 1, 2], freq=[1, 2, 3], random_seed=42)
+    buffered = BufferedSampler(dist)
+
+    assert buffered.distribution is dist
+    assert buffered.block_size == 4096
+    assert list(buffered.values) == [0, 1, 2]
+    with pytest.raises(AttributeError):
+        buffered.not_an_attribute
+
+
+@pytest.mark.parametrize("buffered_sampling", [True, False])
+def test_buffered_sampling_selection(buffered_sampling):
+    """All Exponential, Normal and DiscreteEmpirical are wrapped if selected."""
+    dummy = Dummy(buffered_sampling=buffered_sampling)
+    initialise_distributions(dummy)
+
+    wrapped = [v for v in vars(dummy).values() if isinstance(v, BufferedSampler)]
+    unwrapped = [
+        v
+        for v in vars(dummy).values()
+        if isinstance(v, (Exponential, Normal, DiscreteEmpirical))
+    ]
+    if buffered_sampling:
+        assert len(wrapped) > 0 and unwrapped == []
+    else:
+        assert wrapped == [] and len(unwrapped) > 0
+    # The arrivals sampler is never wrapped
+    assert isinstance(dummy.patient_inter_dist, NSPPThinningModified)
+
+
+def _sample_attributes_one_at_a_time(dummy):
+    # The per-patient sampling previously done in Model.set_patient_attributes
+    ich = dummy.ich_range_distribution.sample()
+    i = max(dummy.i_range_distribution.sample(), ich)
+    tia = max(dummy.tia_range_distribution.sample(), i)
+    stroke_mimic = max(dummy.stroke_mimic_range_distribution.sample(), tia)
+    non_stroke = max(dummy.non_stroke_range_distribution.sample(), stroke_mimic)
+    diagnosis = dummy.diagnosis_distribution.sample()
+    if diagnosis <= ich:
+        patient_diagnosis = 0
+    elif diagnosis <= i:
+        patient_diagnosis = 1
+    elif diagnosis <= tia:
+        patient_diagnosis = 2
+    elif diagnosis <= stroke_mimic:
+        patient_diagnosis = 3
+    else:
+        patient_diagnosis = 4
+    return (
+        min(round(dummy.mrs_type_distribution.sample()), 5),
+        diagnosis,
+        dummy.non_admission_distribution.sample(),
+        dummy.tia_admission_chance_distribution.sample(),
+        dummy.stroke_mimic_admission_chance_distribution.sample(),
+        ich,
+        i,
+        tia,
+        stroke_mimic,
+        non_stroke,
+        patient_diagnosis,
+    )
+
+
+def test_patient_attribute_table_matches_one_at_a_time():
+    """Batched attributes should equal attributes sampled one at a time."""
+    dummy = Dummy(run_number=4)
+    initialise_distributions(dummy)
+    expected = [_sample_attributes_one_at_a_time(dummy) for _ in range(2000)]
+
+    table = generate_patient_attribute_table(Scenario(), run_number=4, n_patients=2000)
+
+    assert len(table) == 2000
+    assert list(table.rows()) == expected
+    # Every diagnosis category should be represented
+    assert set(table["patient_diagnosis"]) == {0, 1, 2, 3, 4}
+
+
+def test_patient_attribute_table_concat_matches_single_batch():
+    """Sampling in several blocks should give the same rows as one block."""
+    dummy = Dummy(run_number=1)
+    initialise_distributions(dummy)
+    blocks = [sample_patient_attributes(dummy, n) for n in [3, 10, 7]]
+
+    joined = PatientAttributeTable.concat(blocks)
+    single = generate_patient_attribute_table(Scenario(), run_number=1, n_patients=20)
+
+    assert list(joined.rows()) == list(single.rows())
+
+
+def test_patient_attribute_table_to_dataframe():
+    """The table can be exported with one row per patient ID."""
+    table = generate_patient_attribute_table(Scenario(), run_number=0, n_patients=50)
+    df = table.to_dataframe()
+
+    assert list(df.columns) == list(PatientAttributeTable.COLUMNS) + [
+        "patient_diagnosis_type"
+    ]
+    assert df.index.name == "Patient ID"
+    assert list(df.index) == list(range(1, 51))
+    assert (df["i_range"] >= df["ich_range"]).all()
+    assert (df["non_stroke_range"] >= df["stroke_mimic_range"]).all()
+    assert df["mrs_type"].between(0, 5).all()
+    expected_type = df["patient_diagnosis"].map(
+        {0: "ICH", 1: "I", 2: "TIA", 3: "Stroke Mimic", 4: "Non Stroke"}
+    )
+    assert (df["patient_diagnosis_type"] == expected_type).all()
+
+
+def test_patient_attribute_table_invalid_columns():
+    """Missing or mismatched columns are rejected."""
+    columns = {name: np.zeros(3) for name in PatientAttributeTable.COLUMNS}
+
+    with pytest.raises(ValueError):
+        PatientAttributeTable({**columns, "mrs_type": np.zeros(2)})
+
+    del columns["ich_range"]
+    with pytest.raises(ValueError):
+        PatientAttributeTable(columns)
+
+
+def _ward_stay_engine(run_number=0):
+    dummy = Dummy(run_number=run_number)
+    initialise_distributions(dummy)
+    return dummy, dummy.ward_stay_engine
+
+
+def test_ward_stay_rules_cover_every_diagnosis_and_mrs():
+    """There is a rule for every diagnosis category and mRS on admission."""
+    assert set(WARD_STAY_RULES) == {(d, m) for d in range(5) for m in range(6)}
+
+
+def test_ward_stay_engine_follows_rules():
+    """Each stay uses the distributions and MRS rules for the patient."""
+    dummy, engine = _ward_stay_engine()
+    save = dummy.config.thrombolysis_los_save
+
+    # ICH with mRS 0 is discharged with the same mRS, and isn't affected by
+    # thrombolysis
+    los, thrombolysed_los, mrs_discharge = engine.sample(0, 0, thrombolysis=True)
+    assert los > 0 and thrombolysed_los is None and mrs_discharge == 0
+
+    # Thrombolysed ischaemic stroke stays are shortened, and mRS can drop by
+    # up to 2
+    reductions = set()
+    for _ in range(200):
+        los, thrombolysed_los, mrs_discharge = engine.sample(1, 4, thrombolysis=True)
+        assert thrombolysed_los == los * save
+        reductions.add(4 - mrs_discharge)
+    assert reductions == {0, 1, 2}
+
+    # ...but not if they weren't thrombolysed
+    reductions = set()
+    for _ in range(200):
+        los, thrombolysed_los, mrs_discharge = engine.sample(1, 4, thrombolysis=False)
+        assert thrombolysed_los is None
+        reductions.add(4 - mrs_discharge)
+    assert reductions == {0, 1}
+
+    # No mRS on discharge is recorded for TIA, stroke mimic or non-stroke
+    for diagnosis in [2, 3, 4]:
+        assert engine.sample(diagnosis, 3)[2] is None
+
+
+def test_ward_stay_engine_uses_model_distributions():
+    """The LOS is drawn from the distribution named in the rule."""
+    dummy_1, engine = _ward_stay_engine(run_number=2)
+    dummy_2, _ = _ward_stay_engine(run_number=2)
+
+    assert engine.sample(0, 3)[0] == dummy_2.ich_ward_time_mrs_3_dist.sample()
+    assert engine.sample(1, 5)[0] == dummy_2.i_ward_time_mrs_5_dist.sample()
+    assert engine.sample(4, 0)[0] == dummy_2.non_stroke_ward_time_dist.sample()
+
+
+def test_ward_stay_engine_batch_matches_one_at_a_time():
+    """Batched stays should equal stays sampled one patient at a time."""
+    rng = np.random.default_rng(7)
+    patient_diagnosis = rng.integers(0, 5, size=500)
+    mrs_type = rng.integers(0, 6, size=500)
+    thrombolysis = rng.random(500) < 0.5
+
+    _, engine = _ward_stay_engine(run_number=3)
+    expected = pd.DataFrame(
+        [
+            engine.sample(d, m, t)
+            for d, m, t in zip(
+                patient_diagnosis.tolist(), mrs_type.tolist(), thrombolysis.tolist()
+            )
+        ],
+        columns=["los", "thrombolysed_los", "mrs_discharge"],
+    ).astype(float)
+
+    _, batch_engine = _ward_stay_engine(run_number=3)
+    batch = batch_engine.sample_batch(patient_diagnosis, mrs_type, thrombolysis)
+
+    pd.testing.assert_frame_equal(batch, expected, check_exact=True)
+
+
+def test_ward_stay_engine_custom_rules():
+    """New diagnoses and distributions can be added as rules."""
+    dummy = Dummy()
+    initialise_distributions(dummy)
+    dummy.stroke_unit_los_dist = DiscreteEmpirical(
+        values=[1440, 2880], freq=[1, 1], random_seed=99
+    )
+    rules = {
+        **WARD_STAY_RULES,
+        (5, 2): WardStayRule(
+            los="stroke_unit_los_dist", mrs_reduction="mrs_reduction_during_stay"
+        ),
+    }
+    engine = WardStayEngine(dummy, thrombolysis_los_save=0.5, rules=rules)
+
+    los, thrombolysed_los, mrs_discharge = engine.sample(5, 2, thrombolysis=True)
+    assert los in {1440, 2880}
+    assert thrombolysed_los is None
+    assert mrs_discharge in {1, 2}
+
+    with pytest.raises(KeyError):
+        engine.sample(6, 0)
@@ -3,9 +3,15 @@ Unit tests for entities.py
 """
 
 import numpy as np
+import pandas as pd
 import pytest
 
-from stroke_ward_model.entities import Patient
+from stroke_ward_model.entities import (
+    Patient,
+    PatientRegister,
+    patients_to_dataframe,
+    validate_patients,
+)
 
 
 @pytest.mark.parametrize(
@@ -117,3 +123,146 @@ def test_patient_default_attributes(
         isinstance(value, float) and np.isnan(value)
     ):
         assert value in allowed_values
+
+
+def test_patient_has_no_instance_dict():
+    """Attributes are held in slots, so unknown attributes can't be set."""
+    patient = Patient(p_id=1)
+
+    assert not hasattr(patient, "__dict__")
+    with pytest.raises(AttributeError):
+        patient.not_an_attribute = 1
+
+
+def test_patient_to_dict():
+    """to_dict() returns every attribute in slot order."""
+    patient = Patient(p_id=7)
+    patient.ward_los = 12.5
+
+    as_dict = patient.to_dict()
+    assert list(as_dict) == list(Patient.__slots__)
+    assert as_dict["id"] == 7
+    assert as_dict["ward_los"] == 12.5
+
+
+def test_patients_to_dataframe_matches_list_of_dicts():
+    """The fast export should match a DataFrame built from dictionaries."""
+    patients = [Patient(p_id=i) for i in range(1, 6)]
+    for i, patient in enumerate(patients):
+        patient.mrs_type = i
+        patient.patient_diagnosis_type = "TIA" if i % 2 else "I"
+        patient.sdec_pathway = bool(i % 2)
+        patient.ward_los = float(i) if i > 2 else np.nan
+
+    expected = pd.DataFrame([p.to_dict() for p in patients])
+    pd.testing.assert_frame_equal(
+        patients_to_dataframe(patients), expected, check_exact=True
+    )
+
+
+def test_patients_to_dataframe_columns():
+    """A subset of columns can be exported, in the order given."""
+    patients = [Patient(p_id=i) for i in range(1, 4)]
+    full = patients_to_dataframe(patients)
+
+    for columns in [["ward_los", "id"], ["mrs_type"]]:
+        pd.testing.assert_frame_equal(
+            patients_to_dataframe(patients, columns=columns), full[columns]
+        )
+
+
+def test_patients_to_dataframe_empty():
+    """No patients gives an empty DataFrame with every column."""
+    df = patients_to_dataframe([])
+
+    assert df.empty
+    assert list(df.columns) == list(Patient.__slots__)
+
+
+def _valid_patient(p_id):
+    patient = Patient(p_id=p_id)
+    for field in Patient._required_fields:
+        setattr(patient, field, False)
+    patient.clock_start = 10.0
+    patient.exit_time = 20.0
+    return patient
+
+
+def test_validate_patients_passes_valid_patients():
+    """Patients with every required field set pass, like Patient.validate()."""
+    patients = [_valid_patient(i) for i in range(1, 4)]
+    for patient in patients:
+        patient.validate()
+
+    validate_patients(patients_to_dataframe(patients))
+    validate_patients(patients_to_dataframe([]))
+
+
+def test_validate_patients_names_failing_patients_and_fields():
+    """The error should name each failing patient ID and its missing fields."""
+    patients = [_valid_patient(i) for i in range(1, 6)]
+    patients[1].sdec_pathway = None
+    patients[1].exit_time = np.nan
+    patients[3].arrived_ooh = None
+
+    # The same patients fail the per-object check
+    failing = []
+    for patient in patients:
+        try:
+            patient.validate()
+        except ValueError:
+            failing.append(patient.id)
+    assert failing == [2, 4]
+
+    with pytest.raises(ValueError) as error:
+        validate_patients(patients_to_dataframe(patients))
+
+    message = str(error.value)
+    assert "2 patient(s)" in message
+    assert "Patient 2: missing fields ['sdec_pathway', 'exit_time']" in message
+    assert "Patient 4: missing fields ['arrived_ooh']" in message
+    assert "Patient 1:" not in message
+
+
+def test_patient_register_add_and_remove():
+    """Patients can be added, counted, listed in order and removed."""
+    register = PatientRegister()
+    patients = [Patient(p_id=i) for i in [3, 1, 2]]
+    for patient in patients:
+        register.add(patient)
+
+    assert len(register) == 3
+    assert patients[0] in register
+    assert register.ids() == [3, 1, 2]
+    assert register.occupants() == patients
+
+    register.remove(patients[1])
+    assert len(register) == 2
+    assert patients[1] not in register
+    assert list(register) == [patients[0], patients[2]]
+
+
+def test_patient_register_errors():
+    """Adding a patient twice or removing an absent one raises ValueError."""
+    register = PatientRegister()
+    patient = Patient(p_id=1)
+    register.add(patient)
+
+    with pytest.raises(ValueError):
+        register.add(patient)
+
+    register.remove(patient)
+    with pytest.raises(ValueError):
+        register.remove(patient)
+
+
+def test_patient_register_iteration_allows_removal():
+    """Patients can be removed while iterating over the register."""
+    register = PatientRegister()
+    for i in range(5):
+        register.add(Patient(p_id=i))
+
+    for patient in register:
+        register.remove(patient)
+
+    assert len(register) == 0
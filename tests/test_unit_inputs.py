@@ -2,10 +2,12 @@
 Unit tests for inputs.py
 """
 
+import pickle
+
 import numpy as np
 import pytest
 
-from stroke_ward_model.inputs import g
+from stroke_ward_model.inputs import g, Scenario, RUNTIME_STATE_ATTRIBUTES
 
 
 @pytest.mark.parametrize(
@@ -15,10 +17,29 @@ from stroke_ward_model.inputs import g
         ("sim_duration", (int,), 525600, None),
         ("number_of_runs", (int,), 10, None),
         ("warm_up_period", (float, int, np.floating), g.sim_duration / 5, None),
+        ("replication_targets", (type(None),), None, None),
+        ("replication_time_budget", (type(None),), None, None),
+        ("replication_confidence", (float,), 0.95, None),
+        ("replication_min_runs", (int,), 5, None),
+        ("replication_max_runs", (int,), 1000, None),
+        ("streaming_trial", (bool,), False, {True, False}),
+        ("streaming_patient_data", (str,), "summary", {"summary", "disk", "drop"}),
+        ("streaming_output_dir", (str,), "trial_output", None),
+        ("result_cache_dir", (type(None),), None, None),
+        ("result_cache_max_entries", (int,), 100, None),
+        ("result_cache_max_mb", (int, float), 1024, None),
+        ("progress_interval", (int,), 10080, None),
 
         # Patient interarrival times
         ("patient_inter_day", (float, np.floating), 200.0, None),
         ("patient_inter_night", (float, np.floating), 666.666666666667, None),
+        ("arrival_sampler", (str,), "thinning", {"thinning", "inversion"}),
+        ("precompute_arrivals", (bool,), False, {True, False}),
+        ("buffered_sampling", (bool,), False, {True, False}),
+        ("fast_resources", (bool,), False, {True, False}),
+        ("patient_validation", (str,), "all", {"all", "sample", "none"}),
+        ("patient_validation_sample_size", (int,), 1000, None),
+        ("recording_level", (str,), "full", {"kpi", "patient", "full"}),
 
         # Capacities
         ("number_of_nurses", (int,), 2, None),
@@ -78,6 +99,8 @@ from stroke_ward_model.inputs import g
         ("ctp_value", (int,), 0, None),
         ("sdec_opening_hour", (int,), 0, None),
         ("ctp_opening_hour", (int,), 0, None),
+        ("sdec_calendar", (type(None),), None, None),
+        ("ctp_calendar", (type(None),), None, None),
         ("in_hours_start", (int,), 7, None),
         ("ooh_start", (int,), 0, None),
 
@@ -112,3 +135,72 @@ def test_g_default_attributes(
     # If an allowed_values set is provided, ensure value is in it
     if allowed_values is not None:
         assert value in allowed_values
+
+
+# ----------------------------------------------------------------------------
+# Scenario
+# ----------------------------------------------------------------------------
+
+
+def test_scenario_defaults_match_g():
+    """A Scenario should default to the current values in g."""
+    scenario = Scenario()
+
+    assert scenario.number_of_ward_beds == g.number_of_ward_beds
+    assert scenario.master_seed == g.master_seed
+    assert list(scenario.tracked_cases) == g.tracked_cases
+    assert scenario.to_dict()["trace_config"] == g.trace_config
+
+
+def test_scenario_excludes_runtime_state():
+    """Flags the model changes during a run should not be in a Scenario."""
+    scenario = Scenario()
+
+    for attr in RUNTIME_STATE_ATTRIBUTES:
+        assert not hasattr(scenario, attr)
+        assert attr not in scenario.to_dict()
+
+
+def test_scenario_overrides_do_not_change_g():
+    """Overrides should apply to the Scenario only."""
+    scenario = Scenario(number_of_ward_beds=g.number_of_ward_beds + 5)
+
+    assert scenario.number_of_ward_beds == g.number_of_ward_beds + 5
+    assert Scenario().number_of_ward_beds == g.number_of_ward_beds
+
+
+def test_scenario_is_immutable():
+    """Attributes, including nested containers, cannot be changed."""
+    scenario = Scenario()
+
+    with pytest.raises(AttributeError):
+        scenario.number_of_ward_beds = 100
+    with pytest.raises(AttributeError):
+        del scenario.number_of_ward_beds
+    with pytest.raises(TypeError):
+        scenario.trace_config["tracked"] = [1]
+
+
+def test_scenario_rejects_unknown_parameter():
+    """Misspelt parameter names should raise rather than be ignored."""
+    with pytest.raises(TypeError):
+        Scenario(number_of_ward_bed=10)
+
+
+def test_scenario_replace():
+    """replace() returns a modified copy and leaves the original unchanged."""
+    scenario = Scenario(sdec_beds=3)
+    changed = scenario.replace(number_of_nurses=4)
+
+    assert changed.number_of_nurses == 4
+    assert changed.sdec_beds == 3
+    assert scenario.number_of_nurses == g.number_of_nurses
+    assert changed != scenario
+    assert changed == Scenario(sdec_beds=3, number_of_nurses=4)
+
+
+def test_scenario_can_be_pickled():
+    """Scenarios need to be picklable to be sent to worker processes."""
+    scenario = Scenario(number_of_ward_beds=20)
+
+    assert pickle.loads(pickle.dumps(scenario)) == scenario
@@ -2,13 +2,25 @@
 Unit tests for model.py
 """
 
+import math
+from collections import deque
+
+import numpy as np
 import pandas as pd
 import pytest
 import simpy
 from unittest.mock import patch
 
-from stroke_ward_model.inputs import g
-from stroke_ward_model.model import Model
+from stroke_ward_model.availability import AvailabilityCalendar
+from stroke_ward_model.entities import (
+    Patient,
+    PatientRegister,
+    patients_to_dataframe,
+    validate_patients,
+)
+from stroke_ward_model.inputs import g, Scenario
+from stroke_ward_model.model import Model, PATIENT_ATTRIBUTE_BLOCK_SIZE
+from stroke_ward_model.results import ResultsStore
 
 
 # ----------------------------------------------------------------------------
@@ -30,6 +42,12 @@ from stroke_ward_model.model import Model
         ("stroke_mimic_patient_count", (int,), 0),
         ("non_stroke_patient_count", (int,), 0),
         ("additional_thrombolysis_from_ctp", (int,), 0),
+        ("ward_block_events_saved", (int,), 0),
+        # Run-time state flags
+        ("ctp_unav", (bool,), False),
+        ("sdec_unav", (bool,), False),
+        ("patient_arrival_gen_1", (bool,), False),
+        ("patient_arrival_gen_2", (bool,), False),
         # Numeric metrics
         ("mean_q_time_nurse", (float, int), 0),
         ("max_q_time_nurse", (float, int), 0),
@@ -39,14 +57,19 @@ from stroke_ward_model.model import Model
         ("thrombolysis_savings", (float, int), 0),
         # Run number
         ("run_number", (int,), None),
+        # Patient registers
+        ("q_for_assessment", (PatientRegister,), None),
+        ("sdec_occupancy", (PatientRegister,), None),
+        ("ward_occupancy", (PatientRegister,), None),
         # List attributes
-        ("q_for_assessment", (list,), []),
-        ("sdec_occupancy", (list,), []),
         ("admission_avoidance", (list,), []),
-        ("ward_occupancy", (list,), []),
         ("non_admissions", (list,), []),
         ("patient_objects", (list,), []),
+        ("ward_bed_waiters", (deque,), None),
+        # Scenario config
+        ("config", (Scenario,), None),
         # DataFrame attributes
+        ("results_store", (ResultsStore,), None),
         ("results_df", (pd.DataFrame,), None),
         ("nurse_q_graph_df", (pd.DataFrame,), None),
         ("ward_occupancy_graph_df", (pd.DataFrame,), None),
@@ -206,11 +229,13 @@ def test_model_instances_independent_lists():
     model1 = Model(run_number=1)
     model2 = Model(run_number=2)
 
-    # Modify model1's list
-    model1.q_for_assessment.append("test")
+    # Modify model1's list and register
+    model1.admission_avoidance.append("test")
+    model1.q_for_assessment.add(Patient(1))
 
-    # Check model2's list is unaffected
-    assert model2.q_for_assessment == []
+    # Check model2's list and register are unaffected
+    assert model2.admission_avoidance == []
+    assert len(model2.q_for_assessment) == 0
 
 
 def test_model_instances_independent_dataframes():
@@ -225,6 +250,59 @@ def test_model_instances_independent_dataframes():
     assert model2.results_df.loc[1, "Q Time Nurse"] == 0.0
 
 
+def test_model_uses_own_config():
+    """Models should use their own config, unaffected by g or other models."""
+    model1 = Model(run_number=1, config=Scenario(number_of_ward_beds=3))
+    model2 = Model(run_number=1, config=Scenario(number_of_ward_beds=7))
+
+    with patch.object(g, "number_of_ward_beds", 50):
+        model3 = Model(run_number=1)
+
+    assert len(model1.ward_bed.items) == 3
+    assert len(model2.ward_bed.items) == 7
+    assert model3.config.number_of_ward_beds == 50
+    # Changing g after a model is created does not change its config
+    assert model3.config.number_of_ward_beds != g.number_of_ward_beds
+
+
+def test_model_runtime_flags_independent():
+    """Closing SDEC in one model should not close it in another."""
+    model1 = Model(
+        run_number=1,
+        config=Scenario(sdec_calendar=AvailabilityCalendar([(0, 0)])),
+    )
+    model2 = Model(run_number=2)
+
+    assert model1.sdec_unav is True
+    assert model2.sdec_unav is False
+    assert g.sdec_unav is False
+
+
+# ----------------------------------------------------------------------------
+# Test should_trace()
+# ----------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize(
+    "show_trace, tracked, identifier, expected",
+    [
+        (False, [1, 2, 3], 2, False),  # tracing off
+        (True, [1, 2, 3], 2, True),  # tracked case
+        (True, [1, 2, 3], 4, False),  # untracked case
+        (True, None, 4, True),  # None tracks every case
+        (False, None, 4, False),
+    ],
+)
+def test_model_should_trace(show_trace, tracked, identifier, expected):
+    """Trace messages are only built when tracing is on for that case."""
+    with (
+        patch.object(g, "show_trace", show_trace),
+        patch.object(g, "trace_config", {"tracked": tracked}),
+    ):
+        model = Model(run_number=1)
+        assert model.should_trace(identifier) is expected
+
+
 # ----------------------------------------------------------------------------
 # Test is_in_hours()
 # ----------------------------------------------------------------------------
@@ -337,12 +415,239 @@ def test_model_generator_patient_arrivals_ooh():
 
 
 # ----------------------------------------------------------------------------
-# Test obstruct_ctp()
+# Test arrival schedules
+# ----------------------------------------------------------------------------
+
+
+def _short_run_config(**overrides):
+    return Scenario(
+        show_trace=False,
+        sim_duration=1440 * 60,
+        warm_up_period=1440 * 10,
+        number_of_ward_beds=10,
+        sdec_unav_freq=480,
+        sdec_unav_time=960,
+        ctp_unav_freq=480,
+        ctp_unav_time=960,
+        **overrides,
+    )
+
+
+def _patient_df(model):
+    return patients_to_dataframe(model.patient_objects)
+
+
+def test_model_precomputed_arrivals_match_sampled():
+    """Replaying precomputed arrivals should give identical results."""
+    sampled = Model(run_number=3, config=_short_run_config())
+    precomputed = Model(
+        run_number=3, config=_short_run_config(precompute_arrivals=True)
+    )
+
+    assert sampled.arrival_schedule is None
+    assert len(precomputed.arrival_schedule) > 0
+
+    sampled.run()
+    precomputed.run()
+
+    pd.testing.assert_frame_equal(
+        _patient_df(sampled), _patient_df(precomputed), check_exact=True
+    )
+    pd.testing.assert_frame_equal(
+        sampled.results_df, precomputed.results_df, check_exact=True
+    )
+
+
+@pytest.mark.parametrize("precompute_arrivals", [False, True])
+def test_model_buffered_sampling_matches_unbuffered(precompute_arrivals):
+    """Buffered sampling should give identical results."""
+    unbuffered = Model(
+        run_number=2,
+        config=_short_run_config(precompute_arrivals=precompute_arrivals),
+    )
+    buffered = Model(
+        run_number=2,
+        config=_short_run_config(
+            precompute_arrivals=precompute_arrivals, buffered_sampling=True
+        ),
+    )
+
+    unbuffered.run()
+    buffered.run()
+
+    pd.testing.assert_frame_equal(
+        _patient_df(unbuffered), _patient_df(buffered), check_exact=True
+    )
+    pd.testing.assert_frame_equal(
+        unbuffered.results_df, buffered.results_df, check_exact=True
+    )
+
+
+def test_model_fast_resources_match_vidigi_resources():
+    """
+    Fast resources should give identical results, apart from not recording
+    the resource IDs.
+    """
+    vidigi = Model(run_number=1, config=_short_run_config())
+    fast = Model(run_number=1, config=_short_run_config(fast_resources=True))
+
+    vidigi.run()
+    fast.run()
+
+    resource_ids = ["nurse_attending_id", "sdec_bed_id", "ward_bed_id"]
+    fast_patients = _patient_df(fast)
+    assert fast_patients[resource_ids].isna().all().all()
+    assert _patient_df(vidigi)["nurse_attending_id"].notna().any()
+
+    pd.testing.assert_frame_equal(
+        _patient_df(vidigi).drop(columns=resource_ids),
+        fast_patients.drop(columns=resource_ids),
+        check_exact=True,
+    )
+    pd.testing.assert_frame_equal(vidigi.results_df, fast.results_df, check_exact=True)
+    pd.testing.assert_frame_equal(
+        vidigi.ward_occupancy_graph_df, fast.ward_occupancy_graph_df, check_exact=True
+    )
+
+
+@pytest.mark.parametrize("patient_validation", ["all", "sample", "none"])
+def test_model_patient_validation_options(patient_validation):
+    """Validation options should only change which patients are checked."""
+    model = Model(
+        run_number=0,
+        config=_short_run_config(
+            patient_validation=patient_validation,
+            patient_validation_sample_size=20,
+        ),
+    )
+    with patch(
+        "stroke_ward_model.model.validate_patients", wraps=validate_patients
+    ) as validate:
+        model.run()
+
+    completed = [p.id for p in model.patient_objects if p.journey_completed]
+    assert len(completed) > 20
+
+    if patient_validation == "none":
+        validate.assert_not_called()
+        return
+
+    checked = validate.call_args.args[0]["id"].tolist()
+    if patient_validation == "all":
+        assert checked == completed
+    else:
+        assert len(checked) == 20
+        assert checked == sorted(checked, key=completed.index)
+        assert set(checked) <= set(completed)
+
+
+def test_model_patient_validation_reports_missing_fields():
+    """A completed patient with a missing field should fail validation."""
+    model = Model(run_number=0, config=_short_run_config())
+    model.run()
+
+    patient = next(p for p in model.patient_objects if p.journey_completed)
+    patient.exit_time = np.nan
+    with pytest.raises(ValueError, match=f"Patient {patient.id}: .*exit_time"):
+        model.validate_completed_patients()
+
+
+def test_model_patient_validation_invalid_option():
+    model = Model(run_number=0, config=_short_run_config(patient_validation="some"))
+    with pytest.raises(ValueError):
+        model.validate_completed_patients()
+
+
+def test_model_patient_attributes_from_table():
+    """Each patient's attributes should come from their row of the table."""
+    model = Model(run_number=0, config=_short_run_config())
+    assert model.patient_attributes is None
+
+    model.run()
+
+    table = model.patient_attributes.to_dataframe()
+    # Sampled in blocks as patients arrived
+    assert len(table) % PATIENT_ATTRIBUTE_BLOCK_SIZE == 0
+    assert len(table) >= len(model.patient_objects)
+
+    patients = _patient_df(model).set_index("id")
+    columns = ["mrs_type", "diagnosis", "non_admission", "patient_diagnosis"]
+    pd.testing.assert_frame_equal(
+        patients[columns],
+        table.loc[patients.index, columns],
+        check_names=False,
+        check_dtype=False,
+    )
+    assert (
+        patients["patient_diagnosis_type"]
+        == table.loc[patients.index, "patient_diagnosis_type"]
+    ).all()
+
+
+def test_model_patient_attributes_sampled_for_schedule():
+    """With precomputed arrivals, every patient's attributes are sampled."""
+    model = Model(run_number=0, config=_short_run_config(precompute_arrivals=True))
+
+    assert len(model.patient_attributes) == len(model.arrival_schedule)
+
+
+def test_model_time_series_built_after_run():
+    """Queue and occupancy DataFrames are built from the recorders."""
+    model = Model(run_number=0, config=_short_run_config())
+    model.run()
+
+    for recorder, df in [
+        (model.nurse_q_recorder, model.nurse_q_graph_df),
+        (model.ward_occupancy_recorder, model.ward_occupancy_graph_df),
+        (model.sdec_occupancy_recorder, model.sdec_occupancy_graph_df),
+    ]:
+        assert len(df) == len(recorder) > 1
+        assert df["Time"].is_monotonic_increasing
+
+    ward = model.ward_occupancy_graph_df
+    warm_up = ward["Time"] <= model.config.warm_up_period
+    assert (ward["During Warm-Up"] == warm_up).all()
+    assert ward["Occupancy"].max() <= model.config.number_of_ward_beds
+
+
+def test_model_arrival_schedule_shared_between_scenarios():
+    """Scenarios with the same demand can replay the same arrivals."""
+    schedule = Model(
+        run_number=1, config=_short_run_config(precompute_arrivals=True)
+    ).arrival_schedule
+
+    model = Model(
+        run_number=1,
+        config=_short_run_config(sdec_beds=10),
+        arrival_schedule=schedule,
+    )
+    model.run()
+
+    arrivals = _patient_df(model)["clock_start"].to_numpy()
+    np.testing.assert_array_equal(arrivals, schedule.arrival_times)
+
+
+def test_model_arrival_schedule_different_demand():
+    """Arrival schedules for different demand should be rejected."""
+    schedule = Model(
+        run_number=1, config=_short_run_config(precompute_arrivals=True)
+    ).arrival_schedule
+
+    with pytest.raises(ValueError):
+        Model(
+            run_number=1,
+            config=_short_run_config(patient_inter_day=100.0),
+            arrival_schedule=schedule,
+        )
+
+
+# ----------------------------------------------------------------------------
+# Test CTP and SDEC availability
 # ----------------------------------------------------------------------------
 
 
-def test_model_obstruct_ctp():
-    """CTP obstruction should set ctp_unav=True for the configured duration."""
+def test_model_ctp_unav():
+    """The CTP scanner should be unavailable for the configured duration."""
     with (
         patch.object(g, "ctp_opening_hour", 0),
         patch.object(g, "ctp_unav_freq", 10),  # first downtime at t=10
@@ -351,29 +656,21 @@ def test_model_obstruct_ctp():
     ):
         model = Model(run_number=1)
 
-        # Start the obstruction process
-        model.env.process(model.obstruct_ctp())
-
         # Just before downtime starts: flag should still be False
         model.env.run(until=9)
-        assert g.ctp_unav is False
+        assert model.ctp_unav is False
 
         # During downtime window: flag should be True
         model.env.run(until=15)
-        assert g.ctp_unav is True
+        assert model.ctp_unav is True
 
         # After downtime ends (10 + 30 = 40): flag should be False again
         model.env.run(until=45)
-        assert g.ctp_unav is False
+        assert model.ctp_unav is False
 
 
-# ----------------------------------------------------------------------------
-# Test obstruct_sdec()
-# ----------------------------------------------------------------------------
-
-
-def test_model_obstruct_sdec():
-    """SDEC obstruction should sdec_unav=True and increment freeze counter."""
+def test_model_sdec_unav():
+    """SDEC should be closed for the configured duration and count closures."""
     with (
         patch.object(g, "sdec_opening_hour", 0),
         patch.object(g, "sdec_unav_freq", 10),  # first freeze at t=10
@@ -383,22 +680,60 @@ def test_model_obstruct_sdec():
     ):
         model = Model(run_number=1)
 
-        # Start obstruction process
-        model.env.process(model.obstruct_sdec())
-
         # Just before freeze: SDEC available, no freezes counted
         model.env.run(until=9)
-        assert g.sdec_unav is False
+        assert model.sdec_unav is False
         assert model.sdec_freeze_counter == 0
 
         # During freeze: SDEC unavailable
         model.env.run(until=15)
-        assert g.sdec_unav is True
+        assert model.sdec_unav is True
 
         # After first freeze ends: SDEC available again, counter incremented
         model.env.run(until=45)
-        assert g.sdec_unav is False
-        assert model.sdec_freeze_counter >= 1
+        assert model.sdec_unav is False
+        assert model.sdec_freeze_counter == 1
+
+
+def test_model_sdec_calendar_closed_at_weekends():
+    """Patients should only be sent to SDEC when its calendar says it's open."""
+    calendar = AvailabilityCalendar.from_opening_hours(
+        [(8, 12), (14, 20)], weekend_hours=[]
+    )
+    model = Model(run_number=0, config=_short_run_config(sdec_calendar=calendar))
+    assert model.sdec_calendar is calendar
+
+    model.run()
+
+    patients = _patient_df(model)
+    admit_times = patients["sdec_admit_time"].dropna()
+    assert len(admit_times) > 0
+    # Weekdays only
+    assert ((admit_times // 1440) % 7 < 5).all()
+    minute_of_day = admit_times % 1440
+    assert (
+        minute_of_day.between(8 * 60, 12 * 60, inclusive="left")
+        | minute_of_day.between(14 * 60, 20 * 60, inclusive="left")
+    ).all()
+
+    running = patients["sdec_running_when_required"].dropna()
+    assert running.any() and not running.all()
+
+
+def test_model_trace_availability(capsys):
+    """Opening and closing should be traced when tracing is switched on."""
+    config = _short_run_config().replace(
+        show_trace=True, trace_config={"tracked": None}
+    )
+    model = Model(run_number=1, config=config)
+    model.env.process(model.trace_availability())
+    model.env.run(until=1441)
+
+    output = capsys.readouterr().out
+    assert "CTP scanner OFFLINE" in output
+    assert "CTP scanner back ONLINE" in output
+    assert "SDEC CLOSES" in output
+    assert "SDEC OPENS" in output
 
 
 # ----------------------------------------------------------------------------
@@ -433,6 +768,38 @@ def test_model_stroke_assessment():
         assert patient.journey_completed
 
 
+def test_model_sdec_patients_leave_when_ward_bed_released():
+    """
+    SDEC patients blocked by a full ward should leave SDEC at the moment a
+    ward bed is released, rather than at the next one-minute check.
+    """
+    with (
+        patch.object(g, "sim_duration", 1440 * 120),
+        patch.object(g, "warm_up_period", 0),
+        patch.object(g, "number_of_ward_beds", 20),
+        patch.object(g, "sdec_unav_freq", 720),
+        patch.object(g, "sdec_unav_time", 720),
+        patch.object(g, "ctp_unav_freq", 720),
+        patch.object(g, "ctp_unav_time", 720),
+        patch.object(g, "show_trace", False),
+    ):
+        model = Model(run_number=1)
+        model.run()
+
+    ward_discharge_times = {p.ward_discharge_time for p in model.patient_objects}
+
+    blocked = [
+        p
+        for p in model.patient_objects
+        if p.sdec_pathway
+        and p.sdec_discharge_time > p.sdec_admit_time + p.sdec_los + 1e-9
+    ]
+
+    assert blocked, "Expected some SDEC patients to be blocked by a full ward"
+    assert all(p.sdec_discharge_time in ward_discharge_times for p in blocked)
+    assert model.ward_block_events_saved > 0
+
+
 # ----------------------------------------------------------------------------
 # Test calculate_run_results()
 # ----------------------------------------------------------------------------
@@ -442,8 +809,8 @@ def test_model_calculate_run_results():
     """Test that calculate_run_results processes data and calculates KPIs."""
     model = Model(run_number=1)
 
-    # Add some dummy data to results_df (beyond the initial row)
-    model.results_df.loc[2] = {
+    # Add some dummy data to the results store (beyond the initial row)
+    row = {
         "Q Time Nurse": 10.0,
         "Time with Nurse": 15.0,
         "Q Time Ward": 120.0,
@@ -469,7 +836,9 @@ def test_model_calculate_run_results():
         "Patient Gen 2 Status": False,
     }
 
-    model.results_df.loc[3] = model.results_df.loc[2].copy()
+    for patient_id in [2, 3]:
+        for column, value in row.items():
+            model.results_store.record(patient_id, column, value)
 
     # Run calculation
     model.calculate_run_results()
@@ -491,6 +860,174 @@ def test_model_calculate_run_results():
     ), "mean_los_ward should be 2880 minutes / 60 = 48 hours"
 
 
+def test_model_resource_use_matches_patient_times():
+    """
+    The time-weighted ward and SDEC use should match integrating the number
+    of patients present from their admission and discharge times.
+    """
+    config = Scenario(
+        sim_duration=1440 * 60,
+        warm_up_period=1440 * 10,
+        number_of_ward_beds=15,
+        show_trace=False,
+    )
+    model = Model(run_number=1, config=config)
+    model.run()
+
+    start, end = config.warm_up_period, model.env.now
+
+    def time_weighted_mean(stays):
+        total = sum(
+            max(0.0, min(leave, end) - max(enter, start)) for enter, leave in stays
+        )
+        return total / (end - start)
+
+    def leave_time(patient, attr):
+        value = getattr(patient, attr, np.nan)
+        return end if np.isnan(value) else value
+
+    ward_stays = [
+        (p.ward_admit_time, leave_time(p, "ward_discharge_time"))
+        for p in model.patient_objects
+        if not np.isnan(getattr(p, "ward_admit_time", np.nan))
+    ]
+    sdec_stays = [
+        (p.sdec_admit_time, leave_time(p, "sdec_discharge_time"))
+        for p in model.patient_objects
+        if not np.isnan(getattr(p, "sdec_admit_time", np.nan))
+    ]
+
+    ward = model.resource_use["ward"]
+    assert ward["mean_in_use"] == pytest.approx(time_weighted_mean(ward_stays))
+    assert ward["utilisation"] == pytest.approx(ward["mean_in_use"] / 15)
+    assert 0 < ward["proportion_at_capacity"] <= 1
+    assert ward["mean_queue_length"] > 0
+    assert model.mean_ward_occupancy == round(ward["mean_in_use"], 2)
+
+    sdec = model.resource_use["sdec"]
+    assert sdec["mean_in_use"] == pytest.approx(time_weighted_mean(sdec_stays))
+
+    # Patients on the CTP pathway don't queue for the scanner, so only the
+    # number of scans at once is counted
+    ctp_scans = [
+        (p.ctp_scan_start_time, leave_time(p, "ctp_scan_end_time"))
+        for p in model.patient_objects
+        if not np.isnan(getattr(p, "ctp_scan_start_time", np.nan))
+    ]
+    assert ctp_scans
+    assert model.resource_use["ctp"]["mean_in_use"] == pytest.approx(
+        time_weighted_mean(ctp_scans)
+    )
+    assert model.resource_use["ctp"]["mean_queue_length"] == 0
+    assert 0 < model.resource_use["nurse"]["utilisation"] < 1
+
+
+@pytest.fixture(scope="module")
+def models_by_recording_level():
+    models = {}
+    for level in ["kpi", "patient", "full"]:
+        config = Scenario(
+            sim_duration=1440 * 60,
+            warm_up_period=1440 * 10,
+            number_of_ward_beds=12,
+            show_trace=False,
+            recording_level=level,
+        )
+        models[level] = Model(run_number=2, config=config)
+        models[level].run()
+    return models
+
+
+@pytest.mark.parametrize("level", ["kpi", "patient"])
+def test_model_recording_level_gives_same_kpis(models_by_recording_level, level):
+    """Recording less should not change the run results."""
+    full = models_by_recording_level["full"]
+    model = models_by_recording_level[level]
+
+    for attr in [
+        "mean_q_time_nurse",
+        "max_q_time_nurse",
+        "number_of_admissions_avoided",
+        "mean_q_time_ward",
+        "max_q_time_ward",
+        "mean_ward_occupancy",
+        "admission_delays",
+        "mean_los_ward",
+        "savings_sdec",
+        "thrombolysis_savings",
+        "total_savings",
+        "mean_mrs_change",
+        "patient_counter",
+    ]:
+        assert getattr(model, attr) == pytest.approx(getattr(full, attr)), attr
+    assert model.resource_use == full.resource_use
+
+
+def test_model_recording_level_drops_patient_and_time_series_data(
+    models_by_recording_level,
+):
+    full = models_by_recording_level["full"]
+    patient = models_by_recording_level["patient"]
+    kpi = models_by_recording_level["kpi"]
+
+    # Patient-level results are kept at the patient level...
+    pd.testing.assert_frame_equal(patient.results_df, full.results_df)
+    assert len(patient.patient_objects) == full.patient_counter
+
+    # ...but not the time series, which only hold their initial row
+    assert len(full.ward_occupancy_graph_df) > 1
+    for model in [patient, kpi]:
+        assert len(model.nurse_q_graph_df) == 1
+        assert len(model.ward_occupancy_graph_df) == 1
+        assert len(model.sdec_occupancy_graph_df) == 1
+
+    # Only KPIs are kept at the KPI level
+    assert kpi.results_df.empty
+    assert list(kpi.results_df.columns) == list(full.results_df.columns)
+    assert kpi.patient_objects == []
+
+
+def test_model_rejects_unknown_recording_level():
+    with pytest.raises(ValueError):
+        Model(run_number=1, config=Scenario(recording_level="everything"))
+
+
+def test_model_run_reports_progress_without_changing_results(
+    models_by_recording_level,
+):
+    full = models_by_recording_level["full"]
+    config = full.config.replace(progress_interval=1440 * 7)
+    end_time = config.sim_duration + config.warm_up_period
+
+    times = []
+    model = Model(run_number=2, config=config)
+    model.run(progress=lambda time, end: times.append((time, end)))
+
+    # Progress is reported every week, and at the end of the run
+    assert times[:2] == [(1440 * 7, end_time), (1440 * 14, end_time)]
+    assert times[-1] == (end_time, end_time)
+    assert len(times) == math.ceil(end_time / (1440 * 7))
+
+    pd.testing.assert_frame_equal(model.results_df, full.results_df)
+    assert model.resource_use == full.resource_use
+
+
+def test_model_run_stopped_by_progress_hook():
+    class Stop(Exception):
+        pass
+
+    def stop_after_a_day(time, end_time):
+        if time >= 1440:
+            raise Stop
+
+    model = Model(
+        run_number=1, config=Scenario(show_trace=False, progress_interval=360)
+    )
+    with pytest.raises(Stop):
+        model.run(progress=stop_after_a_day)
+    assert model.env.now == 1440
+
+
 # ----------------------------------------------------------------------------
 # Test track_days()
 # ----------------------------------------------------------------------------
@@ -0,0 +1,147 @@
+"""
+Unit tests for replications.py
+"""
+
+import math
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+from scipy import stats
+
+from stroke_ward_model.inputs import Scenario
+from stroke_ward_model.replications import (
+    ReplicationController,
+    RunningStatistics,
+)
+
+
+# ----------------------------------------------------------------------------
+# RunningStatistics
+# ----------------------------------------------------------------------------
+
+
+def test_running_statistics_match_numpy():
+    values = np.random.default_rng(3).normal(1e6, 25.0, 500)
+    running = RunningStatistics()
+    for value in values:
+        running.add(value)
+
+    assert running.count == 500
+    assert running.mean == pytest.approx(values.mean(), rel=1e-12)
+    assert running.variance == pytest.approx(values.var(ddof=1), rel=1e-9)
+    assert running.std == pytest.approx(values.std(ddof=1), rel=1e-9)
+    assert running.minimum == values.min()
+    assert running.maximum == values.max()
+
+
+def test_running_statistics_ci_half_width():
+    values = [3.0, 5.0, 4.0, 8.0]
+    running = RunningStatistics()
+    for value in values:
+        running.add(value)
+
+    expected = stats.t.ppf(0.975, 3) * np.std(values, ddof=1) / math.sqrt(4)
+    assert running.ci_half_width() == pytest.approx(expected)
+    assert running.relative_ci_half_width() == pytest.approx(expected / 5.0)
+
+
+def test_running_statistics_edge_cases():
+    running = RunningStatistics()
+    assert math.isnan(running.mean)
+    assert math.isnan(running.ci_half_width())
+
+    # Missing values are ignored
+    running.add(math.nan)
+    running.add(2.0)
+    assert running.count == 1
+    assert math.isnan(running.variance)
+
+    # No variation means no uncertainty, even with a mean of zero
+    constant = RunningStatistics()
+    for _ in range(3):
+        constant.add(0.0)
+    assert constant.relative_ci_half_width() == 0.0
+
+    zero_mean = RunningStatistics()
+    for value in [-1.0, 1.0]:
+        zero_mean.add(value)
+    assert zero_mean.relative_ci_half_width() == math.inf
+
+
+# ----------------------------------------------------------------------------
+# ReplicationController
+# ----------------------------------------------------------------------------
+
+
+def test_controller_needs_a_target_or_budget():
+    with pytest.raises(ValueError):
+        ReplicationController()
+
+
+def test_controller_from_config():
+    assert ReplicationController.from_config(Scenario()) is None
+
+    controller = ReplicationController.from_config(
+        Scenario(
+            replication_targets={"Total Savings": 0.1},
+            replication_min_runs=4,
+            replication_max_runs=20,
+        )
+    )
+    assert controller.targets == {"Total Savings": 0.1}
+    assert controller.min_runs == 4
+    assert controller.max_runs == 20
+
+
+def test_controller_stops_on_precision_after_min_runs():
+    controller = ReplicationController(targets={"kpi": 0.01}, min_runs=4)
+    controller.start()
+
+    for _ in range(3):
+        controller.add_run({"kpi": 10.0})
+        assert not controller.should_stop()
+
+    controller.add_run({"kpi": 10.0})
+    assert controller.should_stop()
+    assert controller.stop_reason == "precision"
+
+
+def test_controller_needs_every_target_met():
+    controller = ReplicationController(
+        targets={"steady": 0.5, "noisy": 0.01}, min_runs=2, max_runs=50
+    )
+    controller.start()
+
+    for i in range(10):
+        controller.add_run({"steady": 10.0, "noisy": float(i % 2)})
+    assert controller.precision()["steady"] == 0.0
+    assert not controller.should_stop()
+
+
+def test_controller_time_budget():
+    with patch(
+        "stroke_ward_model.replications.time.perf_counter",
+        side_effect=[0.0, 5.0, 11.0],
+    ):
+        controller = ReplicationController(time_budget=10)
+        controller.start()
+
+        # Always at least one run
+        assert not controller.should_stop()
+
+        controller.add_run({})
+        assert not controller.should_stop()
+        assert controller.should_stop()
+        assert controller.stop_reason == "time_budget"
+
+
+def test_controller_max_runs():
+    controller = ReplicationController(targets={"kpi": 0.0}, max_runs=3)
+    controller.start()
+
+    for value in [1.0, 2.0, 3.0]:
+        assert not controller.should_stop()
+        controller.add_run({"kpi": value})
+    assert controller.should_stop()
+    assert controller.stop_reason == "max_runs"
@@ -0,0 +1,142 @@
+"""
+Unit tests for resources.py
+"""
+
+import simpy
+from vidigi.resources import VidigiPriorityStore
+
+from stroke_ward_model.resources import FastPriorityResource
+
+
+def _run_requests(resource_cls, requests, **kwargs):
+    """
+    Run a set of (arrival time, priority, hold time) requests against a
+    resource, returning the (name, start time) of each request in the order
+    they were granted.
+    """
+    env = simpy.Environment()
+    resource = resource_cls(env, **kwargs)
+    granted = []
+
+    def user(name, arrival, priority, hold):
+        yield env.timeout(arrival)
+        with resource.request(priority=priority) as req:
+            yield req
+            granted.append((name, env.now))
+            yield env.timeout(hold)
+
+    for name, (arrival, priority, hold) in enumerate(requests):
+        env.process(user(name, arrival, priority, hold))
+    env.run()
+    return granted
+
+
+REQUESTS = [
+    (0, 0, 5),
+    (0, 0, 3),
+    (1, 0, 2),
+    (1, -1, 4),
+    (2, 1, 1),
+    (2, -1, 1),
+    (3, 0, 2),
+    (9, 1, 1),
+]
+
+
+def test_fast_priority_resource_matches_vidigi_priority_store():
+    """Requests should be granted in the same order and at the same times."""
+    for capacity in [1, 2, 3]:
+        assert _run_requests(
+            FastPriorityResource, REQUESTS, capacity=capacity
+        ) == _run_requests(VidigiPriorityStore, REQUESTS, num_resources=capacity)
+
+
+def test_fast_priority_resource_serves_lower_priority_values_first():
+    """Waiting requests are served by priority, then first come first served."""
+    granted = _run_requests(
+        FastPriorityResource,
+        [(0, 0, 10), (1, 1, 1), (2, 0, 1), (3, -1, 1), (4, 0, 1)],
+        capacity=1,
+    )
+    assert [name for name, _ in granted] == [0, 3, 2, 4, 1]
+
+
+def test_fast_priority_resource_counts_available():
+    """Resources are counted out when granted and back in when released."""
+    env = simpy.Environment()
+    resource = FastPriorityResource(env, capacity=2)
+
+    def holder(hold):
+        with resource.request() as req:
+            yield req
+            yield env.timeout(hold)
+
+    for hold in [5, 5, 10]:
+        env.process(holder(hold))
+
+    env.run(until=1)
+    assert resource.available == 0
+    assert len(resource.get_queue) == 1
+
+    # One of the released resources goes straight to the waiting request
+    env.run(until=6)
+    assert resource.available == 1
+    assert len(resource.get_queue) == 0
+
+    env.run()
+    assert resource.available == 2
+
+
+def test_fast_priority_resource_withdraws_requests_left_while_waiting():
+    """A waiting request that is interrupted shouldn't take a resource."""
+    env = simpy.Environment()
+    resource = FastPriorityResource(env, capacity=1)
+    granted = []
+
+    def user(name, hold):
+        try:
+            with resource.request() as req:
+                yield req
+                granted.append(name)
+                yield env.timeout(hold)
+        except simpy.Interrupt:
+            pass
+
+    env.process(user("first", 5))
+    waiter = env.process(user("interrupted", 5))
+    env.process(user("last", 5))
+
+    def interrupt():
+        yield env.timeout(1)
+        waiter.interrupt()
+
+    env.process(interrupt())
+
+    env.run(until=2)
+    assert len(resource.get_queue) == 1
+
+    env.run()
+    assert granted == ["first", "last"]
+    assert resource.available == 1
+    assert resource.get_queue == []
+
+
+def test_fast_priority_resource_withdraws_requests_that_time_out():
+    env = simpy.Environment()
+    resource = FastPriorityResource(env, capacity=1)
+
+    def holder():
+        with resource.request() as req:
+            yield req
+            yield env.timeout(10)
+
+    def impatient():
+        with resource.request() as req:
+            yield req | env.timeout(2)
+
+    env.process(holder())
+    env.process(impatient())
+    env.run()
+
+    assert resource.available == 1
+    assert resource.get_queue == []
@@ -0,0 +1,313 @@
+"""
+Unit tests for results.py
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from stroke_ward_model.results import (
+    KPIAccumulator,
+    ResourceMonitor,
+    ResultsStore,
+    TimeSeriesRecorder,
+    TimeWeightedStatistic,
+)
+
+
+COLUMNS = {"Q Time Nurse": "numeric", "CTP Status": "string"}
+
+
+# ----------------------------------------------------------------------------
+# ResultsStore
+# ----------------------------------------------------------------------------
+
+
+def test_results_store_rejects_unknown_column_type():
+    """Only numeric and string columns are supported."""
+    with pytest.raises(ValueError):
+        ResultsStore({"Q Time Nurse": "integer"})
+
+
+def test_results_store_matches_dataframe_enlargement():
+    """
+    The exported DataFrame should match one built by enlarging a DataFrame
+    cell-by-cell with .at, including row order, dtypes and missing values.
+    """
+    writes = [
+        (5, "Q Time Nurse", 1.5),
+        (3, "CTP Status", True),
+        (5, "CTP Status", False),
+        (3, "Q Time Nurse", 2),
+        (7, "CTP Status", "x"),
+    ]
+
+    expected = pd.DataFrame(
+        {"Patient ID": [1], "Q Time Nurse": [0.0], "CTP Status": [""]}
+    ).set_index("Patient ID")
+    store = ResultsStore(COLUMNS)
+    store.record(1, "Q Time Nurse", 0.0)
+    store.record(1, "CTP Status", "")
+
+    for patient_id, column, value in writes:
+        expected.at[patient_id, column] = value
+        store.record(patient_id, column, value)
+
+    pd.testing.assert_frame_equal(store.to_dataframe(), expected, check_exact=True)
+
+
+def test_results_store_grows_beyond_initial_capacity():
+    """Buffers should grow as required without losing earlier values."""
+    store = ResultsStore(COLUMNS, initial_capacity=2)
+
+    for patient_id in range(1, 101):
+        store.record(patient_id, "Q Time Nurse", float(patient_id))
+
+    df = store.to_dataframe()
+    assert len(store) == 100
+    assert list(df.index) == list(range(1, 101))
+    assert df["Q Time Nurse"].tolist() == [float(i) for i in range(1, 101)]
+    assert df["CTP Status"].isna().all()
+
+
+def test_results_store_get_and_contains():
+    """Recorded values can be read back by patient ID."""
+    store = ResultsStore(COLUMNS)
+    store.record(4, "CTP Status", True)
+
+    assert 4 in store
+    assert 5 not in store
+    assert store.get(4, "CTP Status") is True
+    assert np.isnan(store.get(4, "Q Time Nurse"))
+
+    with pytest.raises(KeyError):
+        store.get(5, "CTP Status")
+
+
+def test_results_store_last_valid_matches_pandas():
+    """last_valid() should agree with Series.last_valid_index()."""
+    store = ResultsStore(COLUMNS)
+    patient_id, value = store.last_valid("Q Time Nurse")
+    assert patient_id is None and np.isnan(value)
+
+    store.record(1, "Q Time Nurse", 0.0)
+    store.record(2, "CTP Status", True)
+    store.record(3, "Q Time Nurse", 10.0)
+    store.record(2, "Q Time Nurse", 20.0)
+    store.record(4, "CTP Status", False)
+
+    series = store.to_dataframe()["Q Time Nurse"]
+    assert store.last_valid("Q Time Nurse") == (
+        series.last_valid_index(),
+        series.loc[series.last_valid_index()],
+    )
+    assert store.last_valid("Q Time Nurse") == (3, 10.0)
+
+    # Overwriting the last valid value with a missing value falls back to the
+    # previous valid row
+    store.record(3, "Q Time Nurse", np.nan)
+    assert store.last_valid("Q Time Nurse") == (2, 20.0)
+
+
+# ----------------------------------------------------------------------------
+# KPIAccumulator
+# ----------------------------------------------------------------------------
+
+
+def test_kpi_accumulator_matches_results_store():
+    """The totals should match summarising the equivalent results DataFrame."""
+    rng = np.random.default_rng(4)
+    store = ResultsStore(COLUMNS)
+    accumulator = KPIAccumulator(["Q Time Nurse"], ignored_ids=[1])
+
+    for patient_id in range(1, 200):
+        value = rng.choice([np.nan, 0.0, rng.uniform(0, 100)])
+        for results in (store, accumulator):
+            results.record(patient_id, "Q Time Nurse", value)
+            results.record(patient_id, "CTP Status", True)
+
+    column = store.to_dataframe().drop([1])["Q Time Nurse"]
+    summary = accumulator.summary()["Q Time Nurse"]
+
+    assert summary["mean"] == pytest.approx(column.mean())
+    assert summary["max"] == column.max()
+    assert summary["sum"] == pytest.approx(column.sum())
+    assert summary["positive"] == (column > 0).sum()
+    assert list(accumulator.summary()) == ["Q Time Nurse"]
+
+
+def test_kpi_accumulator_empty():
+    summary = KPIAccumulator(["Q Time Nurse"]).summary()["Q Time Nurse"]
+
+    assert np.isnan(summary["mean"])
+    assert np.isnan(summary["max"])
+    assert summary["sum"] == 0
+    assert summary["positive"] == 0
+
+
+# ----------------------------------------------------------------------------
+# TimeSeriesRecorder
+# ----------------------------------------------------------------------------
+
+OCCUPANCY_COLUMNS = {
+    "Time": np.float64,
+    "Occupancy": np.float64,
+    "During Warm-Up": bool,
+}
+
+
+def test_time_series_recorder_matches_dataframe_enlargement():
+    """
+    The exported DataFrame should match one built by appending rows with
+    df.loc[len(df)], including dtypes.
+    """
+    rows = [(1.5, 1, True), (2.25, 2, True), (10.0, 1, False), (11.0, 0, False)]
+
+    expected = pd.DataFrame()
+    expected["Time"] = [0.0]
+    expected["Occupancy"] = [0.0]
+    expected["During Warm-Up"] = True
+    recorder = TimeSeriesRecorder(OCCUPANCY_COLUMNS)
+    recorder.append(0.0, 0.0, True)
+
+    for row in rows:
+        expected.loc[len(expected)] = list(row)
+        recorder.append(*row)
+
+    pd.testing.assert_frame_equal(
+        recorder.to_dataframe(), expected, check_exact=True
+    )
+
+
+def test_time_series_recorder_grows_beyond_initial_capacity():
+    """Buffers should grow as required without losing earlier rows."""
+    recorder = TimeSeriesRecorder(OCCUPANCY_COLUMNS, initial_capacity=2)
+
+    for i in range(100):
+        recorder.append(float(i), i % 7, i < 50)
+
+    df = recorder.to_dataframe()
+    assert len(recorder) == 100
+    assert df["Time"].tolist() == [float(i) for i in range(100)]
+    assert df["Occupancy"].tolist() == [float(i % 7) for i in range(100)]
+    assert df["During Warm-Up"].sum() == 50
+
+
+def test_time_series_recorder_rejects_wrong_number_of_values():
+    """Each row needs exactly one value per column."""
+    recorder = TimeSeriesRecorder(OCCUPANCY_COLUMNS)
+    with pytest.raises(ValueError):
+        recorder.append(1.0, 2.0)
+
+
+def test_time_series_recorder_empty():
+    """A recorder with no rows exports an empty DataFrame with its columns."""
+    df = TimeSeriesRecorder(OCCUPANCY_COLUMNS).to_dataframe()
+
+    assert df.empty
+    assert list(df.columns) == list(OCCUPANCY_COLUMNS)
+    assert df["During Warm-Up"].dtype == bool
+
+
+# ----------------------------------------------------------------------------
+# TimeWeightedStatistic
+# ----------------------------------------------------------------------------
+
+
+def test_time_weighted_statistic_matches_step_function():
+    """The mean should match integrating the recorded changes directly."""
+    rng = np.random.default_rng(3)
+    times = np.sort(rng.uniform(0, 1000, 200))
+    values = rng.integers(0, 6, 200)
+    start, end = 250.0, 1200.0
+
+    statistic = TimeWeightedStatistic(capacity=5, start=start)
+    for time, value in zip(times, values):
+        statistic.update(time, value)
+
+    # Value held over each interval, clipped to start onwards
+    edges = np.concatenate([[0.0], times, [end]])
+    held = np.concatenate([[0], values])
+    durations = np.clip(edges[1:], start, None) - np.clip(edges[:-1], start, None)
+
+    assert statistic.mean(end) == pytest.approx(
+        (held * durations).sum() / (end - start)
+    )
+    assert statistic.time_at_capacity(end) == pytest.approx(
+        durations[held >= 5].sum()
+    )
+    assert statistic.proportion_at_capacity(end) == pytest.approx(
+        durations[held >= 5].sum() / (end - start)
+    )
+    assert statistic.maximum(end) == held[durations > 0].max()
+
+
+def test_time_weighted_statistic_is_not_biased_towards_changes():
+    """
+    A value that is high for a short time with many changes, and low for a
+    long time, should be averaged over time rather than over the changes.
+    """
+    statistic = TimeWeightedStatistic()
+    for time in range(10):
+        statistic.update(time, 10)
+    statistic.update(10, 0)
+
+    assert statistic.mean(100) == pytest.approx(1.0)
+
+
+def test_time_weighted_statistic_add_and_reads_without_changes():
+    statistic = TimeWeightedStatistic(capacity=2)
+    statistic.add(10)
+    statistic.add(20)
+    statistic.add(30, -2)
+
+    assert statistic.value == 0
+    assert statistic.mean(40) == pytest.approx((10 * 1 + 10 * 2) / 40)
+    assert statistic.time_at_capacity(40) == pytest.approx(10)
+    # Reading doesn't change the statistic
+    assert statistic.mean(40) == pytest.approx(0.75)
+
+
+def test_time_weighted_statistic_no_time_counted():
+    statistic = TimeWeightedStatistic(capacity=1, start=100)
+    statistic.update(50, 3)
+
+    assert np.isnan(statistic.mean(100))
+    assert np.isnan(statistic.proportion_at_capacity(80))
+    assert np.isnan(statistic.maximum(100))
+    # The value held at the start is counted from then on
+    assert statistic.mean(110) == 3
+    assert statistic.maximum(110) == 3
+
+
+def test_time_weighted_statistic_rejects_going_back_in_time():
+    statistic = TimeWeightedStatistic()
+    statistic.update(10, 1)
+    with pytest.raises(ValueError):
+        statistic.update(5, 2)
+
+
+# ----------------------------------------------------------------------------
+# ResourceMonitor
+# ----------------------------------------------------------------------------
+
+
+def test_resource_monitor_summary():
+    monitor = ResourceMonitor(capacity=2, start=10)
+    monitor.in_use.add(0)
+    monitor.in_use.add(5)
+    monitor.queue.add(15)
+    monitor.queue.add(20, -1)
+    monitor.in_use.add(30, -1)
+
+    summary = monitor.summary(50)
+
+    assert summary["mean_in_use"] == pytest.approx((20 * 2 + 20 * 1) / 40)
+    assert summary["utilisation"] == pytest.approx(0.75)
+    assert summary["proportion_at_capacity"] == pytest.approx(0.5)
+    assert summary["mean_queue_length"] == pytest.approx(5 / 40)
+    assert summary["max_queue_length"] == 1
+
+
+def test_resource_monitor_without_capacity():
+    assert np.isnan(ResourceMonitor(capacity=0).summary(10)["utilisation"])
@@ -0,0 +1,179 @@
+"""
+Unit tests for sweep.py
+"""
+
+import pandas as pd
+import pytest
+
+from stroke_ward_model.inputs import Scenario
+from stroke_ward_model.sweep import Sweep
+from stroke_ward_model.trial import Trial
+
+BASE = Scenario(
+    show_trace=False,
+    number_of_runs=3,
+    sim_duration=1440 * 20,
+    warm_up_period=1440 * 5,
+)
+
+GRID = {"number_of_ward_beds": [8, 12], "therapy_sdec": [False, True]}
+BASELINE = {"number_of_ward_beds": 12, "therapy_sdec": False}
+
+
+@pytest.fixture(scope="module")
+def sweep():
+    sweep = Sweep(GRID, base=BASE, baseline=BASELINE)
+    sweep.run()
+    return sweep
+
+
+# ----------------------------------------------------------------------------
+# Scenarios and baseline
+# ----------------------------------------------------------------------------
+
+
+def test_sweep_creates_scenario_for_each_combination():
+    sweep = Sweep(GRID, base=BASE)
+
+    assert sweep.scenarios == [
+        BASE.replace(number_of_ward_beds=8, therapy_sdec=False),
+        BASE.replace(number_of_ward_beds=8, therapy_sdec=True),
+        BASE.replace(number_of_ward_beds=12, therapy_sdec=False),
+        BASE.replace(number_of_ward_beds=12, therapy_sdec=True),
+    ]
+    assert list(sweep.parameters.columns) == ["number_of_ward_beds", "therapy_sdec"]
+    assert sweep.parameters.loc[3].tolist() == [12, True]
+    assert sweep.baseline == 0
+
+
+def test_sweep_baseline_by_grid_values():
+    sweep = Sweep(
+        GRID, base=BASE, baseline={"number_of_ward_beds": 12, "therapy_sdec": True}
+    )
+    assert sweep.baseline == 3
+
+
+@pytest.mark.parametrize(
+    "grid, baseline, error",
+    [
+        ({**GRID, "master_seed": [1, 2]}, 0, ValueError),
+        ({**GRID, "number_of_runs": [3, 5]}, 0, ValueError),
+        (GRID, 4, ValueError),
+        # Matches two scenarios
+        (GRID, {"therapy_sdec": True}, ValueError),
+        (GRID, {"sdec_beds": 5}, ValueError),
+        ({"ward_beds": [8, 12]}, 0, TypeError),
+    ],
+)
+def test_sweep_rejects_invalid_setup(grid, baseline, error):
+    with pytest.raises(error):
+        Sweep(grid, base=BASE, baseline=baseline)
+
+
+# ----------------------------------------------------------------------------
+# run()
+# ----------------------------------------------------------------------------
+
+
+def test_sweep_results_are_tidy(sweep):
+    results = sweep.results
+
+    assert list(results.columns) == [
+        "Scenario",
+        "number_of_ward_beds",
+        "therapy_sdec",
+        "Run",
+        "KPI",
+        "Value",
+        "Baseline Value",
+        "Difference",
+    ]
+    assert len(results) == 4 * 3 * len(sweep.kpis)
+    assert list(results["KPI"].iloc[: len(sweep.kpis)]) == sweep.kpis
+    assert results.loc[results["Scenario"] == 3, "number_of_ward_beds"].eq(12).all()
+
+
+def test_sweep_results_match_trials(sweep):
+    """Each scenario's replications should be the same as in a Trial."""
+    for number in [0, 3]:
+        trial = Trial(sweep.scenarios[number])
+        trial.run_trial()
+
+        values = (
+            sweep.results[sweep.results["Scenario"] == number]
+            .pivot(index="Run", columns="KPI", values="Value")
+            .loc[:, sweep.kpis]
+        )
+        pd.testing.assert_frame_equal(
+            values,
+            trial.df_trial_results,
+            check_names=False,
+            check_index_type=False,
+            check_dtype=False,
+        )
+
+
+def test_sweep_differences_are_paired_by_run(sweep):
+    results = sweep.results
+    baseline = results[results["Scenario"] == sweep.baseline]
+
+    assert (baseline["Difference"] == 0).all()
+    for _, row in results.sample(20, random_state=1).iterrows():
+        baseline_row = baseline[
+            (baseline["Run"] == row["Run"]) & (baseline["KPI"] == row["KPI"])
+        ]
+        assert row["Baseline Value"] == baseline_row["Value"].item()
+        assert row["Difference"] == pytest.approx(
+            row["Value"] - row["Baseline Value"]
+        )
+
+
+def test_sweep_uses_common_random_numbers(sweep):
+    """
+    The scenarios only differ in capacity, so should have the same arrivals
+    in each replication.
+    """
+    patients = sweep.results[
+        sweep.results["KPI"] == "Mean Number of Patients Assessed"
+    ]
+    assert (patients["Difference"] == 0).all()
+    assert patients["Value"].nunique() == 3
+
+
+def test_sweep_in_workers_gives_same_results(sweep):
+    parallel = Sweep(GRID, base=BASE, baseline=BASELINE)
+    pd.testing.assert_frame_equal(parallel.run(workers=2), sweep.results)
+
+
+# ----------------------------------------------------------------------------
+# summarise()
+# ----------------------------------------------------------------------------
+
+
+def test_sweep_summary(sweep):
+    summary = sweep.summarise()
+
+    assert len(summary) == 4 * len(sweep.kpis)
+    row = summary[(summary["Scenario"] == 1) & (summary["KPI"] == "Total Savings")]
+    runs = sweep.results[
+        (sweep.results["Scenario"] == 1) & (sweep.results["KPI"] == "Total Savings")
+    ]
+    assert row["Mean"].item() == pytest.approx(runs["Value"].mean())
+    assert row["Mean Difference"].item() == pytest.approx(runs["Difference"].mean())
+
+    # Paired t interval for the mean difference
+    half_width = 4.302653 * runs["Difference"].std() / 3**0.5
+    assert row["Difference CI Lower"].item() == pytest.approx(
+        runs["Difference"].mean() - half_width
+    )
+    assert row["Difference CI Upper"].item() == pytest.approx(
+        runs["Difference"].mean() + half_width
+    )
+
+    baseline = summary[summary["Scenario"] == sweep.baseline]
+    assert (baseline["Difference CI Lower"] == 0).all()
+
+
+def test_sweep_summary_needs_run():
+    with pytest.raises(RuntimeError):
+        Sweep(GRID, base=BASE).summarise()
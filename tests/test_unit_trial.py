@@ -2,10 +2,14 @@
 Unit tests for trial.py
 """
 
+from pathlib import Path
+
 import pandas as pd
 import pytest
 from unittest.mock import Mock, patch
 
+from stroke_ward_model.cache import ResultCache, scenario_key
+from stroke_ward_model.inputs import Scenario
 from stroke_ward_model.trial import Trial
 
 
@@ -25,6 +29,10 @@ from stroke_ward_model.trial import Trial
         ("model_objects", (list,), []),
         ("trial_patient_dataframes", (list,), []),
         ("trial_patient_df", (pd.DataFrame,), None),
+        ("config", (Scenario,), None),
+        ("trial_summary", (dict,), {}),
+        ("trial_statistics", (dict,), {}),
+        ("patient_data_files", (list,), []),
     ],
 )
 def test_trial_default_attributes(attr, expected_type, expected_value):
@@ -68,6 +76,15 @@ def test_trial_df_trial_results_structure():
         "Number of Non-Stroke patients",
         "Mean Additional Thrombolysed Patients From CTP Running",
     ]
+    for name in ["Nurse", "CTP", "SDEC", "Ward"]:
+        if name == "CTP":
+            expected_columns.append("Mean Concurrent CTP Scans")
+            continue
+        expected_columns += [
+            f"{name} Utilisation",
+            f"Mean {name} Queue Length",
+            f"Proportion of Time {name} at Capacity",
+        ]
     assert list(df.columns) == expected_columns
 
     # All initial values should be 0.0
@@ -107,6 +124,15 @@ def create_mock_model():
     mock_model.stroke_mimic_patient_count = 3.0
     mock_model.non_stroke_patient_count = 2.0
     mock_model.additional_thrombolysis_from_ctp = 2.0
+    mock_model.resource_use = {
+        resource: {
+            "mean_in_use": 1.0,
+            "utilisation": 0.5,
+            "mean_queue_length": 1.5,
+            "proportion_at_capacity": 0.25,
+        }
+        for resource in ["nurse", "ctp", "sdec", "ward"]
+    }
 
     # Patient objects
     mock_model.patient_objects = [Mock(id=i) for i in range(5)]
@@ -151,6 +177,14 @@ def mock_setup():
         # and will get our mock's run() when call my_model.run()
         from stroke_ward_model.trial import Trial
 
+        # Run a fixed number of runs unless a test sets a precision target
+        # or time budget
+        mock_g.replication_targets = None
+        mock_g.replication_time_budget = None
+        mock_g.streaming_trial = False
+        mock_g.recording_level = "full"
+        mock_g.result_cache_dir = None
+
         yield mock_g, mock_model_class, Trial
 
 
@@ -253,6 +287,30 @@ def test_run_trial_updates_global_state_dictionaries(mock_setup):
     assert isinstance(mock_g.trial_mean_q_time_nurse[1], float)
 
 
+def test_run_trial_stores_trial_summary(mock_setup):
+    """Mean/max values also stored on the trial itself."""
+    trial, _, mock_g = _run_trial_test_setup(
+        mock_setup,
+        num_runs=2,
+        extra_config={"trials_run_counter": 1, "trial_mean_q_time_nurse": {}},
+    )
+
+    assert trial.trial_summary["trial_mean_q_time_nurse"] == 5.2
+    assert trial.trial_summary["trial_max_q_time_ward"] == 8.5
+    assert (
+        mock_g.trial_mean_q_time_nurse[1]
+        == trial.trial_summary["trial_mean_q_time_nurse"]
+    )
+
+
+def test_run_trial_passes_config_to_models(mock_setup):
+    """Every model in the trial is given the trial's config."""
+    trial, _, _ = _run_trial_test_setup(mock_setup, num_runs=2)
+
+    for call in mock_setup[1].call_args_list:
+        assert call.args[1] is trial.config
+
+
 def test_run_trial_respects_csv_export_flag(mock_setup):
     """CSV export respects g.write_to_csv flag."""
     mock_g, mock_model_class, Trial = mock_setup
@@ -304,3 +362,351 @@ def test_run_trial_creates_trial_info_string(mock_setup):
     assert "SDEC Therapy = True" in trial.trial_info
     assert "SDEC Open % = 80" in trial.trial_info
     assert "CTP Open % = 50" in trial.trial_info
+
+
+@pytest.mark.parametrize("workers", [None, 1])
+def test_run_trial_single_worker_runs_in_process(mock_setup, workers):
+    """With no more than one worker, models run here and are kept."""
+    mock_g, mock_model_class, Trial = mock_setup
+    mock_g.number_of_runs = 2
+    mock_g.write_to_csv = False
+
+    mock_models = setup_mock_models(mock_model_class, 2)
+    trial = Trial()
+    trial.run_trial(workers=workers)
+
+    assert trial.model_objects == mock_models
+
+
+# ----------------------------------------------------------------------------
+# Sequential replications
+# ----------------------------------------------------------------------------
+
+
+def _sequential_trial_setup(mock_setup, max_runs=10, **replication_config):
+    mock_g, mock_model_class, Trial = mock_setup
+    mock_g.write_to_csv = False
+    mock_g.replication_confidence = 0.95
+    mock_g.replication_min_runs = 3
+    mock_g.replication_max_runs = max_runs
+    for key, value in replication_config.items():
+        setattr(mock_g, f"replication_{key}", value)
+
+    mock_models = setup_mock_models(mock_model_class, max_runs)
+    return Trial(), mock_models
+
+
+def test_run_trial_stops_when_precision_target_met(mock_setup):
+    """Runs stop once every KPI with a target is precise enough."""
+    trial, mock_models = _sequential_trial_setup(
+        mock_setup, targets={"Total Savings": 0.05}
+    )
+    # Make the first runs noisy so the target is only met later on
+    for mock_model, savings in zip(mock_models, [9000.0, 10000.0, 9400.0]):
+        mock_model.total_savings = savings
+    trial.run_trial()
+
+    controller = trial.replication_controller
+    assert controller.stop_reason == "precision"
+    assert 3 < controller.runs < 10
+    assert len(trial.df_trial_results) == controller.runs
+    assert list(trial.df_trial_results.index) == list(range(controller.runs))
+    assert controller.statistics["Total Savings"].mean == pytest.approx(
+        trial.df_trial_results["Total Savings"].mean()
+    )
+    assert controller.precision()["Total Savings"] <= 0.05
+
+
+def test_run_trial_stops_at_max_runs(mock_setup):
+    """Runs stop at the maximum if the target is never met."""
+    trial, mock_models = _sequential_trial_setup(
+        mock_setup, max_runs=6, targets={"Total Savings": 0.0}
+    )
+    for i, mock_model in enumerate(mock_models):
+        mock_model.total_savings = float(i)
+    trial.run_trial()
+
+    assert trial.replication_controller.stop_reason == "max_runs"
+    assert len(trial.df_trial_results) == 6
+
+
+def test_run_trial_stops_when_time_budget_used(mock_setup):
+    """With a time budget of zero, a single run is carried out."""
+    trial, _ = _sequential_trial_setup(mock_setup, targets=None, time_budget=0)
+    trial.run_trial()
+
+    assert trial.replication_controller.stop_reason == "time_budget"
+    assert len(trial.df_trial_results) == 1
+
+
+def test_run_trial_rejects_unknown_replication_target(mock_setup):
+    trial, _ = _sequential_trial_setup(mock_setup, targets={"Savings": 0.05})
+    with pytest.raises(ValueError):
+        trial.run_trial()
+
+
+# ----------------------------------------------------------------------------
+# Streaming trials
+# ----------------------------------------------------------------------------
+
+
+def _short_trial_config(**overrides):
+    return Scenario(
+        show_trace=False,
+        number_of_runs=3,
+        sim_duration=1440 * 30,
+        warm_up_period=1440 * 5,
+        number_of_ward_beds=10,
+        sdec_unav_freq=480,
+        sdec_unav_time=960,
+        ctp_unav_freq=480,
+        ctp_unav_time=960,
+        **overrides,
+    )
+
+
+@pytest.fixture(scope="module")
+def full_trial():
+    trial = Trial(_short_trial_config())
+    trial.run_trial()
+    return trial
+
+
+def test_streaming_trial_summary_matches_full_trial(full_trial):
+    """Streaming should give the same results without keeping the models."""
+    trial = Trial(_short_trial_config(streaming_trial=True))
+    trial.run_trial()
+
+    assert trial.model_objects == []
+    assert trial.trial_summary == full_trial.trial_summary
+    pd.testing.assert_frame_equal(
+        trial.df_trial_results, full_trial.df_trial_results
+    )
+    for col, statistics in trial.trial_statistics.items():
+        assert statistics.count == 3
+        expected_mean = full_trial.df_trial_results[col].mean()
+        assert statistics.mean == pytest.approx(expected_mean)
+
+    # Patient data reduced to one row per run
+    patients = full_trial.trial_patient_df
+    assert list(trial.trial_patient_df["run"]) == [1, 2, 3]
+    assert list(trial.trial_patient_df["Number of Patients"]) == list(
+        patients.groupby("run").size()
+    )
+    assert trial.trial_patient_df["ward_los"].tolist() == pytest.approx(
+        patients.groupby("run")["ward_los"].mean().tolist()
+    )
+    assert trial.ward_occupancy_df.empty
+    assert trial.sdec_occupancy_df.empty
+
+
+def test_streaming_trial_writes_run_data_to_disk(full_trial, tmp_path):
+    trial = Trial(
+        _short_trial_config(
+            streaming_trial=True,
+            streaming_patient_data="disk",
+            streaming_output_dir=str(tmp_path),
+        )
+    )
+    trial.run_trial()
+
+    assert trial.trial_patient_df.empty
+    assert len(trial.patient_data_files) == 9
+
+    output_dir = tmp_path / scenario_key(trial.config)
+    patients = pd.read_parquet(output_dir / "patients_run_2.parquet")
+    expected = full_trial.trial_patient_df
+    assert patients["id"].tolist() == expected[expected["run"] == 2]["id"].tolist()
+
+    ward = pd.read_parquet(output_dir / "ward_occupancy_run_3.parquet")
+    expected = full_trial.ward_occupancy_df
+    pd.testing.assert_frame_equal(ward, expected[expected["run"] == 3])
+
+
+def test_streaming_trials_of_different_scenarios_keep_their_own_files(tmp_path):
+    trials = [
+        Trial(
+            _short_trial_config(
+                streaming_trial=True,
+                streaming_patient_data="disk",
+                streaming_output_dir=str(tmp_path),
+            ).replace(number_of_ward_beds=beds)
+        )
+        for beds in [8, 12]
+    ]
+    for trial in trials:
+        trial.run_trial()
+
+    first, second = (set(trial.patient_data_files) for trial in trials)
+    assert len(first) == len(second) == 9
+    assert not first & second
+    assert len(list(tmp_path.glob("*/*.parquet"))) == 18
+
+    # The first trial's files weren't overwritten by the second
+    full = Trial(_short_trial_config().replace(number_of_ward_beds=8))
+    full.run_trial()
+    ward_files = [path for path in trials[0].patient_data_files if "ward" in path]
+    expected = full.ward_occupancy_df
+    pd.testing.assert_frame_equal(
+        pd.read_parquet(ward_files[0]), expected[expected["run"] == 1]
+    )
+
+
+def test_streaming_trial_drops_run_data(full_trial):
+    trial = Trial(
+        _short_trial_config(streaming_trial=True, streaming_patient_data="drop")
+    )
+    trial.run_trial()
+
+    assert trial.trial_patient_dataframes == []
+    assert trial.trial_patient_df.empty
+    assert trial.trial_summary == full_trial.trial_summary
+
+
+def test_streaming_trial_rejects_unknown_patient_data_option():
+    trial = Trial(
+        _short_trial_config(streaming_trial=True, streaming_patient_data="keep")
+    )
+    with pytest.raises(ValueError):
+        trial.run_trial()
+
+
+def test_kpi_recording_level_trial_matches_full_trial(full_trial):
+    trial = Trial(_short_trial_config(recording_level="kpi"))
+    trial.run_trial()
+
+    pd.testing.assert_frame_equal(
+        trial.df_trial_results, full_trial.df_trial_results
+    )
+    assert trial.trial_patient_df.empty
+    assert trial.ward_occupancy_df.empty
+    assert trial.sdec_occupancy_df.empty
+
+
+# ----------------------------------------------------------------------------
+# Result cache
+# ----------------------------------------------------------------------------
+
+
+def test_trial_loads_repeated_scenario_from_cache(full_trial, tmp_path):
+    config = _short_trial_config(result_cache_dir=str(tmp_path))
+
+    first = Trial(config)
+    first.run_trial()
+    assert not first.loaded_from_cache
+    pd.testing.assert_frame_equal(
+        first.df_trial_results, full_trial.df_trial_results
+    )
+
+    # The second trial shouldn't run the model at all
+    with patch("stroke_ward_model.trial.Model", side_effect=AssertionError):
+        second = Trial(config.replace(show_trace=False, trials_run_counter=2))
+        second.run_trial()
+
+    assert second.loaded_from_cache
+    assert second.model_objects == []
+    assert second.trial_summary == first.trial_summary
+    pd.testing.assert_frame_equal(second.df_trial_results, first.df_trial_results)
+    pd.testing.assert_frame_equal(second.trial_patient_df, first.trial_patient_df)
+    pd.testing.assert_frame_equal(second.ward_occupancy_df, first.ward_occupancy_df)
+
+
+def test_trial_runs_cached_scenario_again_if_run_data_files_are_missing(tmp_path):
+    config = _short_trial_config(
+        streaming_trial=True,
+        streaming_patient_data="disk",
+        streaming_output_dir=str(tmp_path / "output"),
+        result_cache_dir=str(tmp_path / "cache"),
+    )
+    Trial(config).run_trial()
+
+    cached = Trial(config)
+    cached.run_trial()
+    assert cached.loaded_from_cache
+
+    removed = cached.patient_data_files[0]
+    Path(removed).unlink()
+    trial = Trial(config)
+    trial.run_trial()
+
+    assert not trial.loaded_from_cache
+    assert len(trial.patient_data_files) == 9
+    assert all(Path(path).exists() for path in trial.patient_data_files)
+
+
+# ----------------------------------------------------------------------------
+# Progress and cancellation
+# ----------------------------------------------------------------------------
+
+
+def test_trial_reports_progress(full_trial):
+    """Progress callbacks should be called without changing the results."""
+    completed = []
+    model_times = []
+
+    def run_progress(trial, run):
+        completed.append(
+            (run, trial.completed_runs, trial.trial_statistics["Total Savings"].count)
+        )
+
+    def model_progress(run, time, end_time):
+        model_times.append((run, time, end_time))
+
+    trial = Trial(_short_trial_config(progress_interval=1440))
+    trial.run_trial(run_progress=run_progress, model_progress=model_progress)
+
+    assert completed == [(0, 1, 1), (1, 2, 2), (2, 3, 3)]
+    assert not trial.cancelled
+    pd.testing.assert_frame_equal(trial.df_trial_results, full_trial.df_trial_results)
+
+    # Each run reports its progress once a simulated day
+    end_time = 1440 * 35
+    assert len(model_times) == 3 * 35
+    assert model_times[:2] == [(0, 1440, end_time), (0, 2880, end_time)]
+    assert model_times[-1] == (2, end_time, end_time)
+
+
+def test_trial_cancelled_between_runs_keeps_completed_runs(full_trial, tmp_path):
+    def cancel_after_second_run(trial, run):
+        if run == 1:
+            trial.cancel()
+
+    trial = Trial(_short_trial_config(result_cache_dir=str(tmp_path)))
+    trial.run_trial(run_progress=cancel_after_second_run)
+
+    assert trial.cancelled
+    assert trial.completed_runs == 2
+    pd.testing.assert_frame_equal(
+        trial.df_trial_results, full_trial.df_trial_results.loc[[0, 1]]
+    )
+    assert trial.trial_summary["trial_total_savings"] == round(
+        full_trial.df_trial_results["Total Savings"].iloc[:2].mean(), 2
+    )
+    # Incomplete results aren't cached
+    assert len(ResultCache(tmp_path)) == 0
+
+
+def test_trial_cancelled_during_run_discards_it(full_trial):
+    trial = Trial(_short_trial_config())
+
+    def cancel_part_way_through_second_run(run, time, end_time):
+        if run == 1 and time >= end_time / 2:
+            trial.cancel()
+
+    trial.run_trial(model_progress=cancel_part_way_through_second_run)
+
+    assert trial.cancelled
+    assert trial.completed_runs == 1
+    assert len(trial.model_objects) == 1
+    pd.testing.assert_frame_equal(
+        trial.df_trial_results, full_trial.df_trial_results.loc[[0]]
+    )
+
+
+def test_trial_cancelled_before_any_run_finishes():
+    trial = Trial(_short_trial_config())
+    trial.run_trial(model_progress=lambda run, time, end_time: trial.cancel())
+
+    assert trial.cancelled
+    assert trial.completed_runs == 0
+    assert trial.df_trial_results.empty